@@ -0,0 +1,154 @@
+"""Concurrent scheduler for per-(source, keyword) collection tasks.
+
+``RunManager._collect_assets`` splits collection into one task per source and
+keyword and runs them here. All tasks share one global thread budget, and
+each source has its own concurrency cap (so, e.g., a rate-limited search API
+is not hit by every keyword at once). Results are concatenated in task order,
+so the output is identical to running the tasks one after another.
+
+Brave and Serper tasks fetch pages on their own worker pools; RunManager runs
+the scheduler inside ``page_collector.shared_fetch_budget`` so the global
+budget also caps those fetches.
+
+Configuration (environment):
+    AR_COLLECT_MAX_TASKS      Global number of concurrent tasks (default 16)
+    AR_COLLECT_SOURCE_LIMITS  Per-source caps, e.g. ``brave=2,serper=3`` (default 5 per source)
+"""
+from __future__ import annotations
+
+import contextvars
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from ingestion.streamlit_context import streamlit_context_attacher
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOURCE_LIMIT = 5
+
+# progress_callback(completed_tasks, total_tasks, finished_task, assets_from_task)
+ProgressCallback = Callable[[int, int, 'CollectionTask', int], None]
+
+
+@dataclass
+class CollectionTask:
+    """One unit of collection work: a source queried for a keyword."""
+    source: str
+    keyword: str
+    run: Callable[[], List[dict]]
+
+
+def parse_source_limits(value: Optional[str]) -> Dict[str, int]:
+    """Parse ``source=limit`` pairs separated by commas."""
+    limits: Dict[str, int] = {}
+    for part in (value or '').split(','):
+        name, _, limit = part.partition('=')
+        try:
+            if name.strip():
+                limits[name.strip().lower()] = max(1, int(limit))
+        except ValueError:
+            logger.warning('Ignoring invalid collection limit %r', part)
+    return limits
+
+
+class CollectionScheduler:
+    """Run collection tasks concurrently under global and per-source limits.
+
+    Args:
+        max_tasks: Global number of tasks running at once
+        source_limits: Per-source concurrency caps (sources not listed use DEFAULT_SOURCE_LIMIT)
+        progress_callback: Called after each task with (completed, total, task, asset_count)
+    """
+
+    def __init__(
+        self,
+        max_tasks: Optional[int] = None,
+        source_limits: Optional[Dict[str, int]] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+    ):
+        if max_tasks is None:
+            max_tasks = int(os.getenv('AR_COLLECT_MAX_TASKS', '16'))
+        if source_limits is None:
+            source_limits = parse_source_limits(os.getenv('AR_COLLECT_SOURCE_LIMITS'))
+        self.max_tasks = max(1, max_tasks)
+        self.source_limits = source_limits
+        self.progress_callback = progress_callback
+
+    def _limit(self, source: str) -> int:
+        return self.source_limits.get(source, DEFAULT_SOURCE_LIMIT)
+
+    def run(self, tasks: List[CollectionTask]) -> List[dict]:
+        """Run tasks and return their assets concatenated in task order.
+
+        Tasks are dispatched in order, skipping ahead past a source that is at
+        its cap, so a busy source never holds global slots idle. A task that
+        raises re-raises here (after the running tasks finish), as it would
+        have when the tasks ran sequentially.
+        """
+        if not tasks:
+            return []
+        total = len(tasks)
+        attach_context = streamlit_context_attacher()
+        start = time.time()
+
+        def execute(task: CollectionTask) -> List[dict]:
+            attach_context()
+            task_start = time.time()
+            assets = task.run() or []
+            logger.info('[COLLECT] %s %r: %d asset(s) in %.2fs',
+                        task.source, task.keyword, len(assets), time.time() - task_start)
+            return assets
+
+        results: Dict[int, List[dict]] = {}
+        pending = list(range(total))
+        running: Dict[Future, int] = {}
+        per_source: Dict[str, int] = {}
+        error: Optional[BaseException] = None
+
+        with ThreadPoolExecutor(max_workers=min(self.max_tasks, total), thread_name_prefix='Collect') as executor:
+            while pending or running:
+                # Fill free global slots with the earliest tasks whose source has capacity
+                if error is None:
+                    for i in list(pending):
+                        if len(running) >= self.max_tasks:
+                            break
+                        source = tasks[i].source
+                        if per_source.get(source, 0) >= self._limit(source):
+                            continue
+                        pending.remove(i)
+                        per_source[source] = per_source.get(source, 0) + 1
+                        # Each task runs in a copy of this context (run-scoped fetch memo)
+                        running[executor.submit(contextvars.copy_context().run, execute, tasks[i])] = i
+                elif not running:
+                    break
+
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    i = running.pop(future)
+                    per_source[tasks[i].source] -= 1
+                    try:
+                        results[i] = future.result()
+                    except BaseException as e:  # Surface after in-flight tasks finish
+                        error = error or e
+                        results[i] = []
+                    self._report(len(results), total, tasks[i], len(results[i]))
+
+        if error is not None:
+            raise error
+        logger.info('[COLLECT] %d task(s) finished in %.2fs', total, time.time() - start)
+        collected: List[dict] = []
+        for i in range(total):
+            collected.extend(results[i])
+        return collected
+
+    def _report(self, completed: int, total: int, task: CollectionTask, count: int) -> None:
+        if self.progress_callback is None:
+            return
+        try:
+            self.progress_callback(completed, total, task, count)
+        except Exception as e:
+            logger.debug('Collection progress callback failed: %s', e)
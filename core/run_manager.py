@@ -3,9 +3,12 @@
 from __future__ import annotations
 
 import logging
+import threading
 import uuid
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, Iterable, List, Optional, Any
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Any
 import json
 
 from data import models
@@ -14,19 +17,56 @@ from data import export_s3
 from data.models import ContentAsset, DimensionScores, Run
 from sqlalchemy.orm import joinedload
 
+from core.collection_scheduler import CollectionScheduler, CollectionTask, ProgressCallback
+from ingestion.domain_classifier import GLOBAL_PAGE_PATTERNS, brand_url_scope
+from ingestion.fetch_memo import run_fetch_memo
 from ingestion.metadata_extractor import MetadataExtractor
+from ingestion.page_collector import shared_fetch_budget
+from ingestion.whois_lookup import prefetch_whois
+from scoring.link_verifier import prefetch_link_statuses
 from data.models import NormalizedContent
 
 logger = logging.getLogger(__name__)
 
 
+class _SharedClient:
+    """An API client shared by the collection tasks of one source.
+
+    Built by the first task that needs it and then used by one task at a
+    time: the Reddit and YouTube clients are not thread-safe, and sharing
+    one instance keeps their rate limiting per source instead of per keyword.
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._client = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def use(self) -> Iterator[Any]:
+        with self._lock:
+            if self._client is None:
+                self._client = self._factory()
+            yield self._client
+
+
 class RunManager:
     """High level orchestrator for a Trust Stack analysis run."""
 
-    def __init__(self, engine=None, scoring_pipeline=None, settings: Optional[dict] = None):
+    def __init__(
+        self,
+        engine=None,
+        scoring_pipeline=None,
+        settings: Optional[dict] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+    ):
         self.engine = engine or store.init_db()
         self.settings = settings or {}
         self.scoring_pipeline = scoring_pipeline
+        # Called as (completed, total, task, asset_count) after each collection task
+        self.progress_callback = progress_callback
+        # Score cache hits/misses of the latest _score_assets call
+        self.last_score_cache_stats: Dict[str, Any] = {}
 
     # ------------------------------------------------------------------
     # Public API
@@ -52,12 +92,30 @@ class RunManager:
 
         # Ingestion and scoring can be expensive; perform outside the session scope and re-open
         try:
-            assets = self._collect_assets(run_config)
+            # One memo per run: URLs surfaced by several keywords/sources are fetched once.
+            # The brand scope tells the fetchers which pages are brand-owned (visual capture).
+            scenario_config = run_config.get("scenario_config") or {}
+            with run_fetch_memo() as fetch_memo, brand_url_scope(
+                scenario_config.get("brand_domains"),
+                scenario_config.get("brand_subdomains"),
+                scenario_config.get("brand_social_handles"),
+            ):
+                assets = self._collect_assets(run_config)
+            logger.info("Run %s fetch memo: %s", external_id, fetch_memo.get_stats())
+            # Save what this run learned about its domains' fetch behaviour
+            from ingestion.page_fetcher import DomainConfigCache
+            DomainConfigCache.get_instance().flush()
+            if hasattr(self.scoring_pipeline, "batch_score_content"):
+                # Resolve WHOIS for the run's domains in the background so the
+                # domain age / privacy detectors read from cache during scoring
+                prefetch_whois(asset.get("url") for asset in assets)
             with store.session_scope(self.engine) as session:
                 persisted_assets = store.bulk_insert_assets(session, run_id=run_id, assets=assets)
                 session.expunge_all()
 
+            self.last_score_cache_stats = {}
             scores = self._score_assets(persisted_assets, run_config)
+            self._prune_score_cache()
             with store.session_scope(self.engine) as session:
                 store.bulk_insert_dimension_scores(session, scores)
                 averages = self._calculate_averages(scores)
@@ -67,6 +125,8 @@ class RunManager:
                     averages=averages,
                     authenticity_ratio=averages.get("authenticity_ratio"),
                     overall_score=averages.get("overall_score"),
+                    # Per-run score cache hit rate (see scoring.score_cache)
+                    insights={"score_cache": self.last_score_cache_stats} if self.last_score_cache_stats else None,
                 )
                 store.update_run_status(session, run_id, "completed")
                 # Eagerly load relationships to prevent DetachedInstanceError or NoneType errors
@@ -129,6 +189,12 @@ class RunManager:
         existing ingestion utilities (Brave, Serper, Reddit, YouTube) based on
         configured sources and keywords.
         should map to :class:`data.models.ContentAsset` fields.
+
+        Source/keyword pairs run concurrently through
+        :class:`core.collection_scheduler.CollectionScheduler`
+        (``run_config['collection_max_tasks']`` / ``['collection_source_limits']``
+        override the environment defaults); assets are returned in
+        source-then-keyword order regardless of completion order.
         """
 
         assets = run_config.get("assets")
@@ -234,8 +300,8 @@ class RunManager:
                                     meta=temp_meta
                                 )
                                 
-                                # Run extraction
-                                extractor.enrich_content_metadata(temp_content, html=html)
+                                # Run extraction (reuse the fetcher's parse when available)
+                                extractor.enrich_content_metadata(temp_content, html=result.get("parsed_document") or html)
                                 
                                 # Update asset with enriched fields
                                 if not asset.get("meta_info"):
@@ -359,6 +425,12 @@ class RunManager:
             if q:
                 cached_count_by_query[q] = cached_count_by_query.get(q, 0) + 1
         
+        # Tasks run concurrently and only read these, so they get read-only snapshots
+        excluded_urls = frozenset(excluded_urls)
+        cached_count_by_query = MappingProxyType(cached_count_by_query)
+
+        # One task per (source, keyword), run concurrently; results keep this order
+        tasks: List[CollectionTask] = []
         for source in sources:
             source = (source or "").lower()
             
@@ -369,23 +441,43 @@ class RunManager:
                 logger.info(f"'web' source requested, using configured provider: {provider}")
                 source = provider
             
-            if source == "brave":
-                collected.extend(self._collect_from_brave(keywords, limit, excluded_urls, cached_count_by_query))
-            elif source == "serper":
-                collected.extend(self._collect_from_serper(keywords, limit))
-            elif source == "reddit":
-                collected.extend(self._collect_from_reddit(keywords, limit))
+            # One API client per source, shared by its keyword tasks
+            client = None
+            if source == "reddit":
+                client = _SharedClient(self._new_reddit_crawler)
             elif source == "youtube":
-                collected.extend(self._collect_from_youtube(keywords, limit))
-            else:
-                logger.info("Unsupported source '%s' - skipping", source)
+                client = _SharedClient(self._new_youtube_scraper)
+
+            for kw in keywords:
+                if source == "brave":
+                    run = lambda kw=kw: self._collect_from_brave([kw], limit, excluded_urls, cached_count_by_query)
+                elif source == "serper":
+                    run = lambda kw=kw: self._collect_from_serper([kw], limit)
+                elif source == "reddit":
+                    run = lambda kw=kw, client=client: self._collect_from_reddit([kw], limit, client)
+                elif source == "youtube":
+                    run = lambda kw=kw, client=client: self._collect_from_youtube([kw], limit, client)
+                else:
+                    logger.info("Unsupported source '%s' - skipping", source)
+                    break
+                tasks.append(CollectionTask(source=source, keyword=kw, run=run))
+
+        scheduler = CollectionScheduler(
+            max_tasks=run_config.get("collection_max_tasks"),
+            source_limits=run_config.get("collection_source_limits"),
+            progress_callback=self.progress_callback,
+        )
+        # Each Brave/Serper task runs its own fetch worker pool; the global task
+        # budget also caps their page fetches in flight at any one time
+        with shared_fetch_budget(scheduler.max_tasks):
+            collected.extend(scheduler.run(tasks))
 
         return collected
 
     # ------------------------------------------------------------------
     # Source collectors (lightweight wrappers around existing ingestion code)
     # ------------------------------------------------------------------
-    def _collect_from_brave(self, keywords: List[str], limit: int, excluded_urls: set = None, cached_counts: dict = None) -> List[dict]:
+    def _collect_from_brave(self, keywords: List[str], limit: int, excluded_urls: Iterable[str] = None, cached_counts: Mapping[str, int] = None) -> List[dict]:
         try:
             from ingestion.brave_search import collect_brave_pages
         except Exception as exc:  # pragma: no cover - optional dependency
@@ -438,8 +530,8 @@ class RunManager:
                             title=page.get("title") or "",
                             meta={}
                         )
-                        # Run extraction
-                        extractor.enrich_content_metadata(temp_content, html=html)
+                        # Run extraction (reuse the fetcher's parse when available)
+                        extractor.enrich_content_metadata(temp_content, html=page.get("parsed_document") or html)
                         extracted_meta = temp_content.meta
                     except Exception as e:
                         logger.warning(f"Metadata extraction failed for {page.get('url')}: {e}")
@@ -512,14 +604,23 @@ class RunManager:
                 )
         return assets
 
-    def _collect_from_reddit(self, keywords: List[str], limit: int) -> List[dict]:
+    @staticmethod
+    def _new_reddit_crawler():
+        """RedditCrawler, or None if Reddit ingestion is unavailable."""
         try:
             from ingestion.reddit_crawler import RedditCrawler
         except Exception as exc:  # pragma: no cover - optional dependency
             logger.warning("Reddit ingestion unavailable: %s", exc)
-            return []
+            return None
+        return RedditCrawler()
+
+    def _collect_from_reddit(self, keywords: List[str], limit: int, client: Optional[_SharedClient] = None) -> List[dict]:
+        with (client or _SharedClient(self._new_reddit_crawler)).use() as crawler:
+            if crawler is None:
+                return []
+            return self._reddit_assets(crawler, keywords, limit)
 
-        crawler = RedditCrawler()
+    def _reddit_assets(self, crawler, keywords: List[str], limit: int) -> List[dict]:
         assets: List[dict] = []
         for kw in keywords:
             try:
@@ -547,14 +648,23 @@ class RunManager:
                 )
         return assets
 
-    def _collect_from_youtube(self, keywords: List[str], limit: int) -> List[dict]:
+    @staticmethod
+    def _new_youtube_scraper():
+        """YouTubeScraper, or None if YouTube ingestion is unavailable."""
         try:
             from ingestion.youtube_scraper import YouTubeScraper
         except Exception as exc:  # pragma: no cover - optional dependency
             logger.warning("YouTube ingestion unavailable: %s", exc)
-            return []
+            return None
+        return YouTubeScraper()
 
-        scraper = YouTubeScraper()
+    def _collect_from_youtube(self, keywords: List[str], limit: int, client: Optional[_SharedClient] = None) -> List[dict]:
+        with (client or _SharedClient(self._new_youtube_scraper)).use() as scraper:
+            if scraper is None:
+                return []
+            return self._youtube_assets(scraper, keywords, limit)
+
+    def _youtube_assets(self, scraper, keywords: List[str], limit: int) -> List[dict]:
         assets: List[dict] = []
         for kw in keywords:
             try:
@@ -587,6 +697,94 @@ class RunManager:
         logger.info("No assets supplied; proceeding with empty dataset")
         return []
 
+    def _score_cache_config(self, brand_context: dict) -> Dict[str, Optional[str]]:
+        from scoring.score_cache import SCORE_PROMPT_VERSION
+
+        llm_client = getattr(self.scoring_pipeline, "llm_client", None)
+        return {
+            "model": brand_context.get("llm_model") or getattr(llm_client, "model", None),
+            "rubric_version": getattr(self.scoring_pipeline, "rubric_version", None),
+            "prompt_version": SCORE_PROMPT_VERSION,
+        }
+
+    def _apply_score_cache(self, content_list: List[NormalizedContent], brand_context: dict):
+        """Split content into score-cache hits and items that still need scoring.
+
+        Returns ``(cached_scores, content_to_score, cache_keys)`` where
+        ``cached_scores`` are score dicts for hits (with ``asset_id`` set) and
+        ``cache_keys`` maps the content_id of each item to score to its key.
+        The per-run hit rate is kept in ``self.last_score_cache_stats``.
+        """
+        from scoring.score_cache import score_cache_enabled, score_cache_key
+
+        self.last_score_cache_stats = {
+            "enabled": score_cache_enabled(),
+            "lookups": len(content_list),
+            "hits": 0,
+            "misses": len(content_list),
+            "hit_rate": 0.0,
+        }
+        if not content_list or not score_cache_enabled():
+            return [], content_list, {}
+
+        config = self._score_cache_config(brand_context)
+        keys = {}
+        for content in content_list:
+            try:
+                keys[content.content_id] = score_cache_key(content, brand_context, **config)
+            except Exception as e:
+                logger.debug(f"Could not compute score cache key for {content.content_id}: {e}")
+
+        try:
+            with store.session_scope(self.engine) as session:
+                cached = store.get_cached_scores(session, keys.values())
+        except Exception as e:
+            logger.warning(f"Score cache lookup failed: {e}")
+            cached = {}
+
+        hits: List[dict] = []
+        to_score: List[NormalizedContent] = []
+        for content in content_list:
+            entry = cached.get(keys.get(content.content_id))
+            if entry is not None:
+                hits.append({**entry, "asset_id": int(content.content_id)})
+            else:
+                to_score.append(content)
+
+        lookups = len(content_list)
+        self.last_score_cache_stats.update({
+            "hits": len(hits),
+            "misses": len(to_score),
+            "hit_rate": round(len(hits) / lookups, 3) if lookups else 0.0,
+        })
+        logger.info(f"Score cache: {len(hits)}/{lookups} assets reused ({self.last_score_cache_stats['hit_rate']:.0%} hit rate)")
+        return hits, to_score, {c.content_id: keys[c.content_id] for c in to_score if c.content_id in keys}
+
+    def _store_score_cache(self, scores_by_key: Dict[str, dict], brand_context: dict) -> None:
+        """Store freshly computed LLM scores for reuse by later runs."""
+        if not scores_by_key:
+            return
+        entries = {key: {k: v for k, v in score.items() if k != "asset_id"} for key, score in scores_by_key.items()}
+        try:
+            with store.session_scope(self.engine) as session:
+                store.store_cached_scores(session, entries, **self._score_cache_config(brand_context))
+        except Exception as e:
+            logger.warning(f"Score cache store failed: {e}")
+
+    def _prune_score_cache(self) -> None:
+        """Drop score cache entries that no run has used for AR_SCORE_CACHE_MAX_AGE_DAYS."""
+        from scoring.score_cache import score_cache_enabled, score_cache_max_age_days
+
+        if not score_cache_enabled():
+            return
+        try:
+            with store.session_scope(self.engine) as session:
+                pruned = store.prune_score_cache(session, days_unused=score_cache_max_age_days())
+            if pruned:
+                logger.info(f"Score cache: pruned {pruned} unused entries")
+        except Exception as e:
+            logger.warning(f"Score cache prune failed: {e}")
+
     def _extract_rationale_from_content_scores(self, cs) -> dict:
         """Extract detected_attributes and dimension signals from ContentScores.meta for persistence."""
         import json
@@ -633,11 +831,7 @@ class RunManager:
         }
         
         # 1. Identify global pages based on URL patterns
-        global_map = {
-            "about": ["/about", "/our-story", "/team", "/founders"],
-            "contact": ["/contact", "/support", "/help"],
-            "policies": ["/privacy", "/terms", "/legal", "/standards", "/editorial"]
-        }
+        global_map = GLOBAL_PAGE_PATTERNS
         
         global_assets = {}
         
@@ -758,13 +952,26 @@ class RunManager:
                     "site_level_signals": site_level_signals,
                 }
                 
+                from scoring.score_cache import cacheable_score
+
+                # Reuse stored scores for unchanged assets; only the rest go to the LLM
+                scored, normalized_content_list, cache_keys = self._apply_score_cache(normalized_content_list, brand_context)
+
+                # Check every link of the assets to score in one batch; broken link
+                # detection and LLM issue verification then read cached statuses
+                if normalized_content_list:
+                    prefetch_link_statuses(normalized_content_list)
+
                 # Call the actual Trust Stack scorer
                 logger.info(f"Scoring {len(normalized_content_list)} assets with ContentScorer.batch_score_content()")
-                content_scores_list = self.scoring_pipeline.batch_score_content(normalized_content_list, brand_context)
+                content_scores_list = (
+                    self.scoring_pipeline.batch_score_content(normalized_content_list, brand_context)
+                    if normalized_content_list else []
+                )
                 
-                # Track which assets were scored by ContentScorer
-                scored_asset_ids = set()
-                scored = []
+                # Track which assets were scored by ContentScorer (or reused from the score cache)
+                scored_asset_ids = {entry["asset_id"] for entry in scored}
+                new_cache_entries: Dict[str, dict] = {}
                 
                 # Convert ContentScores back to the dict format expected by RunManager
                 for cs in content_scores_list:
@@ -806,8 +1013,12 @@ class RunManager:
                         # Include detected_attributes in rationale for persistence
                         "rationale": self._extract_rationale_from_content_scores(cs),
                     })
+                    # Error and skipped results carry no dimension signals; never cache them
+                    if cs.content_id in cache_keys and cacheable_score(scored[-1]):
+                        new_cache_entries[cache_keys[cs.content_id]] = scored[-1]
                 
-                logger.info(f"ContentScorer completed: {len(scored)} assets scored via LLM")
+                self._store_score_cache(new_cache_entries, brand_context)
+                logger.info(f"ContentScorer completed: {len(content_scores_list)} assets scored via LLM")
                 
                 # For any assets that were filtered out by ContentScorer (insufficient content),
                 # apply heuristic fallback scoring so they still appear in the report
@@ -835,7 +1046,10 @@ class RunManager:
                             "classification": "Fair" if baseline >= 0.4 else "Poor",
                         })
                 
-                logger.info(f"Total scores: {len(scored)} assets (LLM: {len(scored_asset_ids)}, heuristic: {len(unscored_assets)})")
+                logger.info(
+                    f"Total scores: {len(scored)} assets (LLM: {len(content_scores_list)}, "
+                    f"score cache: {self.last_score_cache_stats.get('hits', 0)}, heuristic: {len(unscored_assets)})"
+                )
                 return scored
                 
             except Exception as e:
@@ -10,6 +10,7 @@ from .models import (
     Run,
     ContentAsset,
     DimensionScores,
+    ScoreCacheEntry,
     TrustStackSummary,
 )
 
@@ -19,5 +20,6 @@ __all__ = [
     "Run",
     "ContentAsset",
     "DimensionScores",
+    "ScoreCacheEntry",
     "TrustStackSummary",
 ]
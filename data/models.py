@@ -122,6 +122,31 @@ class DimensionScores(Base):
     asset = relationship("ContentAsset", back_populates="scores")
 
 
+class ScoreCacheEntry(Base):
+    """Dimension scores keyed by a content hash, reused across runs (see scoring.score_cache)."""
+
+    __tablename__ = "score_cache"
+
+    id = Column(Integer, primary_key=True, index=True)
+    cache_key = Column(String(64), unique=True, index=True, nullable=False)
+    model = Column(String, nullable=True)
+    rubric_version = Column(String, nullable=True)
+    prompt_version = Column(String, nullable=True)
+    score_provenance = Column(Float, nullable=True)
+    score_verification = Column(Float, nullable=True)
+    score_transparency = Column(Float, nullable=True)
+    score_coherence = Column(Float, nullable=True)
+    score_resonance = Column(Float, nullable=True)
+    score_ai_readiness = Column(Float, nullable=True)
+    overall_score = Column(Float, nullable=True)
+    classification = Column(String, nullable=True)
+    rationale = Column(JSON, default=dict)
+    flags = Column(JSON, default=dict)
+    hit_count = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_used_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
 class TrustStackSummary(Base):
     """Aggregated metrics for a run."""
 
@@ -4,8 +4,8 @@ from __future__ import annotations
 
 import os
 from contextlib import contextmanager
-from datetime import datetime
-from typing import Iterable, List, Optional
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
@@ -17,6 +17,7 @@ from data.models import (
     DimensionScores,
     Run,
     Scenario,
+    ScoreCacheEntry,
     TrustStackSummary,
 )
 
@@ -171,6 +172,80 @@ def bulk_insert_dimension_scores(session: Session, scores: Iterable[dict]) -> Li
     return records
 
 
+_SCORE_FIELDS = (
+    "score_provenance",
+    "score_verification",
+    "score_transparency",
+    "score_coherence",
+    "score_resonance",
+    "score_ai_readiness",
+    "overall_score",
+    "classification",
+)
+
+
+def get_cached_scores(session: Session, cache_keys: Iterable[str]) -> Dict[str, dict]:
+    """Return cached score dicts (without asset_id) for the keys found, marking them used."""
+    keys = list(set(cache_keys))
+    found: Dict[str, dict] = {}
+    now = datetime.utcnow()
+    # Chunk the IN clause to stay under SQLite's parameter limit
+    for start in range(0, len(keys), 500):
+        chunk = keys[start:start + 500]
+        for entry in session.query(ScoreCacheEntry).filter(ScoreCacheEntry.cache_key.in_(chunk)):
+            entry.hit_count = (entry.hit_count or 0) + 1
+            entry.last_used_at = now
+            found[entry.cache_key] = {
+                **{field: getattr(entry, field) for field in _SCORE_FIELDS},
+                "rationale": entry.rationale or {},
+                "flags": entry.flags or {},
+            }
+    session.commit()
+    return found
+
+
+def store_cached_scores(
+    session: Session,
+    scores_by_key: Dict[str, dict],
+    model: Optional[str] = None,
+    rubric_version: Optional[str] = None,
+    prompt_version: Optional[str] = None,
+) -> int:
+    """Insert or refresh score cache entries; returns the number written."""
+    if not scores_by_key:
+        return 0
+    keys = list(scores_by_key)
+    existing = {}
+    for start in range(0, len(keys), 500):
+        chunk = keys[start:start + 500]
+        for entry in session.query(ScoreCacheEntry).filter(ScoreCacheEntry.cache_key.in_(chunk)):
+            existing[entry.cache_key] = entry
+    now = datetime.utcnow()
+    for key, score in scores_by_key.items():
+        entry = existing.get(key)
+        if entry is None:
+            entry = ScoreCacheEntry(cache_key=key, hit_count=0, created_at=now)
+            session.add(entry)
+        for field in _SCORE_FIELDS:
+            setattr(entry, field, score.get(field))
+        entry.rationale = score.get("rationale") or {}
+        entry.flags = score.get("flags") or {}
+        entry.model = model
+        entry.rubric_version = rubric_version
+        entry.prompt_version = prompt_version
+        entry.last_used_at = now
+    session.commit()
+    return len(scores_by_key)
+
+
+def prune_score_cache(session: Session, days_unused: int = 30) -> int:
+    """Delete score cache entries not used for N days."""
+    cutoff = datetime.utcnow() - timedelta(days=days_unused)
+    count = session.query(ScoreCacheEntry).filter(ScoreCacheEntry.last_used_at < cutoff).delete()
+    session.commit()
+    return count
+
+
 def create_truststack_summary(
     session: Session,
     run_id: int,
@@ -0,0 +1,223 @@
+"""Asyncio HTTP fetch engine for fetch_pages_parallel.
+
+Keeps many HTTP requests in flight on one event loop instead of parking a
+thread per URL in ``requests.Session.get`` and ``time.sleep``. Connections are
+pooled and kept alive through a single ``aiohttp`` session, with a global
+in-flight limit and a per-domain concurrency cap so one slow site cannot
+monopolise the engine.
+
+Only the network I/O runs on the loop. Response processing (HTML parsing,
+thin-content Playwright fallback, SSL checks) still goes through
+``page_fetcher._build_page_result`` on a small thread pool, so results are
+identical to ``fetch_page``.
+
+aiohttp is optional: when it is not installed ``fetch_pages_parallel`` keeps
+using its thread pool.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from ingestion.fetch_config import get_random_delay, get_realistic_headers, get_retry_config
+from ingestion.http_cache import get_http_cache
+from ingestion.stream_reader import CHUNK_SIZE, BodyAccumulator
+from ingestion.streamlit_context import streamlit_context_attacher
+
+logger = logging.getLogger(__name__)
+
+# Optional aiohttp import
+try:
+    import aiohttp
+    _AIOHTTP_AVAILABLE = True
+except ImportError:
+    aiohttp = None
+    _AIOHTTP_AVAILABLE = False
+
+
+def is_available() -> bool:
+    """Whether the async engine can be used (aiohttp installed and not disabled)."""
+    return _AIOHTTP_AVAILABLE and os.getenv('AR_ASYNC_FETCH', '1') == '1'
+
+
+class _AsyncResponse:
+    """Minimal response object exposing what ``_build_page_result`` reads."""
+
+    def __init__(
+        self,
+        url: str,
+        status_code: int,
+        text: str,
+        headers: Dict[str, str],
+        elapsed: Optional[timedelta] = None,
+        body: Optional[BodyAccumulator] = None,
+    ):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers
+        self.elapsed = elapsed  # Mirrors requests.Response.elapsed for domain latency stats
+        # Same body metadata as stream_reader.StreamedResponse
+        self.content_kind = body.kind if body else 'html'
+        self.content_type = body.content_type if body else headers.get('Content-Type', '')
+        self.pdf_bytes = body.data if body and body.kind == 'pdf' else None
+
+
+class AsyncFetchEngine:
+    """Event-loop based page fetcher with global and per-domain concurrency caps.
+
+    Args:
+        max_in_flight: Maximum concurrent HTTP requests (AR_FETCH_MAX_IN_FLIGHT, default 50)
+        per_domain: Maximum concurrent requests per domain (AR_FETCH_PER_DOMAIN, default 2)
+        process_workers: Threads used for parsing / Playwright hand-off
+        browser_manager: Optional PlaywrightBrowserManager passed to fallbacks
+    """
+
+    def __init__(
+        self,
+        max_in_flight: Optional[int] = None,
+        per_domain: Optional[int] = None,
+        process_workers: int = 5,
+        browser_manager=None,
+    ):
+        self.max_in_flight = max_in_flight or int(os.getenv('AR_FETCH_MAX_IN_FLIGHT', '50'))
+        self.per_domain = per_domain or int(os.getenv('AR_FETCH_PER_DOMAIN', '2'))
+        self.process_workers = max(1, process_workers)
+        self.browser_manager = browser_manager
+
+    def fetch_all(self, urls: List[str]) -> List[Dict[str, str]]:
+        """Fetch all URLs and return results in input order."""
+        if not urls:
+            return []
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._fetch_all(urls))
+
+        # Called from inside a running loop: run ours on a helper thread
+        box: Dict[str, List[Dict[str, str]]] = {}
+        context = contextvars.copy_context()
+        runner = threading.Thread(
+            target=lambda: box.setdefault('results', context.run(asyncio.run, self._fetch_all(urls)))
+        )
+        runner.start()
+        runner.join()
+        return box.get('results') or [_empty_result(u) for u in urls]
+
+    async def _fetch_all(self, urls: List[str]) -> List[Dict[str, str]]:
+        executor = ThreadPoolExecutor(
+            max_workers=self.process_workers,
+            thread_name_prefix='AsyncFetchProcess',
+            initializer=streamlit_context_attacher(),
+        )
+        global_sem = asyncio.Semaphore(self.max_in_flight)
+        domain_sems: Dict[str, asyncio.Semaphore] = {}
+        connector = aiohttp.TCPConnector(limit=self.max_in_flight, ttl_dns_cache=300)
+
+        try:
+            async with aiohttp.ClientSession(connector=connector) as session:
+                tasks = [
+                    self._fetch_one(session, url, global_sem, domain_sems, executor)
+                    for url in urls
+                ]
+                results = await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            executor.shutdown(wait=True)
+
+        ordered = []
+        for url, result in zip(urls, results):
+            if isinstance(result, BaseException):
+                logger.warning('[ASYNC_FETCH] ✗ Failed to fetch %s: %s', url, result)
+                ordered.append(_empty_result(url))
+            else:
+                ordered.append(result)
+        return ordered
+
+    async def _fetch_one(self, session, url, global_sem, domain_sems, executor) -> Dict[str, str]:
+        from ingestion import page_fetcher
+
+        loop = asyncio.get_running_loop()
+
+        # Domains known to need Playwright, and pages rendered for visual analysis,
+        # skip the HTTP request entirely
+        if page_fetcher._requires_playwright_first(url) or page_fetcher._renders_first(url):
+            return await loop.run_in_executor(
+                executor, contextvars.copy_context().run,
+                lambda: page_fetcher._fetch_page_direct(url, browser_manager=self.browser_manager),
+            )
+
+        http_cache = get_http_cache()
+        cached_entry = http_cache.get(url) if http_cache else None
+        extra_headers = http_cache.conditional_headers(cached_entry) if cached_entry else {}
+
+        domain = urlparse(url).netloc
+        domain_sem = domain_sems.setdefault(domain, asyncio.Semaphore(self.per_domain))
+        async with domain_sem:
+            async with global_sem:
+                resp = await self._get_with_retries(session, url, extra_headers)
+
+        if resp is None:
+            return _empty_result(url)
+        return await loop.run_in_executor(
+            executor, contextvars.copy_context().run,
+            page_fetcher._build_page_result, url, resp, self.browser_manager, cached_entry,
+        )
+
+    async def _get_with_retries(self, session, url: str, extra_headers: Optional[Dict[str, str]] = None) -> Optional[_AsyncResponse]:
+        """GET with the same retry/backoff policy as ``fetch_page``."""
+        from ingestion.page_fetcher import _rate_limiter
+
+        headers = get_realistic_headers(url)
+        headers.update(extra_headers or {})
+        # aiohttp only decodes brotli when the optional Brotli package is present
+        headers['Accept-Encoding'] = 'gzip, deflate'
+        retry_config = get_retry_config(url)
+        retries = retry_config['max_retries']
+        timeout = aiohttp.ClientTimeout(total=retry_config['timeout'])
+        last_status_code = None
+
+        for attempt in range(1, retries + 1):
+            if attempt == 1:
+                await _rate_limiter.acquire(url)
+            else:
+                delay = get_random_delay(url)
+                logger.debug('Retry attempt %s/%s for %s - waiting %.2fs', attempt, retries, url, delay)
+                await asyncio.sleep(delay)
+
+            try:
+                started = time.monotonic()
+                async with session.get(url, headers=headers, timeout=timeout, max_redirects=10) as resp:
+                    last_status_code = resp.status
+                    _rate_limiter.record_response(url, resp.status, resp.headers.get('Retry-After'))
+                    # Bounded read: stop at </body>, the byte budget, or a non-HTML/PDF body
+                    body = BodyAccumulator(resp.headers.get('Content-Type', ''))
+                    async for chunk in resp.content.iter_chunked(CHUNK_SIZE):
+                        if not body.feed(chunk):
+                            break
+                    body.finish()
+                    return _AsyncResponse(
+                        str(resp.url), resp.status, body.text(), dict(resp.headers),
+                        elapsed=timedelta(seconds=time.monotonic() - started),
+                        body=body,
+                    )
+            except Exception as e:
+                logger.debug('Fetch attempt %s/%s for %s failed: %s', attempt, retries, url, e)
+                if attempt == retries:
+                    logger.error('Error fetching page %s after %s attempts: %s', url, retries, e)
+                    return None
+                backoff = get_retry_config(url, last_status_code)['base_backoff']
+                await asyncio.sleep(backoff * (2 ** (attempt - 1)))
+        return None
+
+
+def _empty_result(url: str) -> Dict[str, str]:
+    return {"title": "", "body": "", "url": url, "access_denied": False}
+
@@ -33,6 +33,7 @@ from ingestion.fetch_config import (
 
 # Per-domain rate limiting (allows parallel requests to different domains)
 from ingestion.rate_limiter import PerDomainRateLimiter
+from ingestion.search_cache import cached_search
 _rate_limiter = PerDomainRateLimiter(
     default_interval=float(os.getenv('BRAVE_REQUEST_INTERVAL', '2.0'))
 )
@@ -56,7 +57,14 @@ def search_brave(query: str, size: int = 10, start_offset: int = 0) -> List[Dict
 
     For requests larger than the API's per-request limit, this function will
     automatically paginate through multiple requests to collect the desired number of results.
+    Results are served from the shared search cache when available (see ingestion.search_cache).
     """
+    return cached_search('brave', query, size, start_offset,
+                         lambda: _search_brave_uncached(query, size=size, start_offset=start_offset))
+
+
+def _search_brave_uncached(query: str, size: int = 10, start_offset: int = 0) -> List[Dict[str, str]]:
+    """Query Brave (API or HTML) without consulting the search cache."""
     # If user has provided a Brave API key, prefer the API endpoint
     api_key = get_secret('BRAVE_API_KEY')
     api_endpoint = os.getenv('BRAVE_API_ENDPOINT', 'https://api.search.brave.com/res/v1/web/search')
@@ -132,6 +140,7 @@ def search_brave(query: str, size: int = 10, start_offset: int = 0) -> List[Dict
                 else:
                     hdrs['Accept'] = hdrs.get('Accept', '*/*') if hdrs.get('Accept') == '*/*' else 'application/json'
                     resp = requests.get(api_endpoint, params=params, headers=hdrs, timeout=api_timeout)
+                _rate_limiter.record_response(BRAVE_SEARCH_URL, resp.status_code, (getattr(resp, 'headers', None) or {}).get('Retry-After'))
 
                 if resp.status_code == 200:
                     try:
@@ -409,25 +418,18 @@ def collect_brave_pages(
     min_body_length: int = 200,
     min_brand_body_length: int | None = None,
     url_collection_config: 'URLCollectionConfig' | None = None,
-    excluded_urls: set | None = None
+    excluded_urls: set | None = None,
+    max_workers: int | None = None,
 ) -> List[Dict[str, str]]:
     """Collect up to `target_count` successfully fetched pages for a Brave search query.
 
-    Uses a Producer-Consumer pattern:
-    - Main thread (Producer): Fetches search results and pushes them to a queue.
-    - Worker threads (Consumers): Fetch page content and process results.
+    Uses the shared event-driven Producer-Consumer pipeline
+    (ingestion.page_collector.run_collection_pipeline):
+    - Main thread (Producer): Fetches search results (one batch ahead) and pushes them to a queue.
+    - Worker threads (Consumers): Check robots.txt, fetch page content and process results.
     """
-    import queue
-    import threading
-    from concurrent.futures import ThreadPoolExecutor
-
-    # Dynamic Pool Sizing Configuration
-    initial_multiplier = 2
-    max_total_results = pool_size if pool_size is not None else max(30, target_count * 5)
-    current_batch_size = target_count * initial_multiplier
-    
-    current_offset = 0
-    
+    from ingestion.page_collector import run_collection_pipeline
+
     # Initialize persistent Playwright browser if available
     browser_manager = None
     try:
@@ -441,238 +443,23 @@ def collect_brave_pages(
         logger.debug('[BRAVE] Could not start persistent browser: %s', e)
         browser_manager = None
 
-    # Shared state
-    # Use bounded queue to prevent producer from flooding memory if consumers are slow
-    url_queue = queue.Queue(maxsize=max_total_results if max_total_results < 100 else 50)
-    results_lock = threading.Lock()
-    stop_event = threading.Event()
-    seen_urls = set(excluded_urls) if excluded_urls else set()
-    
-    # Collections
-    brand_owned_collected: List[Dict[str, str]] = []
-    third_party_collected: List[Dict[str, str]] = []
-    
-    # Domain diversity tracking
-    from urllib.parse import urlparse
-    domain_counts: Dict[str, int] = {}
-    
-    # Adjust domain limits based on collection strategy
-    if url_collection_config and url_collection_config.brand_owned_ratio >= 0.8:
-        # Brand-controlled search: allow many pages per domain
-        # We WANT multiple pages from the brand's domains (nike.com, about.nike.com, etc.)
-        max_per_domain = target_count  # No effective limit
-        logger.info('[BRAVE] Brand-controlled search: disabled domain diversity limits (max_per_domain=%d)', max_per_domain)
-    else:
-        # Third-party or mixed search: enforce diversity to avoid over-sampling one domain
-        max_per_domain = max(1, int(target_count * 0.2))
-        logger.info('[BRAVE] Mixed search: enforcing domain diversity (max_per_domain=%d)', max_per_domain)
-
-    
-    # Stats
-    stats = {
-        'total_processed': 0,
-        'total_fetched': 0,
-        'total_valid': 0,
-        'no_url': 0,
-        'robots_txt': 0,
-        'thin_content': 0,
-        'brand_owned_pool_full': 0,
-        'third_party_pool_full': 0,
-        'domain_limit_reached': 0,
-        'error_page': 0,
-        'processed': 0
-    }
-
-    # Ratio targets
-    target_brand_owned = target_count
-    target_third_party = 0
-    if url_collection_config:
-        target_brand_owned = int(target_count * url_collection_config.brand_owned_ratio)
-        target_third_party = int(target_count * url_collection_config.third_party_ratio)
-        if target_brand_owned + target_third_party < target_count:
-            if url_collection_config.brand_owned_ratio >= url_collection_config.third_party_ratio:
-                target_brand_owned += (target_count - target_brand_owned - target_third_party)
-            else:
-                target_third_party += (target_count - target_brand_owned - target_third_party)
-
-        logger.info('[BRAVE] Collecting with ratio enforcement: %d brand-owned (%.0f%%) + %d 3rd party (%.0f%%) from %d search results',
-                   target_brand_owned, url_collection_config.brand_owned_ratio * 100,
-                   target_third_party, url_collection_config.third_party_ratio * 100,
-                   max_total_results)
+    def search_batch(size: int, offset: int):
+        results = search_brave(query, size=size, start_offset=offset)
+        return results, offset + len(results)
 
     logger.info('[BRAVE] Starting concurrent collection for query=%s (target=%d)', query, target_count)
-
-    def worker():
-        while True:
-            try:
-                # Timeout allows checking stop_event periodically
-                item = url_queue.get(timeout=0.5)
-            except queue.Empty:
-                if stop_event.is_set():
-                    break
-                continue
-            
-            try:
-                with results_lock:
-                    # Check if we're already done
-                    if len(brand_owned_collected) + len(third_party_collected) >= target_count:
-                        continue
-                    stats['processed'] += 1
-                    stats['total_processed'] += 1
-
-                url = item.get('url')
-                if not url:
-                    with results_lock: stats['no_url'] += 1
-                    continue
-
-                # Classify
-                is_brand_owned = False
-                classification = None
-                if url_collection_config:
-                    classification = classify_url(url, url_collection_config)
-                    is_brand_owned = classification.source_type == URLSourceType.BRAND_OWNED
-
-                # Robots check (cached)
-                try:
-                    allowed = _is_allowed_by_robots(url)
-                except Exception:
-                    allowed = True
-                if not allowed:
-                    with results_lock: stats['robots_txt'] += 1
-                    continue
-
-                # Fetch
-                with results_lock: stats['total_fetched'] += 1
-                content = fetch_page(url, browser_manager=browser_manager)
-                body = content.get('body') or ''
-                required_length = min_brand_body_length if is_brand_owned else min_body_length
-                
-                if body and len(body) >= required_length:
-                    # Check error page
-                    title = content.get('title', '').lower()
-                    error_indicators = ['access denied', 'forbidden', '403', '401', 'error', 'not found', '404']
-                    if any(indicator in title for indicator in error_indicators):
-                        with results_lock: stats['error_page'] += 1
-                        continue
-
-                    with results_lock:
-                        # Re-check limits inside lock
-                        if len(brand_owned_collected) + len(third_party_collected) >= target_count:
-                            continue
-
-                        # Check pools
-                        if url_collection_config:
-                            if is_brand_owned and len(brand_owned_collected) >= target_brand_owned:
-                                stats['brand_owned_pool_full'] += 1
-                                continue
-                            if not is_brand_owned and len(third_party_collected) >= target_third_party:
-                                stats['third_party_pool_full'] += 1
-                                continue
-
-                        # Check diversity
-                        parsed_url = urlparse(url)
-                        domain = parsed_url.netloc.lower()
-                        if domain_counts.get(domain, 0) >= max_per_domain:
-                            stats['domain_limit_reached'] += 1
-                            continue
-
-                        # Add
-                        if url_collection_config:
-                            content['source_type'] = classification.source_type.value
-                            content['source_tier'] = classification.tier.value if classification.tier else 'unknown'
-                            if is_brand_owned:
-                                brand_owned_collected.append(content)
-                            else:
-                                third_party_collected.append(content)
-                        else:
-                            brand_owned_collected.append(content)
-
-                        domain_counts[domain] = domain_counts.get(domain, 0) + 1
-                        stats['total_valid'] += 1
-                        
-                        logger.info('[BRAVE] Collected page %d/%d: %s', 
-                                   len(brand_owned_collected) + len(third_party_collected), 
-                                   target_count, url)
-                else:
-                    with results_lock: stats['thin_content'] += 1
-
-            except Exception as e:
-                logger.error('Worker error processing %s: %s', url, e)
-            finally:
-                url_queue.task_done()
-
-    # Start workers
-    # Try to attach Streamlit context to workers to suppress warnings
-    try:
-        from streamlit.runtime.scriptrunner import add_script_run_ctx
-    except ImportError:
-        # Fallback for older Streamlit versions or if not running in Streamlit
-        try:
-            from streamlit.scriptrunner import add_script_run_ctx
-        except ImportError:
-            add_script_run_ctx = lambda x: x
-
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        futures = [executor.submit(add_script_run_ctx(worker)) for _ in range(5)]
-        
-        # Producer Loop
-        while not stop_event.is_set():
-            # Check if done
-            with results_lock:
-                if len(brand_owned_collected) + len(third_party_collected) >= target_count:
-                    logger.info('[BRAVE] Target reached, stopping producer')
-                    stop_event.set()
-                    break
-                if stats['total_processed'] >= max_total_results:
-                    logger.info('[BRAVE] Max total results reached, stopping producer')
-                    stop_event.set()
-                    break
-
-            logger.info('[BRAVE] Fetching search batch: size=%d, offset=%d', current_batch_size, current_offset)
-            try:
-                search_results = search_brave(query, size=current_batch_size, start_offset=current_offset)
-            except Exception as e:
-                logger.warning('Brave search failed: %s', e)
-                break
-                
-            if not search_results:
-                logger.info('[BRAVE] No more search results available')
-                break
-                
-            current_offset += len(search_results)
-            
-            # Push to queue
-            for item in search_results:
-                url = item.get('url')
-                if url and url not in seen_urls:
-                    seen_urls.add(url)
-                    url_queue.put(item)
-            
-            # Dynamic Sizing based on cumulative success rate
-            with results_lock:
-                success_rate = stats['total_valid'] / stats['total_fetched'] if stats['total_fetched'] > 0 else 0
-            
-            if success_rate < 0.3 and stats['total_fetched'] > 5:
-                current_batch_size = target_count * 2
-            elif success_rate > 0.6 and stats['total_fetched'] > 5:
-                with results_lock:
-                    needed = target_count - (len(brand_owned_collected) + len(third_party_collected))
-                current_batch_size = max(10, int(needed / (success_rate or 0.1)) + 5)
-            else:
-                current_batch_size = target_count
-            
-            # Small sleep to let workers consume a bit before fetching next batch?
-            # Not strictly necessary, but helps avoid flooding queue if search is much faster than fetch
-            time.sleep(0.1)
-
-        # Wait for workers to finish pending tasks or notice stop_event
-        stop_event.set()
-        
-    collected = brand_owned_collected + third_party_collected
-    
     # Do NOT close the singleton browser manager here. Let it persist.
-    # if browser_manager:
-    #     browser_manager.close()
-    
-    logger.info('[BRAVE] Collection complete. Collected: %d. Stats: %s', len(collected), stats)
-    return collected
+    return run_collection_pipeline(
+        search_batch,
+        lambda url: fetch_page(url, browser_manager=browser_manager),
+        target_count,
+        initial_cursor=0,
+        pool_size=pool_size,
+        min_body_length=min_body_length,
+        min_brand_body_length=min_brand_body_length,
+        url_collection_config=url_collection_config,
+        excluded_urls=excluded_urls,
+        is_allowed=_is_allowed_by_robots,
+        max_workers=max_workers,
+        log_tag='BRAVE',
+    )
@@ -0,0 +1,286 @@
+"""Warm, per-domain Playwright browser contexts.
+
+A fresh context per page means every page of a brand site pays again for its
+cookie-consent wall, bot challenge and cold caches. ``BrowserContextPool``
+keeps one warm context per (domain, user agent, text-only) key on each
+browser worker, with these rules:
+
+- At most AR_PLAYWRIGHT_WARM_CONTEXTS idle contexts stay open per worker.
+  When a new one is needed, the least recently used context is closed. They
+  are kept for reuse, not for rendering in parallel: a worker renders one
+  page at a time (see ingestion.playwright_manager).
+- A context is recycled after AR_PLAYWRIGHT_CONTEXT_MAX_PAGES pages, or once
+  a page's JS heap exceeds AR_PLAYWRIGHT_CONTEXT_MAX_HEAP_MB. This keeps
+  long runs from accumulating renderer memory.
+- A context is closed instead of reused after a failed fetch.
+
+Persisting cookies and localStorage (Playwright ``storage_state``) is opt-in,
+since the files hold session cookies in plaintext. When AR_PLAYWRIGHT_STATE_DIR
+is set, state is saved there per domain after a context's first page and
+whenever it closes. New contexts for the domain start from that state, so
+consent choices also carry across runs, and across workers of the same run.
+``clear_all_search_caches`` deletes the saved files.
+
+Configuration (environment):
+    AR_PLAYWRIGHT_CONTEXT_REUSE        Keep contexts open between pages (default 1)
+    AR_PLAYWRIGHT_WARM_CONTEXTS        Idle contexts kept open per browser worker (default 4)
+    AR_PLAYWRIGHT_CONTEXT_MAX_PAGES    Pages per context before recycling (default 25)
+    AR_PLAYWRIGHT_CONTEXT_MAX_HEAP_MB  JS heap that triggers recycling (default 512)
+    AR_PLAYWRIGHT_STATE_DIR            Storage state directory, e.g. .cache/playwright_state (default empty: not persisted)
+    AR_PLAYWRIGHT_STATE_TTL_HOURS      Age after which saved state is ignored (default 24)
+"""
+from __future__ import annotations
+
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# (domain, user agent, text-only) -> one context
+ContextKey = Tuple[str, str, bool]
+
+
+def context_domain(url: str) -> str:
+    """Domain whose cookies a URL shares (www. and the bare domain share one)."""
+    host = urlparse(url).netloc.lower().split(':')[0]
+    return host[4:] if host.startswith('www.') else host
+
+
+class StorageStateStore:
+    """Per-domain Playwright storage_state files (cookies and localStorage).
+
+    Args:
+        directory: Directory holding one JSON file per domain
+        ttl_seconds: Saved state older than this is ignored
+    """
+
+    def __init__(self, directory: str, ttl_seconds: float = 24 * 3600):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, domain: str) -> str:
+        return os.path.join(self.directory, re.sub(r'[^a-z0-9.-]', '_', domain.lower()) + '.json')
+
+    def load_path(self, domain: str) -> Optional[str]:
+        """Path of the domain's saved state, or None if missing or expired."""
+        path = self._path(domain)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                return None
+        except OSError:
+            return None
+        return path
+
+    def save(self, context, domain: str) -> bool:
+        """Write a context's storage state for domain (atomically, owner-readable only)."""
+        path = self._path(domain)
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            context.storage_state(path=tmp)
+            os.chmod(tmp, 0o600)  # Session cookies
+            os.replace(tmp, path)
+            return True
+        except Exception as e:
+            logger.debug('[PLAYWRIGHT] Could not save storage state for %s: %s', domain, e)
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return False
+
+    def clear(self) -> int:
+        """Delete all saved state files; returns the number removed."""
+        count = 0
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return 0
+        for name in names:
+            if name.endswith('.json'):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                    count += 1
+                except OSError as e:
+                    logger.debug('[PLAYWRIGHT] Could not remove storage state %s: %s', name, e)
+        return count
+
+
+_state_store: Optional[StorageStateStore] = None
+_state_store_lock = threading.Lock()
+_state_store_loaded = False
+
+
+def get_storage_state_store() -> Optional[StorageStateStore]:
+    """Get the configured storage state store, or None if disabled."""
+    global _state_store, _state_store_loaded
+    if not _state_store_loaded:
+        with _state_store_lock:
+            if not _state_store_loaded:
+                directory = os.getenv('AR_PLAYWRIGHT_STATE_DIR', '')
+                if directory:
+                    try:
+                        _state_store = StorageStateStore(
+                            directory,
+                            ttl_seconds=float(os.getenv('AR_PLAYWRIGHT_STATE_TTL_HOURS', '24')) * 3600,
+                        )
+                    except OSError as e:
+                        logger.warning('Playwright storage state persistence disabled (%s): %s', directory, e)
+                _state_store_loaded = True
+    return _state_store
+
+
+class PooledContext:
+    """A browser context on loan from a BrowserContextPool."""
+
+    def __init__(self, key: ContextKey, context, blocked: Optional[Dict[str, int]] = None, restored: bool = False):
+        self.key = key
+        self.context = context
+        self.blocked = blocked  # Text-only route counter, if installed
+        self.restored = restored  # Started from saved storage state
+        self.pages = 0
+
+    @property
+    def domain(self) -> str:
+        return self.key[0]
+
+    @property
+    def warm(self) -> bool:
+        """True if this context already loaded a page or restored saved state."""
+        return self.pages > 0 or self.restored
+
+
+class BrowserContextPool:
+    """LRU of warm browser contexts for one browser.
+
+    Playwright's sync API is bound to its thread, so each browser worker owns
+    its own pool. The pool is only used from that worker's thread.
+
+    Args:
+        max_contexts: Open contexts kept between pages (0 closes every context after use)
+        max_pages: Pages served by a context before it is recycled
+        max_heap_bytes: JS heap size of a page that triggers recycling
+        state_store: Where storage state is loaded from and saved to (None disables)
+    """
+
+    def __init__(
+        self,
+        max_contexts: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        max_heap_bytes: Optional[int] = None,
+        state_store: Optional[StorageStateStore] = None,
+    ):
+        reuse = os.getenv('AR_PLAYWRIGHT_CONTEXT_REUSE', '1') != '0'
+        self.max_contexts = max_contexts if max_contexts is not None else (
+            int(os.getenv('AR_PLAYWRIGHT_WARM_CONTEXTS', '4')) if reuse else 0
+        )
+        self.max_pages = max_pages or int(os.getenv('AR_PLAYWRIGHT_CONTEXT_MAX_PAGES', '25'))
+        self.max_heap_bytes = max_heap_bytes or int(
+            float(os.getenv('AR_PLAYWRIGHT_CONTEXT_MAX_HEAP_MB', '512')) * 1024 * 1024
+        )
+        self.state_store = state_store
+        self.browser = None
+        self._idle: 'OrderedDict[ContextKey, PooledContext]' = OrderedDict()
+        self.stats = {'created': 0, 'reused': 0, 'restored': 0, 'recycled': 0, 'evicted': 0, 'discarded': 0}
+
+    def bind(self, browser) -> None:
+        """Use browser for new contexts, dropping contexts of a previous (crashed) browser."""
+        if browser is self.browser:
+            return
+        if self.browser is not None:
+            logger.debug('[PLAYWRIGHT] Browser replaced; dropping %d pooled context(s)', len(self._idle))
+        self._idle.clear()  # Their browser is gone; closing them would only raise
+        self.browser = browser
+
+    def acquire(
+        self,
+        url: str,
+        user_agent: str,
+        text_only: bool,
+        factory: Callable[..., Any],
+        install_routes: Optional[Callable[[Any], Dict[str, int]]] = None,
+    ) -> PooledContext:
+        """Check out the warm context for url's domain, or create one.
+
+        Args:
+            url: Page about to be loaded
+            user_agent: User agent of the context
+            text_only: Whether the context blocks heavy resources
+            factory: Creates a context: ``factory(storage_state=path_or_None)``
+            install_routes: Installs text-only routes on a new context
+        """
+        key = (context_domain(url), user_agent, text_only)
+        lease = self._idle.pop(key, None)
+        if lease is not None:
+            self.stats['reused'] += 1
+            return lease
+
+        state_path = self.state_store.load_path(key[0]) if self.state_store else None
+        try:
+            context = factory(storage_state=state_path)
+        except Exception as e:
+            if state_path is None:
+                raise
+            # A corrupt or incompatible state file must not block the fetch
+            logger.debug('[PLAYWRIGHT] Ignoring saved storage state for %s: %s', key[0], e)
+            state_path = None
+            context = factory(storage_state=None)
+        blocked = install_routes(context) if (text_only and install_routes) else None
+        self.stats['created'] += 1
+        if state_path:
+            self.stats['restored'] += 1
+        return PooledContext(key, context, blocked, restored=bool(state_path))
+
+    def release(self, lease: PooledContext, healthy: bool = True, heap_bytes: Optional[int] = None) -> None:
+        """Return a context after a page; it is kept warm, recycled or discarded.
+
+        Args:
+            lease: Context returned by acquire
+            healthy: False if the fetch failed; the context is closed unsaved
+            heap_bytes: JS heap of the page just loaded, if known
+        """
+        lease.pages += 1
+        if not healthy:
+            self.stats['discarded'] += 1
+            self._close(lease, save=False)
+            return
+        if lease.pages >= self.max_pages or (heap_bytes or 0) >= self.max_heap_bytes:
+            self.stats['recycled'] += 1
+            logger.debug('[PLAYWRIGHT] Recycling context for %s after %d page(s), heap %s',
+                         lease.domain, lease.pages, heap_bytes)
+            self._close(lease, save=True)
+            return
+        if self.max_contexts <= 0:
+            self._close(lease, save=True)
+            return
+        if lease.pages == 1 and self.state_store:
+            # Capture consent cookies early so other workers and later runs get them
+            self.state_store.save(lease.context, lease.domain)
+        self._idle[lease.key] = lease
+        while len(self._idle) > self.max_contexts:
+            _, oldest = self._idle.popitem(last=False)
+            self.stats['evicted'] += 1
+            self._close(oldest, save=True)
+
+    def _close(self, lease: PooledContext, save: bool) -> None:
+        if save and self.state_store:
+            self.state_store.save(lease.context, lease.domain)
+        try:
+            lease.context.close()
+        except Exception:
+            pass
+
+    def close_all(self) -> None:
+        """Save and close every pooled context (worker shutdown)."""
+        while self._idle:
+            _, lease = self._idle.popitem(last=False)
+            self._close(lease, save=True)
+
+    def snapshot(self) -> Dict[str, int]:
+        return {'open': len(self._idle), **self.stats}
@@ -5,7 +5,11 @@ Utility to clear all search-related caches for accurate performance testing.
 This clears:
 - HTTP session cache (connection pooling)
 - Robots.txt cache
-- Domain configuration cache (Playwright requirements)
+- Domain configuration cache (Playwright requirements, footer hashes, fetch stats; in memory and on disk)
+- Persistent HTTP response cache (conditional GET)
+- SSL certificate probe cache
+- Search results cache (Brave/Serper responses)
+- Saved Playwright storage state (cookies and localStorage, if persisted)
 - Streamlit session state (if running in Streamlit context)
 """
 
@@ -37,9 +41,8 @@ def clear_all_search_caches():
     try:
         from ingestion.page_fetcher import DomainConfigCache
         cache = DomainConfigCache.get_instance()
-        count = len(cache._requires_playwright)
-        cache._requires_playwright.clear()
-        print(f"✓ Cleared {count} domain config(s)")
+        count = cache.reset()
+        print(f"✓ Cleared {count} domain config(s) (including persisted learning)")
     except Exception as e:
         print(f"⚠ Could not clear domain config cache: {e}")
     
@@ -51,7 +54,45 @@ def clear_all_search_caches():
     except Exception as e:
         print(f"⚠ Could not reset rate limiter: {e}")
     
-    # 5. Clear Streamlit session state (if in Streamlit context)
+    # 5. Clear persistent HTTP response cache
+    try:
+        from ingestion.http_cache import get_http_cache
+        http_cache = get_http_cache()
+        if http_cache:
+            count = http_cache.clear()
+            print(f"✓ Cleared {count} HTTP response cache entr{'y' if count == 1 else 'ies'}")
+    except Exception as e:
+        print(f"⚠ Could not clear HTTP response cache: {e}")
+    
+    # 6. Clear SSL certificate probe cache
+    try:
+        from ingestion.ssl_utils import clear_ssl_cache
+        count = clear_ssl_cache()
+        print(f"✓ Cleared {count} SSL certificate cache entr{'y' if count == 1 else 'ies'}")
+    except Exception as e:
+        print(f"⚠ Could not clear SSL certificate cache: {e}")
+    
+    # 7. Clear search results cache
+    try:
+        from ingestion.search_cache import get_search_cache
+        search_cache = get_search_cache()
+        if search_cache:
+            count = search_cache.clear()
+            print(f"✓ Cleared {count} search result cache entr{'y' if count == 1 else 'ies'}")
+    except Exception as e:
+        print(f"⚠ Could not clear search result cache: {e}")
+    
+    # 8. Clear saved Playwright storage state
+    try:
+        from ingestion.browser_contexts import get_storage_state_store
+        state_store = get_storage_state_store()
+        if state_store:
+            count = state_store.clear()
+            print(f"✓ Cleared {count} saved browser storage state(s)")
+    except Exception as e:
+        print(f"⚠ Could not clear browser storage state: {e}")
+    
+    # 9. Clear Streamlit session state (if in Streamlit context)
     try:
         import streamlit as st
         # Clear brand domain cache
@@ -67,7 +108,6 @@ def clear_all_search_caches():
         print(f"⚠ Could not clear Streamlit session state: {e}")
     
     print("\n✅ Cache clearing complete!")
-    print("Note: This only clears in-memory caches. Persistent browser state is not affected.")
 
 
 if __name__ == '__main__':
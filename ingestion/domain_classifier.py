@@ -5,8 +5,10 @@ Supports the 60/40 ratio methodology for holistic trust assessment.
 """
 
 from __future__ import annotations
+import contextvars
 import logging
-from typing import Dict, List, Optional, Tuple
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from urllib.parse import urlparse
 from dataclasses import dataclass
 from enum import Enum
@@ -108,6 +110,14 @@ KNOWN_EXPERT_DOMAINS = {
     'stackoverflow.com', 'medium.com', 'substack.com'
 }
 
+# URL patterns of site-wide pages whose signals apply to the whole site
+# (used by RunManager's site-level analysis and the site crawler)
+GLOBAL_PAGE_PATTERNS = {
+    "about": ["/about", "/our-story", "/team", "/founders"],
+    "contact": ["/contact", "/support", "/help"],
+    "policies": ["/privacy", "/terms", "/legal", "/standards", "/editorial"],
+}
+
 
 def extract_domain_parts(url: str) -> Tuple[str, str, str]:
     """Extract domain, subdomain, and path from URL
@@ -423,6 +433,47 @@ def _classify_third_party(url: str, domain: str, subdomain: str) -> URLClassific
     )
 
 
+# Brand of the current run (see brand_url_scope). A context variable, so
+# concurrent runs classify against their own brand.
+_brand_url_config: contextvars.ContextVar[Optional[URLCollectionConfig]] = contextvars.ContextVar(
+    'brand_url_config', default=None
+)
+
+
+@contextmanager
+def brand_url_scope(
+    brand_domains: Optional[Iterable[str]],
+    brand_subdomains: Optional[Iterable[str]] = None,
+    brand_social_handles: Optional[Iterable[str]] = None,
+) -> Iterator[Optional[URLCollectionConfig]]:
+    """Make a run's brand properties known to source_type_of for the scope's duration.
+
+    Fetchers use it to decide, before fetching, which pages are brand-owned.
+    Without brand domains or subdomains the scope is a no-op.
+    """
+    if not brand_domains and not brand_subdomains:
+        yield None
+        return
+    config = URLCollectionConfig(
+        brand_domains=[d.lower() for d in brand_domains or []],
+        brand_subdomains=[d.lower() for d in brand_subdomains or []],
+        brand_social_handles=list(brand_social_handles or []),
+    )
+    token = _brand_url_config.set(config)
+    try:
+        yield config
+    finally:
+        _brand_url_config.reset(token)
+
+
+def source_type_of(url: str) -> URLSourceType:
+    """Source type of url under the active brand_url_scope (UNKNOWN outside one)."""
+    config = _brand_url_config.get()
+    if config is None:
+        return URLSourceType.UNKNOWN
+    return classify_url(url, config).source_type
+
+
 def enforce_ratio(
     all_urls: List[str],
     config: URLCollectionConfig,
@@ -0,0 +1,193 @@
+"""Persistent store for per-domain fetch learning.
+
+Backs ``page_fetcher.DomainConfigCache`` with a small SQLite file (two
+``TTLStore`` tables, see ingestion/ttl_store.py) so that what one run learns
+about a domain (it needs Playwright, how fast and reliable each fetch method
+is) is available to the next run instead of being rediscovered through
+failed fetches. Footer hashes are not stored: footer dedup only makes
+sense within one run, which must still capture its own footer screenshots.
+
+Learning decays: the Playwright flag expires after AR_DOMAIN_CONFIG_TTL_DAYS
+(default 14) without being re-confirmed, and success/failure counts halve
+every AR_DOMAIN_STATS_HALF_LIFE_DAYS (default 7).
+
+Fetch stats change on every page fetch, so they are folded in memory and
+written in batches: every AR_DOMAIN_STATS_FLUSH_EVERY updated rows, at the
+end of each run (``flush``) and at interpreter exit. Playwright flags are
+rare and written through immediately.
+
+Configuration (environment):
+    AR_DOMAIN_CONFIG_PATH        SQLite file (default ``.cache/domain_config.sqlite``; empty disables)
+    AR_DOMAIN_STATS_FLUSH_EVERY  Pending stats rows that trigger a write (default 50)
+"""
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from ingestion.ttl_store import TTLStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.path.join('.cache', 'domain_config.sqlite')
+
+# Exponential moving average weight for latency updates
+_LATENCY_ALPHA = 0.3
+
+# Stats rows not updated for this many half-lives are dropped
+_STATS_RETENTION_HALF_LIVES = 10
+
+
+def _decay(value: float, age_seconds: float, half_life_seconds: float) -> float:
+    if half_life_seconds <= 0 or age_seconds <= 0:
+        return value
+    return value * 0.5 ** (age_seconds / half_life_seconds)
+
+
+class DomainConfigStore:
+    """SQLite-backed per-domain Playwright flags and fetch stats.
+
+    All methods swallow storage errors (logging at debug level): losing
+    learned state must never break a fetch.
+
+    Args:
+        db_path: SQLite file path
+        playwright_ttl_seconds: Lifetime of a Playwright flag that is not re-confirmed
+        stats_half_life_seconds: Half-life of success/failure counts
+        flush_every: Number of pending stats rows that triggers a write
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        playwright_ttl_seconds: float = 14 * 86400,
+        stats_half_life_seconds: float = 7 * 86400,
+        flush_every: int = 50,
+    ):
+        self.db_path = db_path
+        self.playwright_ttl_seconds = playwright_ttl_seconds
+        self.stats_half_life_seconds = stats_half_life_seconds
+        self.flush_every = max(1, flush_every)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stats: Dict[tuple, Dict[str, Any]] = {}  # (domain, method) -> current row
+        self._dirty: set = set()  # keys of rows not yet written
+        self._stats_loaded = False
+        self._flags = TTLStore(db_path, table='domain_playwright', max_memory_entries=0)  # domain -> marked_at
+        self._stats_store = TTLStore(db_path, table='domain_stats', max_memory_entries=0)  # 'domain|method' -> row
+
+    @property
+    def persistent(self) -> bool:
+        return self._flags.persistent and self._stats_store.persistent
+
+    def _stats_expiry(self, row: Dict[str, Any]) -> float:
+        """Rows untouched for this long have decayed to nothing and are dropped."""
+        if self.stats_half_life_seconds <= 0:
+            return float('inf')
+        return row['updated_at'] + _STATS_RETENTION_HALF_LIVES * self.stats_half_life_seconds
+
+    # ------------------------------------------------------------- Loading
+
+    def load(self) -> Dict[str, Any]:
+        """Load unexpired state: {'requires_playwright': {domain: marked_at},
+        'stats': {(domain, method): dict}}."""
+        now = time.time()
+        state = {'requires_playwright': {}, 'stats': {}}
+        for domain, (marked_at, _) in self._flags.load_all().items():
+            state['requires_playwright'][domain] = marked_at
+        for key, (row, _) in self._stats_store.load_all().items():
+            domain, _, method = key.rpartition('|')
+            age = now - (row.get('updated_at') or now)
+            state['stats'][(domain, method)] = {
+                'successes': _decay(row.get('successes') or 0.0, age, self.stats_half_life_seconds),
+                'failures': _decay(row.get('failures') or 0.0, age, self.stats_half_life_seconds),
+                'latency_ms': row.get('latency_ms'),
+                'updated_at': now,
+            }
+        with self._lock:
+            # Rows already updated in this process are newer than the file
+            for key, row in state['stats'].items():
+                self._stats.setdefault(key, dict(row))
+            state['stats'].update({key: dict(row) for key, row in self._stats.items()})
+            self._stats_loaded = True
+        return state
+
+    # ------------------------------------------------------------- Writes
+
+    def mark_requires_playwright(self, domain: str, marked_at: Optional[float] = None) -> None:
+        marked_at = marked_at or time.time()
+        self._flags.put(domain, marked_at, marked_at + self.playwright_ttl_seconds)
+
+    def unmark_requires_playwright(self, domain: str) -> None:
+        self._flags.delete(domain)
+
+    def record_fetch(self, domain: str, method: str, success: bool, latency_ms: Optional[float]) -> Dict[str, Any]:
+        """Fold one fetch outcome into the decayed stats and return the updated row.
+
+        The row is updated in memory; it reaches the file with the next batch.
+        """
+        if not self._stats_loaded:
+            self.load()
+        now = time.time()
+        key = (domain, method)
+        with self._lock:
+            row = self._stats.get(key) or {'successes': 0.0, 'failures': 0.0, 'latency_ms': None, 'updated_at': now}
+            age = now - (row['updated_at'] or now)
+            avg_latency = row['latency_ms']
+            if latency_ms is not None:
+                avg_latency = latency_ms if avg_latency is None else (
+                    _LATENCY_ALPHA * latency_ms + (1 - _LATENCY_ALPHA) * avg_latency
+                )
+            row = {
+                'successes': _decay(row['successes'], age, self.stats_half_life_seconds) + (1 if success else 0),
+                'failures': _decay(row['failures'], age, self.stats_half_life_seconds) + (0 if success else 1),
+                'latency_ms': avg_latency,
+                'updated_at': now,
+            }
+            self._stats[key] = row
+            self._dirty.add(key)
+            due = len(self._dirty) >= self.flush_every
+        if due:
+            self.flush()
+        return dict(row)
+
+    def flush(self) -> int:
+        """Write pending stats rows in one transaction; returns the number written."""
+        with self._flush_lock:
+            with self._lock:
+                pending = {key: dict(self._stats[key]) for key in self._dirty}
+                self._dirty.clear()
+            self._stats_store.put_many(
+                (f'{domain}|{method}', row, self._stats_expiry(row)) for (domain, method), row in pending.items()
+            )
+            return len(pending)
+
+    def clear(self) -> int:
+        """Delete all learned state; returns the number of domains that had a Playwright flag."""
+        with self._lock:
+            self._stats.clear()
+            self._dirty.clear()
+        self._stats_store.clear()
+        return self._flags.clear()
+
+
+def open_domain_store() -> Optional[DomainConfigStore]:
+    """Open the configured store, or None if disabled or unavailable."""
+    db_path = os.getenv('AR_DOMAIN_CONFIG_PATH', DEFAULT_DB_PATH)
+    if not db_path:
+        return None
+    store = DomainConfigStore(
+        db_path,
+        playwright_ttl_seconds=float(os.getenv('AR_DOMAIN_CONFIG_TTL_DAYS', '14')) * 86400,
+        stats_half_life_seconds=float(os.getenv('AR_DOMAIN_STATS_HALF_LIFE_DAYS', '7')) * 86400,
+        flush_every=int(os.getenv('AR_DOMAIN_STATS_FLUSH_EVERY', '50')),
+    )
+    if not store.persistent:
+        return None  # The store has logged why
+    # Stats updated since the last batch would otherwise be lost
+    atexit.register(store.flush)
+    return store
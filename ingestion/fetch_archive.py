@@ -0,0 +1,307 @@
+"""WARC-style fetch recorder and offline replay for the ingestion layer.
+
+Ingestion timings and regressions cannot be measured reproducibly against
+live sites. With ``AR_FETCH_RECORD=run.warc.gz`` every network answer the
+ingestion layer consumes is appended to a gzip-per-record WARC 1.0 archive:
+
+- ``response`` records: HTTP responses read by ``fetch_page`` (status line,
+  headers and the bounded body from ``stream_reader``);
+- ``resource`` records: Playwright results from ``_fetch_with_playwright``
+  (the rendered DOM plus the extracted title/body/links, as JSON);
+- ``metadata`` records: search API results (``search_cache.cached_search``)
+  and TLS certificate data (``ssl_utils.get_ssl_data``).
+
+Each record carries its fetch latency (``X-AR-Latency-Ms``). A JSON-lines
+index (``<archive>.idx``) maps ``(kind, key)`` to the record's offset; it is
+rebuilt by scanning the archive when missing.
+
+With ``AR_FETCH_REPLAY=run.warc.gz`` the same calls are answered from the
+archive and nothing touches the network. Unrecorded URLs come back as empty
+fetches, and robots.txt checks are skipped (only allowed pages were
+recorded). Replay latency is set by ``AR_FETCH_REPLAY_LATENCY``:
+
+    none      serve immediately (default)
+    recorded  sleep for each record's recorded latency
+    <ms>      sleep a fixed synthetic latency per record
+
+Replaying Playwright records goes through the same fallbacks as a live
+fetch, so it needs Playwright importable (no browser is launched).
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+import zlib
+from datetime import datetime, timedelta, timezone
+from email.message import Message
+from email.parser import BytesHeaderParser
+from http import HTTPStatus
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from ingestion.http_cache import normalize_url
+from ingestion.stream_reader import BodyAccumulator, StreamedResponse
+
+logger = logging.getLogger(__name__)
+
+IndexKey = Tuple[str, str]  # (kind, key)
+
+# Per-fetch fields that are not replayable (screenshots are not archived)
+_VOLATILE_FIELDS = ('screenshot_path', 'visual_analysis', 'parsed_document')
+
+
+class _ReplayedResponse:
+    """Response-shaped view of an archived HTTP record (input to StreamedResponse)."""
+
+    def __init__(self, url: str, status_code: int, headers: Message, latency_ms: Optional[float]):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.elapsed = timedelta(milliseconds=latency_ms) if latency_ms is not None else None
+
+
+class FetchArchive:
+    """Append-only WARC archive with an offset index.
+
+    Args:
+        path: Archive file (``.warc.gz``)
+        mode: ``'record'`` or ``'replay'``
+        replay_latency: ``'none'``, ``'recorded'`` or a fixed latency in milliseconds
+    """
+
+    def __init__(self, path: str, mode: str = 'replay', replay_latency: str = 'none'):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unknown archive mode: {mode}")
+        self.path = path
+        self.index_path = path + '.idx'
+        self.mode = mode
+        self.replay_latency = (replay_latency or 'none').strip().lower()
+        self._lock = threading.Lock()
+        self._index: Dict[IndexKey, Tuple[int, int]] = {}
+        self.stats = {'recorded': 0, 'served': 0, 'missing': 0}
+        if mode == 'replay':
+            self._load_index()
+        else:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == 'replay'
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == 'record'
+
+    # --- Index ---------------------------------------------------------------
+
+    def _load_index(self) -> None:
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        self._index[(entry['kind'], entry['key'])] = (entry['offset'], entry['length'])
+                    except (ValueError, KeyError):
+                        continue
+            return
+        logger.info('[ARCHIVE] No index for %s, scanning archive', self.path)
+        for offset, length, headers, _ in self._scan():
+            kind, key = headers.get('X-AR-Kind'), headers.get('X-AR-Key')
+            if kind and key:
+                self._index[(kind, key)] = (offset, length)
+
+    def _scan(self) -> Iterator[Tuple[int, int, Message, bytes]]:
+        """Yield (offset, length, headers, block) for every gzip member in the archive."""
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        offset = 0
+        while offset < len(data):
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            record = decompressor.decompress(data[offset:])
+            length = len(data) - offset - len(decompressor.unused_data)
+            headers, block = _parse_record(record)
+            yield offset, length, headers, block
+            offset += length
+
+    # --- Writing -------------------------------------------------------------
+
+    def _append(self, warc_type: str, kind: str, key: str, target_uri: str, content_type: str,
+                block: bytes, latency_ms: Optional[float] = None) -> None:
+        headers = [
+            ('WARC-Type', warc_type),
+            ('WARC-Record-ID', f'<urn:uuid:{uuid.uuid4()}>'),
+            ('WARC-Date', datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')),
+            ('WARC-Target-URI', target_uri),
+            ('Content-Type', content_type),
+            ('X-AR-Kind', kind),
+            ('X-AR-Key', key),
+        ]
+        if latency_ms is not None:
+            headers.append(('X-AR-Latency-Ms', f'{latency_ms:.1f}'))
+        headers.append(('Content-Length', str(len(block))))
+        head = 'WARC/1.0\r\n' + ''.join(f'{name}: {value}\r\n' for name, value in headers) + '\r\n'
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        member = compressor.compress(head.encode('utf-8') + block + b'\r\n\r\n') + compressor.flush()
+
+        with self._lock:
+            with open(self.path, 'ab') as f:
+                offset = f.tell()
+                f.write(member)
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'kind': kind, 'key': key, 'offset': offset, 'length': len(member)}) + '\n')
+            self._index[(kind, key)] = (offset, len(member))
+            self.stats['recorded'] += 1
+
+    def record_http(self, url: str, resp: StreamedResponse) -> None:
+        """Archive a streamed HTTP response (status, headers, bounded body)."""
+        try:
+            reason = HTTPStatus(resp.status_code).phrase
+        except ValueError:
+            reason = ''
+        lines = [f'HTTP/1.1 {resp.status_code} {reason}']
+        for name, value in (resp.headers or {}).items():
+            # The archived body is already decoded and possibly truncated
+            if name.lower() not in ('content-encoding', 'transfer-encoding', 'content-length'):
+                lines.append(f'{name}: {value}')
+        http_block = ('\r\n'.join(lines) + '\r\n\r\n').encode('utf-8', 'replace') + (resp.content or b'')
+        elapsed = getattr(resp, 'elapsed', None)
+        self._append('response', 'http', normalize_url(url), url, 'application/http; msgtype=response',
+                     http_block, elapsed.total_seconds() * 1000 if elapsed is not None else None)
+
+    def record_json(self, kind: str, key: str, data: Any, latency_ms: Optional[float] = None,
+                    target_uri: Optional[str] = None) -> None:
+        """Archive a JSON document (Playwright results, search results, SSL data)."""
+        if isinstance(data, dict):
+            data = {k: v for k, v in data.items() if k not in _VOLATILE_FIELDS}
+        block = json.dumps(data, default=str).encode('utf-8')
+        warc_type = 'resource' if kind == 'playwright' else 'metadata'
+        self._append(warc_type, kind, key, target_uri or f'urn:ar:{kind}:{key}', 'application/json', block, latency_ms)
+
+    def has(self, kind: str, key: str) -> bool:
+        with self._lock:
+            return (kind, key) in self._index
+
+    # --- Replay --------------------------------------------------------------
+
+    def _read(self, kind: str, key: str) -> Optional[Tuple[Message, bytes]]:
+        location = self._index.get((kind, key))
+        if location is None:
+            with self._lock:
+                self.stats['missing'] += 1
+            logger.debug('[ARCHIVE] Not recorded: %s %s', kind, key)
+            return None
+        offset, length = location
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            member = f.read(length)
+        headers, block = _parse_record(zlib.decompress(member, 16 + zlib.MAX_WBITS))
+        with self._lock:
+            self.stats['served'] += 1
+        self._simulate_latency(headers)
+        return headers, block
+
+    def _simulate_latency(self, headers: Message) -> None:
+        if self.replay_latency in ('', 'none', '0'):
+            return
+        if self.replay_latency == 'recorded':
+            try:
+                delay_ms = float(headers.get('X-AR-Latency-Ms') or 0)
+            except ValueError:
+                delay_ms = 0.0
+        else:
+            try:
+                delay_ms = float(self.replay_latency)
+            except ValueError:
+                return
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+
+    def replay_http(self, url: str) -> Optional[StreamedResponse]:
+        """The archived response for url, read through the same body accumulator as a live fetch."""
+        record = self._read('http', normalize_url(url))
+        if record is None:
+            return None
+        warc_headers, block = record
+        head, _, body_bytes = block.partition(b'\r\n\r\n')
+        status_line, _, header_bytes = head.partition(b'\r\n')
+        try:
+            status_code = int(status_line.split()[1])
+        except (IndexError, ValueError):
+            status_code = 200
+        http_headers = BytesHeaderParser().parsebytes(header_bytes + b'\r\n\r\n')
+        try:
+            latency_ms = float(warc_headers.get('X-AR-Latency-Ms'))
+        except (TypeError, ValueError):
+            latency_ms = None
+        resp = _ReplayedResponse(url, status_code, http_headers, latency_ms)
+        body = BodyAccumulator(http_headers.get('Content-Type', '')).consume([body_bytes])
+        return StreamedResponse(resp, body, body.text())
+
+    def replay_json(self, kind: str, key: str) -> Optional[Any]:
+        record = self._read(kind, key)
+        if record is None:
+            return None
+        try:
+            return json.loads(record[1].decode('utf-8'))
+        except ValueError:
+            return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'mode': self.mode, 'path': self.path, 'records': len(self._index), **self.stats}
+
+
+def _parse_record(record: bytes) -> Tuple[Message, bytes]:
+    """Split a decompressed WARC record into its headers and content block."""
+    head, _, rest = record.partition(b'\r\n\r\n')
+    _, _, header_bytes = head.partition(b'\r\n')  # Drop the WARC/1.0 version line
+    headers = BytesHeaderParser().parsebytes(header_bytes + b'\r\n\r\n')
+    try:
+        length = int(headers.get('Content-Length', len(rest)))
+    except ValueError:
+        length = len(rest)
+    return headers, rest[:length]
+
+
+_archive: Optional[FetchArchive] = None
+_archive_loaded = False
+_archive_lock = threading.Lock()
+
+
+def get_fetch_archive() -> Optional[FetchArchive]:
+    """The archive configured by AR_FETCH_REPLAY / AR_FETCH_RECORD, or None (replay wins)."""
+    global _archive, _archive_loaded
+    if not _archive_loaded:
+        with _archive_lock:
+            if not _archive_loaded:
+                replay_path = os.getenv('AR_FETCH_REPLAY', '')
+                record_path = os.getenv('AR_FETCH_RECORD', '')
+                try:
+                    if replay_path:
+                        _archive = FetchArchive(replay_path, 'replay', os.getenv('AR_FETCH_REPLAY_LATENCY', 'none'))
+                        logger.info('[ARCHIVE] Replaying fetches from %s (%d records)', replay_path, len(_archive._index))
+                    elif record_path:
+                        _archive = FetchArchive(record_path, 'record')
+                        logger.info('[ARCHIVE] Recording fetches to %s', record_path)
+                except OSError as e:
+                    logger.error('[ARCHIVE] Could not open fetch archive: %s', e)
+                    _archive = None
+                _archive_loaded = True
+    return _archive
+
+
+def set_fetch_archive(archive: Optional[FetchArchive]) -> None:
+    """Install an archive explicitly (e.g. from a benchmark script); None disables."""
+    global _archive, _archive_loaded
+    with _archive_lock:
+        _archive = archive
+        _archive_loaded = True
+
+
+def search_key(provider: str, query: str, size: int, offset: int) -> str:
+    return json.dumps([provider, query, int(size), int(offset)])
@@ -0,0 +1,210 @@
+"""Run-scoped fetch memoization.
+
+Within one analysis run the same URL (a brand homepage, an About page) is
+often surfaced by several keywords and sources. While a ``run_fetch_memo()``
+scope is active, ``page_fetcher.fetch_page`` and ``fetch_pages_parallel``
+share one ``FetchMemo``:
+
+- each distinct URL is fetched at most once per run;
+- concurrent requests for a URL wait on the single in-flight fetch
+  (single-flight) instead of issuing their own;
+- callers receive a shallow copy of the memoized result, so per-caller
+  annotations (``source_type``...) do not leak between collectors;
+- the memo keeps results without their ``parsed_document`` (a live
+  BeautifulSoup tree, several times the size of the html it came from);
+  memo hits rebuild it from ``html`` on demand;
+- failed fetches (an ``error``, ``access_denied`` or an empty body) are
+  handed to the callers waiting on them but not memoized, so a transient
+  failure is retried by later callers in the run.
+
+The scope is a context variable, so concurrent runs (e.g. two webapp
+sessions) each get their own memo, and nested scopes reuse the outer memo.
+Worker threads only see the memo if they run in a copy of the submitting
+thread's context; the collection scheduler, page collector and fetchers
+submit their work with ``contextvars.copy_context().run``.
+"""
+from __future__ import annotations
+
+import contextvars
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+from ingestion.http_cache import normalize_url
+
+logger = logging.getLogger(__name__)
+
+# Result fields not kept for the rest of the run
+_UNMEMOIZED_FIELDS = ('parsed_document',)
+
+
+def _is_memoizable(result: Dict) -> bool:
+    """Only successful fetches with content are reused for the rest of the run."""
+    return not result.get('error') and not result.get('access_denied') and bool((result.get('body') or '').strip())
+
+
+class _Flight:
+    """One in-flight fetch: waiters block on ``event`` and then read ``result``."""
+
+    __slots__ = ('event', 'result')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Optional[Dict] = None  # None if the fetch raised
+
+
+class FetchMemo:
+    """Single-flight memo of fetch results keyed by normalized URL."""
+
+    def __init__(self):
+        self._results: Dict[str, Dict] = {}
+        self._inflight: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0  # Requests that waited on another caller's in-flight fetch
+
+    @staticmethod
+    def _key(url: str) -> str:
+        try:
+            return normalize_url(url)
+        except Exception:
+            return url
+
+    def _claim(self, key: str):
+        """Return ('hit', result), ('wait', flight) or ('fetch', flight) (lock must be held)."""
+        if key in self._results:
+            self.hits += 1
+            return 'hit', self._results[key]
+        flight = self._inflight.get(key)
+        if flight is not None:
+            self.coalesced += 1
+            return 'wait', flight
+        flight = self._inflight[key] = _Flight()
+        self.misses += 1
+        return 'fetch', flight
+
+    def _finish(self, key: str, result: Optional[Dict]) -> None:
+        trimmed = None
+        if result is not None:
+            trimmed = {k: v for k, v in result.items() if k not in _UNMEMOIZED_FIELDS}
+        with self._lock:
+            if trimmed is not None and _is_memoizable(trimmed):
+                self._results[key] = trimmed
+            flight = self._inflight.pop(key, None)
+        if flight is not None:
+            flight.result = trimmed
+            flight.event.set()
+
+    def get_or_fetch(self, url: str, fetch: Callable[[], Dict]) -> Dict:
+        """Return the memoized result for url, fetching it (once) if needed.
+
+        If the fetching caller raises, waiters fall back to fetching themselves.
+        """
+        key = self._key(url)
+        while True:
+            with self._lock:
+                state, value = self._claim(key)
+            if state == 'hit':
+                return dict(value)
+            if state == 'wait':
+                value.event.wait()
+                if value.result is not None:
+                    return dict(value.result)
+                continue  # The other fetch raised; try to claim it ourselves
+            result = None
+            try:
+                result = fetch()
+                return dict(result)
+            finally:
+                self._finish(key, result)
+
+    def fetch_many(self, urls: List[str], fetch_batch: Callable[[List[str]], List[Dict]]) -> List[Dict]:
+        """Batch counterpart of get_or_fetch, preserving input order.
+
+        URLs not yet memoized or in flight are fetched together with a single
+        ``fetch_batch`` call (e.g. the async engine); URLs another caller is
+        already fetching are awaited.
+        """
+        claimed: Dict[str, str] = {}  # key -> url to fetch
+        waiting: Dict[str, _Flight] = {}  # key -> another caller's in-flight fetch
+        for url in urls:
+            key = self._key(url)
+            if key in claimed:
+                with self._lock:
+                    self.coalesced += 1
+                continue
+            with self._lock:
+                state, value = self._claim(key)
+            if state == 'fetch':
+                claimed[key] = url
+            elif state == 'wait':
+                waiting[key] = value
+
+        fetched: Dict[str, Dict] = {}  # key -> this batch's result (memoized or not)
+        if claimed:
+            results: List[Optional[Dict]] = [None] * len(claimed)
+            try:
+                results = list(fetch_batch(list(claimed.values())))
+            finally:
+                for key, result in zip(claimed, results + [None] * (len(claimed) - len(results))):
+                    self._finish(key, result)
+                    if result is not None:
+                        fetched[key] = {k: v for k, v in result.items() if k not in _UNMEMOIZED_FIELDS}
+
+        ordered = []
+        for url in urls:
+            key = self._key(url)
+            result = fetched.get(key)
+            if result is None and key in waiting:
+                waiting[key].event.wait()
+                result = waiting[key].result
+            if result is None:
+                with self._lock:
+                    result = self._results.get(key)
+            if result is None:
+                # The fetch raised (here or in another caller): retry this URL on its own
+                ordered.append(self.get_or_fetch(url, lambda u=url: fetch_batch([u])[0]))
+            else:
+                ordered.append(dict(result))
+        return ordered
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._results)
+
+    def get_stats(self) -> Dict[str, float]:
+        with self._lock:
+            requests = self.hits + self.misses + self.coalesced
+            return {
+                'urls': len(self._results),
+                'requests': requests,
+                'hits': self.hits,
+                'coalesced': self.coalesced,
+                'misses': self.misses,
+                'hit_rate': round((self.hits + self.coalesced) / requests, 3) if requests else 0.0,
+            }
+
+
+_active_memo: contextvars.ContextVar[Optional[FetchMemo]] = contextvars.ContextVar('fetch_memo', default=None)
+
+
+def active_fetch_memo() -> Optional[FetchMemo]:
+    """The memo of the current run scope, or None outside run_fetch_memo()."""
+    return _active_memo.get()
+
+
+@contextmanager
+def run_fetch_memo() -> Iterator[FetchMemo]:
+    """Activate a fetch memo for the duration of a run (reuses an active one)."""
+    outer = _active_memo.get()
+    if outer is not None:
+        yield outer
+        return
+    memo = FetchMemo()
+    token = _active_memo.set(memo)
+    try:
+        yield memo
+    finally:
+        _active_memo.reset(token)
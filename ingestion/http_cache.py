@@ -0,0 +1,247 @@
+"""Persistent conditional-GET cache for page fetches.
+
+Stores the validators (ETag / Last-Modified), selected response headers and
+the extracted fetch_page result on disk, keyed by normalized URL. On the next
+fetch the validators are sent as ``If-None-Match`` / ``If-Modified-Since``;
+a ``304 Not Modified`` returns the cached extraction without re-parsing.
+
+Configuration (environment):
+    AR_FETCH_CACHE_DIR        Cache directory (default ``.cache/http``; empty disables)
+    AR_FETCH_CACHE_MAX_MB     Size bound for LRU eviction (default 500)
+    AR_FETCH_CACHE_TTL_HOURS  Maximum entry age before a full refetch (default 168)
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join('.cache', 'http')
+
+# Per-fetch fields that must not be replayed from the cache. SSL fields are
+# re-read on revalidation (ssl_utils keeps its own per-host cache), so
+# ssl_expiry_days does not go stale over the entry's lifetime.
+_VOLATILE_FIELDS = (
+    'screenshot_path', 'visual_analysis', 'parsed_document',
+    'ssl_valid', 'ssl_issuer', 'ssl_expiry_days', 'ssl_error',
+)
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL for cache keys (case, default ports, fragment, query order)."""
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    netloc = parsed.netloc.lower()
+    if (scheme == 'http' and netloc.endswith(':80')) or (scheme == 'https' and netloc.endswith(':443')):
+        netloc = netloc.rsplit(':', 1)[0]
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    return urlunparse((scheme, netloc, parsed.path or '/', parsed.params, query, ''))
+
+
+class HTTPResponseCache:
+    """Size-bounded LRU disk cache of fetch results with HTTP validators.
+
+    Each entry is one JSON file named by the SHA-256 of the normalized URL.
+    File mtime doubles as the LRU timestamp and is bumped on every hit.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int, ttl_seconds: float):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._index: Optional[Dict[str, list]] = None  # key -> [size, last_access]
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(normalize_url(url).encode('utf-8')).hexdigest()
+
+    def _load_index(self) -> Dict[str, list]:
+        """Scan the cache directory once (lock must be held)."""
+        if self._index is None:
+            self._index = {}
+            self._total_bytes = 0
+            os.makedirs(self.cache_dir, exist_ok=True)
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith('.json'):
+                    continue
+                try:
+                    st = os.stat(os.path.join(self.cache_dir, name))
+                except OSError:
+                    continue
+                self._index[name[:-5]] = [st.st_size, st.st_mtime]
+                self._total_bytes += st.st_size
+        return self._index
+
+    def _remove(self, key: str) -> None:
+        """Drop an entry from disk and index (lock must be held)."""
+        size, _ = self._index.pop(key, (0, 0))
+        self._total_bytes -= size
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for url, or None if missing or past its TTL."""
+        key = self._key(url)
+        with self._lock:
+            index = self._load_index()
+            if key not in index:
+                return None
+            try:
+                with open(self._path(key), 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except Exception as e:
+                logger.debug('Dropping unreadable HTTP cache entry for %s: %s', url, e)
+                self._remove(key)
+                return None
+            if time.time() - entry.get('stored_at', 0) > self.ttl_seconds:
+                self._remove(key)
+                return None
+            return entry
+
+    def conditional_headers(self, entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers from a cached entry."""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def revalidated(self, url: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Record a 304 for entry and return a copy of its cached result."""
+        key = self._key(url)
+        now = time.time()
+        with self._lock:
+            self.hits += 1
+            index = self._load_index()
+            if key in index:
+                index[key][1] = now
+                try:
+                    os.utime(self._path(key), (now, now))
+                except OSError:
+                    pass
+        result = dict(entry.get('result') or {})
+        result['url'] = url
+        return result
+
+    def put(self, url: str, headers, result: Dict[str, Any]) -> bool:
+        """Store a 200 response's validators and extracted result.
+
+        Responses without an ETag or Last-Modified header cannot be revalidated
+        and are not stored. Returns True when an entry was written.
+        """
+        headers = headers or {}
+        etag = headers.get('ETag') or headers.get('etag')
+        last_modified = headers.get('Last-Modified') or headers.get('last-modified')
+        if not (etag or last_modified):
+            return False
+
+        entry = {
+            'url': normalize_url(url),
+            'stored_at': time.time(),
+            'etag': etag,
+            'last_modified': last_modified,
+            'headers': {
+                'Content-Type': headers.get('Content-Type') or headers.get('content-type') or '',
+            },
+            'result': {k: v for k, v in result.items() if k not in _VOLATILE_FIELDS},
+        }
+        try:
+            payload = json.dumps(entry, default=str)
+        except Exception as e:
+            logger.debug('Could not serialize HTTP cache entry for %s: %s', url, e)
+            return False
+
+        size = len(payload.encode('utf-8'))
+        if size > self.max_bytes:
+            return False
+
+        key = self._key(url)
+        with self._lock:
+            index = self._load_index()
+            tmp_path = self._path(key) + '.tmp'
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(payload)
+                os.replace(tmp_path, self._path(key))
+            except OSError as e:
+                logger.debug('Could not write HTTP cache entry for %s: %s', url, e)
+                return False
+            old_size, _ = index.get(key, (0, 0))
+            index[key] = [size, time.time()]
+            self._total_bytes += size - old_size
+            self.stores += 1
+            self._evict()
+        return True
+
+    def _evict(self) -> None:
+        """Evict least recently used entries until under max_bytes (lock must be held)."""
+        if self._total_bytes <= self.max_bytes:
+            return
+        for key, _ in sorted(self._index.items(), key=lambda kv: kv[1][1]):
+            if self._total_bytes <= self.max_bytes:
+                break
+            self._remove(key)
+
+    def record_miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def clear(self) -> int:
+        """Delete every entry and return how many were removed."""
+        with self._lock:
+            index = self._load_index()
+            count = len(index)
+            for key in list(index):
+                self._remove(key)
+            return count
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            index = self._load_index()
+            return {
+                'entries': len(index),
+                'bytes': self._total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'stores': self.stores,
+            }
+
+
+_http_cache: Optional[HTTPResponseCache] = None
+_http_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> Optional[HTTPResponseCache]:
+    """Get the shared response cache, or None when AR_FETCH_CACHE_DIR is empty."""
+    global _http_cache
+    cache_dir = os.getenv('AR_FETCH_CACHE_DIR', DEFAULT_CACHE_DIR)
+    if not cache_dir:
+        return None
+    if _http_cache is None or _http_cache.cache_dir != cache_dir:
+        with _http_cache_lock:
+            if _http_cache is None or _http_cache.cache_dir != cache_dir:
+                _http_cache = HTTPResponseCache(
+                    cache_dir,
+                    max_bytes=int(float(os.getenv('AR_FETCH_CACHE_MAX_MB', '500')) * 1024 * 1024),
+                    ttl_seconds=float(os.getenv('AR_FETCH_CACHE_TTL_HOURS', '168')) * 3600,
+                )
+    return _http_cache
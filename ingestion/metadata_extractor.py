@@ -6,9 +6,9 @@ Handles modality detection, channel extraction, schema.org parsing, and more
 import re
 import json
 import logging
-from typing import Dict, Optional, Tuple
+from typing import Dict, Optional, Tuple, Union
 from urllib.parse import urlparse
-from bs4 import BeautifulSoup
+from ingestion.parsed_document import ParsedDocument
 
 logger = logging.getLogger(__name__)
 
@@ -70,7 +70,7 @@ class MetadataExtractor:
             },
         }
 
-    def detect_modality(self, url: str = "", content_type: str = "", html: str = "", src: str = "") -> str:
+    def detect_modality(self, url: str = "", content_type: str = "", html: Union[str, ParsedDocument] = "", src: str = "") -> str:
         """
         Detect content modality (text, image, video, audio)
 
@@ -125,10 +125,8 @@ class MetadataExtractor:
         # Check HTML for OpenGraph tags
         if html:
             try:
-                soup = BeautifulSoup(html, 'html.parser')
-                og_type = soup.find('meta', property='og:type')
-                if og_type and og_type.get('content'):
-                    og_content = og_type['content'].lower()
+                og_content = ParsedDocument.of(html).meta_properties.get('og:type', '').lower()
+                if og_content:
                     if 'video' in og_content:
                         return "video"
                     elif 'audio' in og_content:
@@ -185,12 +183,12 @@ class MetadataExtractor:
             logger.warning(f"Error extracting channel info from {url}: {e}")
             return (src or "unknown", "unknown")
 
-    def parse_schema_org(self, html: str) -> Dict[str, any]:
+    def parse_schema_org(self, html: Union[str, ParsedDocument]) -> Dict[str, any]:
         """
         Parse schema.org structured data from HTML
 
         Args:
-            html: HTML content
+            html: HTML content or ParsedDocument
 
         Returns:
             Dictionary of structured data found
@@ -201,21 +199,12 @@ class MetadataExtractor:
         structured_data = {}
 
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            doc = ParsedDocument.of(html)
+            soup = doc.soup
 
             # Extract JSON-LD
-            json_ld_scripts = soup.find_all('script', type='application/ld+json')
-            if json_ld_scripts:
-                json_ld_data = []
-                for script in json_ld_scripts:
-                    try:
-                        data = json.loads(script.string)
-                        json_ld_data.append(data)
-                    except json.JSONDecodeError:
-                        continue
-
-                if json_ld_data:
-                    structured_data['json_ld'] = json_ld_data
+            if doc.json_ld:
+                structured_data['json_ld'] = list(doc.json_ld)
 
             # Extract microdata (simplified - would need full parser for complete extraction)
             items_with_itemtype = soup.find_all(attrs={"itemtype": True})
@@ -233,12 +222,12 @@ class MetadataExtractor:
 
         return structured_data
 
-    def extract_canonical_url(self, html: str) -> Optional[str]:
+    def extract_canonical_url(self, html: Union[str, ParsedDocument]) -> Optional[str]:
         """
         Extract canonical URL from HTML
 
         Args:
-            html: HTML content
+            html: HTML content or ParsedDocument
 
         Returns:
             Canonical URL if found, None otherwise
@@ -247,7 +236,7 @@ class MetadataExtractor:
             return None
 
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = ParsedDocument.of(html).soup
             canonical = soup.find('link', rel='canonical')
             if canonical and canonical.get('href'):
                 return canonical['href']
@@ -256,12 +245,12 @@ class MetadataExtractor:
 
         return None
 
-    def extract_og_metadata(self, html: str) -> Dict[str, str]:
+    def extract_og_metadata(self, html: Union[str, ParsedDocument]) -> Dict[str, str]:
         """
         Extract Open Graph metadata from HTML
 
         Args:
-            html: HTML content
+            html: HTML content or ParsedDocument
 
         Returns:
             Dictionary of OG metadata
@@ -272,27 +261,20 @@ class MetadataExtractor:
             return og_data
 
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-
             # Extract all OG tags
-            og_tags = soup.find_all('meta', property=re.compile(r'^og:'))
-            for tag in og_tags:
-                property_name = tag.get('property', '').replace('og:', '')
-                content = tag.get('content', '')
-                if property_name and content:
-                    og_data[f'og_{property_name}'] = content
+            og_data.update(ParsedDocument.of(html).og)
 
         except Exception as e:
             logger.debug(f"Error extracting OG metadata: {e}")
 
         return og_data
 
-    def extract_meta_tags(self, html: str) -> Dict[str, str]:
+    def extract_meta_tags(self, html: Union[str, ParsedDocument]) -> Dict[str, str]:
         """
         Extract standard meta tags from HTML
 
         Args:
-            html: HTML content
+            html: HTML content or ParsedDocument
 
         Returns:
             Dictionary of meta tags
@@ -303,7 +285,7 @@ class MetadataExtractor:
             return meta_data
 
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            doc = ParsedDocument.of(html)
 
             # Standard meta tags to extract
             target_tags = [
@@ -316,22 +298,20 @@ class MetadataExtractor:
             ]
 
             for name in target_tags:
-                tag = soup.find('meta', attrs={'name': name})
-                if tag and tag.get('content'):
-                    meta_data[name] = tag['content']
+                if doc.meta.get(name):
+                    meta_data[name] = doc.meta[name]
 
                 # Also try property (common for OG/article tags)
                 if name.startswith('article:') or name.startswith('og:'):
-                    tag = soup.find('meta', property=name)
-                    if tag and tag.get('content'):
-                        meta_data[name] = tag['content']
+                    if doc.meta_properties.get(name):
+                        meta_data[name] = doc.meta_properties[name]
 
         except Exception as e:
             logger.debug(f"Error extracting meta tags: {e}")
 
         return meta_data
 
-    def _extract_publication_date(self, html: str, schema_json: str = None) -> Optional[str]:
+    def _extract_publication_date(self, html: Union[str, ParsedDocument], schema_json: str = None) -> Optional[str]:
         """
         Extract publication date from various sources in priority order.
         
@@ -347,12 +327,13 @@ class MetadataExtractor:
             return None
             
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            doc = ParsedDocument.of(html)
+            soup = doc.soup
             
             # 1. OpenGraph article:published_time
-            og_pub = soup.find('meta', property='article:published_time')
-            if og_pub and og_pub.get('content'):
-                return og_pub['content']
+            og_pub = doc.meta_properties.get('article:published_time')
+            if og_pub:
+                return og_pub
                 
             # 2. Schema.org datePublished (if already extracted)
             if schema_json:
@@ -394,21 +375,21 @@ class MetadataExtractor:
             ]
             
             for attr, val in meta_dates:
-                tag = soup.find('meta', attrs={attr: val})
-                if tag and tag.get('content'):
-                    return tag['content']
+                content = (doc.meta if attr == 'name' else doc.meta_properties).get(val)
+                if content:
+                    return content
                     
         except Exception as e:
             logger.debug(f"Error extracting publication date: {e}")
             
         return None
 
-    def extract_provenance_data(self, html: str) -> Dict[str, str]:
+    def extract_provenance_data(self, html: Union[str, ParsedDocument]) -> Dict[str, str]:
         """
         Extract C2PA/CAI provenance data from HTML
         
         Args:
-            html: HTML content
+            html: HTML content or ParsedDocument
             
         Returns:
             Dictionary of provenance metadata
@@ -419,7 +400,8 @@ class MetadataExtractor:
             return provenance
             
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            doc = ParsedDocument.of(html)
+            soup = doc.soup
             
             # Check for standard C2PA manifest link
             # <link rel="c2pa-manifest" href="...">
@@ -440,9 +422,9 @@ class MetadataExtractor:
             # Check for meta tags
             # <meta name="c2pa-manifest" content="...">
             if 'c2pa_manifest' not in provenance:
-                meta_manifest = soup.find('meta', attrs={'name': 'c2pa-manifest'})
-                if meta_manifest and meta_manifest.get('content'):
-                    provenance['c2pa_manifest'] = meta_manifest['content']
+                meta_manifest = doc.meta.get('c2pa-manifest')
+                if meta_manifest:
+                    provenance['c2pa_manifest'] = meta_manifest
                     provenance['has_c2pa_manifest'] = "true"
 
             # Check for script tag
@@ -462,12 +444,12 @@ class MetadataExtractor:
             
         return provenance
 
-    def extract_meta_tags(self, html: str) -> Dict[str, str]:
+    def extract_meta_tags(self, html: Union[str, ParsedDocument]) -> Dict[str, str]:
         """
         Extract standard meta tags from HTML
 
         Args:
-            html: HTML content
+            html: HTML content or ParsedDocument
 
         Returns:
             Dictionary of meta tags
@@ -478,44 +460,33 @@ class MetadataExtractor:
             return meta_data
 
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-
-            # Extract description
-            description = soup.find('meta', attrs={'name': 'description'})
-            if description and description.get('content'):
-                meta_data['description'] = description['content']
-
-            # Extract keywords
-            keywords = soup.find('meta', attrs={'name': 'keywords'})
-            if keywords and keywords.get('content'):
-                meta_data['keywords'] = keywords['content']
+            meta = ParsedDocument.of(html).meta
 
-            # Extract author
-            author = soup.find('meta', attrs={'name': 'author'})
-            if author and author.get('content'):
-                meta_data['author'] = author['content']
-
-            # Extract robots
-            robots = soup.find('meta', attrs={'name': 'robots'})
-            if robots and robots.get('content'):
-                meta_data['robots'] = robots['content']
+            # Extract description, keywords, author and robots
+            for name in ('description', 'keywords', 'author', 'robots'):
+                if meta.get(name):
+                    meta_data[name] = meta[name]
 
         except Exception as e:
             logger.debug(f"Error extracting meta tags: {e}")
 
         return meta_data
 
-    def enrich_content_metadata(self, content: 'NormalizedContent', html: str = "") -> 'NormalizedContent':
+    def enrich_content_metadata(self, content: 'NormalizedContent', html: Union[str, ParsedDocument] = "") -> 'NormalizedContent':
         """
         Enrich content with extracted metadata
 
         Args:
             content: NormalizedContent object to enrich
-            html: HTML content for extraction (optional)
+            html: HTML content or ParsedDocument for extraction (optional).
+                  The HTML is parsed once and shared by every extractor below.
 
         Returns:
             Enriched NormalizedContent object
         """
+        if html:
+            html = ParsedDocument.of(html, content.url or "")
+
         # Detect modality
         if not content.modality or content.modality == "text":
             content.modality = self.detect_modality(
@@ -588,7 +559,7 @@ class MetadataExtractor:
 
         return content
 
-    def extract_significant_visuals(self, html: str) -> bool:
+    def extract_significant_visuals(self, html: Union[str, ParsedDocument]) -> bool:
         """
         Detect if the page contains significant visuals (hero images, large media)
         that would typically require C2PA credentials.
@@ -599,7 +570,7 @@ class MetadataExtractor:
         - Explicitly excludes known decorative elements (logo, icon, footer, nav)
         
         Args:
-            html: HTML content
+            html: HTML content or ParsedDocument
             
         Returns:
             True if significant visuals detected, False otherwise
@@ -608,7 +579,7 @@ class MetadataExtractor:
             return False
             
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = ParsedDocument.of(html).soup
             
             # 1. Check for Hero/Banner naming conventions in images or their containers
             # Look for images with specific classes or parents with specific classes
@@ -665,14 +636,14 @@ class MetadataExtractor:
             
         return False
 
-    def extract_semantic_text_segments(self, html: str) -> Dict[str, str]:
+    def extract_semantic_text_segments(self, html: Union[str, ParsedDocument]) -> Dict[str, str]:
         """
         Extract text content separated by semantic role (Header, Footer, Main).
         This allows scorers to distinguish between site-wide boilerplates (Footer)
         and actual unique page content.
         
         Args:
-            html: HTML content
+            html: HTML content or ParsedDocument
             
         Returns:
             Dict with 'main_text', 'footer_text', 'header_text', 'rest_text'
@@ -688,7 +659,7 @@ class MetadataExtractor:
             return segments
             
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = ParsedDocument.of(html).soup
             
             # --- Footer Extraction ---
             # Try semantic <footer >, role="contentinfo", or common class names
@@ -3,23 +3,52 @@ Content normalizer for AR tool
 Handles deduplication and content standardization
 """
 
-import hashlib
 import json
-from typing import List, Dict, Set, Any
+import os
+from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 import logging
 
 from data.models import NormalizedContent
 from ingestion.metadata_extractor import MetadataExtractor
+from ingestion.simhash import SimHashIndex, SimHashStore, simhash64
 
 logger = logging.getLogger(__name__)
 
 class ContentNormalizer:
-    """Normalizes and deduplicates content"""
+    """Normalizes and deduplicates content
 
-    def __init__(self, deduplication_window_hours: int = 24):
+    Near-duplicates are items whose 64-bit SimHash fingerprints are within
+    ``max_hamming_distance`` bits (AR_SIMHASH_MAX_DISTANCE, default 6). When
+    ``dedup_store_path`` (AR_DEDUP_STORE_PATH) is set, fingerprints persist
+    across runs and content already seen within the deduplication window is
+    dropped before scoring.
+    """
+
+    def __init__(
+        self,
+        deduplication_window_hours: int = 24,
+        max_hamming_distance: Optional[int] = None,
+        dedup_store_path: Optional[str] = None,
+    ):
         self.deduplication_window = timedelta(hours=deduplication_window_hours)
-        self.seen_hashes: Set[str] = set()
+        if max_hamming_distance is None:
+            max_hamming_distance = int(os.getenv('AR_SIMHASH_MAX_DISTANCE', '6'))
+        self.max_hamming_distance = max_hamming_distance
+        if dedup_store_path is None:
+            dedup_store_path = os.getenv('AR_DEDUP_STORE_PATH', '')
+        self.dedup_store: Optional[SimHashStore] = None
+        if dedup_store_path:
+            try:
+                self.dedup_store = SimHashStore(
+                    dedup_store_path, retention_seconds=self.deduplication_window.total_seconds()
+                )
+            except Exception as e:
+                logger.warning(f"Could not open SimHash store {dedup_store_path}: {e}")
+        # Fingerprints from earlier runs, loaded from the store on first use
+        self.seen_hashes = SimHashIndex(max_hamming_distance)
+        self._seen_loaded = False
+        self.last_dedup_stats: Dict[str, int] = {}
         self.metadata_extractor = MetadataExtractor()
     
     def normalize_content(self, content_list: List[NormalizedContent]) -> List[NormalizedContent]:
@@ -160,44 +189,70 @@ class ContentNormalizer:
         return text.strip()
     
     def _deduplicate_content(self, content_list: List[NormalizedContent]) -> List[NormalizedContent]:
-        """Remove duplicate content using SimHash algorithm"""
-        deduplicated_content = []
-        content_hashes: Dict[str, NormalizedContent] = {}
-        
+        """Remove near-duplicate content using SimHash with an LSH index"""
+        self._load_seen_hashes()
+        batch_index = SimHashIndex(self.max_hamming_distance)
+        kept: List[NormalizedContent] = []
+        fingerprints: List[int] = []
+        stats = {"near_duplicates": 0, "seen_in_previous_runs": 0}
+
         for content in content_list:
-            # Generate SimHash for content
-            content_hash = self._generate_simhash(content)
-            
-            # Check if we've seen this hash before
-            if content_hash in content_hashes:
-                # Keep the one with more engagement (higher rating/upvotes)
-                existing = content_hashes[content_hash]
-                if self._has_more_engagement(content, existing):
-                    content_hashes[content_hash] = content
-            else:
-                content_hashes[content_hash] = content
-        
-        deduplicated_content = list(content_hashes.values())
+            fingerprint = self._generate_simhash(content)
+
+            # Already processed in an earlier run within the window
+            previous = self.seen_hashes.nearest(fingerprint)
+            if previous is not None:
+                stats["seen_in_previous_runs"] += 1
+                logger.debug(f"Dropping {content.content_id}: near-duplicate of previously seen {previous[0]}")
+                continue
+
+            match = batch_index.nearest(fingerprint)
+            if match is None:
+                batch_index.add(len(kept), fingerprint)
+                kept.append(content)
+                fingerprints.append(fingerprint)
+                continue
+
+            # Keep the one with more engagement (higher rating/upvotes)
+            stats["near_duplicates"] += 1
+            slot, distance = match
+            existing = kept[slot]
+            logger.debug(f"Near-duplicate ({distance} bits): {content.content_id} ~ {existing.content_id}")
+            if self._has_more_engagement(content, existing):
+                kept[slot] = content
+                fingerprints[slot] = fingerprint
+
+        deduplicated_content = kept
+        self._remember(deduplicated_content, fingerprints)
+        self.last_dedup_stats = stats
+        if stats["near_duplicates"] or stats["seen_in_previous_runs"]:
+            logger.info(
+                f"SimHash dedup dropped {stats['near_duplicates']} near-duplicate(s) and "
+                f"{stats['seen_in_previous_runs']} item(s) seen in previous runs"
+            )
         return deduplicated_content
-    
-    def _generate_simhash(self, content: NormalizedContent) -> str:
-        """Generate SimHash for content deduplication"""
-        # Combine title and body for hashing
-        text_to_hash = f"{content.title} {content.body}".lower()
-        
-        # Simple hash-based approach (in production, use proper SimHash)
-        # Split into words and create features
-        words = text_to_hash.split()
-        
-        # Create hash from word features
-        word_hashes = []
-        for word in words[:50]:  # Limit to first 50 words
-            word_hash = hashlib.md5(word.encode()).hexdigest()
-            word_hashes.append(word_hash)
-        
-        # Combine hashes
-        combined_hash = hashlib.md5("".join(word_hashes).encode()).hexdigest()
-        return combined_hash
+
+    def _load_seen_hashes(self) -> None:
+        """Load fingerprints persisted within the deduplication window (once)."""
+        if self._seen_loaded or self.dedup_store is None:
+            return
+        self._seen_loaded = True
+        for content_id, fingerprint in self.dedup_store.load(self.deduplication_window.total_seconds()).items():
+            self.seen_hashes.add(content_id, fingerprint)
+        logger.info(f"Loaded {len(self.seen_hashes)} SimHash fingerprint(s) from previous runs")
+
+    def _remember(self, content_list: List[NormalizedContent], fingerprints: List[int]) -> None:
+        """Persist kept fingerprints so later runs can skip these items."""
+        if self.dedup_store is None:
+            return
+        self.dedup_store.add_many([
+            (content.content_id, fingerprint, content.url or "")
+            for content, fingerprint in zip(content_list, fingerprints)
+        ])
+
+    def _generate_simhash(self, content: NormalizedContent) -> int:
+        """Generate a 64-bit SimHash of the title and body (weighted word shingles)"""
+        return simhash64(f"{content.title} {content.body}")
     
     def _has_more_engagement(self, content1: NormalizedContent, content2: NormalizedContent) -> bool:
         """Compare engagement metrics between two content items"""
@@ -253,6 +308,7 @@ class ContentNormalizer:
     def reset_deduplication_cache(self):
         """Reset the deduplication cache (call between different runs)"""
         self.seen_hashes.clear()
+        self._seen_loaded = True  # Do not reload persisted fingerprints
         logger.info("Deduplication cache reset")
     
     def get_normalization_stats(self, original_count: int, final_count: int) -> Dict[str, Any]:
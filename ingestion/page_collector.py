@@ -2,14 +2,410 @@
 
 This module provides a unified interface for collecting pages from different
 search providers (Brave, Serper, etc.) with shared optimization logic.
+
+``run_collection_pipeline`` is the producer/consumer engine behind
+``collect_brave_pages`` and ``collect_serper_pages``:
+
+- The producer (calling thread) requests search batches and prefetches the
+  next batch while workers are still fetching pages. It then blocks on a
+  condition variable until the backlog runs low, so it stays at most one
+  batch ahead instead of sleeping and polling.
+- Workers block on the queue and exit when they receive a sentinel. Once
+  ``target_count`` pages are collected, queued URLs are drained without
+  being fetched.
+- The worker pool size comes from ``max_workers`` or ``AR_COLLECT_WORKERS``
+  (default 5). Inside a ``shared_fetch_budget`` scope, workers also take a
+  slot from the scope's budget for each fetch, so pipelines running side by
+  side (one per keyword) share one cap on in-flight fetches.
+- Admission control runs before each network fetch. The worker classifies
+  the URL and reserves a slot in its pool (brand-owned or third-party) and
+  in its domain quota. The reservation is released if the fetch comes back
+  thin, so full pools and domain limits no longer cost downloads or
+  Playwright renders. A URL blocked only by another worker's reservation is
+  deferred rather than waited for: the worker moves on to the next URL, and
+  deferred URLs are retried once a reservation is committed or released.
 """
+import contextvars
 import logging
-from typing import List, Dict, Optional
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from typing import TYPE_CHECKING, Any, Callable, Iterator, List, Dict, Optional, Tuple
+from urllib.parse import urlparse
 
+from ingestion.robots_cache import prefetch_robots
 from ingestion.search_provider import SearchProvider
+from ingestion.streamlit_context import streamlit_context_attacher
+
+if TYPE_CHECKING:
+    from ingestion.domain_classifier import URLCollectionConfig
 
 logger = logging.getLogger(__name__)
 
+# Marks the end of the URL stream for one worker
+_SENTINEL = None
+
+# Titles that indicate an error page rather than real content
+_ERROR_TITLE_INDICATORS = ['access denied', 'forbidden', '403', '401', 'error', 'not found', '404']
+
+# In-flight fetch slots shared by every pipeline in a shared_fetch_budget scope
+_fetch_budget: contextvars.ContextVar[Optional[threading.BoundedSemaphore]] = contextvars.ContextVar(
+    'collect_fetch_budget', default=None
+)
+
+
+def default_collect_workers() -> int:
+    """Worker pool size for page collection (AR_COLLECT_WORKERS, default 5)."""
+    try:
+        return max(1, int(os.getenv('AR_COLLECT_WORKERS', '5')))
+    except ValueError:
+        return 5
+
+
+@contextmanager
+def shared_fetch_budget(max_fetches: int) -> Iterator[None]:
+    """Cap in-flight page fetches across all pipelines run in this scope (and threads copying its context)."""
+    token = _fetch_budget.set(threading.BoundedSemaphore(max(1, max_fetches)))
+    try:
+        yield
+    finally:
+        _fetch_budget.reset(token)
+
+
+def run_collection_pipeline(
+    search_batch: Callable[[int, Any], Tuple[List[Dict[str, str]], Any]],
+    fetch: Callable[[str], Dict[str, str]],
+    target_count: int,
+    initial_cursor: Any = 0,
+    pool_size: Optional[int] = None,
+    min_body_length: int = 200,
+    min_brand_body_length: Optional[int] = None,
+    url_collection_config: Optional['URLCollectionConfig'] = None,
+    excluded_urls: Optional[set] = None,
+    is_allowed: Optional[Callable[[str], bool]] = None,
+    max_workers: Optional[int] = None,
+    log_tag: str = 'COLLECT',
+) -> List[Dict[str, str]]:
+    """Collect up to ``target_count`` fetched pages from a paginated search.
+
+    Args:
+        search_batch: ``(size, cursor) -> (results, next_cursor)``; results are
+            dicts with at least a ``url`` key. An empty list ends the search.
+        fetch: ``url -> page dict`` (e.g. a bound ``fetch_page``)
+        target_count: Number of valid pages to collect
+        initial_cursor: Provider pagination cursor for the first batch (offset or page)
+        pool_size: Maximum search results to consider (defaults to max(30, target_count * 5))
+        min_body_length: Minimum body length for third-party pages
+        min_brand_body_length: Minimum body length for brand-owned pages (default: 75)
+        url_collection_config: Optional ratio enforcement configuration
+        excluded_urls: URLs to skip (e.g. already collected by an earlier run)
+        is_allowed: Optional robots.txt check; disallowed URLs are skipped before fetching
+        max_workers: Worker pool size (default: AR_COLLECT_WORKERS)
+        log_tag: Provider tag used in log lines (e.g. 'BRAVE')
+
+    Returns:
+        Brand-owned pages followed by third-party pages
+    """
+    if target_count <= 0:
+        return []
+    if min_brand_body_length is None:
+        min_brand_body_length = 75
+    if url_collection_config:
+        from ingestion.domain_classifier import classify_url, URLSourceType
+
+    tag = f'[{log_tag}]'
+    workers = max_workers or default_collect_workers()
+    max_total_results = pool_size if pool_size is not None else max(30, target_count * 5)
+    # A slot from the enclosing shared_fetch_budget, if any, is held around each fetch
+    fetch_slot = _fetch_budget.get() or nullcontext()
+    # Keep at least one fetch per worker queued before requesting another batch
+    low_water = workers
+
+    url_queue: queue.Queue = queue.Queue()
+    # Guards the collections and stats; also signals the producer when the backlog drains
+    cond = threading.Condition()
+    done = threading.Event()
+    seen_urls = set(excluded_urls) if excluded_urls else set()
+
+    brand_owned_collected: List[Dict[str, str]] = []
+    third_party_collected: List[Dict[str, str]] = []
+    domain_counts: Dict[str, int] = {}
+
+    # Adjust domain limits based on collection strategy
+    if url_collection_config and url_collection_config.brand_owned_ratio >= 0.8:
+        # Brand-controlled search: we WANT multiple pages from the brand's domains
+        max_per_domain = target_count  # No effective limit
+        logger.info('%s Brand-controlled search: disabled domain diversity limits (max_per_domain=%d)', tag, max_per_domain)
+    else:
+        # Third-party or mixed search: enforce diversity to avoid over-sampling one domain
+        max_per_domain = max(1, int(target_count * 0.2))
+        logger.info('%s Mixed search: enforcing domain diversity (max_per_domain=%d)', tag, max_per_domain)
+
+    stats = {
+        'total_processed': 0,
+        'total_fetched': 0,
+        'total_valid': 0,
+        'no_url': 0,
+        'robots_txt': 0,
+        'thin_content': 0,
+        'brand_owned_pool_full': 0,
+        'third_party_pool_full': 0,
+        'domain_limit_reached': 0,
+        'error_page': 0,
+        'processed': 0,
+        'search_batches': 0,
+        'admission_deferrals': 0,
+    }
+
+    # Ratio targets
+    target_brand_owned = target_count
+    target_third_party = 0
+    if url_collection_config:
+        target_brand_owned = int(target_count * url_collection_config.brand_owned_ratio)
+        target_third_party = int(target_count * url_collection_config.third_party_ratio)
+        if target_brand_owned + target_third_party < target_count:
+            if url_collection_config.brand_owned_ratio >= url_collection_config.third_party_ratio:
+                target_brand_owned += (target_count - target_brand_owned - target_third_party)
+            else:
+                target_third_party += (target_count - target_brand_owned - target_third_party)
+        logger.info('%s Collecting with ratio enforcement: %d brand-owned (%.0f%%) + %d 3rd party (%.0f%%) from %d search results',
+                    tag, target_brand_owned, url_collection_config.brand_owned_ratio * 100,
+                    target_third_party, url_collection_config.third_party_ratio * 100, max_total_results)
+
+    def collected_count() -> int:
+        return len(brand_owned_collected) + len(third_party_collected)
+
+    # Admission control: slots reserved by in-flight fetches, per pool and per domain
+    reserved_pools: Dict[bool, int] = {True: 0, False: 0}
+    reserved_domains: Dict[str, int] = {}
+    # URLs blocked only by reservations, with the release count when they were deferred
+    deferred: List[Tuple[int, Dict[str, str]]] = []
+    releases = [0]
+
+    def pool_state(is_brand_owned: bool) -> Tuple[int, int]:
+        """(committed, target) for the pool a page would land in (lock must be held)."""
+        if url_collection_config and not is_brand_owned:
+            return len(third_party_collected), target_third_party
+        return len(brand_owned_collected), target_brand_owned
+
+    def admit(domain: str, is_brand_owned: bool) -> Optional[str]:
+        """Reserve a pool slot and a domain slot before fetching (lock must be held).
+
+        Returns None once reserved, 'deferred' if the only obstacle is other
+        workers' reservations, or the stats key explaining the rejection.
+        """
+        if done.is_set():
+            return 'done'
+        committed, target = pool_state(is_brand_owned)
+        if committed >= target:
+            return 'brand_owned_pool_full' if is_brand_owned or not url_collection_config else 'third_party_pool_full'
+        domain_committed = domain_counts.get(domain, 0)
+        if domain_committed >= max_per_domain:
+            return 'domain_limit_reached'
+        if (committed + reserved_pools[is_brand_owned] >= target
+                or domain_committed + reserved_domains.get(domain, 0) >= max_per_domain):
+            return 'deferred'
+        reserved_pools[is_brand_owned] += 1
+        reserved_domains[domain] = reserved_domains.get(domain, 0) + 1
+        return None
+
+    def release(domain: str, is_brand_owned: bool) -> None:
+        """Give back a reservation (lock must be held); deferred URLs become retryable."""
+        reserved_pools[is_brand_owned] -= 1
+        reserved_domains[domain] -= 1
+        if not reserved_domains[domain]:
+            del reserved_domains[domain]
+        releases[0] += 1
+
+    def next_deferred() -> Optional[Dict[str, str]]:
+        """A deferred URL with a reservation given back since it was deferred, if any."""
+        with cond:
+            for i, (released_at, item) in enumerate(deferred):
+                if released_at < releases[0]:
+                    del deferred[i]
+                    return item
+        return None
+
+    def process(item: Dict[str, str], retry: bool = False) -> None:
+        with cond:
+            if done.is_set():
+                return
+            if not retry:
+                stats['processed'] += 1
+                stats['total_processed'] += 1
+
+        url = item.get('url')
+        if not url:
+            with cond:
+                stats['no_url'] += 1
+            return
+
+        is_brand_owned = False
+        classification = None
+        if url_collection_config:
+            classification = classify_url(url, url_collection_config)
+            is_brand_owned = classification.source_type == URLSourceType.BRAND_OWNED
+
+        if is_allowed is not None:
+            try:
+                allowed = is_allowed(url)
+            except Exception:
+                allowed = True
+            if not allowed:
+                with cond:
+                    stats['robots_txt'] += 1
+                return
+
+        domain = urlparse(url).netloc.lower()
+        with cond:
+            rejection = admit(domain, is_brand_owned)
+            if rejection == 'deferred':
+                # Retried by whichever worker commits or releases a reservation next
+                stats['admission_deferrals'] += 1
+                deferred.append((releases[0], item))
+                return
+            if rejection:
+                if rejection != 'done':
+                    stats[rejection] += 1
+                return
+            stats['total_fetched'] += 1
+
+        committed = False
+        try:
+            with fetch_slot:
+                content = fetch(url)
+            body = content.get('body') or ''
+            required_length = min_brand_body_length if is_brand_owned else min_body_length
+            if not body or len(body) < required_length:
+                with cond:
+                    stats['thin_content'] += 1
+                return
+
+            title = (content.get('title') or '').lower()
+            if any(indicator in title for indicator in _ERROR_TITLE_INDICATORS):
+                with cond:
+                    stats['error_page'] += 1
+                return
+
+            if url_collection_config:
+                content['source_type'] = classification.source_type.value
+                content['source_tier'] = classification.tier.value if classification.tier else 'unknown'
+
+            with cond:
+                # The reserved slots guarantee room in the pool and the domain quota
+                release(domain, is_brand_owned)
+                committed = True
+                if url_collection_config and not is_brand_owned:
+                    third_party_collected.append(content)
+                else:
+                    brand_owned_collected.append(content)
+                domain_counts[domain] = domain_counts.get(domain, 0) + 1
+                stats['total_valid'] += 1
+                logger.info('%s Collected page %d/%d: %s', tag, collected_count(), target_count, url)
+                if collected_count() >= target_count:
+                    done.set()
+        finally:
+            if not committed:
+                with cond:
+                    release(domain, is_brand_owned)
+
+    attach_context = streamlit_context_attacher()
+
+    def worker() -> None:
+        attach_context()
+        while True:
+            # Deferred URLs first: the reservation that blocked them was given back,
+            # often by this worker, which is then the one free to retry them
+            item = next_deferred()
+            if item is not None:
+                try:
+                    process(item, retry=True)
+                except Exception as e:
+                    logger.error('%s Worker error processing %s: %s', tag, item.get('url'), e)
+                continue
+            item = url_queue.get()
+            try:
+                if item is _SENTINEL:
+                    return
+                with cond:
+                    # A slot freed up in the backlog; the producer may want to search again
+                    cond.notify_all()
+                process(item)
+            except Exception as e:
+                logger.error('%s Worker error processing %s: %s', tag, (item or {}).get('url'), e)
+            finally:
+                url_queue.task_done()
+
+    logger.info('%s Starting concurrent collection (target=%d, workers=%d)', tag, target_count, workers)
+
+    batch_size = target_count * 2
+    cursor = initial_cursor
+    pushed = 0
+    stale_batches = 0  # Consecutive batches that yielded no new URLs
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'{log_tag.title()}Collect') as executor:
+        for _ in range(workers):
+            # Workers see the caller's context variables (run-scoped fetch memo)
+            executor.submit(contextvars.copy_context().run, worker)
+        try:
+            while not done.is_set() and pushed < max_total_results:
+                logger.info('%s Fetching search batch: size=%d, cursor=%s', tag, batch_size, cursor)
+                try:
+                    search_results, cursor = search_batch(batch_size, cursor)
+                except Exception as e:
+                    logger.warning('%s Search failed: %s', tag, e)
+                    break
+                if not search_results:
+                    logger.info('%s No more search results available', tag)
+                    break
+                stats['search_batches'] += 1
+
+                fresh = []
+                for item in search_results:
+                    url = item.get('url')
+                    if url and url not in seen_urls and pushed + len(fresh) < max_total_results:
+                        seen_urls.add(url)
+                        fresh.append(item)
+                # Resolve robots.txt for this batch's domains up front so workers never block on it
+                if is_allowed is not None:
+                    prefetch_robots(item.get('url') for item in fresh)
+                for item in fresh:
+                    url_queue.put(item)
+                pushed += len(fresh)
+                stale_batches = 0 if fresh else stale_batches + 1
+                if stale_batches >= 3:
+                    logger.info('%s Search keeps returning known URLs, stopping producer', tag)
+                    break
+
+                # Size the next batch from the cumulative success rate
+                with cond:
+                    fetched = stats['total_fetched']
+                    success_rate = stats['total_valid'] / fetched if fetched else 0
+                    needed = target_count - collected_count()
+                if success_rate < 0.3 and fetched > 5:
+                    batch_size = target_count * 2
+                elif success_rate > 0.6 and fetched > 5:
+                    batch_size = max(10, int(needed / (success_rate or 0.1)) + 5)
+                else:
+                    batch_size = target_count
+
+                # Stay one batch ahead: wait (without polling) until workers drain the backlog
+                with cond:
+                    while not done.is_set() and url_queue.qsize() >= low_water:
+                        cond.wait()
+        finally:
+            if done.is_set():
+                logger.info('%s Target reached, stopping producer', tag)
+            elif pushed >= max_total_results:
+                logger.info('%s Max total results reached, stopping producer', tag)
+            for _ in range(workers):
+                url_queue.put(_SENTINEL)
+
+    collected = brand_owned_collected + third_party_collected
+    logger.info('%s Collection complete. Collected: %d. Stats: %s', tag, len(collected), stats)
+    return collected
+
 
 def collect_pages(
     provider: SearchProvider,
@@ -39,12 +435,9 @@ def collect_pages(
         List of dicts with page content {title, body, url, source_type, source_tier, ...}
         
     Note:
-        Currently delegates to provider-specific implementations. Future versions
-        will extract shared logic into this function for better code reuse.
+        Delegates to the provider-specific collectors, which share
+        ``run_collection_pipeline`` and differ only in search pagination.
     """
-    # Delegate to provider-specific implementation
-    # TODO: Extract shared logic from provider-specific functions into this unified function
-    
     if provider.name == "BRAVE":
         from ingestion.brave_search import collect_brave_pages
         return collect_brave_pages(
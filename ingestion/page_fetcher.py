@@ -5,20 +5,30 @@ Handles HTTP requests, Playwright rendering, content extraction, and robots.txt
 """
 from __future__ import annotations
 
+import contextvars
 import logging
 import requests
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional, Sequence, Union
 from datetime import datetime
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 import hashlib
 from ingestion.screenshot_capture import get_screenshot_capture, should_capture_screenshot
+from ingestion.domain_classifier import source_type_of
+from ingestion.domain_store import open_domain_store
+from ingestion.fetch_archive import get_fetch_archive
+from ingestion.fetch_memo import active_fetch_memo
+from ingestion.http_cache import get_http_cache, normalize_url
+from ingestion.parsed_document import ParsedDocument
+from ingestion.robots_cache import get_robots_cache
+from ingestion.ssl_utils import get_ssl_data, prefetch_ssl
+from ingestion.stream_reader import extract_pdf_text, read_streamed
 from config.settings import SETTINGS
-import urllib.robotparser as robotparser
 import os
 import time
 import threading
 import re
+import weakref
 from pathlib import Path
 
 # Import fetch configuration module
@@ -30,64 +40,182 @@ from ingestion.fetch_config import (
     get_retry_config,
 )
 
+logger = logging.getLogger('ingestion.page_fetcher')
+
 # Per-domain rate limiting (allows parallel requests to different domains)
 from ingestion.rate_limiter import PerDomainRateLimiter
+# The per-domain rate adapts to server responses (see record_response in fetch_page)
 _rate_limiter = PerDomainRateLimiter(
-    default_interval=float(os.getenv('BRAVE_REQUEST_INTERVAL', '2.0'))
+    default_interval=float(os.getenv('BRAVE_REQUEST_INTERVAL', '2.0')),
+    burst=float(os.getenv('AR_RATE_LIMIT_BURST', '2')),
+    max_speedup=float(os.getenv('AR_RATE_LIMIT_MAX_SPEEDUP', '4')),
 )
 
 # Session management for connection pooling and cookie handling
 _SESSIONS_CACHE: Dict[str, requests.Session] = {}
 _SESSIONS_LOCK = threading.Lock()
+# Bound at import so monkeypatched ``requests`` modules in tests do not affect the check
+_RequestsResponse = requests.Response
 
 
 class DomainConfigCache:
-    """Cache for domain-specific configuration and behavior learning."""
+    """Cache for domain-specific configuration and behavior learning.
+
+    Learned state (Playwright requirement, per-method success/latency
+    stats) is loaded from the persistent domain store on first use and
+    saved back to it (stats in batches, see ``flush``), so later runs start
+    from what earlier runs learned (see ingestion/domain_store.py).
+
+    Seen footer hashes are kept in memory for the current run only (the
+    active ``run_fetch_memo()`` scope), so each run captures every domain's
+    footer once.
+    """
     _instance = None
     _lock = threading.Lock()
+    _store = None
     _requires_playwright: Dict[str, bool] = {}  # domain -> bool
+    _playwright_marked_at: Dict[str, float] = {}  # domain -> when the flag was last confirmed
+    _stats: Dict[tuple, Dict[str, float]] = {}  # (domain, method) -> decayed counts / latency
 
     @classmethod
     def get_instance(cls):
         if cls._instance is None:
             with cls._lock:
                 if cls._instance is None:
-                    cls._instance = cls()
+                    instance = cls()
+                    instance._load_persisted()
+                    cls._instance = instance
         return cls._instance
 
+    def _load_persisted(self):
+        """Seed the in-memory maps from the persistent store, if enabled."""
+        store = open_domain_store()
+        if store is None:
+            return
+        state = store.load()
+        self._store = store
+        self._playwright_marked_at.update(state['requires_playwright'])
+        self._requires_playwright.update({domain: True for domain in state['requires_playwright']})
+        self._stats.update(state['stats'])
+        if state['requires_playwright']:
+            logger.info(f"Loaded {len(state['requires_playwright'])} domain(s) known to require Playwright")
+
     def mark_requires_playwright(self, url: str):
         """Mark a domain as requiring Playwright."""
         domain = urlparse(url).netloc
+        now = time.time()
         with self._lock:
             self._requires_playwright[domain] = True
+            self._playwright_marked_at[domain] = now
             logger.info(f"Marked domain {domain} as requiring Playwright for future requests")
+        if self._store:
+            self._store.mark_requires_playwright(domain, now)
 
     # Add footer hash tracking per domain
-    _seen_footer_hashes: Dict[str, set] = {} # domain -> set of hashes for this run
+    _seen_footer_hashes: Dict[str, set] = {} # domain -> set of hashes, outside any run scope
+    _run_footer_hashes: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()  # run memo -> {domain: set}
+
+    def _footer_hashes(self, domain: str) -> set:
+        """Footer hashes seen for domain in the current run (lock must be held)."""
+        memo = active_fetch_memo()
+        seen = self._seen_footer_hashes if memo is None else self._run_footer_hashes.setdefault(memo, {})
+        return seen.setdefault(domain, set())
 
     def mark_footer_seen(self, url: str, footer_hash: str):
-        """Mark a footer hash as seen for a domain."""
+        """Mark a footer hash as seen for a domain in the current run."""
         if not footer_hash:
             return
         domain = urlparse(url).netloc
         with self._lock:
-            if domain not in self._seen_footer_hashes:
-                self._seen_footer_hashes[domain] = set()
-            self._seen_footer_hashes[domain].add(footer_hash)
+            self._footer_hashes(domain).add(footer_hash)
 
     def is_footer_seen(self, url: str, footer_hash: str) -> bool:
-        """Check if a footer hash has been seen for this domain."""
+        """Check if a footer hash has been seen for this domain in the current run."""
         if not footer_hash:
             return False
         domain = urlparse(url).netloc
         with self._lock:
-            return footer_hash in self._seen_footer_hashes.get(domain, set())
+            return footer_hash in self._footer_hashes(domain)
 
     def requires_playwright(self, url: str) -> bool:
-        """Check if a domain is known to require Playwright."""
+        """Check if a domain is known to require Playwright (and the flag has not expired)."""
         domain = urlparse(url).netloc
         with self._lock:
-            return self._requires_playwright.get(domain, False)
+            if not self._requires_playwright.get(domain, False):
+                return False
+            marked_at = self._playwright_marked_at.get(domain)
+            if self._store and marked_at and time.time() - marked_at > self._store.playwright_ttl_seconds:
+                self._requires_playwright.pop(domain, None)
+                self._playwright_marked_at.pop(domain, None)
+                logger.info(f"Playwright requirement for {domain} expired; retrying plain HTTP")
+                return False
+            return True
+
+    def record_fetch(self, url: str, method: str, success: bool, latency_ms: Optional[float] = None):
+        """Record the outcome of an 'http' or 'playwright' fetch for the URL's domain.
+
+        A flagged domain whose Playwright renders keep failing (two more
+        failures than successes, after decay) loses its flag so the smart
+        fallback stops skipping the cheaper HTTP path.
+        """
+        domain = urlparse(url).netloc
+        if not domain:
+            return
+        if self._store:
+            stats = self._store.record_fetch(domain, method, success, latency_ms)
+        else:
+            stats = {}
+        with self._lock:
+            if not stats:
+                stats = dict(self._stats.get((domain, method)) or {'successes': 0.0, 'failures': 0.0, 'latency_ms': None})
+                stats['successes'] += 1 if success else 0
+                stats['failures'] += 0 if success else 1
+                if latency_ms is not None:
+                    prev = stats.get('latency_ms')
+                    stats['latency_ms'] = latency_ms if prev is None else 0.3 * latency_ms + 0.7 * prev
+            self._stats[(domain, method)] = stats
+            demote = (
+                method == 'playwright'
+                and self._requires_playwright.get(domain, False)
+                and stats['failures'] >= stats['successes'] + 2
+            )
+            if demote:
+                self._requires_playwright.pop(domain, None)
+                self._playwright_marked_at.pop(domain, None)
+                logger.info(f"Playwright keeps failing for {domain}; no longer forcing it")
+        if demote and self._store:
+            self._store.unmark_requires_playwright(domain)
+
+    def domain_stats(self, url: str) -> Dict[str, Dict[str, float]]:
+        """Per-method stats for the URL's domain: {'http': {...}, 'playwright': {...}}."""
+        domain = urlparse(url).netloc
+        with self._lock:
+            return {
+                method: dict(stats)
+                for (d, method), stats in self._stats.items()
+                if d == domain
+            }
+
+    def flush(self) -> None:
+        """Write fetch stats still pending in the persistent store."""
+        if self._store:
+            self._store.flush()
+
+    def reset(self) -> int:
+        """Forget all learned state, in memory and in the persistent store.
+
+        Returns the number of domains that were flagged as requiring Playwright.
+        """
+        with self._lock:
+            count = len(self._requires_playwright)
+            self._requires_playwright.clear()
+            self._playwright_marked_at.clear()
+            self._seen_footer_hashes.clear()
+            self._run_footer_hashes.clear()
+            self._stats.clear()
+        if self._store:
+            count = max(count, self._store.clear())
+        return count
 
 _domain_config = DomainConfigCache.get_instance()
 
@@ -110,52 +238,29 @@ def _get_session(domain: str) -> requests.Session:
             session = requests.Session()
             # Configure session for better compatibility
             session.max_redirects = 10
+            # Stream bodies so fetch_page can bound what it reads (see ingestion.stream_reader)
+            session.stream = True
             _SESSIONS_CACHE[domain] = session
         return _SESSIONS_CACHE[domain]
 
 
-# Module-level robots.txt cache to share across functions
-_ROBOTS_CACHE: Dict[str, robotparser.RobotFileParser] = {}
+# Shared robots.txt cache (in-memory + SQLite, with TTL and negative caching)
+_ROBOTS_CACHE = get_robots_cache()
 
 
 def _is_allowed_by_robots(url: str, user_agent: str | None = None) -> bool:
     """Check robots.txt for the given URL and user agent. Returns True if fetching is allowed.
 
-    Uses a module-level cache to avoid repeated robots.txt fetches. If robots.txt cannot be
-    fetched or parsed, defaults to permissive (True).
+    Uses the shared robots cache (ingestion.robots_cache) to avoid repeated robots.txt
+    fetches across runs. If robots.txt cannot be fetched or parsed, defaults to permissive (True).
+    Offline replay (AR_FETCH_REPLAY) allows everything: only allowed pages were recorded.
     """
+    archive = get_fetch_archive()
+    if archive is not None and archive.replaying:
+        return True
     try:
-        parsed = urlparse(url)
-        netloc = parsed.netloc
-        scheme = parsed.scheme or 'https'
-        key = f"{scheme}://{netloc}"
         ua = user_agent or os.getenv('AR_USER_AGENT', 'Mozilla/5.0 (compatible; ar-bot/1.0)')
-        if key in _ROBOTS_CACHE:
-            rp = _ROBOTS_CACHE[key]
-            try:
-                return rp.can_fetch(ua, parsed.path or '/')
-            except Exception:
-                return True
-
-        robots_url = f"{key}/robots.txt"
-        rp = robotparser.RobotFileParser()
-        try:
-            _rate_limiter.wait_for_domain(robots_url)
-            r = requests.get(robots_url, headers={'User-Agent': ua}, timeout=5)
-            if r.status_code == 200 and r.text:
-                rp.parse(r.text.splitlines())
-            else:
-                rp.parse([])
-        except Exception:
-            try:
-                rp.parse([])
-            except Exception:
-                pass
-        _ROBOTS_CACHE[key] = rp
-        try:
-            return rp.can_fetch(ua, parsed.path or '/')
-        except Exception:
-            return True
+        return _ROBOTS_CACHE.can_fetch(url, ua)
     except Exception:
         return True
 
@@ -165,12 +270,12 @@ try:
     _PLAYWRIGHT_AVAILABLE = True
 except Exception:
     _PLAYWRIGHT_AVAILABLE = False
+from ingestion.playwright_manager import install_text_only_routes, text_only_enabled
+from ingestion.render_wait import get_render_budget, wait_for_stable_dom
 
-logger = logging.getLogger('ingestion.page_fetcher')
 
-
-def _extract_footer_links(html: str, base_url: str) -> Dict[str, str]:
-    """Parse HTML and attempt to find Terms and Privacy links.
+def _extract_footer_links(html: Union[str, ParsedDocument], base_url: str) -> Dict[str, str]:
+    """Parse HTML (or reuse a ParsedDocument) and attempt to find Terms and Privacy links.
 
     Returns a dict with keys 'terms' and 'privacy' whose values are absolute URLs or
     empty strings when not found.
@@ -178,8 +283,9 @@ def _extract_footer_links(html: str, base_url: str) -> Dict[str, str]:
     terms_url = ""
     privacy_url = ""
     try:
-        s = BeautifulSoup(html or "", "lxml")
-        footer = s.find('footer')
+        doc = ParsedDocument.of(html or "")
+        s = doc.soup
+        footer = doc.footer
         anchors = footer.find_all('a', href=True) if footer else []
         # If footer anchors are not present, fall back to scanning all anchors
         if not anchors:
@@ -211,7 +317,7 @@ def _extract_footer_links(html: str, base_url: str) -> Dict[str, str]:
     return {"terms": terms_url, "privacy": privacy_url}
 
 
-def _extract_verification_badges(html: str, url: str) -> Dict[str, any]:
+def _extract_verification_badges(html: Union[str, ParsedDocument], url: str) -> Dict[str, any]:
     """Extract verification badge information from social media pages.
     
     Detects platform-specific verification indicators for:
@@ -220,7 +326,7 @@ def _extract_verification_badges(html: str, url: str) -> Dict[str, any]:
     - X/Twitter: verified account badges with data-testid or aria-labels
     
     Args:
-        html: Raw HTML content
+        html: Raw HTML content or ParsedDocument
         url: URL of the page (used to determine platform)
     
     Returns:
@@ -241,7 +347,7 @@ def _extract_verification_badges(html: str, url: str) -> Dict[str, any]:
         return result
     
     try:
-        soup = BeautifulSoup(html, "lxml")
+        soup = ParsedDocument.of(html).soup
         url_lower = url.lower()
         
         # Determine platform from URL
@@ -273,7 +379,7 @@ def _extract_verification_badges(html: str, url: str) -> Dict[str, any]:
     return result
 
 
-def _compute_footer_hash(html: str) -> str:
+def _compute_footer_hash(html: Union[str, ParsedDocument]) -> str:
     """
     Compute a structure-based hash of the footer to identify duplicates.
     Uses text content of the footer to be robust against minor changes.
@@ -281,8 +387,9 @@ def _compute_footer_hash(html: str) -> str:
     if not html:
         return ""
     try:
-        soup = BeautifulSoup(html, "lxml")
-        footer = soup.find('footer')
+        doc = ParsedDocument.of(html)
+        soup = doc.soup
+        footer = doc.footer
         if not footer:
             # Fallback: look for generic footer classes/IDs
             footer = soup.find('div', class_=lambda x: x and 'footer' in x.lower())
@@ -565,7 +672,16 @@ def _detect_generic_badge(soup: BeautifulSoup, result: Dict) -> Dict:
     return result
 
 
-def _extract_internal_links(url: str, html_content: str, max_links: int = 15) -> List[str]:
+# Paths _extract_internal_links skips by default (non-content and boilerplate pages)
+_NON_CONTENT_PATHS = ('/search', '/login', '/cart', '/checkout', '/account', '/privacy', '/terms', '/contact')
+
+
+def _extract_internal_links(
+    url: str,
+    html_content: Union[str, ParsedDocument],
+    max_links: int = 15,
+    exclude_paths: Sequence[str] = _NON_CONTENT_PATHS,
+) -> List[str]:
 
     """Extract internal links from a brand domain page.
 
@@ -574,14 +690,15 @@ def _extract_internal_links(url: str, html_content: str, max_links: int = 15) ->
 
     Args:
         url: The parent URL (used to determine internal links)
-        html_content: HTML content of the page
+        html_content: HTML content of the page (or its ParsedDocument)
         max_links: Maximum number of links to extract
+        exclude_paths: Path fragments to skip (the site crawler keeps policy and contact pages)
 
     Returns:
         List of internal URLs (subpages on the same domain)
     """
     try:
-        soup = BeautifulSoup(html_content, "lxml")
+        soup = ParsedDocument.of(html_content).soup
         parent_domain = urlparse(url).netloc
 
         internal_links = []
@@ -607,8 +724,7 @@ def _extract_internal_links(url: str, html_content: str, max_links: int = 15) ->
 
                 # Skip common non-content pages
                 path = urlparse(full_url).path.lower()
-                if any(skip in path for skip in ['/search', '/login', '/cart', '/checkout',
-                                                   '/account', '/privacy', '/terms', '/contact']):
+                if any(skip in path for skip in exclude_paths):
                     continue
 
                 # Skip duplicate fragments
@@ -1064,8 +1180,113 @@ def _extract_body_text(soup: BeautifulSoup) -> str:
     return body
 
 
+# URL path fragments of the content types VISUAL_SCOPE can name (as in the attribute detector)
+_VISUAL_CONTENT_PATTERNS = (
+    ('blog', ('/blog/',)),
+    ('news', ('/news/', '/story/')),
+    ('article', ('/article/', '/post/')),
+)
+
+
+def _visual_content_type(url: str) -> str:
+    """Content type of url for the visual-analysis scope, judged from its path."""
+    path = urlparse(url).path.lower()
+    # We treat root pages as landing pages
+    if path in ['', '/', '/index.html']:
+        return 'landing_page'
+    for content_type, patterns in _VISUAL_CONTENT_PATTERNS:
+        if any(p in path for p in patterns):
+            return content_type
+    return 'other'
+
+
+def _visual_capture_needed(url: str) -> bool:
+    """Whether url gets screenshots for visual analysis; decided before any fetch.
+
+    The source type comes from the run's brand_url_scope: brand-owned pages
+    are captured, other pages only if their content type is in VISUAL_SCOPE.
+    """
+    if not SETTINGS.get('visual_analysis_enabled', False):
+        return False
+    return should_capture_screenshot(_visual_content_type(url), source_type_of(url).value)
+
+
+def _capture_page_visuals(page, url: str, html: Union[str, ParsedDocument]) -> Dict:
+    """Dual-zone screenshots of an open, rendered page.
+
+    Captures the hero viewport and, unless the domain's footer was already
+    captured, the footer viewport, then stores both. Returns the
+    ``screenshot_path``, ``visual_analysis`` and ``parsed_document`` result
+    fields, so the rendered HTML is parsed only once per page.
+    """
+    page_doc = html if isinstance(html, ParsedDocument) else ParsedDocument(html, url)
+    visuals = {"screenshot_path": None, "visual_analysis": {}, "parsed_document": page_doc}
+    try:
+        capture = get_screenshot_capture()
+
+        # Check for footer deduplication
+        footer_hash = _compute_footer_hash(page_doc)
+        skip_bottom = False
+
+        # Only dedup if we found a valid footer hash
+        if footer_hash:
+            if _domain_config.is_footer_seen(url, footer_hash):
+                skip_bottom = True
+                logger.info(f"Smart Capture: Skipping bottom screenshot (duplicate footer detected) for {url}")
+            else:
+                _domain_config.mark_footer_seen(url, footer_hash)
+
+        # Use Dual-Zone Capture
+        dual_results = capture.capture_dual_screenshots(page, url, skip_bottom=skip_bottom)
+
+        run_id = f"fetch_{datetime.now().strftime('%Y%m%d')}"
+
+        # Process TOP screenshot (Primary)
+        if dual_results.get("top"):
+            screenshot_key = capture.store_screenshot(dual_results["top"]['bytes'], url, run_id)
+            if screenshot_key:
+                logger.info(f"Top Screenshot stored: {screenshot_key}")
+
+                # Process BOTTOM screenshot (Secondary)
+                bottom_key = None
+                if dual_results.get("bottom"):
+                    # Suffix the URL so the footer gets its own storage key
+                    bottom_key = capture.store_screenshot(dual_results["bottom"]['bytes'], url + "#footer", run_id)
+                    logger.info(f"Bottom Screenshot stored: {bottom_key}")
+
+                # Both zones travel in 'visual_analysis'; 'screenshot_path' keeps the primary
+                visuals["screenshot_path"] = screenshot_key
+                visuals["visual_analysis"] = {
+                    "screenshots": {
+                        "top": screenshot_key,
+                        "bottom": bottom_key
+                    }
+                }
+    except Exception as e:
+        logger.warning(f"Screenshot capture failed for {url}: {e}")
+    return visuals
+
+
 def _fetch_with_playwright(url: str, user_agent: str, browser_manager=None) -> Dict[str, str]:
     """Fetch a URL using Playwright and extract content.
+
+    Results are recorded to, or replayed from, the fetch archive when
+    AR_FETCH_RECORD / AR_FETCH_REPLAY is set (see ingestion.fetch_archive).
+    """
+    archive = get_fetch_archive()
+    if archive is None:
+        return _render_with_playwright(url, user_agent, browser_manager)
+    if archive.replaying:
+        replayed = archive.replay_json('playwright', normalize_url(url))
+        return replayed or {"title": "", "body": "", "url": url, "terms": "", "privacy": "", "access_denied": False}
+    started = time.monotonic()
+    result = _render_with_playwright(url, user_agent, browser_manager)
+    archive.record_json('playwright', normalize_url(url), result, (time.monotonic() - started) * 1000, target_uri=url)
+    return result
+
+
+def _render_with_playwright(url: str, user_agent: str, browser_manager=None) -> Dict[str, str]:
+    """Render a URL with Playwright (persistent browser or a one-off launch) and extract content.
     
     Args:
         url: URL to fetch
@@ -1078,37 +1299,35 @@ def _fetch_with_playwright(url: str, user_agent: str, browser_manager=None) -> D
     page = None
     browser = None
     pw_context = None
-    screenshot_key = None
     access_denied = False
     
     try:
-        # Check if visual analysis is enabled
-        visual_enabled = SETTINGS.get('visual_analysis_enabled', False)
-        
-        # Determine if we should capture screenshot
-        capture_needed = False
-        if visual_enabled:
-            # Basic scope check
-            path = urlparse(url).path
-            is_home = path in ['', '/', '/index.html']
-            # We treat ambiguous pages as potential landing pages if they are root
-            if is_home or should_capture_screenshot("landing_page", "brand_owned"):
-                capture_needed = True
+        # Screenshots come from the same page load as the text
+        capture_needed = _visual_capture_needed(url)
 
         # Use persistent browser if available
         if browser_manager and browser_manager.is_started:
-            result = browser_manager.fetch_page(url, user_agent, capture_screenshot=capture_needed)
+            result = browser_manager.fetch_page(
+                url, user_agent, capture_screenshot=capture_needed,
+                on_page=_capture_page_visuals if capture_needed else None,
+            )
             
-            # Extract footer links from raw_content if available
+            # Extract footer links and badges from the rendered HTML, parsed once
             if 'raw_content' in result:
+                raw_content = result.pop('raw_content')
+                page_doc = result.get('parsed_document') or ParsedDocument(raw_content, url)
+                result['parsed_document'] = page_doc
                 try:
-                    links = _extract_footer_links(result['raw_content'], url)
+                    links = _extract_footer_links(page_doc, url)
                     result['terms'] = links.get('terms', '')
                     result['privacy'] = links.get('privacy', '')
-                    del result['raw_content']  # Clean up
                 except Exception:
                     result['terms'] = ""
                     result['privacy'] = ""
+                try:
+                    result['verification_badges'] = _extract_verification_badges(page_doc, url)
+                except Exception:
+                    result['verification_badges'] = {"verified": False, "platform": "unknown", "badge_type": "", "evidence": ""}
             return result
         else:
             # Fallback to per-page browser launch
@@ -1127,6 +1346,9 @@ def _fetch_with_playwright(url: str, user_agent: str, browser_manager=None) -> D
             ]
             browser = pw_context.chromium.launch(headless=True, args=args)
             page = browser.new_page(user_agent=user_agent)
+            # Text-only fetches skip images, media, fonts and trackers; screenshots need the full page
+            if not capture_needed and text_only_enabled():
+                install_text_only_routes(page)
             
             # Inject stealth scripts to mask automation (comprehensive)
             page.add_init_script("""
@@ -1162,6 +1384,11 @@ def _fetch_with_playwright(url: str, user_agent: str, browser_manager=None) -> D
             page.wait_for_selector('body', timeout=8000)
         except Exception:
             pass
+
+        # Let client-side rendering settle within the domain's learned budget
+        render = wait_for_stable_dom(page, get_render_budget().budget_ms(url))
+        if 'error' not in render:
+            get_render_budget().record(url, render['elapsed_ms'], render['stable'])
         
         page_content = page.content()
         page_title = page.title() or ''
@@ -1225,79 +1452,23 @@ def _fetch_with_playwright(url: str, user_agent: str, browser_manager=None) -> D
             # Fallback to raw HTML if inner_text extraction fails
             page_body = page_content
         
+        # Parse the rendered HTML once for footer links, badges and footer hash
+        page_doc = ParsedDocument(page_content, url)
+
         # Extract footer links
         try:
-            links = _extract_footer_links(page_content, url)
+            links = _extract_footer_links(page_doc, url)
         except Exception:
             links = {"terms": "", "privacy": ""}
         
         # Extract verification badges
         try:
-            verification_badges = _extract_verification_badges(page_content, url)
+            verification_badges = _extract_verification_badges(page_doc, url)
         except Exception:
             verification_badges = {"verified": False, "platform": "unknown", "badge_type": "", "evidence": ""}
         
-        # Capture screenshot if enabled
-        if capture_needed and page:
-            try:
-                capture = get_screenshot_capture()
-                
-                # Check for footer deduplication
-                footer_hash = _compute_footer_hash(page_content)
-                skip_bottom = False
-                
-                # Only dedup if we found a valid footer hash
-                if footer_hash:
-                    if _domain_config.is_footer_seen(url, footer_hash):
-                        skip_bottom = True
-                        logger.info(f"Smart Capture: Skipping bottom screenshot (duplicate footer detected) for {url}")
-                    else:
-                        _domain_config.mark_footer_seen(url, footer_hash)
-                
-                # Use Dual-Zone Capture
-                dual_results = capture.capture_dual_screenshots(page, url, skip_bottom=skip_bottom)
-                
-                run_id = f"fetch_{datetime.now().strftime('%Y%m%d')}"
-                
-                # Process TOP screenshot (Primary)
-                if dual_results.get("top"):
-                    top_data = dual_results["top"]
-                    screenshot_key = capture.store_screenshot(top_data['bytes'], url, run_id)
-                    if screenshot_key:
-                        logger.info(f"Top Screenshot stored: {screenshot_key}")
-                        
-                        # Process BOTTOM screenshot (Secondary)
-                        bottom_key = None
-                        if dual_results.get("bottom"):
-                            bottom_data = dual_results["bottom"]
-                            # Append _footer to url for unique key generation in store_screenshot
-                            # or just let store_screenshot handle it (it mostly uses timestamp)
-                            # We'll rely on the logic in store_screenshot but maybe add a suffix if needed?
-                            # store_screenshot uses timestamp, so consecutive calls are fine.
-                            bottom_key = capture.store_screenshot(bottom_data['bytes'], url + "#footer", run_id)
-                            logger.info(f"Bottom Screenshot stored: {bottom_key}")
-                            
-                        # Store in result for visual analysis
-                        # We attach this as a special meta field in 'visual_analysis'
-                        # which will be lifted by NormalizedContent
-                        # Since return is a fixed dict, we'll put it in 'screenshot_path' 
-                        # or 'visual_analysis_meta'. Let's put in 'screenshot_path' primarily
-                        # but we need to pass the full struct.
-                        # We'll use a side-channel or just stash it in the return dict 
-                        # and update fetch_page to handle it.
-                        
-                        # For now, simplistic approach: only pass Main path in screenshot_path
-                        # In the future, we want to pass the whole struct.
-                        # Let's add it to the 'visual_data' key in returned dict
-                        visual_data = {
-                            "screenshots": {
-                                "top": screenshot_key,
-                                "bottom": bottom_key
-                            }
-                        }
-            except Exception as e:
-                logger.warning(f"Screenshot capture failed for {url}: {e}")
-                visual_data = {}
+        # Capture screenshots from this same page load if enabled
+        visuals = _capture_page_visuals(page, url, page_doc) if capture_needed else {}
 
         return {
             "title": page_title.strip(),
@@ -1306,10 +1477,10 @@ def _fetch_with_playwright(url: str, user_agent: str, browser_manager=None) -> D
             "terms": links.get("terms", ""),
             "privacy": links.get("privacy", ""),
             "verification_badges": verification_badges,
-            "verification_badges": verification_badges, # keep distinct for now
-            "screenshot_path": screenshot_key,
-            "visual_analysis": visual_data if 'visual_data' in locals() else {}, # Pass rich data
+            "screenshot_path": visuals.get("screenshot_path"),
+            "visual_analysis": visuals.get("visual_analysis", {}), # Pass rich data
             "html": page_content, # Include raw HTML for metadata extraction
+            "parsed_document": page_doc, # Parsed form of html, reused downstream
             "access_denied": access_denied
         }
 
@@ -1336,8 +1507,77 @@ def _fetch_with_playwright(url: str, user_agent: str, browser_manager=None) -> D
                 pass
 
 
+def _playwright_fetch_recorded(url: str, user_agent: str, browser_manager=None, min_body: int = 100) -> Dict[str, str]:
+    """Run _fetch_with_playwright and record its outcome and latency in the domain stats."""
+    started = time.monotonic()
+    result = _fetch_with_playwright(url, user_agent, browser_manager)
+    success = not result.get('access_denied', False) and len(result.get('body') or '') >= min_body
+    _domain_config.record_fetch(url, 'playwright', success, (time.monotonic() - started) * 1000)
+    return result
+
+
+def _record_http_outcome(url: str, resp, success: bool) -> None:
+    """Record a plain-HTTP fetch outcome; latency comes from ``resp.elapsed`` when present."""
+    elapsed = getattr(resp, 'elapsed', None)
+    latency_ms = elapsed.total_seconds() * 1000 if elapsed is not None else None
+    _domain_config.record_fetch(url, 'http', success, latency_ms)
+
+
+def _requires_playwright_first(url: str) -> bool:
+    """True when Playwright is available and the domain is configured or known to need it."""
+    return _PLAYWRIGHT_AVAILABLE and (should_use_playwright(url) or _domain_config.requires_playwright(url))
+
+
+def _renders_first(url: str) -> bool:
+    """True when url is fetched with a single Playwright render (visual analysis screenshots)."""
+    return _PLAYWRIGHT_AVAILABLE and _visual_capture_needed(url)
+
+
+def _fetch_known_playwright_domain(url: str, browser_manager=None) -> Optional[Dict[str, str]]:
+    """Smart Fallback: render directly with Playwright for domains known to need it.
+
+    Returns the Playwright result, or None when the caller should continue with
+    a plain HTTP fetch (domain not flagged, robots disallow, or render blocked).
+    """
+    if not _requires_playwright_first(url):
+        return None
+
+    logger.info('Smart Fallback: Skipping lxml fetch for %s (known to require Playwright)', url)
+    # Use realistic browser headers for Playwright too
+    pw_headers = get_realistic_headers(url)
+    ua = pw_headers['User-Agent']
+    # Respect robots.txt before attempting a headful fetch
+    try:
+        allowed = _is_allowed_by_robots(url, ua)
+    except Exception:
+        allowed = True
+    if allowed:
+        result = _playwright_fetch_recorded(url, ua, browser_manager, min_body=1)
+        # If Playwright was blocked (Access Denied) or returned no content, fall back to requests
+        if not result.get('access_denied', False) and result.get('body'):
+            return result
+        logger.warning(f"Playwright fetch denied or failed for {url} (access_denied={result.get('access_denied')}), falling back to requests")
+    return None
+
+
 def fetch_page(url: str, timeout: int = 10, browser_manager=None) -> Dict[str, str]:
-    """Fetch a URL and return a simple content dict {title, body, url}"""
+    """Fetch a URL and return a simple content dict {title, body, url}
+
+    Inside a run_fetch_memo() scope each URL is fetched once per run and
+    concurrent callers share the in-flight fetch (see ingestion.fetch_memo).
+    """
+    memo = active_fetch_memo()
+    if memo is not None:
+        return memo.get_or_fetch(url, lambda: _fetch_page_direct(url, timeout, browser_manager))
+    return _fetch_page_direct(url, timeout, browser_manager)
+
+
+def _fetch_page_direct(url: str, timeout: int = 10, browser_manager=None) -> Dict[str, str]:
+    """fetch_page without the run-scoped memo."""
+    archive = get_fetch_archive()
+    if archive is not None and archive.replaying:
+        return _replay_page(url, archive, browser_manager)
+
     # Get realistic headers for this URL
     headers = get_realistic_headers(url)
 
@@ -1353,26 +1593,28 @@ def fetch_page(url: str, timeout: int = 10, browser_manager=None) -> Dict[str, s
 
     # Smart Fallback: Check if we already know this domain needs Playwright
     # But only if Playwright is available and enabled
-    use_pw_config = should_use_playwright(url)
-    
     # Removed early Playwright forcing for visual analysis to prioritize requests-first strategy
-
-    if _PLAYWRIGHT_AVAILABLE and (use_pw_config or _domain_config.requires_playwright(url)):
-        logger.info('Smart Fallback: Skipping lxml fetch for %s (known to require Playwright)', url)
-        # Use realistic browser headers for Playwright too
-        pw_headers = get_realistic_headers(url)
-        ua = pw_headers['User-Agent']
-        # Respect robots.txt before attempting a headful fetch
-        try:
-            allowed = _is_allowed_by_robots(url, ua)
-        except Exception:
-            allowed = True
-        if allowed:
-            result = _fetch_with_playwright(url, ua, browser_manager)
-            # If Playwright was blocked (Access Denied) or returned no content, fall back to requests
-            if not result.get('access_denied', False) and result.get('body'):
-                return result
-            logger.warning(f"Playwright fetch denied or failed for {url} (access_denied={result.get('access_denied')}), falling back to requests")
+    pw_result = _fetch_known_playwright_domain(url, browser_manager)
+    if pw_result is not None:
+        return pw_result
+
+    # Start the (per-host, cached) TLS certificate probe so it overlaps the HTTP request
+    prefetch_ssl([url])
+
+    # Visual analysis needs a render anyway: take text, DOM, badges and screenshots
+    # from that one page load instead of an HTTP fetch plus a second render
+    render_first = _renders_first(url)
+    if render_first:
+        pw_result = _fetch_rendered_page(url, browser_manager)
+        if pw_result is not None:
+            return pw_result
+
+    # Revalidate against the persistent response cache when we have validators
+    # (not while recording: a 304 would leave nothing replayable in the archive)
+    http_cache = get_http_cache() if archive is None else None
+    cached_entry = http_cache.get(url) if http_cache else None
+    if cached_entry:
+        headers.update(http_cache.conditional_headers(cached_entry))
 
     resp = None
     last_status_code = None
@@ -1392,12 +1634,19 @@ def fetch_page(url: str, timeout: int = 10, browser_manager=None) -> Dict[str, s
             # Use session.get instead of requests.get for better session management
             resp = session.get(url, headers=headers, timeout=timeout)
             last_status_code = resp.status_code
+            _rate_limiter.record_response(url, resp.status_code, (getattr(resp, 'headers', None) or {}).get('Retry-After'))
+            if isinstance(resp, _RequestsResponse):
+                # Sessions stream: read within the byte budget, sniffing HTML / PDF / other
+                resp = read_streamed(resp)
+                if archive is not None:
+                    archive.record_http(url, resp)
             break
         except Exception as e:
             # Handle both requests.RequestException and generic exceptions from monkeypatches
             logger.debug('Fetch attempt %s/%s for %s failed: %s', attempt, retries, url, e)
             if attempt == retries:
                 logger.error('Error fetching page %s after %s attempts: %s', url, retries, e)
+                _domain_config.record_fetch(url, 'http', False)
                 # No resp to dump; just return empty
                 return {"title": "", "body": "", "url": url, "access_denied": False}
             # Get smarter backoff based on status code if available
@@ -1405,15 +1654,104 @@ def fetch_page(url: str, timeout: int = 10, browser_manager=None) -> Dict[str, s
             backoff = retry_config_updated['base_backoff']
             time.sleep(backoff * (2 ** (attempt - 1)))
 
+    return _build_page_result(url, resp, browser_manager, cached_entry, rendered=render_first)
+
+
+def _fetch_rendered_page(url: str, browser_manager=None, min_body: int = 150) -> Optional[Dict[str, str]]:
+    """Single-render fetch for visual analysis: text, DOM, badges and screenshots from one load.
+
+    Returns the fetch_page result, or None when the render is disallowed,
+    blocked or too thin (the caller then falls back to a plain HTTP fetch).
+    """
+    ua = get_realistic_headers(url)['User-Agent']
+    try:
+        allowed = _is_allowed_by_robots(url, ua)
+    except Exception:
+        allowed = True
+    if not allowed:
+        return None
+
+    logger.info("Visual Analysis: Rendering %s once for text and screenshots", url)
+    result = _playwright_fetch_recorded(url, ua, browser_manager, min_body=min_body)
+    if result.get('access_denied') or len(result.get('body') or '') < min_body:
+        logger.warning(f"Visual Analysis: Render blocked or thin for {url}, falling back to requests without screenshots")
+        return None
+
+    doc = result.get('parsed_document')
+    if doc is None and result.get('html'):
+        doc = result['parsed_document'] = ParsedDocument(result['html'], url)
+    result.setdefault('structured_body', _extract_structured_body_text(doc.soup) if doc is not None else [])
+    if url.startswith('https'):
+        try:
+            result.update(get_ssl_data(url))
+        except Exception as e:
+            logger.debug(f"Failed to load ssl_utils: {e}")
+    return result
+
+
+def _replay_page(url: str, archive, browser_manager=None) -> Dict[str, str]:
+    """Serve fetch_page from the fetch archive: the recorded HTTP response, else a recorded render."""
+    resp = archive.replay_http(url)
+    if resp is not None:
+        return _build_page_result(url, resp, browser_manager)
+    replayed = archive.replay_json('playwright', normalize_url(url))
+    return replayed or {"title": "", "body": "", "url": url, "access_denied": False}
+
+
+def _ssl_fields(url: str) -> Dict[str, Any]:
+    """SSL certificate fields for a result (ssl_valid, ssl_issuer, ...).
+
+    The probe is started in the background before the HTTP request (one per
+    host, cached), so this normally returns immediately. Only https URLs are
+    checked.
+    """
+    ssl_data = {"ssl_valid": "false"}
+    if url.startswith('https'):
+        try:
+            ssl_data = get_ssl_data(url)
+        except Exception as e:
+            logger.debug(f"Failed to load ssl_utils: {e}")
+    return ssl_data
+
+
+def _build_page_result(url: str, resp, browser_manager=None, cached_entry: Optional[Dict] = None,
+                       rendered: bool = False) -> Dict[str, str]:
+    """Turn an HTTP response into the fetch_page result dict.
+
+    Handles non-200 statuses, thin-content Playwright fallback, footer links,
+    verification badges, SSL data and the secondary visual-analysis render.
+    ``resp`` only needs ``status_code`` and ``text`` attributes, so both the
+    requests path and the async engine can share this step.
+
+    A 304 for a request revalidated against ``cached_entry`` returns the cached
+    extraction directly; fresh 200 results with validators are stored.
+
+    ``rendered`` means a Playwright render of this URL was already attempted
+    (see _fetch_rendered_page), so no further render is started here.
+    """
+    http_cache = get_http_cache()
     try:
         if resp is None:
             return {"title": "", "body": "", "url": url}
 
+        if resp.status_code == 304 and cached_entry and http_cache:
+            logger.debug('HTTP cache: %s not modified, reusing cached extraction', url)
+            _record_http_outcome(url, resp, True)
+            result = http_cache.revalidated(url, cached_entry)
+            result.update(_ssl_fields(url))
+            if not rendered:
+                _attach_visual_analysis(url, result, browser_manager)
+            return result
+
+        if http_cache:
+            http_cache.record_miss()
+
         if resp.status_code != 200:
             logger.warning("Fetching %s returned %s", url, resp.status_code)
+            _record_http_outcome(url, resp, False)
             # Check if Playwright should be used (global override or domain-specific config)
             use_pw = should_use_playwright(url)
-            try_playwright = use_pw and _PLAYWRIGHT_AVAILABLE
+            try_playwright = use_pw and _PLAYWRIGHT_AVAILABLE and not rendered
             if try_playwright:
                 try:
                     # Use realistic browser headers for Playwright too
@@ -1426,7 +1764,7 @@ def fetch_page(url: str, timeout: int = 10, browser_manager=None) -> Dict[str, s
                         allowed = True
                     if allowed:
                         logger.info('Attempting Playwright-rendered fetch for %s (domain config or AR_USE_PLAYWRIGHT)', url)
-                        result = _fetch_with_playwright(url, ua, browser_manager)
+                        result = _playwright_fetch_recorded(url, ua, browser_manager, min_body=100)
                         if result.get('body') and len(result.get('body', '')) >= 100:
                             # Success! Mark this domain as requiring Playwright for future
                             _domain_config.mark_requires_playwright(url)
@@ -1449,10 +1787,16 @@ def fetch_page(url: str, timeout: int = 10, browser_manager=None) -> Dict[str, s
                 links = {"terms": "", "privacy": ""}
             return {"title": "", "body": "", "url": url, "terms": links.get("terms", ""), "privacy": links.get("privacy", ""), "access_denied": resp.status_code == 403}
 
+        content_kind = getattr(resp, 'content_kind', 'html')
+        if content_kind != 'html':
+            return _build_non_html_result(url, resp, content_kind)
+
         # Check for 403 Forbidden specifically to mark as access denied
         access_denied = resp.status_code == 403
 
-        soup = BeautifulSoup(resp.text, "lxml")
+        # Parse once; footer links, badges and MetadataExtractor reuse this document
+        doc = ParsedDocument(resp.text, url)
+        soup = doc.soup
         title = soup.title.string.strip() if soup.title and soup.title.string else ""
 
         # Try OpenGraph / Twitter meta fallbacks for title/description
@@ -1472,10 +1816,12 @@ def fetch_page(url: str, timeout: int = 10, browser_manager=None) -> Dict[str, s
             og_desc = soup.select_one('meta[property="og:description"]') or soup.select_one('meta[name="twitter:description"]')
             if og_desc and og_desc.get('content'):
                 body = og_desc.get('content').strip()
-        if (not title or not body or len(body) < 200):
+        thin = not title or not body or len(body) < 200
+        _record_http_outcome(url, resp, not thin)
+        if thin:
             # Attempt Playwright fallback for thin content if enabled and allowed
             # Force Playwright if content is thin, even if not explicitly configured for this domain
-            try_playwright = _PLAYWRIGHT_AVAILABLE
+            try_playwright = _PLAYWRIGHT_AVAILABLE and not rendered
             if try_playwright:
                 try:
                     # Use realistic browser headers for Playwright too
@@ -1488,7 +1834,7 @@ def fetch_page(url: str, timeout: int = 10, browser_manager=None) -> Dict[str, s
                         allowed = True
                     if allowed:
                         logger.info('Attempting Playwright-rendered fetch for thin content: %s', url)
-                        result = _fetch_with_playwright(url, ua, browser_manager)
+                        result = _playwright_fetch_recorded(url, ua, browser_manager, min_body=150)
                         if result.get('body') and len(result.get('body', '')) >= 150:
                             # Success! Mark this domain as requiring Playwright for future
                             _domain_config.mark_requires_playwright(url)
@@ -1506,28 +1852,19 @@ def fetch_page(url: str, timeout: int = 10, browser_manager=None) -> Dict[str, s
                 pass
 
         try:
-            links = _extract_footer_links(getattr(resp, 'text', '') or '', url)
+            links = _extract_footer_links(doc, url)
         except Exception:
             links = {"terms": "", "privacy": ""}
         
         # Extract verification badges for social media pages
         try:
-            verification_badges = _extract_verification_badges(getattr(resp, 'text', '') or '', url)
+            verification_badges = _extract_verification_badges(doc, url)
         except Exception:
             verification_badges = {"verified": False, "platform": "unknown", "badge_type": "", "evidence": ""}
         
 
         # NEW: Check SSL Certificate
-        # We do this after main content fetch to avoid blocking if the fetch failed anyway,
-        # but before constructing the result.
-        # Only check for https URLs.
-        ssl_data = {"ssl_valid": "false"}
-        if url.startswith('https'):
-            try:
-                from ingestion.ssl_utils import get_ssl_data
-                ssl_data = get_ssl_data(url)
-            except Exception as e:
-                logger.debug(f"Failed to load ssl_utils: {e}")
+        ssl_data = _ssl_fields(url)
 
         result = {
             "title": title, 
@@ -1539,43 +1876,17 @@ def fetch_page(url: str, timeout: int = 10, browser_manager=None) -> Dict[str, s
             "verification_badges": verification_badges,
             "screenshot_path": None,
             "html": resp.text, # Include raw HTML for metadata extraction
+            "parsed_document": doc, # Parsed form of html, reused by MetadataExtractor
             "access_denied": access_denied,
-            "visual_analysis": result.get("visual_analysis_data"), # Propagate rich visual data
+            "visual_analysis": None, # Filled by the secondary Playwright render below when enabled
             **ssl_data # Merge SSL data (ssl_valid, ssl_issuer, etc.)
         }
 
-        # NEW: Secondary Visual Analysis Step
-        # If visual analysis is enabled and we haven't captured a screenshot yet, try Playwright now.
-        visual_enabled = SETTINGS.get('visual_analysis_enabled', False)
-        if visual_enabled and _PLAYWRIGHT_AVAILABLE and not result.get('screenshot_path'):
-            # Only attempt if the main request wasn't blocked (if it was blocked, we already know we can't access)
-            if not result.get('access_denied'):
-                logger.info("Visual Analysis: Attempting secondary Playwright fetch for screenshot...")
-                try:
-                    # Use realistic headers for the secondary fetch
-                    pw_headers = get_realistic_headers(url)
-                    ua = pw_headers['User-Agent']
-                    pw_result = _fetch_with_playwright(url, ua, browser_manager)
-                    
-                    # Only merge if PW succeeds and isn't blocked
-                    if not pw_result.get('access_denied'):
-                        result['screenshot_path'] = pw_result.get('screenshot_path')
-                        if pw_result.get('screenshot_path'):
-                            logger.info(f"Visual Analysis: Successfully captured screenshot: {pw_result['screenshot_path']}")
-                        
-                        # Optionally upgrade body/badges if PW found more content
-                        # (Playwright renders JS, so it might find things requests missed)
-                        if len(pw_result.get('body', '')) > len(result.get('body', '')):
-                            result['body'] = pw_result['body']
-                            result['structured_body'] = _extract_elements_with_structure(BeautifulSoup(pw_result['body'], "lxml"))
-                        
-                        # Merge verification badges if PW found them
-                        if pw_result.get('verification_badges', {}).get('verified'):
-                            result['verification_badges'] = pw_result['verification_badges']
-                    else:
-                        logger.warning(f"Visual Analysis: Secondary Playwright fetch was blocked (Access Denied). Keeping standard content for {url}")
-                except Exception as e:
-                    logger.warning(f"Visual Analysis: Secondary Playwright fetch failed: {e}")
+        if http_cache and getattr(resp, 'headers', None):
+            http_cache.put(url, resp.headers, result)
+
+        if not rendered:
+            _attach_visual_analysis(url, result, browser_manager)
 
         return result
 
@@ -1593,15 +1904,93 @@ def fetch_page(url: str, timeout: int = 10, browser_manager=None) -> Dict[str, s
         return {"title": "", "body": "", "url": url, "access_denied": False}
 
 
+def _build_non_html_result(url: str, resp, content_kind: str) -> Dict[str, str]:
+    """Result for a streamed non-HTML body: PDF text, or an empty result for anything else."""
+    content_type = getattr(resp, 'content_type', '')
+    result = {
+        "title": "",
+        "body": "",
+        "url": url,
+        "terms": "",
+        "privacy": "",
+        "screenshot_path": None,
+        "html": "",
+        "access_denied": False,
+        "visual_analysis": None,
+        "content_type": content_type,
+    }
+    if content_kind != 'pdf' or not getattr(resp, 'pdf_bytes', None):
+        logger.info('Skipping non-HTML response from %s (%s)', url, content_type or content_kind)
+        return result
+
+    title, text = extract_pdf_text(resp.pdf_bytes)
+    if not title:
+        title = os.path.basename(urlparse(url).path) or url
+    result.update({"title": title, "body": text})
+    _record_http_outcome(url, resp, bool(text))
+    logger.info('Extracted %d characters from PDF %s', len(text), url)
+    http_cache = get_http_cache()
+    if text and http_cache and getattr(resp, 'headers', None):
+        http_cache.put(url, resp.headers, result)
+    return result
+
+
+def _attach_visual_analysis(url: str, result: Dict, browser_manager=None) -> None:
+    """Secondary visual-analysis step: render with Playwright for a screenshot.
+
+    fetch_page renders visual-analysis pages up front (see _fetch_rendered_page);
+    this covers callers that build a result from an HTTP response without that
+    render. Mutates ``result`` in place, merging the screenshot,
+    visual analysis and any richer body / verification badges Playwright found.
+    """
+    # If visual analysis is enabled and we haven't captured a screenshot yet, try Playwright now.
+    if _PLAYWRIGHT_AVAILABLE and _visual_capture_needed(url) and not result.get('screenshot_path'):
+        # Only attempt if the main request wasn't blocked (if it was blocked, we already know we can't access)
+        if not result.get('access_denied'):
+            logger.info("Visual Analysis: Attempting secondary Playwright fetch for screenshot...")
+            try:
+                # Use realistic headers for the secondary fetch
+                pw_headers = get_realistic_headers(url)
+                ua = pw_headers['User-Agent']
+                pw_result = _fetch_with_playwright(url, ua, browser_manager)
+                
+                # Only merge if PW succeeds and isn't blocked
+                if not pw_result.get('access_denied'):
+                    result['screenshot_path'] = pw_result.get('screenshot_path')
+                    if pw_result.get('visual_analysis'):
+                        result['visual_analysis'] = pw_result['visual_analysis']
+                    if pw_result.get('screenshot_path'):
+                        logger.info(f"Visual Analysis: Successfully captured screenshot: {pw_result['screenshot_path']}")
+                    
+                    # Optionally upgrade body/badges if PW found more content
+                    # (Playwright renders JS, so it might find things requests missed)
+                    if len(pw_result.get('body', '')) > len(result.get('body', '')):
+                        result['body'] = pw_result['body']
+                        # Structure comes from the rendered DOM the render already parsed
+                        pw_doc = pw_result.get('parsed_document')
+                        if pw_doc is not None:
+                            result['structured_body'] = _extract_structured_body_text(pw_doc.soup)
+                    
+                    # Merge verification badges if PW found them
+                    if pw_result.get('verification_badges', {}).get('verified'):
+                        result['verification_badges'] = pw_result['verification_badges']
+                else:
+                    logger.warning(f"Visual Analysis: Secondary Playwright fetch was blocked (Access Denied). Keeping standard content for {url}")
+            except Exception as e:
+                logger.warning(f"Visual Analysis: Secondary Playwright fetch failed: {e}")
+
+
 def fetch_pages_parallel(
     urls: List[str],
     max_workers: int = None,
     browser_manager=None
 ) -> List[Dict[str, str]]:
-    """Fetch multiple pages in parallel using ThreadPoolExecutor.
+    """Fetch multiple pages in parallel.
     
-    This function significantly improves performance when fetching multiple pages,
-    especially for JavaScript-heavy pages that require Playwright rendering.
+    When aiohttp is installed (and AR_ASYNC_FETCH is not '0') the HTTP requests run
+    on the asyncio engine in ingestion.async_fetcher, which keeps up to
+    AR_FETCH_MAX_IN_FLIGHT requests in flight with AR_FETCH_PER_DOMAIN per domain.
+    Otherwise each URL is fetched with fetch_page on a ThreadPoolExecutor.
     
     Args:
         urls: List of URLs to fetch
@@ -1636,6 +2025,23 @@ def fetch_pages_parallel(
     # Limit max_workers to avoid overwhelming the system
     max_workers = min(max_workers, len(urls), 10)
     
+    # Probe each distinct host's certificate in the background while pages download
+    prefetch_ssl(urls)
+
+    from ingestion import async_fetcher
+    # Recording and replay go through fetch_page, which the fetch archive hooks into
+    if async_fetcher.is_available() and get_fetch_archive() is None:
+        logger.info('[PARALLEL] Fetching %d pages with async engine', len(urls))
+        start_time = time.time()
+        engine = async_fetcher.AsyncFetchEngine(process_workers=max_workers, browser_manager=browser_manager)
+        memo = active_fetch_memo()
+        # Within a run, only URLs no other collector has fetched (or is fetching) hit the network
+        ordered = memo.fetch_many(urls, engine.fetch_all) if memo is not None else engine.fetch_all(urls)
+        elapsed = time.time() - start_time
+        logger.info('[PARALLEL] Completed fetching %d pages in %.2f seconds (avg: %.2f s/page)',
+                   len(urls), elapsed, elapsed / len(urls))
+        return ordered
+    
     logger.info('[PARALLEL] Fetching %d pages with %d workers', len(urls), max_workers)
     
     results = {}
@@ -1652,8 +2058,9 @@ def fetch_pages_parallel(
             fetch_task = fetch_page
 
         # Submit all fetch tasks exactly once
+        # Each fetch runs in a copy of this context, so it sees the run's fetch memo
         future_to_url = {
-            executor.submit(fetch_task, url, browser_manager=browser_manager): url
+            executor.submit(contextvars.copy_context().run, fetch_task, url, browser_manager=browser_manager): url
             for url in urls
         }
         
@@ -0,0 +1,126 @@
+"""Parse-once HTML document shared by page_fetcher and MetadataExtractor.
+
+A page's HTML used to be re-parsed by every extractor (footer links,
+verification badges, schema.org, OG/meta tags, provenance, visuals, text
+segments). ``ParsedDocument`` parses it once and memoizes the derived views,
+so a fetch plus metadata enrichment walks the DOM a single time.
+
+Functions that accept HTML take either a raw string or a ``ParsedDocument``;
+use ``ParsedDocument.of(html)`` to normalize the argument.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+logger = logging.getLogger(__name__)
+
+
+class ParsedDocument:
+    """HTML parsed once, with lazily memoized derived views.
+
+    Attributes:
+        html: Raw HTML string
+        url: Page URL (optional, informational)
+    """
+
+    def __init__(self, html: str, url: str = "", parser: str = "lxml"):
+        self.html = html or ""
+        self.url = url
+        self._parser = parser
+        self._soup: Optional[BeautifulSoup] = None
+        self._json_ld: Optional[List[Any]] = None
+        self._meta: Optional[Dict[str, Dict[str, str]]] = None
+        self._og: Optional[Dict[str, str]] = None
+        self._footer = None
+        self._footer_found = False
+
+    @classmethod
+    def of(cls, html, url: str = "") -> "ParsedDocument":
+        """Return html unchanged if it is already a ParsedDocument, else parse it."""
+        if isinstance(html, cls):
+            return html
+        return cls(html, url)
+
+    def __bool__(self) -> bool:
+        return bool(self.html)
+
+    def __len__(self) -> int:
+        return len(self.html)
+
+    def __str__(self) -> str:
+        return self.html
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        """The parse tree (built on first access). Treat it as read-only."""
+        if self._soup is None:
+            try:
+                self._soup = BeautifulSoup(self.html, self._parser)
+            except FeatureNotFound:
+                self._soup = BeautifulSoup(self.html, "html.parser")
+        return self._soup
+
+    @property
+    def json_ld(self) -> List[Any]:
+        """Decoded ``application/ld+json`` blocks (invalid JSON is skipped)."""
+        if self._json_ld is None:
+            blocks = []
+            for script in self.soup.find_all('script', type='application/ld+json'):
+                try:
+                    blocks.append(json.loads(script.string))
+                except (TypeError, ValueError):
+                    continue
+            self._json_ld = blocks
+        return self._json_ld
+
+    def _meta_index(self) -> Dict[str, Dict[str, str]]:
+        """Index <meta> content by ``name`` and ``property`` in one pass.
+
+        Name/property lookups keep the first tag (like ``soup.find``); OG tags
+        keep the last one, as the original per-tag loop did.
+        """
+        if self._meta is None:
+            index = {'name': {}, 'property': {}}
+            og = {}
+            for tag in self.soup.find_all('meta'):
+                content = tag.get('content')
+                if not content:
+                    continue
+                for attr in ('name', 'property'):
+                    key = tag.get(attr)
+                    if key and key not in index[attr]:
+                        index[attr][key] = content
+                prop = tag.get('property') or ''
+                if prop.startswith('og:') and prop[3:]:
+                    og['og_' + prop[3:]] = content
+            self._meta = index
+            self._og = og
+        return self._meta
+
+    @property
+    def meta(self) -> Dict[str, str]:
+        """<meta name="..."> content by name."""
+        return self._meta_index()['name']
+
+    @property
+    def meta_properties(self) -> Dict[str, str]:
+        """<meta property="..."> content by property (og:*, article:*, ...)."""
+        return self._meta_index()['property']
+
+    @property
+    def og(self) -> Dict[str, str]:
+        """OpenGraph tags keyed as ``og_<name>`` (matching MetadataExtractor output)."""
+        self._meta_index()
+        return self._og
+
+    @property
+    def footer(self):
+        """The first <footer> element, or None."""
+        if not self._footer_found:
+            self._footer = self.soup.find('footer')
+            self._footer_found = True
+        return self._footer
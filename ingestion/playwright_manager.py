@@ -1,11 +1,35 @@
+"""Pool of persistent Playwright browsers for JS-rendered fetches.
+
+``PlaywrightBrowserManager`` runs AR_PLAYWRIGHT_WORKERS browser workers
+(default 2). Each is a thread owning its own Playwright instance and
+Chromium process. Fetches go to the least-loaded live worker, a worker whose
+browser dies is restarted with backoff, and ``get_stats`` reports totals and
+a per-worker breakdown.
+
+Each worker renders one page at a time. Playwright's sync API objects are
+bound to the thread that created them, and every sync call blocks that thread
+until the browser answers, so one worker cannot interleave several pages.
+Parallel rendering therefore comes from more workers, not from several
+contexts per worker. The warm contexts a worker keeps (see
+ingestion.browser_contexts) sit idle until a later page of the same domain
+reuses them.
+
+Configuration (environment):
+    AR_PLAYWRIGHT_WORKERS              Browser workers, i.e. pages rendered at once (default 2)
+    AR_PLAYWRIGHT_MAX_LAUNCH_FAILURES  Failed launches before a worker is given up on (default 3)
+    AR_PLAYWRIGHT_PAGE_DEADLINE_S      Hard limit for one rendered page (default 30)
+"""
 import logging
 import os
 import threading
 import queue
 import time
 import asyncio
-from typing import Optional, Dict, Any, Tuple
+from typing import Callable, Optional, Dict, Any, Tuple
 from datetime import datetime
+from urllib.parse import urlparse
+from ingestion.browser_contexts import BrowserContextPool, get_storage_state_store
+from ingestion.render_wait import get_render_budget, wait_for_stable_dom
 from ingestion.screenshot_capture import get_screenshot_capture, should_capture_screenshot
 from config.settings import SETTINGS
 
@@ -22,22 +46,237 @@ except Exception:
     Playwright = None
 
 
+# Chromium flags shared by every browser worker.
+# --disable-http2 fixes ERR_HTTP2_PROTOCOL_ERROR from CDNs/WAFs (e.g., Akamai on adidas.com)
+_LAUNCH_ARGS = [
+    '--disable-gpu',
+    '--disable-dev-shm-usage',
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-accelerated-2d-canvas',
+    '--disable-gl-drawing-for-tests',
+    '--disable-http2',
+    # Stealth additions
+    '--disable-blink-features=AutomationControlled',
+    '--disable-infobars',
+    '--ignore-certificate-errors',
+]
+
+# Modern Chrome UA used when callers hand us a headless/automation UA
+_MODERN_USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
+
+
+# Text-only mode: resource types and third-party hosts aborted when no screenshot is needed.
+# Host entries match the request hostname or its subdomains; an entry with a path
+# ('bing.com/bat') also requires that path prefix. Document requests are never blocked.
+# Override with AR_PLAYWRIGHT_BLOCK_RESOURCES / add hosts with AR_PLAYWRIGHT_BLOCK_HOSTS
+# (comma-separated); disable entirely with AR_PLAYWRIGHT_TEXT_ONLY=0.
+_DEFAULT_BLOCKED_RESOURCE_TYPES = ('image', 'media', 'font')
+_DEFAULT_BLOCKED_HOSTS = (
+    'doubleclick.net',
+    'googlesyndication.com',
+    'googleadservices.com',
+    'google-analytics.com',
+    'googletagmanager.com',
+    'adservice.google.com',
+    'amazon-adsystem.com',
+    'facebook.net',
+    'connect.facebook.com',
+    'hotjar.com',
+    'segment.com',
+    'segment.io',
+    'criteo.com',
+    'criteo.net',
+    'taboola.com',
+    'outbrain.com',
+    'scorecardresearch.com',
+    'quantserve.com',
+    'adnxs.com',
+    'adsrvr.org',
+    'moatads.com',
+    'bing.com/bat',
+    'clarity.ms',
+    'nr-data.net',
+    'fullstory.com',
+    'mixpanel.com',
+    'tiktok.com/i18n/pixel',
+    'analytics.tiktok.com',
+    'pinimg.com/ct',
+    'snap.licdn.com',
+)
+
+
+def _env_list(name: str, default) -> Tuple[str, ...]:
+    raw = os.getenv(name)
+    if raw is None:
+        return tuple(default)
+    return tuple(item.strip().lower() for item in raw.split(',') if item.strip())
+
+
+def text_only_enabled() -> bool:
+    """Whether text-only fetches block heavy resources (AR_PLAYWRIGHT_TEXT_ONLY, default on)."""
+    return os.getenv('AR_PLAYWRIGHT_TEXT_ONLY', '1') != '0'
+
+
+def get_block_list() -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Return (blocked resource types, blocked host patterns) for text-only fetches."""
+    types = _env_list('AR_PLAYWRIGHT_BLOCK_RESOURCES', _DEFAULT_BLOCKED_RESOURCE_TYPES)
+    hosts = _DEFAULT_BLOCKED_HOSTS + _env_list('AR_PLAYWRIGHT_BLOCK_HOSTS', ())
+    return types, hosts
+
+
+def _matches_blocked_host(host: str, path: str, pattern: str) -> bool:
+    """True if host (and path, for entries like 'bing.com/bat') falls under a block-list entry."""
+    pattern_host, _, pattern_path = pattern.partition('/')
+    if host != pattern_host and not host.endswith('.' + pattern_host):
+        return False
+    return not pattern_path or path.startswith('/' + pattern_path)
+
+
+def should_block_request(resource_type: str, url: str, blocked_types, blocked_hosts) -> bool:
+    """True if a request should be aborted in text-only mode.
+
+    Documents (the page itself and its frames) are always loaded, so a
+    first-party page on a tracker's domain is never aborted. Query strings
+    are never matched.
+    """
+    if resource_type == 'document':
+        return False
+    if resource_type in blocked_types:
+        return True
+    parsed = urlparse(url)
+    if parsed.scheme not in ('http', 'https') or not parsed.hostname:
+        return False
+    host = parsed.hostname.lower()
+    path = parsed.path.lower()
+    return any(_matches_blocked_host(host, path, pattern) for pattern in blocked_hosts)
+
+
+def install_text_only_routes(target) -> Dict[str, int]:
+    """Abort images, media, fonts and tracker/ad requests on a Playwright page or context.
+
+    Returns a counter dict ({'blocked': n}) updated as requests are intercepted.
+    """
+    blocked_types, blocked_hosts = get_block_list()
+    counter = {'blocked': 0}
+
+    def _handle(route):
+        request = route.request
+        try:
+            if should_block_request(request.resource_type, request.url, blocked_types, blocked_hosts):
+                counter['blocked'] += 1
+                route.abort()
+            else:
+                route.continue_()
+        except Exception:
+            # Route may already be handled if the page is closing
+            pass
+
+    target.route('**/*', _handle)
+    return counter
+
+
+def _page_deadline_seconds() -> float:
+    """Hard limit for one rendered page, from AR_PLAYWRIGHT_PAGE_DEADLINE_S (default 30)."""
+    try:
+        return max(1.0, float(os.getenv('AR_PLAYWRIGHT_PAGE_DEADLINE_S', '30')))
+    except ValueError:
+        return 30.0
+
+
+def _max_launch_failures() -> int:
+    """Consecutive failed browser launches after which a worker is not restarted, from
+    AR_PLAYWRIGHT_MAX_LAUNCH_FAILURES (default 3)."""
+    try:
+        return max(1, int(os.getenv('AR_PLAYWRIGHT_MAX_LAUNCH_FAILURES', '3')))
+    except ValueError:
+        return 3
+
+
+def _default_pool_size() -> int:
+    """Number of browser workers, from AR_PLAYWRIGHT_WORKERS (default 2)."""
+    try:
+        return max(1, int(os.getenv('AR_PLAYWRIGHT_WORKERS', '2')))
+    except ValueError:
+        return 2
+
+
+class _BrowserWorker:
+    """One browser in the pool: a dedicated thread owning its own Playwright instance.
+
+    The sync Playwright API is bound to the thread that created it, so each
+    worker keeps its own request queue and browser process and handles one
+    fetch at a time.
+    """
+
+    def __init__(self, index: int):
+        self.index = index
+        self.request_queue: queue.Queue = queue.Queue()
+        self.thread: Optional[threading.Thread] = None
+        # False once the thread has stopped taking tasks (guarded by the manager's lock)
+        self.accepting = False
+        # Tasks dispatched to this worker that have not produced a result yet
+        self.pending = 0
+        self.processed = 0
+        self.failed = 0
+        self.restarts = 0
+        # Consecutive thread exits before the browser launched, and the earliest
+        # time (monotonic) the worker may be restarted again
+        self.launch_failures = 0
+        self.retry_at = 0.0
+        # Warm per-domain contexts of this worker's browser
+        self.contexts: Optional[BrowserContextPool] = None
+
+    @property
+    def is_alive(self) -> bool:
+        return bool(self.thread and self.thread.is_alive())
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "index": self.index,
+            "alive": self.is_alive,
+            "pending": self.pending,
+            "processed": self.processed,
+            "failed": self.failed,
+            "restarts": self.restarts,
+            "launch_failures": self.launch_failures,
+            "contexts": self.contexts.snapshot() if self.contexts else {},
+        }
+
+
 class PlaywrightBrowserManager:
-    """Thread-safe manager for persistent Playwright browser instance.
+    """Thread-safe manager for a pool of persistent Playwright browsers.
     
-    Uses a dedicated thread to handle all Playwright interactions, ensuring
-    thread safety for the synchronous Playwright API.
+    Each browser runs in a dedicated worker thread, ensuring thread safety for
+    the synchronous Playwright API, and renders one page at a time. Fetches
+    are dispatched to the least-loaded live worker so JS-heavy pages render
+    in parallel, one per worker, instead of queueing behind a single browser.
     """
     
-    def __init__(self):
-        """Initialize the browser manager."""
-        self._request_queue = queue.Queue()
-        self._thread: Optional[threading.Thread] = None
+    def __init__(self, num_workers: Optional[int] = None):
+        """Initialize the browser manager.
+        
+        Args:
+            num_workers: Number of browser worker threads. Defaults to
+                AR_PLAYWRIGHT_WORKERS (2).
+        """
+        self._num_workers = num_workers or _default_pool_size()
+        self._workers = [_BrowserWorker(i) for i in range(self._num_workers)]
         self._is_started = False
         self._lock = threading.Lock()
+        # Restart policy for workers whose browser fails to launch
+        self.max_launch_failures = _max_launch_failures()
+        self.restart_backoff_s = 1.0
+        # How long a fetch waits for a draining worker to stop before giving up
+        self.drain_wait_s = 5.0
+        # Per-domain stability-wait budgets learned from earlier renders
+        self.render_budget = get_render_budget()
+        self.page_deadline_s = _page_deadline_seconds()
+        # Each worker thread's BrowserContextPool (Playwright objects are thread-bound)
+        self._local = threading.local()
         
     def start(self) -> bool:
-        """Launch the browser thread.
+        """Launch the browser worker threads.
         
         Returns:
             True if started successfully (or already started), False otherwise
@@ -47,21 +286,58 @@ class PlaywrightBrowserManager:
             return False
             
         with self._lock:
-            if self._is_started:
+            if self._is_started and any(w.is_alive for w in self._workers):
                 return True
                 
             try:
-                self._thread = threading.Thread(target=self._run_browser_loop, daemon=True, name="PlaywrightBrowserThread")
-                self._thread.start()
+                for worker in self._workers:
+                    if not worker.is_alive:
+                        # An explicit start gives failing workers a fresh restart budget
+                        worker.launch_failures = 0
+                        worker.retry_at = 0.0
+                        self._start_worker(worker)
                 self._is_started = True
-                logger.info('Playwright browser thread started')
+                logger.info('Playwright browser pool started (%d workers)', self._num_workers)
                 return True
             except Exception as e:
                 logger.error('Failed to start Playwright thread: %s', e)
                 return False
 
-    def _run_browser_loop(self):
-        """Internal loop running in a dedicated thread.
+    def _start_worker(self, worker: _BrowserWorker) -> None:
+        """Start (or restart) the thread for a worker. Caller must hold self._lock."""
+        worker.accepting = True
+        worker.thread = threading.Thread(
+            target=self._run_browser_loop,
+            args=(worker,),
+            daemon=True,
+            name=f"PlaywrightBrowserThread-{worker.index}",
+        )
+        worker.thread.start()
+
+    def _launch_browser(self, playwright: Playwright) -> Browser:
+        """Launch a Chromium instance with the pool's hardened flags."""
+        launch_args = list(_LAUNCH_ARGS)
+        
+        # Default to Headed mode (false) to bypass bot detection on sites like Costco
+        # Use SETTINGS for the source of truth, creating a toggle-able experience
+        # Use 'new' headless mode if headless is requested
+        # This is more stealthy than the old headless mode
+        if SETTINGS.get('headless_mode', True):
+            launch_args.append('--headless=new')
+        
+        return playwright.chromium.launch(
+            # We must set headless=False here because we are passing --headless=new in args
+            # If we set headless=True, Playwright adds the old --headless flag which overrides ours
+            headless=False,
+            args=launch_args,
+            ignore_default_args=['--enable-automation'],
+            handle_sigint=False,
+            handle_sigterm=False,
+            handle_sighup=False
+        )
+
+    def _run_browser_loop(self, worker: _BrowserWorker):
+        """Internal loop running in a worker's dedicated thread.
         
         Note: We do NOT create a new event loop here because:
         1. sync_playwright() uses synchronous API and doesn't need an event loop
@@ -70,50 +346,20 @@ class PlaywrightBrowserManager:
         """
         playwright = None
         browser = None
+        launched = False
         
         try:
-            logger.info('Initializing Playwright in dedicated thread...')
+            logger.info('Initializing Playwright in worker %d...', worker.index)
             playwright = sync_playwright().start()
-            
-            # Harden browser launch args to prevent crashes on macOS/Headless
-            # --disable-http2 fixes ERR_HTTP2_PROTOCOL_ERROR from CDNs/WAFs (e.g., Akamai on adidas.com)
-            launch_args = [
-                '--disable-gpu',
-                '--disable-dev-shm-usage',
-                '--no-sandbox',
-                '--disable-setuid-sandbox',
-                '--disable-accelerated-2d-canvas',
-                '--disable-gl-drawing-for-tests',
-                '--disable-http2',
-                # Stealth additions
-                '--disable-blink-features=AutomationControlled',
-                '--disable-infobars',
-                '--ignore-certificate-errors',
-            ]
-            
-            # Default to Headed mode (false) to bypass bot detection on sites like Costco
-            # Use SETTINGS for the source of truth, creating a toggle-able experience
-            headless_mode = SETTINGS.get('headless_mode', True)
-            
-            # Use 'new' headless mode if headless is requested
-            # This is more stealthy than the old headless mode
-            if headless_mode:
-                launch_args.append('--headless=new')
-            
-            browser = playwright.chromium.launch(
-                # We must set headless=False here because we are passing --headless=new in args
-                # If we set headless=True, Playwright adds the old --headless flag which overrides ours
-                headless=False,
-                args=launch_args,
-                ignore_default_args=['--enable-automation'],
-                handle_sigint=False,
-                handle_sigterm=False,
-                handle_sighup=False
-            )
-            logger.info(f'Playwright browser initialized successfully (Headless: {headless_mode})')
+            browser = self._launch_browser(playwright)
+            worker.contexts = self._context_pool(browser)
+            launched = True
+            with self._lock:
+                worker.launch_failures = 0
+            logger.info(f'Playwright browser {worker.index} initialized successfully (Headless: {SETTINGS.get("headless_mode", True)})')
             
             while True:
-                task = self._request_queue.get()
+                task = worker.request_queue.get()
                 if task is None:
                     break
                     
@@ -124,56 +370,52 @@ class PlaywrightBrowserManager:
                     
                     # Update to modern Chrome 131 User Agent if generic/older one provided
                     if "HeadlessChrome" in user_agent or "Playwright" in user_agent:
-                        user_agent = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
+                        user_agent = _MODERN_USER_AGENT
                         
                     capture_screenshot = task.get("capture_screenshot", False)
+                    on_page = task.get("on_page")
                     result_queue = task.get("result_queue")
-                    logger.debug(f'Browser thread processing fetch request for: {url}')
+                    logger.debug(f'Browser worker {worker.index} processing fetch request for: {url}')
                     
                     try:
                         # Check if browser is still connected
                         if not browser.is_connected():
-                            logger.warning('Browser disconnected, restarting...')
+                            logger.warning('Browser %d disconnected, restarting...', worker.index)
                             try:
                                 browser.close()
                             except: pass
-                            browser = playwright.chromium.launch(
-                                headless=False,
-                                args=launch_args, # launch_args now includes --headless=new if needed
-                                handle_sigint=False,
-                                handle_sigterm=False,
-                                handle_sighup=False
-                            )
+                            browser = self._launch_browser(playwright)
+                            worker.restarts += 1
                             
-                        data = self._process_fetch(browser, url, user_agent, capture_screenshot)
+                        data = self._process_fetch(browser, url, user_agent, capture_screenshot, on_page=on_page)
                         result_queue.put(data)
                     except Exception as e:
                         error_msg = str(e)
                         # If target closed, try one restart
                         if "Target page, context or browser has been closed" in error_msg or "Connection closed" in error_msg:
-                            logger.warning('Browser crashed during fetch, restarting and retrying: %s', e)
+                            logger.warning('Browser %d crashed during fetch, restarting and retrying: %s', worker.index, e)
                             try:
                                 try:
                                     browser.close()
                                 except: pass
-                                browser = playwright.chromium.launch(
-                                    headless=False,
-                                    args=launch_args, # launch_args now includes --headless=new if needed
-                                    handle_sigint=False,
-                                    handle_sigterm=False,
-                                    handle_sighup=False
-                                )
+                                browser = self._launch_browser(playwright)
+                                worker.restarts += 1
                                 # Retry fetch once
-                                data = self._process_fetch(browser, url, user_agent, capture_screenshot)
+                                data = self._process_fetch(browser, url, user_agent, capture_screenshot, on_page=on_page)
                                 result_queue.put(data)
                             except Exception as retry_e:
                                 logger.error('Retry failed for %s: %s', url, retry_e)
+                                worker.failed += 1
                                 result_queue.put({"title": "", "body": "", "url": url, "error": str(retry_e)})
                         else:
                             logger.error('Error processing fetch for %s: %s', url, e)
+                            worker.failed += 1
                             result_queue.put({"title": "", "body": "", "url": url, "error": str(e)})
                     finally:
-                        self._request_queue.task_done()
+                        with self._lock:
+                            worker.pending = max(0, worker.pending - 1)
+                            worker.processed += 1
+                        worker.request_queue.task_done()
                     
         except Exception as e:
             # Suppress errors during shutdown (like BrokenPipeError, Event loop is closed)
@@ -181,10 +423,17 @@ class PlaywrightBrowserManager:
             if not sys.is_finalizing():
                 # Only log if not shutting down
                 if "Broken pipe" not in str(e) and "Event loop is closed" not in str(e):
-                    logger.error('Playwright browser loop crashed: %s', e)
+                    logger.error('Playwright browser loop %d crashed: %s', worker.index, e)
         finally:
             import sys # Ensure sys is available in finally block
             # Clean up browser and playwright - suppress all errors during cleanup
+            if worker.contexts:
+                try:
+                    if not sys.is_finalizing():
+                        # Saves each domain's storage state for the next run
+                        worker.contexts.close_all()
+                except Exception:
+                    pass
             if browser:
                 try:
                     if not sys.is_finalizing():
@@ -198,24 +447,91 @@ class PlaywrightBrowserManager:
                 except Exception:
                     pass
             
+            if not launched:
+                # Back off before the next restart (1s, 2s, 4s... capped at 30s)
+                with self._lock:
+                    worker.launch_failures += 1
+                    backoff = min(30.0, self.restart_backoff_s * 2 ** (worker.launch_failures - 1))
+                    worker.retry_at = time.monotonic() + backoff
+            
+            # Fail any tasks still queued on this worker so callers never block forever
+            self._drain_worker_queue(worker)
+            
             # Log shutdown only if not finalizing
             if not sys.is_finalizing():
                 try:
                     # Check if logger is still valid (not None) during interpreter shutdown
                     if logger and hasattr(logger, 'info'):
-                        logger.info('Playwright browser thread stopped')
+                        logger.info('Playwright browser thread %d stopped', worker.index)
                 except Exception:
                     pass
-            
-            # Ensure we mark as stopped so it can be restarted if needed
-            with self._lock:
-                self._is_started = False
-                self._thread = None
 
-    def _process_fetch(self, browser: Browser, url: str, user_agent: str, capture_screenshot: bool = False) -> Dict[str, str]:
-        """Perform the actual fetch logic inside the browser thread."""
+    def _drain_worker_queue(self, worker: _BrowserWorker) -> None:
+        """Stop a worker taking tasks and answer every queued fetch with an error result.
+
+        Runs under self._lock, which fetch_page also holds while enqueueing, so
+        no task can be queued on the worker after it has been drained.
+        """
+        with self._lock:
+            worker.accepting = False
+            while True:
+                try:
+                    task = worker.request_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if task and task.get("result_queue"):
+                    task["result_queue"].put({"title": "", "body": "", "url": task.get("url"), "error": "Browser worker stopped"})
+                    worker.pending = max(0, worker.pending - 1)
+
+    def _context_pool(self, browser: Browser) -> BrowserContextPool:
+        """The calling worker thread's context pool, bound to its current browser."""
+        pool = getattr(self._local, 'contexts', None)
+        if pool is None:
+            pool = BrowserContextPool(state_store=get_storage_state_store())
+            self._local.contexts = pool
+        pool.bind(browser)
+        return pool
+
+    @staticmethod
+    def _js_heap_bytes(page: Page) -> Optional[int]:
+        """Used JS heap of a page (Chromium only), or None."""
+        try:
+            value = page.evaluate('() => (performance.memory ? performance.memory.usedJSHeapSize : null)')
+        except Exception:
+            return None
+        return int(value) if isinstance(value, (int, float)) else None
+
+    def _process_fetch(self, browser: Browser, url: str, user_agent: str, capture_screenshot: bool = False,
+                       on_page: Optional[Callable[[Page, str, str], Dict[str, Any]]] = None) -> Dict[str, str]:
+        """Perform the actual fetch logic inside the browser thread.
+
+        After navigation commits, the page is scraped as soon as its text
+        stops growing (``wait_for_stable_dom``), bounded by the domain's
+        learned render budget. Every step shares a hard per-page deadline
+        (AR_PLAYWRIGHT_PAGE_DEADLINE_S).
+
+        Pages run in the worker's warm context for the URL's domain (see
+        ingestion.browser_contexts), so cookies set by earlier pages, such
+        as consent choices, carry over.
+
+        ``on_page(page, url, html)`` runs on the open page after text
+        extraction, replacing the built-in above-the-fold screenshot; the dict
+        it returns is merged into the result. Callers use it to take their
+        screenshots from the same page load as the text.
+        """
         page = None
+        lease = None
+        contexts = self._context_pool(browser)
+        succeeded = False
+        heap_bytes = None
         screenshot_key = None
+        started = time.monotonic()
+        deadline = started + self.page_deadline_s
+
+        def remaining_ms() -> int:
+            # Playwright treats timeout=0 as "no timeout", so never go below 1ms
+            return max(1, int((deadline - time.monotonic()) * 1000))
+
         try:
             logger.debug(f'[PLAYWRIGHT] Creating new page for: {url}')
             
@@ -226,11 +542,22 @@ class PlaywrightBrowserManager:
                 "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8"
             }
             
-            context = browser.new_context(
-                user_agent=user_agent,
-                extra_http_headers=extra_headers
+            # Text-only fetches skip images, media, fonts and trackers; screenshots need the full page
+            lease = contexts.acquire(
+                url,
+                user_agent,
+                text_only=not capture_screenshot and text_only_enabled(),
+                factory=lambda storage_state: browser.new_context(
+                    user_agent=user_agent,
+                    extra_http_headers=extra_headers,
+                    storage_state=storage_state,
+                ),
+                install_routes=install_text_only_routes,
             )
-            page = context.new_page()
+            warm_context = lease.warm
+            blocked = lease.blocked
+            blocked_before = blocked['blocked'] if blocked is not None else 0
+            page = lease.context.new_page()
             
             logger.debug(f'[PLAYWRIGHT] Page created, navigating to: {url}')
             # Stealth: Inject scripts to mask automation
@@ -270,9 +597,7 @@ class PlaywrightBrowserManager:
 
             # Use 'commit' to avoid hanging on heavy sites (like Winn-Dixie)
             # Then rely on wait_for_selector to ensure body is present
-            # Use 'commit' to avoid hanging on heavy sites (like Winn-Dixie)
-            # Then rely on wait_for_selector to ensure body is present
-            response = page.goto(url, timeout=60000, wait_until='commit')
+            response = page.goto(url, timeout=remaining_ms(), wait_until='commit')
             logger.debug(f'[PLAYWRIGHT] Navigation "commit" complete for: {url}')
             
             # Check for HTTP errors status
@@ -283,15 +608,27 @@ class PlaywrightBrowserManager:
             
             try:
                 # Increased timeout for body selector to allow content to load after commit
-                page.wait_for_selector('body', timeout=15000)
+                page.wait_for_selector('body', timeout=min(15000, remaining_ms()))
             except Exception as wait_e:
                 logger.warning(f"[PLAYWRIGHT] Timeout waiting for body selector: {wait_e}")
                 pass
+
+            # Wait for client-side rendering to settle instead of a fixed delay
+            budget_ms = min(self.render_budget.budget_ms(url), remaining_ms())
+            render = wait_for_stable_dom(page, budget_ms)
+            if 'error' not in render:
+                self.render_budget.record(url, render['elapsed_ms'], render['stable'])
+            logger.debug(
+                f"[PLAYWRIGHT] DOM {'stable' if render['stable'] else 'still changing'} after "
+                f"{render['elapsed_ms']}ms (budget {budget_ms}ms, {render.get('chars', 0)} chars) for: {url}"
+            )
             
             logger.debug(f'[PLAYWRIGHT] Extracting content from: {url}')
             page_content = page.content()
             page_title = page.title() or ''
             logger.debug(f'[PLAYWRIGHT] Content extracted, title="{page_title[:50]}..." for: {url}')
+            if blocked is not None:
+                logger.debug(f"[PLAYWRIGHT] Text-only mode blocked {blocked['blocked'] - blocked_before} requests for: {url}")
             
             # Extraction logic (mirrors _fetch_with_playwright)
             page_body = ""
@@ -335,10 +672,17 @@ class PlaywrightBrowserManager:
                 page_body = page_content
 
             # Try to dismiss modals/popups before scraping/screenshot
-            self._dismiss_modals(page)
+            if deadline - time.monotonic() > 1:
+                self._dismiss_modals(page)
 
             # Capture screenshot if requested
-            if capture_screenshot:
+            page_extras: Dict[str, Any] = {}
+            if on_page is not None:
+                try:
+                    page_extras = on_page(page, url, page_content) or {}
+                except Exception as e:
+                    logger.warning(f"[PLAYWRIGHT] Page job failed for {url}: {e}")
+            elif capture_screenshot:
                 try:
                     capture_tool = get_screenshot_capture()
                     # Capture above fold
@@ -372,6 +716,8 @@ class PlaywrightBrowserManager:
             if access_denied:
                 logger.warning(f"[PLAYWRIGHT] Detected Access Denied content for {url}")
 
+            heap_bytes = self._js_heap_bytes(page)
+            succeeded = True
             return {
                 "title": page_title.strip(),
                 "body": page_body.strip(),
@@ -379,7 +725,11 @@ class PlaywrightBrowserManager:
                 "raw_content": page_content, # Return raw content for footer link extraction
                 "html": page_content, # Standardized key for metadata extraction
                 "screenshot_path": screenshot_key,
-                "access_denied": access_denied
+                "access_denied": access_denied,
+                "render_ms": int((time.monotonic() - started) * 1000),
+                "dom_stable": render['stable'],
+                "warm_context": warm_context,
+                **page_extras,
             }
         finally:
             if page:
@@ -387,6 +737,8 @@ class PlaywrightBrowserManager:
                     page.close()
                 except Exception:
                     pass
+            if lease:
+                contexts.release(lease, healthy=succeeded, heap_bytes=heap_bytes)
 
     def _dismiss_modals(self, page: Page):
         """Attempt to dismiss common modals and popups."""
@@ -416,56 +768,134 @@ class PlaywrightBrowserManager:
             logger.warning(f"[PLAYWRIGHT] Error dismissing modals: {e}")
 
 
-    def fetch_page(self, url: str, user_agent: str, capture_screenshot: bool = False) -> Dict[str, Any]:
+    def _may_restart(self, worker: _BrowserWorker, now: float) -> bool:
+        """Whether a dead worker may be restarted now. Caller must hold self._lock."""
+        return worker.launch_failures < self.max_launch_failures and now >= worker.retry_at
+
+    def _dispatch(self, task: Dict[str, Any]) -> Optional[_BrowserWorker]:
+        """Queue task on the least-loaded accepting worker, restarting dead workers on the way.
+
+        The task is queued under self._lock, so a worker is either still
+        accepting it (and will process or drain it) or is not picked. Only
+        threads that have exited are restarted, within the restart budget (see
+        _may_restart). A worker that is alive but draining is waited for, up to
+        drain_wait_s, rather than given a second thread on its queue.
+
+        Raises RuntimeError if the pool is not started; returns None if no
+        worker can take the task.
+        """
+        deadline = time.monotonic() + self.drain_wait_s
+        while True:
+            with self._lock:
+                if not self._is_started:
+                    raise RuntimeError("Browser not started")
+                now = time.monotonic()
+                for worker in self._workers:
+                    if not worker.is_alive and self._may_restart(worker, now):
+                        logger.warning('Playwright worker %d is not running, restarting it', worker.index)
+                        worker.pending = 0
+                        worker.restarts += 1
+                        self._start_worker(worker)
+                ready = [w for w in self._workers if w.accepting and w.is_alive]
+                if ready:
+                    worker = min(ready, key=lambda w: (w.pending, w.index))
+                    worker.pending += 1
+                    worker.request_queue.put(task)
+                    return worker
+                draining = [w.thread for w in self._workers if w.is_alive]
+            remaining = deadline - time.monotonic()
+            if not draining or remaining <= 0:
+                return None
+            # Release the lock so the draining worker can finish, then restart it
+            draining[0].join(timeout=remaining)
+
+    def fetch_page(self, url: str, user_agent: str, capture_screenshot: bool = False,
+                   timeout: Optional[float] = None,
+                   on_page: Optional[Callable[[Page, str, str], Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
-        Fetch a page using the background browser.
+        Fetch a page using the least-loaded background browser.
         Returns a dict with title, body, etc.
+
+        Args:
+            url: URL to render
+            user_agent: User agent for the browser context
+            capture_screenshot: Whether to capture an above-the-fold screenshot
+            timeout: Optional seconds to wait for a result. None waits until
+                the worker answers (workers always answer, even on failure).
+            on_page: Optional job run in the worker on the open page (see
+                _process_fetch)
         """
         if not self.is_started:
             raise RuntimeError("Browser not started")
 
         result_queue = queue.Queue()
-        self._request_queue.put({
+        worker = self._dispatch({
             "type": "fetch",
             "url": url,
             "user_agent": user_agent,
             "capture_screenshot": capture_screenshot,
+            "on_page": on_page,
             "result_queue": result_queue
         })
+        if worker is None:
+            logger.warning('No Playwright worker available for %s (restart budget exhausted)', url)
+            return {"title": "", "body": "", "url": url, "error": "No browser worker available"}
         
         try:
-            # Wait indefinitely for the result
-            # The background thread guarantees a result (success or error) because of the try/finally block
-            result = result_queue.get()
-            if isinstance(result, Exception):
-                raise result
-            return result
-        # queue.Empty is no longer possible without a timeout, but keeping generic error handling is fine
-        except Exception as e:
-            raise e
+            result = result_queue.get(timeout=timeout)
+        except queue.Empty:
+            logger.warning('Timed out after %ss waiting for browser worker %d: %s', timeout, worker.index, url)
+            return {"title": "", "body": "", "url": url, "error": "Timeout waiting for browser"}
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return pool statistics (totals plus a per-worker breakdown)."""
+        with self._lock:
+            per_worker = [w.snapshot() for w in self._workers]
+        return {
+            "workers": self._num_workers,
+            "alive": sum(1 for w in per_worker if w["alive"]),
+            "pending": sum(w["pending"] for w in per_worker),
+            "processed": sum(w["processed"] for w in per_worker),
+            "failed": sum(w["failed"] for w in per_worker),
+            "restarts": sum(w["restarts"] for w in per_worker),
+            "per_worker": per_worker,
+            "contexts": {
+                key: sum(w["contexts"].get(key, 0) for w in per_worker)
+                for key in ("open", "created", "reused", "restored", "recycled", "evicted", "discarded")
+            },
+            "render_budgets_ms": self.render_budget.snapshot(),
+        }
 
     def close(self):
-        """Stop the browser thread."""
-        thread_to_join = None
+        """Stop all browser worker threads."""
+        threads_to_join = []
         with self._lock:
             if not self._is_started:
                 return
-            self._request_queue.put(None)
-            thread_to_join = self._thread
+            for worker in self._workers:
+                if worker.is_alive:
+                    worker.request_queue.put(None)
+                    threads_to_join.append(worker.thread)
+            self._is_started = False
             
-        # Release lock before joining to avoid deadlock with thread's cleanup
-        if thread_to_join:
-            thread_to_join.join(timeout=2)
+        # Release lock before joining to avoid deadlock with the workers' cleanup
+        deadline = time.monotonic() + 2
+        for thread in threads_to_join:
+            thread.join(timeout=max(0.0, deadline - time.monotonic()))
             
         # Ensure state is cleared
         with self._lock:
-            self._is_started = False
-            self._thread = None
+            for worker in self._workers:
+                worker.thread = None
+                worker.pending = 0
     
     @property
     def is_started(self) -> bool:
         with self._lock:
-            return self._is_started and self._thread and self._thread.is_alive()
+            return self._is_started and any(w.is_alive for w in self._workers)
 
 
 # Global singleton instance
@@ -2,81 +2,203 @@
 
 Provides thread-safe rate limiting on a per-domain basis to avoid overwhelming
 individual servers while allowing parallel requests to different domains.
+
+Each domain gets a token bucket. Its refill rate adapts to how the server
+responds (AIMD): every successful response adds a small increment to the rate,
+while 429/503 responses or a ``Retry-After`` header halve it (and honour the
+requested delay).
 """
+import asyncio
 import time
 import threading
+from email.utils import parsedate_to_datetime
 from urllib.parse import urlparse
-from typing import Dict
+from typing import Any, Dict, Optional
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds."""
+    if value is None or value == '':
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(str(value)).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+class _DomainBucket:
+    """Token bucket state for one domain."""
+
+    __slots__ = ('rate', 'tokens', 'updated', 'successes', 'throttled')
+
+    def __init__(self, rate: float, tokens: float, now: float):
+        self.rate = rate
+        self.tokens = tokens
+        self.updated = now
+        self.successes = 0
+        self.throttled = 0
 
 
 class PerDomainRateLimiter:
-    """Thread-safe per-domain rate limiter.
-    
-    Tracks the last request time for each domain and enforces a minimum
-    interval between requests to the same domain. Requests to different
-    domains can proceed in parallel without waiting.
-    
+    """Thread-safe, adaptive per-domain rate limiter.
+
+    Each domain starts at one request per ``default_interval`` seconds with
+    ``burst`` requests allowed back to back. Requests to different domains
+    can proceed in parallel without waiting.
+
+    Call ``record_response`` after each request to let the per-domain rate
+    adapt: it grows by ``increase_step`` requests/second per success (up to
+    ``max_speedup`` times the initial rate) and halves on 429/503 or when the
+    server sends ``Retry-After`` (down to ``1 / max_slowdown`` of the initial rate).
+
     Usage:
         limiter = PerDomainRateLimiter(default_interval=2.0)
         limiter.wait_for_domain('https://example.com/page1')  # No wait (first request)
         limiter.wait_for_domain('https://other.com/page')     # No wait (different domain)
         limiter.wait_for_domain('https://example.com/page2')  # Waits if < 2s since last example.com request
+        limiter.record_response('https://example.com/page2', 429, retry_after='10')  # Back off
     """
-    
-    def __init__(self, default_interval: float = 2.0):
+
+    def __init__(
+        self,
+        default_interval: float = 2.0,
+        burst: float = 1.0,
+        max_speedup: float = 1.0,
+        max_slowdown: float = 8.0,
+        increase_step: Optional[float] = None,
+        max_retry_after: float = 300.0,
+    ):
         """Initialize the rate limiter.
-        
+
         Args:
-            default_interval: Minimum seconds between requests to the same domain
+            default_interval: Initial minimum seconds between requests to the same domain
+            burst: Bucket capacity (requests allowed back to back after idling)
+            max_speedup: Upper bound on the learned rate, as a multiple of the initial rate.
+                The default of 1.0 never exceeds ``default_interval`` (safe for quota'd APIs).
+            max_slowdown: Lower bound on the learned rate, as a divisor of the initial rate
+            increase_step: Additive rate increase per success (default: 10% of the initial rate)
+            max_retry_after: Cap on honoured Retry-After delays, in seconds
         """
-        self._domain_last_request: Dict[str, float] = {}
-        self._domain_locks: Dict[str, threading.Lock] = {}
-        self._locks_lock = threading.Lock()  # Lock for managing the locks dictionary
         self._default_interval = default_interval
-    
+        self._burst = max(1.0, burst)
+        self._base_rate = 1.0 / default_interval if default_interval > 0 else 0.0
+        self._max_rate = self._base_rate * max(1.0, max_speedup)
+        self._min_rate = self._base_rate / max(1.0, max_slowdown)
+        self._increase_step = increase_step if increase_step is not None else self._base_rate * 0.1
+        self._max_retry_after = max_retry_after
+        self._buckets: Dict[str, _DomainBucket] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _domain(url: str) -> Optional[str]:
+        try:
+            return urlparse(url).netloc or None
+        except Exception:
+            return None  # Failed to parse URL, no rate limiting
+
+    def _bucket(self, domain: str, now: float) -> _DomainBucket:
+        """Get the domain's bucket, refilled up to now (lock must be held)."""
+        bucket = self._buckets.get(domain)
+        if bucket is None:
+            bucket = self._buckets[domain] = _DomainBucket(self._base_rate, self._burst, now)
+        elif now > bucket.updated:
+            bucket.tokens = min(self._burst, bucket.tokens + (now - bucket.updated) * bucket.rate)
+            bucket.updated = now
+        return bucket
+
+    def reserve(self, url: str) -> float:
+        """Reserve the next request slot for this URL's domain without sleeping.
+
+        The slot is booked immediately, so concurrent callers are spaced out
+        correctly. Callers are responsible for waiting the returned delay
+        (e.g. ``await asyncio.sleep(delay)`` from async code).
+
+        Args:
+            url: The URL to be requested. Domain is extracted from this URL.
+
+        Returns:
+            Seconds the caller must wait before issuing the request.
+        """
+        if self._base_rate <= 0:
+            return 0.0
+        domain = self._domain(url)
+        if not domain:
+            return 0.0  # Invalid URL, no rate limiting
+
+        with self._lock:
+            bucket = self._bucket(domain, time.monotonic())
+            bucket.tokens -= 1.0
+            if bucket.tokens >= 0:
+                return 0.0
+            return -bucket.tokens / bucket.rate
+
     def wait_for_domain(self, url: str) -> None:
         """Wait if necessary before making a request to this URL's domain.
-        
+
         Args:
             url: The URL to be requested. Domain is extracted from this URL.
         """
-        if self._default_interval <= 0:
-            return
-        
-        # Extract domain from URL
-        try:
-            domain = urlparse(url).netloc
-            if not domain:
-                return  # Invalid URL, no rate limiting
-        except Exception:
-            return  # Failed to parse URL, no rate limiting
-        
-        # Get or create a lock for this specific domain
-        with self._locks_lock:
-            if domain not in self._domain_locks:
-                self._domain_locks[domain] = threading.Lock()
-            domain_lock = self._domain_locks[domain]
-        
-        # Acquire the domain-specific lock and calculate sleep time
-        with domain_lock:
-            last_time = self._domain_last_request.get(domain, 0)
-            now = time.monotonic()
-            elapsed = now - last_time
-            
-            if elapsed < self._default_interval:
-                sleep_time = self._default_interval - elapsed
-            else:
-                sleep_time = 0
-            
-            # Update timestamp BEFORE sleeping (reserve this slot)
-            self._domain_last_request[domain] = now + sleep_time
-        
+        sleep_time = self.reserve(url)
+
         # Sleep OUTSIDE the lock to allow other domains to proceed in parallel
         if sleep_time > 0:
             time.sleep(sleep_time)
-    
+
+    async def acquire(self, url: str) -> None:
+        """Async counterpart of ``wait_for_domain`` for event-loop callers."""
+        sleep_time = self.reserve(url)
+        if sleep_time > 0:
+            await asyncio.sleep(sleep_time)
+
+    def record_response(self, url: str, status_code: Optional[int], retry_after: Any = None) -> None:
+        """Adapt the domain's rate to a response (AIMD).
+
+        Args:
+            url: The requested URL
+            status_code: HTTP status of the response
+            retry_after: Raw ``Retry-After`` header value, if any
+        """
+        if self._base_rate <= 0 or status_code is None:
+            return
+        domain = self._domain(url)
+        if not domain:
+            return
+        delay = parse_retry_after(retry_after)
+        throttled = status_code in (429, 503) or delay is not None
+
+        with self._lock:
+            bucket = self._bucket(domain, time.monotonic())
+            if throttled:
+                bucket.throttled += 1
+                bucket.rate = max(self._min_rate, bucket.rate / 2.0)
+                if delay:
+                    # Put the bucket into debt so the next request waits at least `delay`
+                    delay = min(delay, self._max_retry_after)
+                    bucket.tokens = min(bucket.tokens, 1.0 - delay * bucket.rate)
+            elif 200 <= status_code < 400:
+                bucket.successes += 1
+                bucket.rate = min(self._max_rate, bucket.rate + self._increase_step)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Per-domain state: learned rate, interval, available tokens and counters."""
+        with self._lock:
+            now = time.monotonic()
+            return {
+                domain: {
+                    'rate': round(bucket.rate, 4),
+                    'interval': round(1.0 / bucket.rate, 3) if bucket.rate else 0.0,
+                    'tokens': round(min(self._burst, bucket.tokens + (now - bucket.updated) * bucket.rate), 3),
+                    'successes': bucket.successes,
+                    'throttled': bucket.throttled,
+                }
+                for domain, bucket in self._buckets.items()
+            }
+
     def reset(self) -> None:
         """Clear all domain tracking. Useful for testing."""
-        with self._locks_lock:
-            self._domain_last_request.clear()
-            self._domain_locks.clear()
+        with self._lock:
+            self._buckets.clear()
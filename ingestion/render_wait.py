@@ -0,0 +1,189 @@
+"""Adaptive render waits for Playwright fetches.
+
+Fixed timeouts either scrape client-rendered pages before hydration or let a
+slow page hold a browser for a minute. Instead:
+
+- ``wait_for_stable_dom`` runs a MutationObserver in the page and returns
+  once the body's text length has stopped changing for several consecutive
+  ticks (or its timeout expires).
+- ``RenderBudget`` learns how long each domain takes to settle (an
+  exponential moving average, persisted through the domain store as the
+  'render' method stats). That time, with headroom, becomes the domain's
+  stability-wait timeout.
+- Callers bound the whole page with a hard deadline (see
+  ``PlaywrightBrowserManager._process_fetch``).
+
+Configuration (environment):
+    AR_RENDER_BUDGET_MS      Stability-wait budget for domains not seen yet (default 8000)
+    AR_RENDER_BUDGET_MIN_MS  Lower bound of learned budgets (default 1500)
+    AR_RENDER_BUDGET_MAX_MS  Upper bound of learned budgets (default 20000)
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+from ingestion.domain_store import open_domain_store
+
+logger = logging.getLogger(__name__)
+
+# Sampling interval and number of unchanged samples that count as "stable"
+_TICK_MS = 150
+_STABLE_TICKS = 4
+# Text shorter than this is treated as a loading shell, never as stable
+_MIN_CHARS = 50
+
+_BUDGET_HEADROOM = 2.0
+_BUDGET_PADDING_MS = 500
+_EWMA_ALPHA = 0.3
+# A timed-out wait only shows rendering takes longer than the budget: grow it
+_TIMEOUT_GROWTH = 1.5
+
+_STABILITY_SCRIPT = """
+async ({tickMs, stableTicks, timeoutMs, minChars}) => {
+  const start = performance.now();
+  const textLength = () => (document.body ? document.body.textContent.length : 0);
+  return await new Promise((resolve) => {
+    let last = -1, quiet = 0, ticks = 0, mutations = 0;
+    const observer = new MutationObserver((records) => { mutations += records.length; });
+    observer.observe(document.documentElement || document, {childList: true, subtree: true, characterData: true});
+    const timer = setInterval(() => {
+      ticks += 1;
+      const length = textLength();
+      quiet = (length === last && length >= minChars) ? quiet + 1 : 0;
+      last = length;
+      const elapsed = performance.now() - start;
+      if (quiet >= stableTicks || elapsed >= timeoutMs) {
+        clearInterval(timer);
+        observer.disconnect();
+        resolve({stable: quiet >= stableTicks, chars: length, ticks, mutations, elapsed_ms: Math.round(elapsed)});
+      }
+    }, tickMs);
+  });
+}
+"""
+
+
+def wait_for_stable_dom(
+    page,
+    timeout_ms: int,
+    tick_ms: int = _TICK_MS,
+    stable_ticks: int = _STABLE_TICKS,
+    min_chars: int = _MIN_CHARS,
+) -> Dict[str, Any]:
+    """Wait until the page's text stops growing, at most timeout_ms.
+
+    Returns {'stable', 'chars', 'ticks', 'mutations', 'elapsed_ms'}; ``stable``
+    is False on timeout. A client-side redirect that replaces the document is
+    waited out once more within the same timeout.
+    """
+    started = time.monotonic()
+    result: Dict[str, Any] = {'stable': False, 'chars': 0, 'ticks': 0, 'mutations': 0}
+    for _ in range(2):
+        remaining = int(timeout_ms - (time.monotonic() - started) * 1000)
+        if remaining <= 0:
+            break
+        try:
+            value = page.evaluate(_STABILITY_SCRIPT, {
+                'tickMs': tick_ms, 'stableTicks': stable_ticks, 'timeoutMs': remaining, 'minChars': min_chars,
+            })
+            if isinstance(value, dict):
+                result = value
+            else:
+                result['error'] = f'Unexpected stability result: {value!r}'
+            break
+        except Exception as e:
+            # "Execution context was destroyed": the page navigated; wait on the new document
+            logger.debug('[PLAYWRIGHT] Stability wait interrupted: %s', e)
+            result['error'] = str(e)
+    result['elapsed_ms'] = int((time.monotonic() - started) * 1000)
+    return result
+
+
+class RenderBudget:
+    """Per-domain stability-wait budgets learned from observed render times.
+
+    Args:
+        default_ms: Budget for domains without history
+        min_ms: Lower bound of learned budgets
+        max_ms: Upper bound of learned budgets
+        persist: Load and store render times through the domain store
+    """
+
+    def __init__(
+        self,
+        default_ms: Optional[int] = None,
+        min_ms: Optional[int] = None,
+        max_ms: Optional[int] = None,
+        persist: bool = True,
+    ):
+        self.default_ms = default_ms or int(os.getenv('AR_RENDER_BUDGET_MS', '8000'))
+        self.min_ms = min_ms or int(os.getenv('AR_RENDER_BUDGET_MIN_MS', '1500'))
+        self.max_ms = max_ms or int(os.getenv('AR_RENDER_BUDGET_MAX_MS', '20000'))
+        self._render_ms: Dict[str, float] = {}  # domain -> EWMA of time to a stable DOM
+        self._lock = threading.Lock()
+        self._persist = persist
+        self._store = None
+        self._loaded = not persist
+
+    def _ensure_loaded(self) -> None:
+        """Load persisted render times on first use (lock must be held)."""
+        if self._loaded:
+            return
+        self._loaded = True
+        self._store = open_domain_store()
+        if self._store is None:
+            return
+        for (domain, method), row in self._store.load().get('stats', {}).items():
+            if method == 'render' and row.get('latency_ms') is not None:
+                self._render_ms[domain] = row['latency_ms']
+
+    @staticmethod
+    def _domain(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+    def budget_ms(self, url: str) -> int:
+        """Stability-wait timeout for url's domain."""
+        with self._lock:
+            self._ensure_loaded()
+            learned = self._render_ms.get(self._domain(url))
+        if learned is None:
+            return self.default_ms
+        budget = learned * _BUDGET_HEADROOM + _BUDGET_PADDING_MS
+        return int(min(self.max_ms, max(self.min_ms, budget)))
+
+    def record(self, url: str, elapsed_ms: float, stable: bool) -> None:
+        """Fold one stability wait into the domain's render time."""
+        domain = self._domain(url)
+        observed = elapsed_ms if stable else min(self.max_ms, elapsed_ms * _TIMEOUT_GROWTH)
+        with self._lock:
+            self._ensure_loaded()
+            previous = self._render_ms.get(domain)
+            self._render_ms[domain] = observed if previous is None else (
+                _EWMA_ALPHA * observed + (1 - _EWMA_ALPHA) * previous
+            )
+            store = self._store
+        if store is not None:
+            store.record_fetch(domain, 'render', stable, observed)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {domain: int(ms) for domain, ms in self._render_ms.items()}
+
+
+_render_budget: Optional[RenderBudget] = None
+_render_budget_lock = threading.Lock()
+
+
+def get_render_budget() -> RenderBudget:
+    """Get the process-wide render budget."""
+    global _render_budget
+    if _render_budget is None:
+        with _render_budget_lock:
+            if _render_budget is None:
+                _render_budget = RenderBudget()
+    return _render_budget
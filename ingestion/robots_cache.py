@@ -0,0 +1,215 @@
+"""Shared, persistent robots.txt cache.
+
+robots.txt bodies are kept in a shared ``TTLStore`` (ingestion/ttl_store.py),
+in memory and in a SQLite file, so Streamlit sessions and CLI runs share lookups instead of re-downloading
+robots.txt for every domain. Entries expire after a TTL. Missing robots.txt
+(4xx) is cached as "allow all" for the full TTL. Timeouts and server errors
+are cached negatively for a shorter period, so a dead host is not retried on
+every URL.
+
+``prefetch`` resolves robots.txt for all distinct origins of a batch of URLs
+concurrently, so collection workers never stall on a robots lookup.
+
+Configuration (environment):
+    AR_ROBOTS_CACHE_PATH          SQLite file (default ``.cache/robots.sqlite``; empty keeps it in memory only)
+    AR_ROBOTS_TTL_HOURS           Lifetime of fetched robots.txt (default 24)
+    AR_ROBOTS_NEGATIVE_TTL_HOURS  Lifetime of timeout/5xx entries (default 1)
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+import urllib.robotparser as robotparser
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+from ingestion.fetch_archive import get_fetch_archive
+from ingestion.ttl_store import TTLStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.path.join('.cache', 'robots.sqlite')
+
+
+def _origin(url: str) -> str:
+    parsed = urlparse(url)
+    return f"{parsed.scheme or 'https'}://{parsed.netloc}"
+
+
+def _default_user_agent() -> str:
+    return os.getenv('AR_USER_AGENT', 'Mozilla/5.0 (compatible; ar-bot/1.0)')
+
+
+class _RobotsEntry:
+    """Parsed robots.txt for one origin."""
+
+    def __init__(self, body: str, status: int):
+        self.body = body
+        self.status = status
+        self.parser = robotparser.RobotFileParser()
+        self.parser.parse(body.splitlines() if body else [])
+
+    def encode(self) -> str:
+        return json.dumps({'status': self.status, 'body': self.body})
+
+    @classmethod
+    def decode(cls, payload: str) -> '_RobotsEntry':
+        data = json.loads(payload)
+        return cls(data.get('body') or '', data.get('status'))
+
+
+class RobotsCache:
+    """robots.txt cache with in-memory and optional SQLite tiers.
+
+    Args:
+        db_path: SQLite file path, or None/'' for memory only
+        ttl_seconds: Lifetime of successfully fetched (or 4xx) entries
+        negative_ttl_seconds: Lifetime of entries for timeouts and 5xx responses
+        timeout: robots.txt request timeout in seconds
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        ttl_seconds: float = 24 * 3600,
+        negative_ttl_seconds: float = 3600,
+        timeout: float = 5,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.timeout = timeout
+        self._store = TTLStore(db_path, table='robots', encode=_RobotsEntry.encode, decode=_RobotsEntry.decode)
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, threading.Event] = {}
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'fetches': 0, 'negative': 0}
+
+    # ----------------------------------------------------------------- Lookups
+
+    def _download(self, origin: str, user_agent: str) -> Tuple[int, str]:
+        """Fetch robots.txt; returns (status, body). Status 0 means the request failed."""
+        try:
+            r = requests.get(f"{origin}/robots.txt", headers={'User-Agent': user_agent}, timeout=self.timeout)
+            return r.status_code, (r.text or '') if r.status_code == 200 else ''
+        except Exception as e:
+            logger.debug('robots.txt fetch failed for %s: %s', origin, e)
+            return 0, ''
+
+    def _resolve(self, origin: str, user_agent: str) -> _RobotsEntry:
+        """Return a fresh entry for origin, fetching at most once across threads."""
+        while True:
+            with self._lock:
+                entry = self._store.get(origin)
+                if entry:
+                    self.stats['memory_hits'] += 1
+                    return entry
+                waiter = self._inflight.get(origin)
+                if waiter is None:
+                    waiter = threading.Event()
+                    self._inflight[origin] = waiter
+                    break
+            # Another thread is resolving this origin; wait for it and re-check
+            waiter.wait(self.timeout + 1)
+
+        try:
+            entry = self._store.load(origin)
+            if entry:
+                with self._lock:
+                    self.stats['disk_hits'] += 1
+            else:
+                status, body = self._download(origin, user_agent)
+                negative = status == 0 or status >= 500
+                ttl = self.negative_ttl_seconds if negative else self.ttl_seconds
+                entry = _RobotsEntry(body, status)
+                with self._lock:
+                    self.stats['fetches'] += 1
+                    if negative:
+                        self.stats['negative'] += 1
+                self._store.put(origin, entry, time.time() + ttl)
+            return entry
+        finally:
+            with self._lock:
+                self._inflight.pop(origin, None)
+            waiter.set()
+
+    def can_fetch(self, url: str, user_agent: Optional[str] = None) -> bool:
+        """True if robots.txt allows fetching url. Defaults to permissive on any error."""
+        try:
+            parsed = urlparse(url)
+            entry = self._resolve(_origin(url), user_agent or _default_user_agent())
+            return entry.parser.can_fetch(user_agent or _default_user_agent(), parsed.path or '/')
+        except Exception:
+            return True
+
+    def sitemaps(self, url: str) -> List[str]:
+        """``Sitemap:`` URLs declared in robots.txt for url's origin."""
+        try:
+            entry = self._resolve(_origin(url), _default_user_agent())
+            return list(entry.parser.site_maps() or [])
+        except Exception:
+            return []
+
+    def prefetch(self, urls: Iterable[str], max_workers: int = 8, user_agent: Optional[str] = None) -> int:
+        """Resolve robots.txt for every distinct origin in urls concurrently.
+
+        Blocks until all lookups finish (each bounded by the request timeout).
+        Returns the number of origins that were not already cached in memory.
+        """
+        origins = []
+        with self._lock:
+            for url in urls:
+                if not url or not url.startswith('http'):
+                    continue
+                origin = _origin(url)
+                if origin not in origins and not self._store.get(origin):
+                    origins.append(origin)
+        if not origins:
+            return 0
+
+        ua = user_agent or _default_user_agent()
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(origins)), thread_name_prefix='RobotsPrefetch') as executor:
+            list(executor.map(lambda o: self._resolve(o, ua), origins))
+        logger.debug('Prefetched robots.txt for %d origin(s)', len(origins))
+        return len(origins)
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def clear(self) -> None:
+        """Drop all cached entries, in memory and on disk."""
+        self._store.clear()
+
+
+_robots_cache: Optional[RobotsCache] = None
+_robots_cache_lock = threading.Lock()
+
+
+def get_robots_cache() -> RobotsCache:
+    """Get the process-wide robots.txt cache."""
+    global _robots_cache
+    if _robots_cache is None:
+        with _robots_cache_lock:
+            if _robots_cache is None:
+                _robots_cache = RobotsCache(
+                    db_path=os.getenv('AR_ROBOTS_CACHE_PATH', DEFAULT_DB_PATH),
+                    ttl_seconds=float(os.getenv('AR_ROBOTS_TTL_HOURS', '24')) * 3600,
+                    negative_ttl_seconds=float(os.getenv('AR_ROBOTS_NEGATIVE_TTL_HOURS', '1')) * 3600,
+                )
+    return _robots_cache
+
+
+def prefetch_robots(urls: Iterable[str], max_workers: int = 8) -> int:
+    """Prefetch robots.txt for the distinct origins in urls (see RobotsCache.prefetch)."""
+    archive = get_fetch_archive()
+    if archive is not None and archive.replaying:
+        return 0  # Offline replay does not consult robots.txt
+    try:
+        return get_robots_cache().prefetch(urls, max_workers=max_workers)
+    except Exception as e:
+        logger.debug('robots.txt prefetch failed: %s', e)
+        return 0
@@ -0,0 +1,249 @@
+"""TTL cache for search API results.
+
+Identical searches are issued over and over: by each run, by every Streamlit
+rerun, and by ``VerificationManager`` for every claim. ``search_brave`` and
+``search_serper`` (and therefore ``search_unified.search``) go through
+``SearchCache.get_or_search``. It is keyed by
+``(provider, query, size, offset, locale)``:
+
+- A fresh entry (younger than the TTL) is returned without an API call.
+- A stale entry (within the stale window past the TTL) is returned
+  immediately while one background refresh replaces it
+  (stale-while-revalidate).
+- Anything older, or missing, is a miss and calls the provider.
+  Empty result lists are not cached, because providers return them on
+  errors too.
+
+Backends are pluggable (``SearchCacheBackend``). The built-in ones keep
+entries in a ``TTLStore`` (ingestion/ttl_store.py) until they are past the
+stale window. SQLite is the default, so the cache is shared across processes
+and survives restarts.
+
+Configuration (environment):
+    AR_SEARCH_CACHE_BACKEND      ``sqlite`` (default), ``memory`` or ``none``
+    AR_SEARCH_CACHE_PATH         SQLite file (default ``.cache/search.sqlite``)
+    AR_SEARCH_CACHE_TTL_HOURS    Freshness lifetime (default 24)
+    AR_SEARCH_CACHE_STALE_HOURS  Stale-while-revalidate window after the TTL (default 24)
+    AR_SEARCH_LOCALE             Locale component of the key (default ``en-US``)
+"""
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ingestion.fetch_archive import get_fetch_archive, search_key
+from ingestion.ttl_store import TTLStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.path.join('.cache', 'search.sqlite')
+
+SearchKey = Tuple[str, str, int, int, str]
+
+
+def default_locale() -> str:
+    return os.getenv('AR_SEARCH_LOCALE', 'en-US')
+
+
+class SearchCacheBackend(ABC):
+    """Storage interface: results plus the time they were stored."""
+
+    @abstractmethod
+    def get(self, key: SearchKey) -> Optional[Tuple[List[Dict], float]]:
+        """Cached (results, stored_at) for key, or None."""
+
+    @abstractmethod
+    def set(self, key: SearchKey, results: List[Dict], stored_at: float) -> None:
+        """Store results for key."""
+
+    @abstractmethod
+    def clear(self) -> int:
+        """Remove every entry; returns the number removed."""
+
+
+class _TTLStoreBackend(SearchCacheBackend):
+    """Backend on a shared ``TTLStore``; entries are dropped max_age_seconds after they were stored."""
+
+    def __init__(self, store: TTLStore, max_age_seconds: float):
+        self._store = store
+        self.max_age_seconds = max_age_seconds
+
+    @staticmethod
+    def _key(key: SearchKey) -> str:
+        return json.dumps(list(key))
+
+    def get(self, key):
+        entry = self._store.get(self._key(key)) or self._store.load(self._key(key))
+        if entry is None:
+            return None
+        return entry['results'], entry['stored_at']
+
+    def set(self, key, results, stored_at):
+        self._store.put(
+            self._key(key), {'results': results, 'stored_at': stored_at}, stored_at + self.max_age_seconds
+        )
+
+    def clear(self):
+        return self._store.clear()
+
+
+class MemorySearchCacheBackend(_TTLStoreBackend):
+    """In-process backend (per process, lost on restart)."""
+
+    def __init__(self, max_age_seconds: float = float('inf'), max_entries: int = 10000):
+        super().__init__(TTLStore(max_memory_entries=max_entries), max_age_seconds)
+
+
+class SQLiteSearchCacheBackend(_TTLStoreBackend):
+    """SQLite backend shared by every process using the same file."""
+
+    def __init__(self, db_path: str, max_age_seconds: float = float('inf')):
+        super().__init__(TTLStore(db_path, table='search_results'), max_age_seconds)
+        self.db_path = db_path
+
+
+class SearchCache:
+    """Stale-while-revalidate cache in front of a search function.
+
+    Args:
+        backend: Storage backend
+        ttl_seconds: Age below which entries are served without refreshing
+        stale_seconds: Extra age during which entries are served while refreshing in the background
+    """
+
+    def __init__(self, backend: SearchCacheBackend, ttl_seconds: float = 24 * 3600, stale_seconds: float = 24 * 3600):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self._lock = threading.Lock()
+        self._refreshing: set = set()
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'refreshes': 0, 'errors': 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def get_or_search(
+        self,
+        provider: str,
+        query: str,
+        size: int,
+        offset: int,
+        search: Callable[[], List[Dict]],
+        locale: Optional[str] = None,
+    ) -> List[Dict]:
+        """Return cached results for the key, calling ``search`` on a miss."""
+        key: SearchKey = (provider, query, int(size), int(offset), locale or default_locale())
+        cached = self.backend.get(key)
+        if cached is not None:
+            results, stored_at = cached
+            age = time.time() - stored_at
+            if age < self.ttl_seconds:
+                self._count('hits')
+                return copy.deepcopy(results)
+            if age < self.ttl_seconds + self.stale_seconds:
+                self._count('stale_hits')
+                self._refresh_in_background(key, search)
+                return copy.deepcopy(results)
+
+        self._count('misses')
+        results = search()
+        self._store(key, results)
+        return results
+
+    def _store(self, key: SearchKey, results: List[Dict]) -> None:
+        if results:
+            self.backend.set(key, copy.deepcopy(results), time.time())
+
+    def _refresh_in_background(self, key: SearchKey, search: Callable[[], List[Dict]]) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._store(key, search())
+                self._count('refreshes')
+            except Exception as e:
+                self._count('errors')
+                logger.debug('Background search refresh failed for %s: %s', key, e)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name='SearchCacheRefresh', daemon=True).start()
+
+    def clear(self) -> int:
+        return self.backend.clear()
+
+    def get_stats(self) -> Dict[str, float]:
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats['hits'] + stats['stale_hits'] + stats['misses']
+        stats['hit_rate'] = round((stats['hits'] + stats['stale_hits']) / lookups, 3) if lookups else 0.0
+        stats['backend'] = type(self.backend).__name__
+        return stats
+
+
+_search_cache: Optional[SearchCache] = None
+_search_cache_lock = threading.Lock()
+
+
+def _build_default_cache() -> Optional[SearchCache]:
+    backend_name = os.getenv('AR_SEARCH_CACHE_BACKEND', 'sqlite').lower()
+    if backend_name in ('none', 'off', ''):
+        return None
+    ttl_seconds = float(os.getenv('AR_SEARCH_CACHE_TTL_HOURS', '24')) * 3600
+    stale_seconds = float(os.getenv('AR_SEARCH_CACHE_STALE_HOURS', '24')) * 3600
+    backend: SearchCacheBackend
+    if backend_name == 'memory':
+        backend = MemorySearchCacheBackend(ttl_seconds + stale_seconds)
+    else:
+        # Falls back to memory only (with a warning) if the file cannot be opened
+        backend = SQLiteSearchCacheBackend(
+            os.getenv('AR_SEARCH_CACHE_PATH', DEFAULT_DB_PATH), ttl_seconds + stale_seconds
+        )
+    return SearchCache(backend, ttl_seconds=ttl_seconds, stale_seconds=stale_seconds)
+
+
+def get_search_cache() -> Optional[SearchCache]:
+    """Get the shared search cache, or None when AR_SEARCH_CACHE_BACKEND is 'none'."""
+    global _search_cache
+    if _search_cache is None:
+        with _search_cache_lock:
+            if _search_cache is None:
+                _search_cache = _build_default_cache()
+    return _search_cache
+
+
+def set_search_cache(cache: Optional[SearchCache]) -> None:
+    """Replace the shared search cache (e.g. with another backend, or None to rebuild from env)."""
+    global _search_cache
+    with _search_cache_lock:
+        _search_cache = cache
+
+
+def cached_search(provider: str, query: str, size: int, offset: int, search: Callable[[], List[Dict]]) -> List[Dict]:
+    """Run ``search`` through the shared cache (or directly when caching is disabled).
+
+    Under a fetch archive (ingestion.fetch_archive) results are recorded, or
+    replayed without calling the provider.
+    """
+    archive = get_fetch_archive()
+    key = search_key(provider, query, size, offset)
+    if archive is not None and archive.replaying:
+        return archive.replay_json('search', key) or []
+
+    started = time.monotonic()
+    cache = get_search_cache()
+    results = search() if cache is None else cache.get_or_search(provider, query, size, offset, search)
+    if archive is not None and archive.recording and results:
+        archive.record_json('search', key, results, (time.monotonic() - started) * 1000)
+    return results
@@ -16,6 +16,11 @@ Usage:
 
 Configuration:
     Set SEARCH_PROVIDER=brave or SEARCH_PROVIDER=serper in your .env file
+
+Caching:
+    Both providers answer through the TTL search cache in ingestion.search_cache
+    (keyed by provider, query, size, offset and locale), so repeated searches
+    from any entry point do not spend API quota.
 """
 from __future__ import annotations
 
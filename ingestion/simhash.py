@@ -0,0 +1,158 @@
+"""64-bit SimHash fingerprints and a banded LSH index for near-duplicate detection.
+
+``simhash64`` hashes weighted word shingles (weight = shingle frequency)
+into one 64-bit fingerprint, so near-duplicate texts end up a few bits
+apart. Examples are tracking-parameter variants, regional mirrors and
+syndicated copies.
+
+``SimHashIndex`` finds fingerprints within a Hamming distance ``k`` without
+comparing against every stored item. It splits the fingerprint into
+``k + 1`` bands. By the pigeonhole principle, two fingerprints at most ``k``
+bits apart agree exactly on at least one band, so only items sharing a band
+bucket are compared.
+
+``SimHashStore`` optionally persists fingerprints in SQLite (a ``TTLStore``
+table), so deduplication can span runs within a time window.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+import time
+from collections import Counter
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from ingestion.ttl_store import TTLStore
+
+logger = logging.getLogger(__name__)
+
+_MASK64 = (1 << 64) - 1
+_WORD = re.compile(r'\w+', re.UNICODE)
+
+
+def _hash64(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def simhash64(text: str, shingle_size: int = 3) -> int:
+    """64-bit SimHash of text using weighted word shingles."""
+    words = _WORD.findall((text or '').lower())
+    if not words:
+        return 0
+    if len(words) < shingle_size:
+        features = Counter(words)
+    else:
+        features = Counter(' '.join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1))
+
+    vector = [0] * 64
+    for feature, weight in features.items():
+        h = _hash64(feature)
+        for bit in range(64):
+            vector[bit] += weight if (h >> bit) & 1 else -weight
+    fingerprint = 0
+    for bit, value in enumerate(vector):
+        if value > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin((a ^ b) & _MASK64).count('1')
+
+
+class SimHashIndex:
+    """Banded LSH index over 64-bit fingerprints.
+
+    Args:
+        max_distance: Largest Hamming distance reported as a near-duplicate
+    """
+
+    def __init__(self, max_distance: int = 3):
+        self.max_distance = max(0, min(int(max_distance), 63))
+        bands = self.max_distance + 1
+        width = 64 // bands
+        # (shift, mask) per band; the last band absorbs the remainder bits
+        self._bands: List[Tuple[int, int]] = []
+        for i in range(bands):
+            bits = width if i < bands - 1 else 64 - width * (bands - 1)
+            self._bands.append((i * width, (1 << bits) - 1))
+        self._tables: List[Dict[int, List[Hashable]]] = [{} for _ in self._bands]
+        self._fingerprints: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._fingerprints
+
+    def add(self, key: Hashable, fingerprint: int) -> None:
+        if key in self._fingerprints:
+            self.remove(key)
+        self._fingerprints[key] = fingerprint
+        for table, (shift, mask) in zip(self._tables, self._bands):
+            table.setdefault((fingerprint >> shift) & mask, []).append(key)
+
+    def remove(self, key: Hashable) -> None:
+        fingerprint = self._fingerprints.pop(key, None)
+        if fingerprint is None:
+            return
+        for table, (shift, mask) in zip(self._tables, self._bands):
+            bucket = table.get((fingerprint >> shift) & mask)
+            if bucket and key in bucket:
+                bucket.remove(key)
+
+    def query(self, fingerprint: int) -> List[Tuple[Hashable, int]]:
+        """Keys within max_distance of fingerprint as (key, distance), closest first."""
+        candidates = set()
+        for table, (shift, mask) in zip(self._tables, self._bands):
+            candidates.update(table.get((fingerprint >> shift) & mask, ()))
+        matches = []
+        for key in candidates:
+            distance = hamming_distance(fingerprint, self._fingerprints[key])
+            if distance <= self.max_distance:
+                matches.append((key, distance))
+        return sorted(matches, key=lambda m: m[1])
+
+    def nearest(self, fingerprint: int) -> Optional[Tuple[Hashable, int]]:
+        matches = self.query(fingerprint)
+        return matches[0] if matches else None
+
+    def clear(self) -> None:
+        self._fingerprints.clear()
+        for table in self._tables:
+            table.clear()
+
+
+class SimHashStore:
+    """Fingerprints seen in earlier runs, in a ``TTLStore`` table.
+
+    Args:
+        db_path: SQLite file path
+        retention_seconds: How long a fingerprint is kept after it was last seen
+    """
+
+    def __init__(self, db_path: str, retention_seconds: float = 30 * 86400):
+        self.db_path = db_path
+        self.retention_seconds = retention_seconds
+        self._store = TTLStore(db_path, table='simhashes', max_memory_entries=0)
+
+    def load(self, window_seconds: float) -> Dict[str, int]:
+        """Fingerprints seen within the window."""
+        cutoff = time.time() - window_seconds
+        return {
+            content_id: entry['fingerprint'] & _MASK64
+            for content_id, (entry, _) in self._store.load_all().items()
+            if entry['seen_at'] >= cutoff
+        }
+
+    def add_many(self, entries: List[Tuple[str, int, str]]) -> None:
+        """Store (content_id, fingerprint, url) entries seen now."""
+        now = time.time()
+        self._store.put_many(
+            (content_id, {'fingerprint': fp, 'url': url, 'seen_at': now}, now + self.retention_seconds)
+            for content_id, fp, url in entries
+        )
+
+    def clear(self) -> int:
+        return self._store.clear()
@@ -0,0 +1,239 @@
+"""Priority-frontier crawler for brand sites.
+
+``SiteCrawler`` expands seed pages (usually brand homepages) into the pages
+that carry the most trust signal, using as few fetches as possible:
+
+- Links come from ``page_fetcher._extract_internal_links``. They enter a
+  priority frontier scored by URL pattern. About and policy pages rank
+  first (``GLOBAL_PAGE_PATTERNS``, shared with RunManager's site-level
+  analysis), then contact, product and blog pages, then everything else.
+  Deeper links and additional pages of a category already covered on the
+  same domain rank lower.
+- Every URL is canonicalized before it enters the frontier. Fragments,
+  tracking parameters, default ports, trailing slashes and index pages are
+  removed, so a page reached through different links is fetched once.
+- Each round pops the best URLs that fit the per-domain budget and fetches
+  them concurrently with ``fetch_pages_parallel``. The links on those pages
+  feed the next round.
+
+Configuration (environment):
+    AR_CRAWL_MAX_PAGES        Pages fetched per crawl (default 20)
+    AR_CRAWL_PAGES_PER_DOMAIN Pages fetched per domain (default 10)
+    AR_CRAWL_MAX_DEPTH        Link depth followed from the seeds (default 2)
+"""
+from __future__ import annotations
+
+import heapq
+import logging
+import os
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from ingestion.domain_classifier import GLOBAL_PAGE_PATTERNS
+from ingestion.http_cache import normalize_url
+from ingestion.page_fetcher import _extract_internal_links, _is_allowed_by_robots, fetch_pages_parallel
+from ingestion.robots_cache import prefetch_robots
+
+logger = logging.getLogger(__name__)
+
+# Page categories the crawler looks for, in match order
+CRAWL_PAGE_PATTERNS = {
+    **GLOBAL_PAGE_PATTERNS,
+    "product": ["/product", "/shop", "/collections", "/catalog", "/p/"],
+    "blog": ["/blog", "/news", "/press", "/stories", "/articles", "/insights"],
+}
+
+# Base priority per category; pages matching none get _DEFAULT_PRIORITY
+CATEGORY_PRIORITY = {
+    "about": 1.0,
+    "policies": 0.9,
+    "contact": 0.7,
+    "product": 0.5,
+    "blog": 0.4,
+}
+_DEFAULT_PRIORITY = 0.2
+_SEED_PRIORITY = 10.0
+_DEPTH_PENALTY = 0.15  # per link hop from the seed
+_PATH_PENALTY = 0.02  # per path segment
+_REPEAT_DECAY = 0.5  # per page of the same category already taken on the domain
+
+# Paths never worth a fetch (policy and contact pages are kept, unlike the default)
+_CRAWL_EXCLUDE_PATHS = ('/search', '/login', '/cart', '/checkout', '/account')
+_SKIP_EXTENSIONS = (
+    '.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.ico', '.css', '.js',
+    '.json', '.xml', '.zip', '.mp3', '.mp4', '.mov', '.woff', '.woff2',
+)
+_TRACKING_PARAMS = {'gclid', 'fbclid', 'msclkid', 'mc_cid', 'mc_eid', '_ga', 'ref', 'ref_src', 'srsltid'}
+_INDEX_PAGES = ('index.html', 'index.htm', 'index.php', 'default.aspx')
+
+
+def canonicalize_url(url: str) -> str:
+    """Canonical form of a URL for crawl deduplication."""
+    parsed = urlparse(normalize_url(url))
+    query = urlencode([
+        (k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+        if k.lower() not in _TRACKING_PARAMS and not k.lower().startswith('utm_')
+    ])
+    path = parsed.path
+    for index in _INDEX_PAGES:
+        if path.lower().endswith('/' + index):
+            path = path[:-len(index)]
+            break
+    if len(path) > 1:
+        path = path.rstrip('/') or '/'
+    return urlunparse((parsed.scheme, parsed.netloc, path, parsed.params, query, ''))
+
+
+def domain_key(url: str) -> str:
+    """Host a URL's budget is charged to (www. and the bare domain share one)."""
+    host = urlparse(url).netloc.lower().split(':')[0]
+    return host[4:] if host.startswith('www.') else host
+
+
+def classify_page(url: str) -> Optional[str]:
+    """Page category of a URL (see CRAWL_PAGE_PATTERNS), or None."""
+    path = urlparse(url).path.lower()
+    for category, patterns in CRAWL_PAGE_PATTERNS.items():
+        if any(p in path for p in patterns):
+            return category
+    return None
+
+
+def link_priority(url: str, depth: int, taken_in_category: int = 0) -> float:
+    """Frontier priority of a link found depth hops from a seed (higher first)."""
+    if depth == 0:
+        return _SEED_PRIORITY
+    base = CATEGORY_PRIORITY.get(classify_page(url), _DEFAULT_PRIORITY)
+    segments = len([s for s in urlparse(url).path.split('/') if s])
+    return base * (_REPEAT_DECAY ** taken_in_category) - _DEPTH_PENALTY * depth - _PATH_PENALTY * segments
+
+
+class SiteCrawler:
+    """Bounded best-first crawler over brand sites.
+
+    Args:
+        max_pages: Total pages fetched per crawl (seeds included)
+        max_pages_per_domain: Pages fetched per domain
+        max_depth: Link hops followed from the seeds
+        max_workers: Concurrent fetches per round (default AR_PARALLEL_FETCH_WORKERS or 5)
+        links_per_page: Links considered per fetched page
+        respect_robots: Skip URLs disallowed by robots.txt
+        fetch_many: Fetches a list of URLs, returning results in order
+            (default ``fetch_pages_parallel``)
+        browser_manager: Passed through to ``fetch_pages_parallel``
+    """
+
+    def __init__(
+        self,
+        max_pages: Optional[int] = None,
+        max_pages_per_domain: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        links_per_page: int = 100,
+        respect_robots: bool = True,
+        fetch_many: Optional[Callable[[List[str]], List[Dict]]] = None,
+        browser_manager=None,
+    ):
+        self.max_pages = max_pages if max_pages is not None else int(os.getenv('AR_CRAWL_MAX_PAGES', '20'))
+        self.max_pages_per_domain = (
+            max_pages_per_domain if max_pages_per_domain is not None
+            else int(os.getenv('AR_CRAWL_PAGES_PER_DOMAIN', '10'))
+        )
+        self.max_depth = max_depth if max_depth is not None else int(os.getenv('AR_CRAWL_MAX_DEPTH', '2'))
+        self.max_workers = max_workers or int(os.getenv('AR_PARALLEL_FETCH_WORKERS', '5'))
+        self.links_per_page = links_per_page
+        self.respect_robots = respect_robots
+        self.browser_manager = browser_manager
+        self._fetch_many = fetch_many or self._fetch_parallel
+        self.stats: Dict[str, int] = {}
+
+    def _fetch_parallel(self, urls: List[str]) -> List[Dict]:
+        return fetch_pages_parallel(urls, max_workers=self.max_workers, browser_manager=self.browser_manager)
+
+    def _links(self, url: str, result: Dict) -> List[str]:
+        page = result.get('parsed_document') or result.get('html')
+        if not page:
+            return []
+        return _extract_internal_links(
+            result.get('url') or url, page, max_links=self.links_per_page, exclude_paths=_CRAWL_EXCLUDE_PATHS,
+        )
+
+    def crawl(self, seeds: Iterable[str]) -> List[Dict]:
+        """Fetch the seeds and their highest-priority subpages.
+
+        Returns the fetch results that have body text, in fetch order. Each
+        carries ``crawl_depth`` and ``page_category``. Counters for the crawl
+        are left in ``self.stats``.
+        """
+        stats = Counter(fetched=0, pages=0, discovered=0, duplicates=0, over_budget=0, robots_blocked=0)
+        frontier: List[tuple] = []  # (-priority, seq, url, depth)
+        seen = set()
+        taken_per_domain: Counter = Counter()
+        taken_per_category: Counter = Counter()  # (domain, category) -> pages taken
+        seq = 0
+
+        def push(url: str, depth: int) -> None:
+            nonlocal seq
+            canonical = canonicalize_url(url)
+            if canonical in seen:
+                stats['duplicates'] += 1
+                return
+            if urlparse(canonical).path.lower().endswith(_SKIP_EXTENSIONS):
+                return
+            seen.add(canonical)
+            stats['discovered'] += 1
+            taken = taken_per_category[(domain_key(canonical), classify_page(canonical))]
+            heapq.heappush(frontier, (-link_priority(canonical, depth, taken), seq, canonical, depth))
+            seq += 1
+
+        seeds = [s for s in seeds if s and s.startswith('http')]
+        if self.respect_robots:
+            prefetch_robots(seeds)
+        for seed in seeds:
+            push(seed, 0)
+
+        pages: List[Dict] = []
+        while frontier and stats['fetched'] < self.max_pages:
+            batch = []
+            while frontier and len(batch) < self.max_workers and stats['fetched'] + len(batch) < self.max_pages:
+                neg_priority, order, url, depth = heapq.heappop(frontier)
+                domain, category = domain_key(url), classify_page(url)
+                if taken_per_domain[domain] >= self.max_pages_per_domain:
+                    stats['over_budget'] += 1
+                    continue
+                # Priorities drop as a category fills up; re-queue entries scored before that
+                priority = link_priority(url, depth, taken_per_category[(domain, category)])
+                if priority < -neg_priority - 1e-9:
+                    heapq.heappush(frontier, (-priority, order, url, depth))
+                    continue
+                if self.respect_robots and not _is_allowed_by_robots(url):
+                    stats['robots_blocked'] += 1
+                    continue
+                taken_per_domain[domain] += 1
+                taken_per_category[(domain, category)] += 1
+                batch.append((url, depth, category))
+            if not batch:
+                break
+
+            results = self._fetch_many([url for url, _, _ in batch])
+            for (url, depth, category), result in zip(batch, results):
+                stats['fetched'] += 1
+                result = result or {}
+                if result.get('body'):
+                    result['crawl_depth'] = depth
+                    result['page_category'] = category
+                    pages.append(result)
+                    stats['pages'] += 1
+                if depth < self.max_depth:
+                    for link in self._links(url, result):
+                        push(link, depth + 1)
+
+        self.stats = dict(stats)
+        logger.info('[CRAWL] %d page(s) from %d seed(s): %s', len(pages), len(seeds), self.stats)
+        return pages
+
+
+def crawl_site(seeds: Iterable[str], **kwargs) -> List[Dict]:
+    """Crawl seeds with a SiteCrawler built from kwargs (see SiteCrawler)."""
+    return SiteCrawler(**kwargs).crawl(seeds)
@@ -0,0 +1,299 @@
+"""Sitemap-based URL discovery for brand sites.
+
+Sitemaps list the pages a site wants indexed, so they are a cheap source of
+real, current brand URLs that need no LLM guessing or verification.
+``discover_site_urls`` works as follows:
+
+- It reads ``Sitemap:`` lines from the cached robots.txt, falling back to
+  ``/sitemap.xml``.
+- It follows sitemap indexes (most recently modified children first) and
+  gzipped sitemaps.
+- It returns the best URLs, ranked by page category (as in the site
+  crawler) and by ``lastmod`` freshness.
+
+Sitemaps are stream-parsed with iterparse, and each processed element is
+cleared. Only the top ``limit`` entries are kept, in a heap. Memory
+therefore stays flat on 100k-URL sitemaps. Reads are capped per file at
+AR_SITEMAP_MAX_BYTES of uncompressed XML. defusedxml is used when it is
+installed.
+
+Configuration (environment):
+    AR_SITEMAP_MAX_BYTES  Uncompressed bytes read per sitemap file (default 50MB, the protocol limit)
+    AR_SITEMAP_MAX_FILES  Sitemap files read per site, indexes included (default 20)
+"""
+from __future__ import annotations
+
+import gzip
+import heapq
+import io
+import logging
+import os
+import zlib
+from collections import deque
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+from ingestion.fetch_archive import get_fetch_archive
+from ingestion.robots_cache import get_robots_cache
+from ingestion.site_crawler import _SKIP_EXTENSIONS, canonicalize_url, classify_page, domain_key, link_priority
+
+logger = logging.getLogger(__name__)
+
+try:
+    from defusedxml.ElementTree import iterparse as _iterparse, ParseError
+    _DEFUSEDXML_AVAILABLE = True
+except ImportError:
+    from xml.etree.ElementTree import iterparse as _iterparse, ParseError
+    _DEFUSEDXML_AVAILABLE = False
+
+_FRESHNESS_WEIGHT = 0.5  # Bonus for a URL modified today, fading to 0 after a year
+
+
+@dataclass
+class SitemapEntry:
+    url: str
+    lastmod: Optional[datetime]
+    sitemap: str
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[datetime]:
+    """Parse a W3C datetime (``2024-05-01`` or ``2024-05-01T10:00:00Z``) to naive UTC."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def sitemap_url_score(url: str, lastmod: Optional[datetime], now: Optional[datetime] = None) -> float:
+    """Rank of a sitemap URL: crawler link priority plus a freshness bonus."""
+    score = link_priority(url, depth=1)
+    if lastmod is not None:
+        age_days = ((now or datetime.utcnow()) - lastmod).days
+        score += _FRESHNESS_WEIGHT * max(0.0, 1 - max(age_days, 0) / 365)
+    return score
+
+
+class _CappedStream(io.RawIOBase):
+    """Read-only stream that reports EOF after max_bytes."""
+
+    def __init__(self, stream, max_bytes: int):
+        self._stream = stream
+        self._remaining = max_bytes
+        self.truncated = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._remaining <= 0:
+            self.truncated = True
+            return 0
+        data = self._stream.read(min(len(buffer), self._remaining))
+        n = len(data)
+        buffer[:n] = data
+        self._remaining -= n
+        return n
+
+
+def _maybe_gunzip(stream):
+    """Transparently decompress gzipped sitemaps (detected by magic bytes)."""
+    buffered = stream if hasattr(stream, 'peek') else io.BufferedReader(stream)
+    if buffered.peek(2)[:2] == b'\x1f\x8b':
+        return gzip.GzipFile(fileobj=buffered)
+    return buffered
+
+
+def iter_sitemap(stream) -> Iterator[Tuple[str, str, Optional[str]]]:
+    """Yield ``(kind, loc, lastmod)`` from a sitemap or sitemap index stream.
+
+    ``kind`` is 'url' for pages and 'sitemap' for index children. Only
+    ``<loc>``/``<lastmod>`` directly under an entry count, so image and video
+    extension tags are ignored. Processed elements are cleared as parsing
+    proceeds.
+    """
+    root = None
+    depth = 0
+    loc = lastmod = None
+    for event, elem in _iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            depth += 1
+            if root is None:
+                root = elem
+            continue
+        tag = elem.tag.rsplit('}', 1)[-1]
+        if depth == 3 and tag == 'loc':
+            loc = (elem.text or '').strip()
+        elif depth == 3 and tag == 'lastmod':
+            lastmod = (elem.text or '').strip() or None
+        elif depth == 2:
+            if loc and tag in ('url', 'sitemap'):
+                yield ('url' if tag == 'url' else 'sitemap'), loc, lastmod
+            loc = lastmod = None
+            root.clear()
+        depth -= 1
+
+
+class SitemapDiscovery:
+    """Find and rank a site's URLs from its sitemaps.
+
+    Args:
+        max_files: Sitemap files read per site, indexes included
+        max_bytes: Uncompressed bytes read per sitemap file
+        timeout: HTTP timeout per sitemap request
+        opener: Returns a readable binary stream for a sitemap URL, or None
+            (default: streamed HTTP GET)
+    """
+
+    def __init__(
+        self,
+        max_files: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        timeout: float = 10,
+        opener: Optional[Callable[[str], Optional[io.IOBase]]] = None,
+    ):
+        self.max_files = max_files or int(os.getenv('AR_SITEMAP_MAX_FILES', '20'))
+        self.max_bytes = max_bytes or int(os.getenv('AR_SITEMAP_MAX_BYTES', str(50 * 1024 * 1024)))
+        self.timeout = timeout
+        self._open = opener or self._open_http
+        self.stats = {'files': 0, 'entries': 0, 'truncated': 0, 'errors': 0}
+
+    def _open_http(self, url: str):
+        resp = requests.get(
+            url,
+            headers={'User-Agent': os.getenv('AR_USER_AGENT', 'Mozilla/5.0 (compatible; ar-bot/1.0)')},
+            timeout=self.timeout,
+            stream=True,
+        )
+        if resp.status_code != 200:
+            resp.close()
+            logger.debug('[SITEMAP] %s returned %s', url, resp.status_code)
+            return None
+        resp.raw.decode_content = True  # Undo Content-Encoding; .xml.gz bodies are handled by _maybe_gunzip
+        return resp.raw
+
+    def sitemap_urls(self, site_url: str) -> List[str]:
+        """Sitemaps declared in robots.txt, or the conventional /sitemap.xml."""
+        declared = get_robots_cache().sitemaps(site_url)
+        if declared:
+            return declared
+        parsed = urlparse(site_url)
+        return [f"{parsed.scheme or 'https'}://{parsed.netloc}/sitemap.xml"]
+
+    def iter_entries(self, site_url: str) -> Iterator[SitemapEntry]:
+        """Stream page entries from all of a site's sitemaps (breadth-first over indexes)."""
+        queue = deque(self.sitemap_urls(site_url))
+        seen = set()
+        files = 0
+        while queue and files < self.max_files:
+            sitemap_url = queue.popleft()
+            if sitemap_url in seen:
+                continue
+            seen.add(sitemap_url)
+            files += 1
+            try:
+                stream = self._open(sitemap_url)
+            except Exception as e:
+                logger.debug('[SITEMAP] Could not open %s: %s', sitemap_url, e)
+                self.stats['errors'] += 1
+                continue
+            if stream is None:
+                continue
+            self.stats['files'] += 1
+            children = []
+            capped = None
+            try:
+                with closing(stream):
+                    capped = _CappedStream(_maybe_gunzip(stream), self.max_bytes)
+                    for kind, loc, lastmod in iter_sitemap(capped):
+                        if kind == 'sitemap':
+                            children.append((parse_lastmod(lastmod) or datetime.min, loc))
+                        else:
+                            self.stats['entries'] += 1
+                            yield SitemapEntry(loc, parse_lastmod(lastmod), sitemap_url)
+            except (ParseError, ValueError, OSError, EOFError, zlib.error) as e:
+                # Entries parsed before the error (or the byte cap) are kept
+                if capped is not None and capped.truncated:
+                    self.stats['truncated'] += 1
+                    logger.info('[SITEMAP] %s exceeded %d bytes; using the entries read so far', sitemap_url, self.max_bytes)
+                else:
+                    self.stats['errors'] += 1
+                    logger.debug('[SITEMAP] Failed to parse %s: %s', sitemap_url, e)
+            # Most recently modified child sitemaps first
+            queue.extend(loc for _, loc in sorted(children, reverse=True))
+
+    def discover(
+        self,
+        site_url: str,
+        limit: int = 50,
+        max_age_days: Optional[int] = None,
+        same_site: bool = True,
+    ) -> List[Dict]:
+        """Top ``limit`` URLs from a site's sitemaps, best first.
+
+        Args:
+            site_url: Any URL on the site (its origin is used)
+            limit: Number of URLs returned
+            max_age_days: Drop URLs whose lastmod is older (URLs without lastmod are kept)
+            same_site: Drop URLs on other domains
+
+        Returns:
+            Dicts with url, lastmod (ISO string or None), category, score and sitemap
+        """
+        archive = get_fetch_archive()
+        if archive is not None and archive.replaying:
+            return []  # Sitemaps are not part of the fetch archive
+
+        now = datetime.utcnow()
+        site = domain_key(site_url)
+        top: List[tuple] = []  # min-heap of (score, seq, canonical url, entry)
+        kept = set()
+        for seq, entry in enumerate(self.iter_entries(site_url)):
+            if not entry.url.startswith('http'):
+                continue
+            canonical = canonicalize_url(entry.url)
+            host = domain_key(canonical)
+            if same_site and host != site and not host.endswith('.' + site):
+                continue
+            if urlparse(canonical).path.lower().endswith(_SKIP_EXTENSIONS) or canonical in kept:
+                continue
+            if max_age_days is not None and entry.lastmod is not None and (now - entry.lastmod).days > max_age_days:
+                continue
+            item = (sitemap_url_score(canonical, entry.lastmod, now), seq, canonical, entry)
+            if len(top) < limit:
+                heapq.heappush(top, item)
+                kept.add(canonical)
+            elif item[0] > top[0][0]:
+                kept.discard(heapq.heapreplace(top, item)[2])
+                kept.add(canonical)
+
+        results = [
+            {
+                'url': canonical,
+                'lastmod': entry.lastmod.isoformat() if entry.lastmod else None,
+                'category': classify_page(canonical),
+                'score': round(score, 3),
+                'sitemap': entry.sitemap,
+            }
+            for score, _, canonical, entry in sorted(top, key=lambda item: (-item[0], item[1]))
+        ]
+        logger.info('[SITEMAP] %d URL(s) for %s from %s', len(results), site, self.stats)
+        return results
+
+
+def discover_site_urls(site_url: str, limit: int = 50, max_age_days: Optional[int] = None, **kwargs) -> List[Dict]:
+    """Ranked URLs from a site's sitemaps (see SitemapDiscovery.discover)."""
+    try:
+        return SitemapDiscovery(**kwargs).discover(site_url, limit=limit, max_age_days=max_age_days)
+    except Exception as e:
+        logger.warning('[SITEMAP] Discovery failed for %s: %s', site_url, e)
+        return []
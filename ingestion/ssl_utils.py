@@ -3,21 +3,197 @@ SSL Utility Module for Trust Stack Analysis
 
 Provides functions to check SSL certificate validity, expiration, and issuer information
 to support the Source Domain Trust Baseline signal.
+
+Certificates are probed once per hostname and cached: valid certificates until
+AR_SSL_CACHE_TTL_HOURS (default 24) or their expiry, whichever comes first;
+failed probes for AR_SSL_NEGATIVE_TTL_MINUTES (default 10). Probes run on a
+shared background pool (AR_SSL_PROBE_WORKERS, default 8) with a single
+SSLContext, so callers can start them early with ``prefetch_ssl`` and collect
+the result later with ``get_ssl_data``.
 """
 
+import os
 import ssl
 import socket
 import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from urllib.parse import urlparse
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional
+
+from ingestion.fetch_archive import get_fetch_archive
+from ingestion.ttl_store import TTLStore
 
 logger = logging.getLogger(__name__)
 
+_SSL_CONTEXT: Optional[ssl.SSLContext] = None
+_CERT_CACHE = TTLStore()  # hostname -> probe record, in memory until its cache expiry
+_INFLIGHT: Dict[str, Future] = {}
+_PROBE_POOL: Optional[ThreadPoolExecutor] = None
+_LOCK = threading.Lock()
+
+
+def _get_ssl_context() -> ssl.SSLContext:
+    """Shared verification context (certifi bundle loaded once)."""
+    global _SSL_CONTEXT
+    with _LOCK:
+        if _SSL_CONTEXT is None:
+            context = ssl.create_default_context()
+            try:
+                import certifi
+                context.load_verify_locations(cafile=certifi.where())
+            except ImportError:
+                pass # Fallback to system default if certifi missing
+            _SSL_CONTEXT = context
+        return _SSL_CONTEXT
+
+
+def _get_probe_pool() -> ThreadPoolExecutor:
+    global _PROBE_POOL
+    with _LOCK:
+        if _PROBE_POOL is None:
+            _PROBE_POOL = ThreadPoolExecutor(
+                max_workers=int(os.getenv('AR_SSL_PROBE_WORKERS', '8')),
+                thread_name_prefix='SSLProbe',
+            )
+        return _PROBE_POOL
+
+
+def _hostname(url: str) -> Optional[str]:
+    """Hostname for an https URL, or None for other schemes."""
+    parsed = urlparse(url)
+    if parsed.scheme != 'https':
+        return None
+    return parsed.netloc.split(':')[0].lower() # Remove port if present
+
+
+def _probe_host(hostname: str, timeout: int = 5) -> Dict[str, Any]:
+    """Handshake with hostname:443 and return a probe record.
+
+    The record holds ssl_valid / ssl_issuer / ssl_error plus ``not_after``
+    (expiry as a UTC datetime, or None) so days-to-expiry can be computed at
+    lookup time.
+    """
+    record = {
+        "ssl_valid": "false",
+        "ssl_issuer": "",
+        "ssl_error": "",
+        "not_after": None,
+    }
+
+    try:
+        context = _get_ssl_context()
+        with socket.create_connection((hostname, 443), timeout=timeout) as sock:
+            with context.wrap_socket(sock, server_hostname=hostname) as ssock:
+                cert = ssock.getpeercert()
+                
+                # If we got here without exception, the cert is valid for the hostname
+                record["ssl_valid"] = "true"
+                
+                # Extract expiration
+                not_after_str = cert.get('notAfter')
+                if not_after_str:
+                    # Format: 'May 20 12:00:00 2026 GMT'
+                    ssl_date_fmt = r'%b %d %H:%M:%S %Y %Z'
+                    record["not_after"] = datetime.strptime(not_after_str, ssl_date_fmt)
+                
+                # Extract Issuer
+                # cert['issuer'] is a tuple of tuples, e.g.:
+                # ((('countryName', 'US'),), (('organizationName', 'Google Trust Services LLC'),), (('commonName', 'GTS CA 1C3'),))
+                issuer_dict = {key: value for rdn in cert.get('issuer', []) for key, value in rdn}
+                record["ssl_issuer"] = issuer_dict.get('organizationName') or issuer_dict.get('commonName') or "Unknown"
+
+    except ssl.SSLCertVerificationError as e:
+        record["ssl_valid"] = "false"
+        record["ssl_error"] = f"Certificate verification failed: {e.verify_message}"
+        logger.debug(f"SSL verification failed for {hostname}: {e}")
+    except ssl.SSLError as e:
+        record["ssl_valid"] = "false"
+        record["ssl_error"] = f"SSL protocol error: {e}"
+        logger.debug(f"SSL error for {hostname}: {e}")
+    except socket.timeout:
+        record["ssl_valid"] = "false" # Timeout implies we can't verify
+        record["ssl_error"] = "Connection timed out"
+    except Exception as e:
+        record["ssl_valid"] = "false"
+        record["ssl_error"] = str(e)
+        logger.debug(f"Error checking SSL for {hostname}: {e}")
+
+    return record
+
+
+def _cache_expiry(record: Dict[str, Any]) -> float:
+    """Expiry-aware cache deadline for a probe record."""
+    now = time.time()
+    if record.get("ssl_valid") != "true":
+        return now + float(os.getenv('AR_SSL_NEGATIVE_TTL_MINUTES', '10')) * 60
+    deadline = now + float(os.getenv('AR_SSL_CACHE_TTL_HOURS', '24')) * 3600
+    not_after = record.get("not_after")
+    if not_after:
+        seconds_left = (not_after - datetime.utcnow()).total_seconds()
+        deadline = min(deadline, now + max(0.0, seconds_left))
+    return deadline
+
+
+def _probe_and_cache(hostname: str, timeout: int) -> Dict[str, Any]:
+    try:
+        record = _probe_host(hostname, timeout)
+        _CERT_CACHE.put(hostname, record, _cache_expiry(record))
+        return record
+    finally:
+        with _LOCK:
+            _INFLIGHT.pop(hostname, None)
+
+
+def _submit_probe(hostname: str, timeout: int) -> Optional[Future]:
+    """Start a background probe unless one is cached or already running."""
+    pool = _get_probe_pool()
+    with _LOCK:
+        if _CERT_CACHE.get(hostname) is not None:
+            return None
+        future = _INFLIGHT.get(hostname)
+        if future is None:
+            future = pool.submit(_probe_and_cache, hostname, timeout)
+            _INFLIGHT[hostname] = future
+        return future
+
+
+def prefetch_ssl(urls: Iterable[str], timeout: int = 5) -> int:
+    """Start background certificate probes for the distinct HTTPS hosts in urls.
+
+    Returns immediately; the number of probes started or already running is returned.
+    """
+    archive = get_fetch_archive()
+    if archive is not None and archive.replaying:
+        return 0  # Replayed from the fetch archive in get_ssl_data
+    started = 0
+    seen = set()
+    for url in urls:
+        try:
+            hostname = _hostname(url or '')
+        except Exception:
+            continue
+        if hostname and hostname not in seen:
+            seen.add(hostname)
+            if _submit_probe(hostname, timeout) is not None:
+                started += 1
+    return started
+
+
+def clear_ssl_cache() -> int:
+    """Drop all cached probe results and return how many were removed."""
+    return _CERT_CACHE.clear()
+
+
 def get_ssl_data(url: str, timeout: int = 5) -> Dict[str, Any]:
     """
     Connect to a URL's host and extract SSL certificate information.
 
+    Uses the per-hostname cache, joining a background probe if one is already
+    running for the host, so a crawl performs one TLS handshake per host.
+
     Args:
         url: The URL to check (must be reachable)
         timeout: Socket timeout in seconds
@@ -37,55 +213,37 @@ def get_ssl_data(url: str, timeout: int = 5) -> Dict[str, Any]:
     }
 
     try:
-        parsed = urlparse(url)
-        hostname = parsed.netloc.split(':')[0] # Remove port if present
+        hostname = _hostname(url)
         
         # Skip if not https (though we might want to check port 443 anyway, 
         # usually we only care if the content itself was served securely)
-        if parsed.scheme != 'https':
+        if not hostname:
             result["ssl_error"] = "Not HTTPS"
             return result
 
-        context = ssl.create_default_context()
-        try:
-            import certifi
-            context.load_verify_locations(cafile=certifi.where())
-        except ImportError:
-            pass # Fallback to system default if certifi missing
-        
-        with socket.create_connection((hostname, 443), timeout=timeout) as sock:
-            with context.wrap_socket(sock, server_hostname=hostname) as ssock:
-                cert = ssock.getpeercert()
-                
-                # If we got here without exception, the cert is valid for the hostname
-                result["ssl_valid"] = "true"
-                
-                # Extract expiration
-                not_after_str = cert.get('notAfter')
-                if not_after_str:
-                    # Format: 'May 20 12:00:00 2026 GMT'
-                    ssl_date_fmt = r'%b %d %H:%M:%S %Y %Z'
-                    expiry_date = datetime.strptime(not_after_str, ssl_date_fmt)
-                    days_left = (expiry_date - datetime.utcnow()).days
-                    result["ssl_expiry_days"] = days_left
-                
-                # Extract Issuer
-                # cert['issuer'] is a tuple of tuples, e.g.:
-                # ((('countryName', 'US'),), (('organizationName', 'Google Trust Services LLC'),), (('commonName', 'GTS CA 1C3'),))
-                issuer_dict = {key: value for rdn in cert.get('issuer', []) for key, value in rdn}
-                result["ssl_issuer"] = issuer_dict.get('organizationName') or issuer_dict.get('commonName') or "Unknown"
+        archive = get_fetch_archive()
+        if archive is not None and archive.replaying:
+            return archive.replay_json('ssl', hostname) or {**result, "ssl_error": "Not in fetch archive"}
+
+        record = _CERT_CACHE.get(hostname)
+        if record is None:
+            # Join a background probe (started by prefetch_ssl or now)
+            future = _submit_probe(hostname, timeout)
+            if future is not None:
+                record = future.result(timeout=timeout * 2 + 1)
+            else:
+                record = _CERT_CACHE.get(hostname)
+        if record is None:
+            record = _probe_and_cache(hostname, timeout)
+
+        result["ssl_valid"] = record["ssl_valid"]
+        result["ssl_issuer"] = record["ssl_issuer"]
+        result["ssl_error"] = record["ssl_error"]
+        if record.get("not_after"):
+            result["ssl_expiry_days"] = (record["not_after"] - datetime.utcnow()).days
+        if archive is not None and archive.recording and not archive.has('ssl', hostname):
+            archive.record_json('ssl', hostname, result, target_uri=f'https://{hostname}/')
 
-    except ssl.SSLCertVerificationError as e:
-        result["ssl_valid"] = "false"
-        result["ssl_error"] = f"Certificate verification failed: {e.verify_message}"
-        logger.debug(f"SSL verification failed for {url}: {e}")
-    except ssl.SSLError as e:
-        result["ssl_valid"] = "false"
-        result["ssl_error"] = f"SSL protocol error: {e}"
-        logger.debug(f"SSL error for {url}: {e}")
-    except socket.timeout:
-        result["ssl_valid"] = "false" # Timeout implies we can't verify
-        result["ssl_error"] = "Connection timed out"
     except Exception as e:
         result["ssl_valid"] = "false"
         result["ssl_error"] = str(e)
@@ -0,0 +1,263 @@
+"""Bounded, content-type aware response reading for page fetches.
+
+``fetch_page`` used to read ``resp.text`` in full and hand whatever came back
+to BeautifulSoup, including multi-megabyte pages, PDFs and binary downloads.
+Responses are now streamed in chunks:
+
+- The kind of body (``html``, ``pdf`` or ``other``) is sniffed from the
+  ``Content-Type`` header and the first bytes. Anything that is neither HTML
+  nor PDF is abandoned after the first chunk.
+- HTML stops at ``</body>`` (there is nothing to extract after it) or at the
+  byte budget, whichever comes first.
+- PDFs are read up to their own budget and turned into text by
+  ``extract_pdf_text`` (PyPDF2 when installed, else a small built-in
+  extractor for plain and Flate-compressed text streams).
+
+Configuration (environment):
+    AR_FETCH_MAX_BYTES      Byte budget for HTML/text bodies (default 5 MB)
+    AR_FETCH_MAX_PDF_BYTES  Byte budget for PDF bodies (default 10 MB; 0 skips PDFs)
+"""
+from __future__ import annotations
+
+import logging
+import os
+import re
+import zlib
+from typing import Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Optional PyPDF2 import (also used by utils.document_processor)
+try:
+    import PyPDF2
+    _PYPDF2_AVAILABLE = True
+except ImportError:
+    PyPDF2 = None
+    _PYPDF2_AVAILABLE = False
+
+CHUNK_SIZE = 64 * 1024
+_SNIFF_BYTES = 1024
+_BODY_END = b'</body'
+_HTML_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain', 'application/xml', 'text/xml')
+_HTML_PREFIXES = (b'<!doctype', b'<html', b'<head', b'<body', b'<?xml', b'<!--', b'<meta', b'<title', b'<div', b'<script')
+
+
+def max_html_bytes() -> int:
+    return int(os.getenv('AR_FETCH_MAX_BYTES', str(5 * 1024 * 1024)))
+
+
+def max_pdf_bytes() -> int:
+    return int(os.getenv('AR_FETCH_MAX_PDF_BYTES', str(10 * 1024 * 1024)))
+
+
+def sniff_content_kind(content_type: Optional[str], head: bytes) -> str:
+    """Classify a body as 'html', 'pdf' or 'other' from its header and first bytes."""
+    mime = (content_type or '').split(';', 1)[0].strip().lower()
+    start = head[:_SNIFF_BYTES].lstrip(b'\xef\xbb\xbf \t\r\n').lower()
+    if mime == 'application/pdf' or start.startswith(b'%pdf-'):
+        return 'pdf'
+    if start.startswith(_HTML_PREFIXES):
+        return 'html'
+    if b'\x00' in start:
+        return 'other'
+    if not mime or mime in _HTML_TYPES or (mime == 'application/octet-stream' and b'<' in start):
+        return 'html'
+    return 'other'
+
+
+class BodyAccumulator:
+    """Collects streamed chunks until the body is complete, over budget or unwanted.
+
+    ``feed`` returns False once no more data is needed. ``kind`` is decided on
+    the first non-empty chunk.
+    """
+
+    def __init__(self, content_type: Optional[str], max_bytes: Optional[int] = None, max_pdf: Optional[int] = None):
+        self.content_type = content_type or ''
+        self.max_bytes = max_html_bytes() if max_bytes is None else max_bytes
+        self.max_pdf = max_pdf_bytes() if max_pdf is None else max_pdf
+        self.kind: Optional[str] = None
+        self.truncated = False
+        self.reached_body_end = False
+        self._chunks = []
+        self._size = 0
+        self._tail = b''
+
+    @property
+    def data(self) -> bytes:
+        return b''.join(self._chunks)
+
+    @property
+    def bytes_read(self) -> int:
+        return self._size
+
+    def feed(self, chunk: bytes) -> bool:
+        if not chunk:
+            return True
+        if self.kind is None:
+            self.kind = sniff_content_kind(self.content_type, chunk)
+            if self.kind == 'other' or (self.kind == 'pdf' and self.max_pdf <= 0):
+                self.truncated = True
+                return False
+
+        limit = self.max_pdf if self.kind == 'pdf' else self.max_bytes
+        if limit and self._size + len(chunk) > limit:
+            chunk = chunk[:limit - self._size]
+            self.truncated = True
+
+        if self.kind == 'html':
+            window = (self._tail + chunk).lower()
+            end = window.find(_BODY_END)
+            if end != -1:
+                # Keep through the closing tag; the remainder is scripts and trackers at most
+                keep = end + len(_BODY_END) - len(self._tail)
+                close = window.find(b'>', end)
+                if close != -1:
+                    keep = close + 1 - len(self._tail)
+                chunk = chunk[:max(keep, 0)]
+                self.reached_body_end = True
+            self._tail = window[-len(_BODY_END):]
+
+        self._chunks.append(chunk)
+        self._size += len(chunk)
+        return not (self.truncated or self.reached_body_end)
+
+    def finish(self) -> 'BodyAccumulator':
+        """Mark the stream as done (classifies empty bodies)."""
+        if self.kind is None:
+            self.kind = sniff_content_kind(self.content_type, b'')
+        return self
+
+    def consume(self, chunks: Iterable[bytes]) -> 'BodyAccumulator':
+        for chunk in chunks:
+            if not self.feed(chunk):
+                break
+        return self.finish()
+
+    def text(self) -> str:
+        """Decoded body for HTML, empty for PDF and other kinds."""
+        return decode_body(self.data, self.content_type) if self.kind == 'html' else ''
+
+
+_META_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?([a-zA-Z0-9_.:-]+)', re.IGNORECASE)
+
+
+def decode_body(data: bytes, content_type: Optional[str]) -> str:
+    """Decode HTML bytes using the header charset, a <meta charset> or UTF-8."""
+    encodings = []
+    match = re.search(r'charset=["\']?([\w.:-]+)', content_type or '', re.IGNORECASE)
+    if match:
+        encodings.append(match.group(1))
+    meta = _META_CHARSET.search(data[:4096])
+    if meta:
+        encodings.append(meta.group(1).decode('ascii', 'ignore'))
+    encodings.append('utf-8')
+    for encoding in encodings:
+        try:
+            return data.decode(encoding, errors='replace')
+        except LookupError:
+            continue
+    return data.decode('utf-8', errors='replace')
+
+
+class StreamedResponse:
+    """A bounded read of a ``requests.Response``.
+
+    Exposes the attributes ``_build_page_result`` reads from a response
+    (``status_code``, ``headers``, ``text``, ``elapsed``, ``url``) plus
+    what the reader learned about the body.
+    """
+
+    def __init__(self, resp, body: BodyAccumulator, text: str):
+        self.status_code = resp.status_code
+        self.headers = resp.headers
+        self.elapsed = getattr(resp, 'elapsed', None)
+        self.url = getattr(resp, 'url', None)
+        self.text = text
+        self.content_kind = body.kind
+        self.content_type = body.content_type
+        self.truncated = body.truncated and not body.reached_body_end
+        self.bytes_read = body.bytes_read
+        self.content = body.data  # Bytes actually read (what the fetch archive records)
+        self.pdf_bytes = body.data if body.kind == 'pdf' else None
+
+
+def read_streamed(resp, chunk_size: int = CHUNK_SIZE) -> StreamedResponse:
+    """Read a ``requests`` response opened with ``stream=True`` within the byte budgets.
+
+    The connection is closed when the read stops early, so the rest of the
+    body is never downloaded.
+    """
+    content_type = resp.headers.get('Content-Type', '')
+    body = BodyAccumulator(content_type)
+    try:
+        body.consume(resp.iter_content(chunk_size=chunk_size))
+    finally:
+        resp.close()
+    text = body.text()
+    if body.truncated and body.kind != 'html':
+        logger.info('Skipped %s body (%s) from %s', body.kind, content_type or 'no content type', resp.url)
+    elif body.truncated:
+        logger.info('Truncated %s at %d bytes', resp.url, body.bytes_read)
+    return StreamedResponse(resp, body, text)
+
+
+# --- PDF text --------------------------------------------------------------
+
+_PDF_STREAM = re.compile(rb'stream\r?\n(.*?)\r?\nendstream', re.DOTALL)
+_PDF_TEXT_OP = re.compile(rb'\((?:\\.|[^\\)])*\)\s*(?:Tj|\'|")|\[(?:\\.|[^\]])*\]\s*TJ|T\*|ET')
+_PDF_STRING = re.compile(rb'\(((?:\\.|[^\\)])*)\)')
+_PDF_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f', b'(': b'(', b')': b')', b'\\': b'\\'}
+_PDF_TITLE = re.compile(rb'/Title\s*\(((?:\\.|[^\\)])*)\)')
+
+
+def _unescape_pdf_string(raw: bytes) -> str:
+    out = re.sub(
+        rb'\\([0-7]{1,3}|.)',
+        lambda m: bytes([int(m.group(1), 8) & 0xFF]) if m.group(1)[:1].isdigit() else _PDF_ESCAPES.get(m.group(1), m.group(1)),
+        raw, flags=re.DOTALL,
+    )
+    return out.decode('latin-1')
+
+
+def _extract_pdf_text_builtin(data: bytes) -> str:
+    """Text operators from plain or FlateDecode content streams (no fonts/CMaps)."""
+    lines, current = [], []
+    for match in _PDF_STREAM.finditer(data):
+        content = match.group(1)
+        try:
+            content = zlib.decompress(content)
+        except zlib.error:
+            pass
+        for op in _PDF_TEXT_OP.finditer(content):
+            token = op.group(0)
+            if token in (b'T*', b'ET'):
+                if current:
+                    lines.append(''.join(current))
+                    current = []
+                continue
+            current.append(''.join(_unescape_pdf_string(s) for s in _PDF_STRING.findall(token)))
+    if current:
+        lines.append(''.join(current))
+    return '\n'.join(line.strip() for line in lines if line.strip())
+
+
+def extract_pdf_text(data: bytes) -> Tuple[str, str]:
+    """Return (title, text) for PDF bytes; empty strings when nothing is readable."""
+    if _PYPDF2_AVAILABLE:
+        try:
+            import io
+            reader = PyPDF2.PdfReader(io.BytesIO(data))
+            text = '\n'.join((page.extract_text() or '') for page in reader.pages).strip()
+            title = str((reader.metadata or {}).get('/Title') or '').strip()
+            if text:
+                return title, text
+        except Exception as e:
+            logger.debug('PyPDF2 could not read PDF: %s', e)
+    title_match = _PDF_TITLE.search(data)
+    title = _unescape_pdf_string(title_match.group(1)).strip() if title_match else ''
+    try:
+        return title, _extract_pdf_text_builtin(data)
+    except Exception as e:
+        logger.debug('Built-in PDF extraction failed: %s', e)
+        return title, ''
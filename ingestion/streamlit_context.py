@@ -0,0 +1,36 @@
+"""Streamlit script-run context for worker threads.
+
+Streamlit only knows which session a thread belongs to if the script-run
+context is attached to it; worker threads that call ``st.*`` (or log through
+Streamlit) without it trigger "missing ScriptRunContext" warnings.
+``get_script_run_ctx()`` only works in the thread running the script, so the
+context is captured there and attached inside each worker.
+"""
+import logging
+import threading
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+def streamlit_context_attacher() -> Callable[[], None]:
+    """Capture the caller's Streamlit context and return a callable that attaches it to the current thread.
+
+    Outside Streamlit (or without it installed) the callable does nothing, so
+    it can always be called at the start of a worker or passed as a thread
+    pool ``initializer``.
+    """
+    try:
+        from streamlit.runtime.scriptrunner_utils.script_run_context import get_script_run_ctx, add_script_run_ctx
+        ctx = get_script_run_ctx()
+    except Exception:
+        ctx = None
+    if ctx is None:
+        return lambda: None
+
+    def attach() -> None:
+        try:
+            add_script_run_ctx(threading.current_thread(), ctx)
+        except Exception as e:
+            logger.debug('Could not attach Streamlit context: %s', e)
+    return attach
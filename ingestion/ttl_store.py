@@ -0,0 +1,196 @@
+"""Shared TTL key/value store for the ingestion caches.
+
+The robots.txt, SSL probe, domain learning, search results, SimHash, WHOIS
+and link status caches all keep the same kind of data: a string key, a
+value, and a time after which the value is no longer trusted. ``TTLStore``
+keeps it in a bounded in-memory LRU tier and, optionally, in one table of a
+SQLite file, so Streamlit sessions, CLI runs and later runs share it.
+
+Each store opens its SQLite connection once and reuses it (WAL mode, so other
+processes can read while one writes); values are serialized with ``encode``
+and ``decode`` (JSON by default). Storage errors are logged at debug level
+and treated as misses, since losing cached state must never break a fetch. A
+file that cannot be opened disables persistence with a warning.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = ['key', 'value', 'expires_at']
+
+
+class TTLStore:
+    """Key/value entries with per-entry expiry, in memory and optionally in SQLite.
+
+    Args:
+        db_path: SQLite file path, or None/'' for memory only
+        table: Table holding this store's entries in the file
+        max_memory_entries: Size of the in-memory LRU tier (0 disables it)
+        encode: Serializes a value for the SQLite tier
+        decode: Inverse of ``encode``
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        table: str = 'entries',
+        max_memory_entries: int = 10000,
+        encode: Callable[[Any], str] = json.dumps,
+        decode: Callable[[str], Any] = json.loads,
+    ):
+        self.db_path = db_path or None
+        self.table = table
+        self.max_memory_entries = max_memory_entries
+        self._encode = encode
+        self._decode = decode
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()  # key -> (value, expires_at)
+        self._lock = threading.Lock()  # memory tier
+        self._db_lock = threading.Lock()  # the shared connection
+        self._conn: Optional[sqlite3.Connection] = None
+        if self.db_path:
+            self._open()
+
+    @property
+    def persistent(self) -> bool:
+        return self._conn is not None
+
+    # ------------------------------------------------------------------ SQLite
+
+    def _open(self) -> None:
+        try:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            columns = [row[1] for row in conn.execute(f'PRAGMA table_info({self.table})')]
+            if columns and columns != _COLUMNS:
+                # Left by an older layout of this cache; its contents are disposable
+                conn.execute(f'DROP TABLE {self.table}')
+            conn.execute(
+                f'CREATE TABLE IF NOT EXISTS {self.table} ('
+                ' key TEXT PRIMARY KEY, value TEXT, expires_at REAL)'
+            )
+            conn.commit()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning('%s cache disabled persistent storage (%s): %s', self.table, self.db_path, e)
+            self.db_path = None
+            return
+        self._conn = conn
+
+    def _execute(self, sql: str, params: Any = (), many: bool = False) -> Optional[List[tuple]]:
+        """Run one statement in its own transaction; returns the rows, or None on error."""
+        if self._conn is None:
+            return None
+        with self._db_lock:
+            try:
+                with self._conn:
+                    cursor = self._conn.executemany(sql, params) if many else self._conn.execute(sql, params)
+                    return cursor.fetchall()
+            except sqlite3.Error as e:
+                logger.debug('%s cache storage failed (%s): %s', self.table, self.db_path, e)
+                return None
+
+    def _decoded(self, key: str, payload: str) -> Optional[Any]:
+        try:
+            return self._decode(payload)
+        except (TypeError, ValueError) as e:
+            logger.debug('%s cache entry %s unreadable: %s', self.table, key, e)
+            return None
+
+    # ------------------------------------------------------------ Memory tier
+
+    def _remember(self, key: str, value: Any, expires_at: float) -> None:
+        """Add to the memory tier (lock must be held)."""
+        if self.max_memory_entries <= 0:
+            return
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_memory_entries:
+            self._entries.popitem(last=False)
+
+    # ----------------------------------------------------------------- Access
+
+    def get(self, key: str) -> Optional[Any]:
+        """Fresh value for key from the memory tier, or None."""
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None:
+                return None
+            if cached[1] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return cached[0]
+
+    def load(self, key: str) -> Optional[Any]:
+        """Fresh value for key from the SQLite tier (kept in memory afterwards), or None."""
+        rows = self._execute(f'SELECT value, expires_at FROM {self.table} WHERE key = ?', (key,))
+        if not rows or rows[0][1] <= time.time():
+            return None
+        value = self._decoded(key, rows[0][0])
+        if value is not None:
+            with self._lock:
+                self._remember(key, value, rows[0][1])
+        return value
+
+    def load_all(self) -> Dict[str, Tuple[Any, float]]:
+        """Every fresh persisted entry as {key: (value, expires_at)}; expired rows are deleted."""
+        now = time.time()
+        self._execute(f'DELETE FROM {self.table} WHERE expires_at <= ?', (now,))
+        entries = {}
+        for key, payload, expires_at in self._execute(
+            f'SELECT key, value, expires_at FROM {self.table} WHERE expires_at > ?', (now,)
+        ) or []:
+            value = self._decoded(key, payload)
+            if value is not None:
+                entries[key] = (value, expires_at)
+        return entries
+
+    def put(self, key: str, value: Any, expires_at: float, persist: bool = True) -> None:
+        """Store value until expires_at; ``persist=False`` keeps it in memory only."""
+        self.put_many([(key, value, expires_at)], persist=persist)
+
+    def put_many(self, entries: Iterable[Tuple[str, Any, float]], persist: bool = True) -> None:
+        """Store (key, value, expires_at) entries, writing them in one transaction."""
+        entries = list(entries)
+        with self._lock:
+            for key, value, expires_at in entries:
+                self._remember(key, value, expires_at)
+        if not persist or self._conn is None or not entries:
+            return
+        try:
+            rows = [(key, self._encode(value), expires_at) for key, value, expires_at in entries]
+        except (TypeError, ValueError) as e:
+            logger.debug('%s cache entry not serializable: %s', self.table, e)
+            return
+        self._execute(f'INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)', rows, many=True)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+        self._execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def clear(self) -> int:
+        """Drop every entry, in memory and on disk; returns the number removed."""
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+        rows = self._execute(f'SELECT COUNT(*) FROM {self.table}')
+        if rows:
+            count = max(count, rows[0][0])
+            self._execute(f'DELETE FROM {self.table}')
+        return count
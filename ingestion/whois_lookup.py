@@ -7,13 +7,33 @@ Provides domain registration data for trust scoring:
 - WHOIS privacy status (hidden info can be a flag)
 - Domain expiration risk
 - Registrant organization/country
+
+Results are cached per registrable domain in memory and in a SQLite file (a
+``TTLStore``, see ingestion/ttl_store.py), so runs share lookups. ``prefetch_whois`` resolves a run's domains
+concurrently right after collection, so the scoring-time detectors read from
+the cache instead of blocking on WHOIS sockets.
+
+Configuration (environment):
+    AR_WHOIS_CACHE_PATH          SQLite file (default ``.cache/whois.sqlite``; empty keeps it in memory only)
+    AR_WHOIS_TTL_DAYS            Lifetime of successful lookups (default 30)
+    AR_WHOIS_NEGATIVE_TTL_HOURS  Lifetime of definitive failures, e.g. no match or unknown TLD (default 6)
+    AR_WHOIS_TRANSIENT_TTL_MINUTES  Lifetime of transient failures, memory only (default 5)
+    AR_WHOIS_WORKERS             Concurrent prefetch lookups (default 2; registries throttle bursts)
 """
 
+import json
 import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Optional, Any
+from typing import Callable, Dict, Iterable, List, Optional, Any
 from urllib.parse import urlparse
 
+from ingestion.domain_classifier import extract_domain_parts
+from ingestion.ttl_store import TTLStore
+
 logger = logging.getLogger(__name__)
 
 # Try to import python-whois
@@ -24,25 +44,182 @@ except ImportError:
     WHOIS_AVAILABLE = False
     logger.warning("python-whois not installed. WHOIS lookups will be unavailable. Install with: pip install python-whois")
 
+DEFAULT_DB_PATH = os.path.join('.cache', 'whois.sqlite')
+
+_DATE_FIELDS = ('creation_date', 'expiration_date', 'updated_date')
+
+# Error text meaning the registry answered and the domain has no record; anything
+# else (timeouts, resets, throttling) is transient and may succeed on retry
+_DEFINITIVE_ERROR_MARKERS = (
+    'no match',
+    'not found',
+    'no entries found',
+    'no data found',
+    'unknown tld',
+    'no whois server',
+)
+
+
+def _is_definitive_error(error: Exception) -> bool:
+    """True if a WHOIS failure will not change on retry (no match, unknown TLD)."""
+    if type(error).__name__ == 'UnknownTld':
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in _DEFINITIVE_ERROR_MARKERS)
+
+
+def _encode_record(record: Dict[str, Any]) -> str:
+    return json.dumps(record, default=lambda v: v.isoformat() if isinstance(v, datetime) else str(v))
+
+
+def _decode_record(payload: str) -> Dict[str, Any]:
+    record = json.loads(payload)
+    for field in _DATE_FIELDS:
+        value = record.get(field)
+        if isinstance(value, str):
+            try:
+                record[field] = datetime.fromisoformat(value)
+            except ValueError:
+                pass
+    return record
+
+
+class WHOISCache:
+    """WHOIS record cache with a bounded in-memory tier and an optional SQLite tier.
+
+    Registration data barely changes, so successful lookups are kept for a
+    long TTL. Definitive failures (no match, unknown TLD) are cached
+    negatively for a shorter period so a broken domain is not retried for
+    every asset. Transient failures (timeouts, rate limiting), flagged
+    ``transient`` by the query, are kept in memory for a few minutes only and
+    never persisted, so one throttled burst does not pin "WHOIS failed" for
+    later runs. Concurrent lookups of the same domain share one query.
+
+    Args:
+        db_path: SQLite file path, or None/'' for memory only
+        ttl_seconds: Lifetime of successful lookups
+        negative_ttl_seconds: Lifetime of definitive failures
+        transient_ttl_seconds: Lifetime of transient failures (memory only)
+        max_memory_entries: Size of the in-memory LRU tier
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        ttl_seconds: float = 30 * 86400,
+        negative_ttl_seconds: float = 6 * 3600,
+        transient_ttl_seconds: float = 5 * 60,
+        max_memory_entries: int = 2048,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.transient_ttl_seconds = transient_ttl_seconds
+        self._store = TTLStore(
+            db_path, table='whois', max_memory_entries=max_memory_entries,
+            encode=_encode_record, decode=_decode_record,
+        )
+        self._inflight: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'lookups': 0, 'negative': 0, 'transient': 0}
+
+    # ----------------------------------------------------------------- Lookups
+
+    def contains(self, domain: str) -> bool:
+        return self._store.get(domain) is not None
+
+    def resolve(self, domain: str, query: Callable[[str], Dict[str, Any]]) -> Dict[str, Any]:
+        """Return the record for domain, running query at most once across threads."""
+        while True:
+            with self._lock:
+                record = self._store.get(domain)
+                if record is not None:
+                    self.stats['memory_hits'] += 1
+                    return record
+                waiter = self._inflight.get(domain)
+                if waiter is None:
+                    waiter = threading.Event()
+                    self._inflight[domain] = waiter
+                    break
+            # Another thread is looking this domain up; wait for it and re-check
+            waiter.wait(60)
+
+        try:
+            record = self._store.load(domain)
+            if record is not None:
+                with self._lock:
+                    self.stats['disk_hits'] += 1
+            else:
+                record = query(domain)
+                transient = bool(record.get('transient'))
+                negative = 'error' in record and not transient
+                if transient:
+                    ttl = self.transient_ttl_seconds
+                elif negative:
+                    ttl = self.negative_ttl_seconds
+                else:
+                    ttl = self.ttl_seconds
+                expires_at = time.time() + ttl
+                with self._lock:
+                    self.stats['lookups'] += 1
+                    if transient:
+                        self.stats['transient'] += 1
+                    elif negative:
+                        self.stats['negative'] += 1
+                self._store.put(domain, record, expires_at, persist=not transient)
+            return record
+        finally:
+            with self._lock:
+                self._inflight.pop(domain, None)
+            waiter.set()
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def clear(self) -> int:
+        """Drop all cached entries, in memory and on disk; returns the number removed."""
+        return self._store.clear()
+
+
+_whois_cache: Optional[WHOISCache] = None
+_whois_cache_lock = threading.Lock()
+
+
+def get_whois_cache() -> WHOISCache:
+    """Get the process-wide WHOIS cache."""
+    global _whois_cache
+    if _whois_cache is None:
+        with _whois_cache_lock:
+            if _whois_cache is None:
+                _whois_cache = WHOISCache(
+                    db_path=os.getenv('AR_WHOIS_CACHE_PATH', DEFAULT_DB_PATH),
+                    ttl_seconds=float(os.getenv('AR_WHOIS_TTL_DAYS', '30')) * 86400,
+                    negative_ttl_seconds=float(os.getenv('AR_WHOIS_NEGATIVE_TTL_HOURS', '6')) * 3600,
+                    transient_ttl_seconds=float(os.getenv('AR_WHOIS_TRANSIENT_TTL_MINUTES', '5')) * 60,
+                )
+    return _whois_cache
+
 
 class WHOISLookup:
     """
     WHOIS lookup utility for domain registration information.
     
     Used by the attribute detector for Provenance dimension scoring.
+    Lookups go through the shared ``WHOISCache`` (see ``get_whois_cache``),
+    and ``prefetch`` resolves a run's domains concurrently ahead of scoring.
     """
     
-    # Cache for WHOIS results to avoid repeated lookups
-    _cache: Dict[str, Dict[str, Any]] = {}
-    
-    def __init__(self):
+    def __init__(self, cache: Optional[WHOISCache] = None, max_workers: Optional[int] = None):
         """Initialize the WHOIS lookup utility."""
         self.available = WHOIS_AVAILABLE
+        self.cache = cache if cache is not None else get_whois_cache()
+        self.max_workers = max_workers or int(os.getenv('AR_WHOIS_WORKERS', '2'))
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
     
     @classmethod
     def clear_cache(cls):
         """Clear the WHOIS cache."""
-        cls._cache.clear()
+        get_whois_cache().clear()
     
     def lookup(self, url_or_domain: str) -> Dict[str, Any]:
         """
@@ -53,7 +230,7 @@ class WHOISLookup:
             
         Returns:
             Dict with WHOIS data including:
-            - domain: Clean domain name
+            - domain: Registrable domain (subdomains share one lookup)
             - domain_name: Registered domain name
             - registrar: Domain registrar
             - creation_date: When domain was registered
@@ -80,17 +257,43 @@ class WHOISLookup:
                 'domain': url_or_domain
             }
         
-        # Check cache
-        if domain in self._cache:
-            logger.debug(f"WHOIS cache hit for {domain}")
-            return self._cache[domain]
+        record = self.cache.resolve(domain, self._query)
+        return self._build_result(record)
+    
+    def prefetch(self, urls: Iterable[str]) -> List[Future]:
+        """Start background lookups for the distinct registrable domains in urls.
+        
+        Returns immediately with one future per domain not already cached in
+        memory. Later ``lookup`` calls for an in-flight domain join its query
+        instead of starting another one.
+        """
+        if not self.available:
+            return []
+        domains = []
+        for url in urls:
+            domain = self._extract_domain(url or '')
+            if domain and domain not in domains and not self.cache.contains(domain):
+                domains.append(domain)
+        if not domains:
+            return []
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='WHOISPrefetch')
+        logger.info(f"Prefetching WHOIS for {len(domains)} domain(s)")
+        return [self._pool.submit(self.cache.resolve, domain, self._query) for domain in domains]
+    
+    def _query(self, domain: str) -> Dict[str, Any]:
+        """Query WHOIS for domain and return the record to cache.
         
+        Only registration facts are cached; age and trust signals are derived
+        from them at lookup time (see ``_build_result``).
+        """
         try:
             logger.debug(f"Performing WHOIS lookup for {domain}")
             w = whois.whois(domain)
             
             # Extract and normalize data
-            result = {
+            record = {
                 'domain': domain,
                 'domain_name': self._normalize_field(w.domain_name),
                 'registrar': self._normalize_field(w.registrar),
@@ -104,49 +307,52 @@ class WHOISLookup:
                 'registrant_state': self._normalize_field(getattr(w, 'state', None)),
             }
             
-            # Calculate domain age
-            creation = result.get('creation_date')
-            if creation and isinstance(creation, datetime):
-                now = datetime.now()
-                if creation.tzinfo is not None:
-                    creation = creation.replace(tzinfo=None)
-                age_days = (now - creation).days
-                result['domain_age_days'] = age_days
-                result['domain_age_years'] = round(age_days / 365.25, 1)
-            else:
-                result['domain_age_days'] = None
-                result['domain_age_years'] = None
-            
             # Detect WHOIS privacy
-            org = result.get('registrant_org', '') or ''
+            org = record.get('registrant_org', '') or ''
             privacy_indicators = [
                 'privacy', 'proxy', 'protected', 'whoisguard', 
                 'domains by proxy', 'contact privacy', 'redacted',
                 'privacy protect', 'domain protection'
             ]
-            result['whois_privacy'] = any(
+            record['whois_privacy'] = any(
                 indicator in org.lower() 
                 for indicator in privacy_indicators
             )
             
-            # Calculate trust signals
-            result['trust_signals'] = self._calculate_trust_signals(result)
-            
-            # Cache the result
-            self._cache[domain] = result
-            
-            logger.info(f"WHOIS lookup successful for {domain}: age={result.get('domain_age_years')} years")
-            return result
+            logger.info(f"WHOIS lookup successful for {domain}")
+            return record
             
         except Exception as e:
             logger.warning(f"WHOIS lookup failed for {domain}: {e}")
-            error_result = {
+            # Definitive failures are cached negatively; transient ones only briefly, in memory
+            return {
                 'error': str(e),
-                'domain': domain
+                'domain': domain,
+                'transient': not _is_definitive_error(e),
             }
-            # Cache errors too (with shorter TTL in production)
-            self._cache[domain] = error_result
-            return error_result
+    
+    def _build_result(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of a cached record with domain age and trust signals as of now."""
+        result = dict(record)
+        if 'error' in result:
+            return result
+        
+        # Calculate domain age
+        creation = result.get('creation_date')
+        if creation and isinstance(creation, datetime):
+            now = datetime.now()
+            if creation.tzinfo is not None:
+                creation = creation.replace(tzinfo=None)
+            age_days = (now - creation).days
+            result['domain_age_days'] = age_days
+            result['domain_age_years'] = round(age_days / 365.25, 1)
+        else:
+            result['domain_age_days'] = None
+            result['domain_age_years'] = None
+        
+        # Calculate trust signals
+        result['trust_signals'] = self._calculate_trust_signals(result)
+        return result
     
     def _extract_domain(self, url_or_domain: str) -> Optional[str]:
         """Extract clean domain from URL or domain string."""
@@ -163,15 +369,16 @@ class WHOISLookup:
         else:
             domain = url_or_domain
         
-        # Remove www. prefix
-        if domain.startswith('www.'):
-            domain = domain[4:]
-        
-        # Remove port if present
+        # Remove path (bare "domain/path" input) and port if present
+        domain = domain.split('/')[0]
         if ':' in domain:
             domain = domain.split(':')[0]
+        if not domain:
+            return None
         
-        return domain.lower() if domain else None
+        # Reduce to the registrable domain (blog.nike.com and www.nike.co.uk share one lookup)
+        registrable, _, _ = extract_domain_parts(f"https://{domain.lower()}")
+        return registrable or None
     
     def _normalize_field(self, value) -> Optional[str]:
         """Normalize a single WHOIS field."""
@@ -346,3 +553,15 @@ def get_whois_lookup() -> WHOISLookup:
     if _whois_lookup is None:
         _whois_lookup = WHOISLookup()
     return _whois_lookup
+
+
+def prefetch_whois(urls: Iterable[str]) -> int:
+    """Start background WHOIS lookups for the distinct domains in urls.
+    
+    Returns the number of lookups started; see ``WHOISLookup.prefetch``.
+    """
+    try:
+        return len(get_whois_lookup().prefetch(urls))
+    except Exception as e:
+        logger.debug(f"WHOIS prefetch failed: {e}")
+        return 0
@@ -18,6 +18,8 @@ except ImportError:
     def get_whois_lookup():
         return None
 
+from scoring.link_verifier import content_links, get_link_checker
+
 logger = logging.getLogger(__name__)
 
 
@@ -1276,19 +1278,26 @@ class TrustStackAttributeDetector:
         )
 
     def _detect_broken_links(self, content: NormalizedContent) -> Optional[DetectedAttribute]:
-        """Detect broken link rate"""
-        text = content.body + " " + content.title
+        """Detect broken link rate
 
-        # Find URLs in text
-        urls = re.findall(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', text)
+        Reads link statuses checked ahead of scoring (see
+        link_verifier.prefetch_link_statuses); no requests are made here.
+        """
+        urls = content_links(content)
 
         if not urls:
             return None  # No links to check
 
-        # Check metadata for broken link info
-        meta = content.meta or {}
-        broken_count = int(meta.get("broken_links", 0))
-        total_count = len(urls)
+        checker = get_link_checker()
+        checked = [result for result in (checker.cached(url) for url in urls) if result is not None]
+        if checked:
+            broken_count = sum(1 for result in checked if result['is_broken'])
+            total_count = len(checked)
+        else:
+            # Not prefetched: fall back to broken link info in metadata
+            meta = content.meta or {}
+            broken_count = int(meta.get("broken_links", 0))
+            total_count = len(urls)
 
         if broken_count == 0:
             value = 10.0
@@ -1,17 +1,36 @@
 """
 Link verifier for validating LLM-reported broken links
 Checks actual HTTP status codes to prevent hallucinations
+
+Link checks go through a shared ``LinkChecker`` (see ``get_link_checker``):
+- Statuses are cached in memory, and on disk (AR_LINK_CACHE_PATH), for
+  AR_LINK_CACHE_TTL_HOURS (a ``TTLStore``, see ingestion/ttl_store.py). Footer and nav links repeated across a site's
+  pages are therefore checked once.
+- HEAD requests run concurrently over one pooled session, with at most
+  AR_LINK_CHECK_PER_HOST requests in flight per host.
+- A failed HEAD, or a HEAD answer of 404/503, is confirmed with GET before a
+  link counts as broken. Hosts that reject HEAD (405/501), or whose HEAD
+  answers GET contradicts, are checked with GET only from then on.
+- ``prefetch_link_statuses`` checks the links of every asset in one batch
+  before scoring, so ``broken_link_rate`` detection is a cache lookup.
 """
 
+import os
 import re
 import logging
-from typing import List, Set
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Set
 import requests
+from requests.adapters import HTTPAdapter
 from urllib.parse import urljoin, urlparse
 
+from ingestion.ttl_store import TTLStore
+
 logger = logging.getLogger(__name__)
 
-# Timeout for HTTP requests (seconds)
 # Timeout for HTTP requests (seconds)
 REQUEST_TIMEOUT = 10
 
@@ -22,125 +41,336 @@ DEFAULT_HEADERS = {
     'Accept-Language': 'en-US,en;q=0.9',
 }
 
+DEFAULT_DB_PATH = os.path.join('.cache', 'link_status.sqlite')
+
+# HEAD answers meaning "use GET on this host"
+_HEAD_UNSUPPORTED = (405, 501)
+
+# HEAD answers that are only trusted once GET agrees
+_GET_CONFIRMS = (404, 503) + _HEAD_UNSUPPORTED
+
+# Punctuation the URL regex picks up from surrounding prose
+_TRAILING_PUNCTUATION = '.,;:!?)]}\'"'
+
 
 def extract_urls(text: str) -> Set[str]:
     """
     Extract URLs from text content
-    
+
     Args:
         text: Content text to extract URLs from
-    
+
     Returns:
         Set of unique URLs found in text
     """
     # Regex pattern for URLs
     url_pattern = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
-    
+
     urls = set(re.findall(url_pattern, text))
     return urls
 
 
+def normalize_link(url: str, base_url: Optional[str] = None) -> str:
+    """Cache key of a link: resolved against base_url, without fragment or trailing punctuation."""
+    if base_url and not urlparse(url).netloc:
+        url = urljoin(base_url, url)
+    return url.split('#', 1)[0].rstrip(_TRAILING_PUNCTUATION)
+
+
+def _status_result(url: str, status_code: Optional[int], error: Optional[str] = None) -> dict:
+    # 403 Forbidden is treated as NOT BROKEN because it usually means the link exists
+    # but the server is blocking our bot/crawler.
+    if status_code == 403:
+        is_broken = False
+        logger.debug(f"URL {url} returned 403 (Forbidden). Treating as valid (anti-bot protection).")
+    else:
+        is_broken = status_code is not None and status_code >= 400
+    return {'url': url, 'status_code': status_code, 'is_broken': is_broken, 'error': error}
+
+
+class LinkStatusCache:
+    """Link check results: a bounded in-memory tier and an optional SQLite tier.
+
+    Only answered checks (an HTTP status) are persisted. Unreachable links
+    are remembered for the current process only, since their cause is
+    usually transient.
+
+    Args:
+        db_path: SQLite file path, or None/'' for memory only
+        ttl_seconds: Lifetime of results
+        max_memory_entries: Size of the in-memory LRU tier
+    """
+
+    def __init__(self, db_path: Optional[str] = None, ttl_seconds: float = 24 * 3600,
+                 max_memory_entries: int = 20000):
+        self.ttl_seconds = ttl_seconds
+        self._store = TTLStore(db_path, table='link_status', max_memory_entries=max_memory_entries)
+        self._lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'stored': 0}
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self.stats[stat] += 1
+
+    def get(self, url: str) -> Optional[dict]:
+        result = self._store.get(url)
+        if result is not None:
+            self._count('memory_hits')
+            return result
+        result = self._store.load(url)
+        if result is not None:
+            self._count('disk_hits')
+        return result
+
+    def put(self, url: str, result: dict) -> None:
+        self._count('stored')
+        self._store.put(url, result, time.time() + self.ttl_seconds, persist=result.get('status_code') is not None)
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+
+class LinkChecker:
+    """Concurrent, deduplicated HTTP status checks for links.
+
+    Args:
+        cache: Result cache (default: a LinkStatusCache built from AR_LINK_CACHE_*)
+        max_workers: Concurrent checks overall (default AR_LINK_CHECK_WORKERS or 16)
+        per_host: Concurrent checks per host (default AR_LINK_CHECK_PER_HOST or 2)
+        timeout: Per-request timeout in seconds
+        session: HTTP session to use (default: a pooled requests.Session)
+    """
+
+    def __init__(
+        self,
+        cache: Optional[LinkStatusCache] = None,
+        max_workers: Optional[int] = None,
+        per_host: Optional[int] = None,
+        timeout: float = REQUEST_TIMEOUT,
+        session: Optional[requests.Session] = None,
+    ):
+        self.cache = cache if cache is not None else LinkStatusCache(
+            db_path=os.getenv('AR_LINK_CACHE_PATH', DEFAULT_DB_PATH),
+            ttl_seconds=float(os.getenv('AR_LINK_CACHE_TTL_HOURS', '24')) * 3600,
+        )
+        self.max_workers = max_workers or int(os.getenv('AR_LINK_CHECK_WORKERS', '16'))
+        self.per_host = per_host or int(os.getenv('AR_LINK_CHECK_PER_HOST', '2'))
+        self.timeout = timeout
+        self._session = session or self._build_session()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._host_slots: Dict[str, threading.Semaphore] = {}
+        self._head_unsupported: Set[str] = set()
+        self.stats = {'checked': 0, 'head': 0, 'get': 0, 'deduplicated': 0}
+
+    def _build_session(self) -> requests.Session:
+        session = requests.Session()
+        # One pool per host, sized to the per-host concurrency
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.per_host)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update(DEFAULT_HEADERS)
+        return session
+
+    @contextmanager
+    def _host_slot(self, host: str):
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.Semaphore(self.per_host)
+        with slot:
+            yield
+
+    def _uses_get_only(self, host: str) -> bool:
+        with self._lock:
+            return host in self._head_unsupported
+
+    def _mark_head_unsupported(self, host: str) -> None:
+        with self._lock:
+            self._head_unsupported.add(host)
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _request_status(self, method: str, url: str) -> int:
+        response = self._session.request(method, url, timeout=self.timeout, allow_redirects=True, stream=True)
+        response.close()  # Only the status is needed
+        return response.status_code
+
+    def _check(self, url: str) -> dict:
+        """Check one URL over the network (HEAD, confirmed or replaced by GET where needed)."""
+        host = urlparse(url).netloc.lower()
+        status_code, error = None, None
+        with self._host_slot(host):
+            get_only = self._uses_get_only(host)
+            if not get_only:
+                self._count('head')
+                try:
+                    status_code = self._request_status('HEAD', url)
+                except requests.exceptions.RequestException as e:
+                    logger.debug(f"HEAD failed for {url}, retrying with GET: {e}")
+                if status_code in _HEAD_UNSUPPORTED:
+                    self._mark_head_unsupported(host)
+                    get_only = True
+            if status_code is None or status_code in _GET_CONFIRMS or get_only:
+                head_status = status_code
+                self._count('get')
+                try:
+                    status_code = self._request_status('GET', url)
+                except requests.exceptions.Timeout:
+                    logger.warning(f"Timeout checking URL: {url}")
+                    error = 'timeout'
+                except requests.exceptions.RequestException as e:
+                    logger.warning(f"Error checking URL {url}: {e}")
+                    error = str(e)
+                if head_status is not None and status_code is not None and status_code < 400 <= head_status:
+                    # HEAD misreports this host's pages; use GET for the rest of them
+                    logger.debug(f"HEAD {head_status} but GET {status_code} for {url}; using GET for {host}")
+                    self._mark_head_unsupported(host)
+        return _status_result(url, status_code, error)
+
+    def _run(self, url: str) -> dict:
+        try:
+            result = self._check(url)
+        except Exception as e:
+            result = _status_result(url, None, str(e))
+        self.cache.put(url, result)
+        with self._lock:
+            self.stats['checked'] += 1
+            self._inflight.pop(url, None)
+        return result
+
+    def cached(self, url: str) -> Optional[dict]:
+        """Cached result for url, without any network access."""
+        return self.cache.get(url)
+
+    def submit(self, url: str) -> Future:
+        """Future for url's result: cached, already in flight, or newly started."""
+        result = self.cache.get(url)
+        if result is None:
+            with self._lock:
+                future = self._inflight.get(url)
+                if future is not None:
+                    self.stats['deduplicated'] += 1
+                    return future
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='LinkCheck')
+                future = self._inflight[url] = self._pool.submit(self._run, url)
+                return future
+        future = Future()
+        future.set_result(result)
+        return future
+
+    def check(self, url: str) -> dict:
+        """Result for one URL (see check_link_status)."""
+        return self.submit(url).result()
+
+    def check_many(self, urls: Iterable[str], timeout: Optional[float] = None) -> Dict[str, dict]:
+        """Check urls concurrently; returns url -> result for the checks finished within timeout."""
+        futures = {url: self.submit(url) for url in dict.fromkeys(urls)}
+        wait(futures.values(), timeout=timeout)
+        return {url: future.result() for url, future in futures.items() if future.done()}
+
+
+_link_checker: Optional[LinkChecker] = None
+_link_checker_lock = threading.Lock()
+
+
+def get_link_checker() -> LinkChecker:
+    """Get the process-wide link checker."""
+    global _link_checker
+    if _link_checker is None:
+        with _link_checker_lock:
+            if _link_checker is None:
+                _link_checker = LinkChecker()
+    return _link_checker
+
+
+def content_links(content) -> Set[str]:
+    """Normalized links in a content item's title and body (object or dict)."""
+    if isinstance(content, dict):
+        title, body, url = content.get('title'), content.get('body'), content.get('url')
+    else:
+        title, body, url = getattr(content, 'title', ''), getattr(content, 'body', ''), getattr(content, 'url', None)
+    return {normalize_link(link, url) for link in extract_urls(f"{title or ''} {body or ''}")}
+
+
+def prefetch_link_statuses(contents: Iterable, max_urls: Optional[int] = None,
+                           budget_seconds: Optional[float] = None,
+                           checker: Optional[LinkChecker] = None) -> Dict[str, int]:
+    """Check the links of all contents in one batch, ahead of scoring.
+
+    Waits at most budget_seconds (AR_LINK_CHECK_BUDGET_S, default 60). Checks
+    still running after that finish in the background and are cached.
+    AR_LINK_CHECK_PREFETCH=0 disables prefetching.
+
+    Returns:
+        Counts of links found, checked and broken
+    """
+    if os.getenv('AR_LINK_CHECK_PREFETCH', '1') == '0':
+        return {}
+    max_urls = max_urls or int(os.getenv('AR_LINK_CHECK_MAX_URLS', '1000'))
+    if budget_seconds is None:
+        budget_seconds = float(os.getenv('AR_LINK_CHECK_BUDGET_S', '60'))
+    checker = checker if checker is not None else get_link_checker()
+
+    urls: Dict[str, None] = {}
+    for content in contents:
+        for url in content_links(content):
+            urls[url] = None
+    found = len(urls)
+    if not urls:
+        return {'links': 0, 'checked': 0, 'broken': 0}
+
+    started = time.monotonic()
+    results = checker.check_many(list(urls)[:max_urls], timeout=budget_seconds)
+    stats = {
+        'links': found,
+        'checked': len(results),
+        'broken': sum(1 for r in results.values() if r['is_broken']),
+    }
+    logger.info(f"Prefetched link statuses in {time.monotonic() - started:.1f}s: {stats}")
+    return stats
+
+
 def check_link_status(url: str) -> dict:
     """
     Check HTTP status of a single URL
-    
+
     Args:
         url: URL to check
-    
+
     Returns:
         Dict with 'url', 'status_code', 'is_broken', 'error'
     """
-    try:
-        # First try HEAD request with headers
-        try:
-            response = requests.head(
-                url, 
-                headers=DEFAULT_HEADERS, 
-                timeout=REQUEST_TIMEOUT, 
-                allow_redirects=True
-            )
-            status_code = response.status_code
-        except requests.exceptions.RequestException:
-            # If HEAD fails (connection error etc), force a retry with GET below
-            status_code = None
-
-        # If HEAD failed or returned 403/404/405/503, try GET as fallback
-        # (Some servers block HEAD or return 403 for it)
-        if status_code is None or status_code in [403, 404, 405, 503]:
-            try:
-                response = requests.get(
-                    url, 
-                    headers=DEFAULT_HEADERS, 
-                    timeout=REQUEST_TIMEOUT, 
-                    allow_redirects=True, 
-                    stream=True
-                )
-                status_code = response.status_code
-                response.close() # Close immediately, we just need the status
-            except requests.exceptions.RequestException:
-                pass # use the previous status_code or None
-
-        # Determine if broken
-        # 403 Forbidden is treated as NOT BROKEN because it usually means the link exists
-        # but the server is blocking our bot/crawler.
-        if status_code == 403:
-            is_broken = False
-            logger.info(f"URL {url} returned 403 (Forbidden). Treating as valid (anti-bot protection).")
-        else:
-            is_broken = status_code is not None and status_code >= 400
-
-        return {
-            'url': url,
-            'status_code': status_code,
-            'is_broken': is_broken,
-            'error': None
-        }
-    except requests.exceptions.Timeout:
-        logger.warning(f"Timeout checking URL: {url}")
-        return {
-            'url': url,
-            'status_code': None,
-            'is_broken': True,
-            'error': 'timeout'
-        }
-    except requests.exceptions.RequestException as e:
-        logger.warning(f"Error checking URL {url}: {e}")
-        return {
-            'url': url,
-            'status_code': None,
-            'is_broken': True,
-            'error': str(e)
-        }
+    return get_link_checker().check(url)
 
 
 def verify_broken_links(content_text: str, content_url: str = None) -> List[dict]:
     """
     Verify which links in content are actually broken
-    
+
     Args:
         content_text: Text content to check for links
         content_url: Base URL for resolving relative links (optional)
-    
+
     Returns:
         List of broken link dicts with url, status_code, error
     """
-    urls = extract_urls(content_text)
-    
+    urls = {normalize_link(url, content_url) for url in extract_urls(content_text)}
+
     if not urls:
         logger.debug("No URLs found in content")
         return []
-    
+
     logger.info(f"Checking {len(urls)} URLs for broken links")
-    
+
     broken_links = []
-    for url in urls:
-        # Resolve relative URLs if base URL provided
-        if content_url and not urlparse(url).netloc:
-            url = urljoin(content_url, url)
-        
-        result = check_link_status(url)
+    for url, result in get_link_checker().check_many(urls).items():
         if result['is_broken']:
             broken_links.append(result)
             logger.info(f"Found broken link: {url} (status={result['status_code']})")
-    
+
     return broken_links
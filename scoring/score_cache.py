@@ -0,0 +1,107 @@
+"""
+Content-addressed score cache keys for Trust Stack scoring
+
+Scores depend on the asset's content, the brand context and the scorer
+configuration. ``score_cache_key`` hashes exactly those inputs: normalized
+title and body, scoring-relevant metadata, the brand context, the rubric
+version, the LLM model and the prompt version. Unchanged assets then map to
+the same key on every run. The cached scores themselves live in the database
+(``data.models.ScoreCacheEntry``, next to ``DimensionScores``).
+
+Bump ``SCORE_PROMPT_VERSION`` (or set AR_SCORE_PROMPT_VERSION) whenever the
+scoring prompts or signal logic change, so stale scores are not reused.
+Set AR_SCORE_CACHE=0 to disable the cache.
+
+Only scores backed by dimension signals are cached (``cacheable_score``).
+Entries no run has used for AR_SCORE_CACHE_MAX_AGE_DAYS (default 30) are
+pruned at the end of each run.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+
+from config.settings import SETTINGS
+from data.models import NormalizedContent
+
+SCORE_PROMPT_VERSION = os.getenv('AR_SCORE_PROMPT_VERSION', '1')
+
+# Metadata that changes between fetches without changing what is scored
+_VOLATILE_META_KEYS = ('query', 'structured_body', 'ssl_expiry_days')
+# Site-level signal fields that only describe which pages this run happened to collect
+_VOLATILE_SITE_KEYS = ('global_pages_found',)
+
+
+def score_cache_enabled() -> bool:
+    return os.getenv('AR_SCORE_CACHE', '1') != '0'
+
+
+def score_cache_max_age_days() -> int:
+    """Days an unused cache entry is kept (AR_SCORE_CACHE_MAX_AGE_DAYS, default 30)"""
+    try:
+        return max(1, int(os.getenv('AR_SCORE_CACHE_MAX_AGE_DAYS', '30')))
+    except ValueError:
+        return 30
+
+
+def cacheable_score(score: Dict[str, Any]) -> bool:
+    """Whether a RunManager score dict holds real LLM scores worth caching
+
+    The scorer turns scoring errors and skipped items into neutral scores with
+    no dimension signals and zero confidence. Caching those would pin them for
+    every later run of the unchanged asset.
+    """
+    dimensions = (score.get('rationale') or {}).get('dimensions') or {}
+    return any(isinstance(dim, dict) and (dim.get('confidence') or 0) > 0 for dim in dimensions.values())
+
+
+def _ssl_expiry_bucket(days: Any) -> Optional[str]:
+    """Coarse certificate expiry state (the day count itself changes daily)"""
+    if days is None:
+        return None
+    try:
+        days = int(days)
+    except (TypeError, ValueError):
+        return None
+    if days < 0:
+        return 'expired'
+    return 'expiring' if days < 30 else 'valid'
+
+
+def score_cache_key(
+    content: NormalizedContent,
+    brand_context: Dict[str, Any],
+    model: Optional[str],
+    rubric_version: Optional[str] = None,
+    prompt_version: Optional[str] = None,
+) -> str:
+    """SHA-256 key of everything that determines an asset's scores"""
+    meta = content.meta or {}
+    if isinstance(meta, str):
+        try:
+            meta = json.loads(meta)
+        except ValueError:
+            meta = {}
+    relevant_meta = {k: v for k, v in meta.items() if k not in _VOLATILE_META_KEYS}
+    relevant_meta['ssl_expiry'] = _ssl_expiry_bucket(meta.get('ssl_expiry_days'))
+
+    site_signals = brand_context.get('site_level_signals') or {}
+    payload = {
+        'title': ' '.join((content.title or '').split()),
+        'body': ' '.join((content.body or '').split()),
+        'url': content.url or '',
+        'source_type': content.source_type,
+        'channel': content.channel,
+        'modality': content.modality,
+        'meta': relevant_meta,
+        'visual_analysis': content.visual_analysis if brand_context.get('visual_analysis_enabled') else None,
+        'brand': brand_context.get('brand_name'),
+        'keywords': sorted(brand_context.get('keywords') or []),
+        'site_level_signals': {k: v for k, v in site_signals.items() if k not in _VOLATILE_SITE_KEYS},
+        'rubric_version': rubric_version or SETTINGS.get('rubric_version'),
+        'model': model or 'default',
+        'prompt_version': prompt_version or SCORE_PROMPT_VERSION,
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
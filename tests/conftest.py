@@ -0,0 +1,123 @@
+"""Shared pytest fixtures.
+
+Several ingestion caches persist to ``.cache/`` in the working directory by
+default. Tests must neither read a developer's learned state nor write mocked
+results into it, so persistence is switched off for the whole session; tests
+that exercise persistence point the stores at a temporary path themselves.
+
+The environment is applied in ``pytest_configure``, before test modules are
+imported, so caches built at import time never open the on-disk stores. The
+session fixture then rebuilds any singleton created before that.
+"""
+import os
+import sys
+
+import pytest
+
+# Environment applied for the whole test session
+_ISOLATED_ENV = {
+    'AR_DOMAIN_CONFIG_PATH': '',
+    'AR_ROBOTS_CACHE_PATH': '',
+    'AR_FETCH_CACHE_DIR': '',
+    # Mocked provider responses must neither be answered from nor written to a shared cache
+    'AR_SEARCH_CACHE_BACKEND': 'none',
+    'AR_WHOIS_CACHE_PATH': '',
+    # Content in RunManager tests would otherwise send real HEAD/GET requests
+    'AR_LINK_CACHE_PATH': '',
+    'AR_LINK_CHECK_PREFETCH': '0',
+    'AR_PLAYWRIGHT_STATE_DIR': '',
+}
+
+# Values the isolated variables had before the session, restored afterwards
+_SAVED_ENV = {}
+
+
+def pytest_configure(config):
+    _SAVED_ENV.update({name: os.environ.get(name) for name in _ISOLATED_ENV})
+    os.environ.update(_ISOLATED_ENV)
+
+
+def pytest_unconfigure(config):
+    for name, value in _SAVED_ENV.items():
+        if value is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = value
+
+
+def _reset_domain_config():
+    """Drop the DomainConfigCache singleton, detaching it from any persistent store."""
+    page_fetcher = sys.modules.get('ingestion.page_fetcher')
+    if page_fetcher is None:
+        # Not imported yet: it will read the isolated environment on first import
+        return
+    cache_cls = page_fetcher.DomainConfigCache
+    with cache_cls._lock:
+        # Learned maps are class-level, so clear them in place (not via reset(),
+        # which would also wipe the on-disk store)
+        cache_cls._requires_playwright.clear()
+        cache_cls._playwright_marked_at.clear()
+        cache_cls._seen_footer_hashes.clear()
+        cache_cls._stats.clear()
+        cache_cls._instance = None
+    page_fetcher._domain_config = cache_cls.get_instance()
+
+
+def _reset_robots_cache():
+    """Replace the process-wide robots.txt cache with an in-memory one."""
+    robots_cache = sys.modules.get('ingestion.robots_cache')
+    if robots_cache is None:
+        return
+    with robots_cache._robots_cache_lock:
+        robots_cache._robots_cache = None
+    page_fetcher = sys.modules.get('ingestion.page_fetcher')
+    if page_fetcher is not None:
+        # Bound at import time
+        page_fetcher._ROBOTS_CACHE = robots_cache.get_robots_cache()
+
+
+def _reset_search_cache():
+    """Drop the shared search cache so it is rebuilt from the isolated environment."""
+    search_cache = sys.modules.get('ingestion.search_cache')
+    if search_cache is not None:
+        search_cache.set_search_cache(None)
+
+
+def _reset_whois_cache():
+    """Drop the WHOIS cache and lookup singletons so they are rebuilt in memory."""
+    whois_lookup = sys.modules.get('ingestion.whois_lookup')
+    if whois_lookup is None:
+        return
+    with whois_lookup._whois_cache_lock:
+        whois_lookup._whois_cache = None
+    whois_lookup._whois_lookup = None
+
+
+def _reset_link_checker():
+    """Drop the link checker singleton so its status cache is rebuilt in memory."""
+    link_verifier = sys.modules.get('scoring.link_verifier')
+    if link_verifier is None:
+        return
+    with link_verifier._link_checker_lock:
+        link_verifier._link_checker = None
+
+
+def _reset_storage_state_store():
+    """Forget the Playwright storage state store so it is re-read from the environment."""
+    browser_contexts = sys.modules.get('ingestion.browser_contexts')
+    if browser_contexts is None:
+        return
+    with browser_contexts._state_store_lock:
+        browser_contexts._state_store = None
+        browser_contexts._state_store_loaded = False
+
+
+@pytest.fixture(autouse=True, scope='session')
+def _isolate_persistent_caches():
+    os.environ.update(_ISOLATED_ENV)
+    _reset_domain_config()
+    _reset_robots_cache()
+    _reset_search_cache()
+    _reset_whois_cache()
+    _reset_link_checker()
+    _reset_storage_state_store()
@@ -0,0 +1,69 @@
+"""Tests for the adaptive token-bucket PerDomainRateLimiter."""
+import asyncio
+import time
+
+from ingestion.rate_limiter import PerDomainRateLimiter, parse_retry_after
+
+
+def test_burst_allows_back_to_back_requests():
+    limiter = PerDomainRateLimiter(default_interval=1.0, burst=3)
+    waits = [limiter.reserve('https://cdn.example.com/%d' % i) for i in range(4)]
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert 0.9 < waits[3] <= 1.0
+
+
+def test_rate_increases_additively_on_success():
+    limiter = PerDomainRateLimiter(default_interval=1.0, max_speedup=4, increase_step=0.5)
+    for _ in range(3):
+        limiter.record_response('https://fast.com/', 200)
+    assert limiter.snapshot()['fast.com']['rate'] == 2.5
+
+    for _ in range(20):
+        limiter.record_response('https://fast.com/', 200)
+    assert limiter.snapshot()['fast.com']['rate'] == 4.0
+
+
+def test_default_limiter_never_exceeds_configured_interval():
+    limiter = PerDomainRateLimiter(default_interval=1.0)
+    for _ in range(10):
+        limiter.record_response('https://api.example.com/', 200)
+    assert limiter.snapshot()['api.example.com']['interval'] == 1.0
+
+
+def test_rate_halves_on_throttling():
+    limiter = PerDomainRateLimiter(default_interval=1.0, max_slowdown=4)
+    limiter.record_response('https://fragile.com/', 429)
+    assert limiter.snapshot()['fragile.com']['rate'] == 0.5
+    limiter.record_response('https://fragile.com/', 503)
+    limiter.record_response('https://fragile.com/', 503)
+    snapshot = limiter.snapshot()['fragile.com']
+    assert snapshot['rate'] == 0.25
+    assert snapshot['throttled'] == 3
+
+
+def test_retry_after_delays_next_request():
+    limiter = PerDomainRateLimiter(default_interval=0.1)
+    limiter.reserve('https://busy.com/a')
+    limiter.record_response('https://busy.com/a', 429, retry_after='5')
+    assert 4.9 < limiter.reserve('https://busy.com/b') <= 5.1
+    assert limiter.reserve('https://other.com/') == 0.0
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('10') == 10.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('garbage') is None
+    future = time.strftime('%a, %d %b %Y %H:%M:%S GMT', time.gmtime(time.time() + 60))
+    assert 55 < parse_retry_after(future) <= 60
+
+
+def test_async_acquire_waits_for_slot():
+    limiter = PerDomainRateLimiter(default_interval=0.2)
+
+    async def run():
+        start = time.monotonic()
+        await limiter.acquire('https://example.com/1')
+        await limiter.acquire('https://example.com/2')
+        return time.monotonic() - start
+
+    assert 0.15 < asyncio.run(run()) < 0.5
@@ -0,0 +1,78 @@
+"""Tests for the asyncio fetch engine used by fetch_pages_parallel."""
+import asyncio
+import time
+import unittest
+from unittest.mock import patch
+
+from ingestion import async_fetcher, page_fetcher
+from ingestion.rate_limiter import PerDomainRateLimiter
+
+
+class TestRateLimiterReserve(unittest.TestCase):
+    def test_reserve_books_slots_without_sleeping(self):
+        limiter = PerDomainRateLimiter(default_interval=1.0)
+        start = time.time()
+        first = limiter.reserve('https://example.com/a')
+        second = limiter.reserve('https://example.com/b')
+        other = limiter.reserve('https://other.com/')
+
+        self.assertLess(time.time() - start, 0.1)
+        self.assertEqual(first, 0)
+        self.assertGreater(second, 0.9)
+        self.assertEqual(other, 0)
+
+
+@unittest.skipUnless(async_fetcher._AIOHTTP_AVAILABLE, 'aiohttp not installed')
+class TestAsyncFetchEngine(unittest.TestCase):
+    def setUp(self):
+        self.in_flight = {}
+        self.peak = {}
+
+        async def fake_get(engine, session, url, extra_headers=None):
+            domain = url.split('/')[2]
+            self.in_flight[domain] = self.in_flight.get(domain, 0) + 1
+            self.peak[domain] = max(self.peak.get(domain, 0), self.in_flight[domain])
+            await asyncio.sleep(0.2)
+            self.in_flight[domain] -= 1
+            if url.endswith('/missing'):
+                return None
+            return async_fetcher._AsyncResponse(url, 200, '<html>%s</html>' % url, {})
+
+        def fake_build(url, resp, browser_manager=None, cached_entry=None):
+            return {'title': '', 'body': resp.text, 'url': url}
+
+        for p in (
+            patch.object(async_fetcher.AsyncFetchEngine, '_get_with_retries', fake_get),
+            patch.object(page_fetcher, '_build_page_result', fake_build),
+            patch.object(page_fetcher, '_requires_playwright_first', lambda url: False),
+            patch.object(page_fetcher, '_renders_first', lambda url: False),
+        ):
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_results_keep_input_order_and_run_concurrently(self):
+        urls = ['https://site%d.com/page' % i for i in range(10)] + ['https://site0.com/missing']
+        engine = async_fetcher.AsyncFetchEngine(max_in_flight=20, per_domain=2)
+
+        start = time.time()
+        results = engine.fetch_all(urls)
+        elapsed = time.time() - start
+
+        self.assertEqual([r['url'] for r in results], urls)
+        self.assertIn('site3.com', results[3]['body'])
+        self.assertEqual(results[-1]['body'], '')
+        self.assertLess(elapsed, 1.0)
+
+    def test_per_domain_cap_is_enforced(self):
+        urls = ['https://busy.com/page%d' % i for i in range(6)]
+        engine = async_fetcher.AsyncFetchEngine(max_in_flight=20, per_domain=2)
+
+        start = time.time()
+        engine.fetch_all(urls)
+
+        self.assertEqual(self.peak['busy.com'], 2)
+        self.assertGreaterEqual(time.time() - start, 0.6)
+
+
+if __name__ == '__main__':
+    unittest.main()
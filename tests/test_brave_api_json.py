@@ -1,7 +1,17 @@
 import json
+
+import pytest
 from unittest import mock
 
 from ingestion import brave_search
+from ingestion import search_cache
+
+
+@pytest.fixture(autouse=True)
+def _isolated_search_cache(monkeypatch):
+    # Keep results from earlier searches (or the on-disk cache) out of these tests
+    monkeypatch.setattr(search_cache, '_search_cache',
+                        search_cache.SearchCache(search_cache.MemorySearchCacheBackend()))
 
 
 def make_resp(json_obj):
@@ -65,6 +65,11 @@ def test_collect_respects_robots_disallow(monkeypatch):
         return r
 
     monkeypatch.setattr(page_fetcher, 'requests', types.SimpleNamespace(get=fake_requests_get))
+    # robots.txt is resolved through the shared robots cache; use a fresh in-memory one
+    from ingestion import robots_cache
+    monkeypatch.setattr(robots_cache, 'requests', types.SimpleNamespace(get=fake_requests_get))
+    monkeypatch.setattr(page_fetcher, '_ROBOTS_CACHE', robots_cache.RobotsCache(db_path=None))
+    monkeypatch.setattr(robots_cache, '_robots_cache', page_fetcher._ROBOTS_CACHE)
 
     collected = brave_search.collect_brave_pages('query', target_count=1, pool_size=2, min_body_length=100)
     assert len(collected) == 1
@@ -0,0 +1,135 @@
+"""Tests for warm per-domain browser contexts."""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from ingestion import playwright_manager
+from ingestion.browser_contexts import BrowserContextPool, StorageStateStore, context_domain
+from ingestion.playwright_manager import PlaywrightBrowserManager
+
+
+class FakeContext:
+    def __init__(self, storage_state=None):
+        self.storage_state_in = storage_state
+        self.closed = False
+
+    def storage_state(self, path):
+        with open(path, 'w') as f:
+            f.write('{"cookies": [{"name": "consent", "value": "yes"}], "origins": []}')
+
+    def close(self):
+        self.closed = True
+
+
+class TestBrowserContextPool(unittest.TestCase):
+    def setUp(self):
+        self.state_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.state_dir, True)
+        self.created = []
+
+    def _factory(self, storage_state=None):
+        context = FakeContext(storage_state)
+        self.created.append(context)
+        return context
+
+    def _pool(self, **kwargs):
+        kwargs.setdefault('state_store', StorageStateStore(self.state_dir))
+        pool = BrowserContextPool(**{'max_contexts': 2, 'max_pages': 3, **kwargs})
+        pool.bind(object())
+        return pool
+
+    def _load(self, pool, url, **release):
+        lease = pool.acquire(url, 'UA', True, self._factory)
+        pool.release(lease, **release)
+        return lease
+
+    def test_context_domain(self):
+        self.assertEqual(context_domain('https://WWW.Acme.com:443/about'), 'acme.com')
+        self.assertEqual(context_domain('https://shop.acme.com/'), 'shop.acme.com')
+
+    def test_same_domain_reuses_warm_context(self):
+        pool = self._pool()
+        first = self._load(pool, 'https://acme.com/')
+        second = pool.acquire('https://www.acme.com/about', 'UA', True, self._factory)
+        self.assertIs(second, first)
+        self.assertTrue(second.warm)
+        self.assertEqual(len(self.created), 1)
+        self.assertEqual(pool.stats['reused'], 1)
+
+    def test_lru_cap_evicts_and_saves_state(self):
+        pool = self._pool()
+        for url in ('https://a.com/', 'https://b.com/', 'https://c.com/'):
+            self._load(pool, url)
+        self.assertTrue(self.created[0].closed)
+        self.assertEqual(pool.snapshot()['open'], 2)
+        self.assertEqual(pool.stats['evicted'], 1)
+        self.assertTrue(os.path.exists(os.path.join(self.state_dir, 'a.com.json')))
+
+    def test_recycles_after_max_pages_and_heap_growth(self):
+        pool = self._pool()
+        for _ in range(3):
+            self._load(pool, 'https://acme.com/')
+        self.assertTrue(self.created[0].closed)
+        self._load(pool, 'https://big.com/', heap_bytes=pool.max_heap_bytes)
+        self.assertTrue(self.created[1].closed)
+        self.assertEqual(pool.stats['recycled'], 2)
+
+    def test_new_context_starts_from_saved_state(self):
+        self._load(self._pool(), 'https://acme.com/')
+        lease = self._pool().acquire('https://acme.com/p', 'UA', True, self._factory)
+        self.assertTrue(lease.restored)
+        self.assertEqual(lease.context.storage_state_in, os.path.join(self.state_dir, 'acme.com.json'))
+
+        expired = self._pool(state_store=StorageStateStore(self.state_dir, ttl_seconds=-1))
+        self.assertFalse(expired.acquire('https://acme.com/p', 'UA', True, self._factory).restored)
+
+    def test_saved_state_can_be_cleared(self):
+        store = StorageStateStore(self.state_dir)
+        for url in ('https://a.com/', 'https://b.com/'):
+            self._load(self._pool(state_store=store), url)
+        self.assertEqual(store.clear(), 2)
+        self.assertIsNone(store.load_path('a.com'))
+
+    def test_failed_fetch_discards_context(self):
+        pool = self._pool()
+        self._load(pool, 'https://acme.com/', healthy=False)
+        self.assertTrue(self.created[0].closed)
+        self.assertEqual(pool.snapshot()['open'], 0)
+        self.assertFalse(os.path.exists(os.path.join(self.state_dir, 'acme.com.json')))
+
+    def test_new_browser_drops_pooled_contexts(self):
+        pool = self._pool()
+        self._load(pool, 'https://acme.com/')
+        pool.bind(object())
+        pool.acquire('https://acme.com/', 'UA', True, self._factory)
+        self.assertEqual(len(self.created), 2)
+
+
+class TestProcessFetchReuse(unittest.TestCase):
+    def test_second_page_on_domain_reuses_context(self):
+        page = MagicMock()
+        page.content.return_value = '<html><body><p>Hello</p></body></html>'
+        page.title.return_value = 'Hello'
+        page.query_selector.return_value = None
+        page.query_selector_all.return_value = []
+        page.is_visible.return_value = False
+        page.evaluate.return_value = None
+        browser = MagicMock()
+        browser.new_context.return_value.new_page.return_value = page
+
+        with patch.dict('os.environ', {'AR_PLAYWRIGHT_STATE_DIR': ''}), \
+                patch.object(playwright_manager, 'get_storage_state_store', return_value=None):
+            manager = PlaywrightBrowserManager(num_workers=1)
+            first = manager._process_fetch(browser, 'https://shop.com/', 'UA')
+            second = manager._process_fetch(browser, 'https://shop.com/about', 'UA')
+
+        self.assertEqual(browser.new_context.call_count, 1)
+        self.assertFalse(first['warm_context'])
+        self.assertTrue(second['warm_context'])
+        self.assertEqual(page.close.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
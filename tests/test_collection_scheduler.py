@@ -0,0 +1,86 @@
+"""Tests for the concurrent collection scheduler used by RunManager."""
+import threading
+import time
+import unittest
+
+from core.collection_scheduler import CollectionScheduler, CollectionTask, parse_source_limits
+
+
+def _task(source, keyword, delay=0.0, log=None, active=None, lock=None):
+    def run():
+        if active is not None:
+            with lock:
+                active[source] = active.get(source, 0) + 1
+                log.append(dict(active))
+        time.sleep(delay)
+        if active is not None:
+            with lock:
+                active[source] -= 1
+        return [{'source_type': source, 'query': keyword}]
+    return CollectionTask(source=source, keyword=keyword, run=run)
+
+
+class TestCollectionScheduler(unittest.TestCase):
+    def test_runs_concurrently_and_keeps_task_order(self):
+        tasks = [
+            _task(source, kw, delay=0.1 if source != 'youtube' else 0.0)
+            for source in ('brave', 'serper', 'reddit', 'youtube')
+            for kw in ('a', 'b', 'c', 'd', 'e')
+        ]
+        start = time.time()
+        assets = CollectionScheduler(max_tasks=20, source_limits={}).run(tasks)
+        elapsed = time.time() - start
+
+        self.assertLess(elapsed, 0.5)  # Sequential would take 1.5s
+        self.assertEqual(
+            [(a['source_type'], a['query']) for a in assets],
+            [(t.source, t.keyword) for t in tasks],
+        )
+
+    def test_per_source_and_global_limits(self):
+        log, active, lock = [], {}, threading.Lock()
+        tasks = [_task('brave', str(i), 0.03, log, active, lock) for i in range(6)]
+        tasks += [_task('reddit', str(i), 0.03, log, active, lock) for i in range(6)]
+
+        CollectionScheduler(max_tasks=3, source_limits={'brave': 1, 'reddit': 2}).run(tasks)
+
+        self.assertTrue(all(snapshot.get('brave', 0) <= 1 for snapshot in log))
+        self.assertTrue(all(snapshot.get('reddit', 0) <= 2 for snapshot in log))
+        self.assertTrue(all(sum(snapshot.values()) <= 3 for snapshot in log))
+        # A capped source does not stop other sources from using free slots
+        self.assertTrue(any(snapshot.get('reddit', 0) == 2 for snapshot in log))
+
+    def test_progress_callback_and_errors(self):
+        progress = []
+
+        def boom():
+            raise RuntimeError('search failed')
+
+        tasks = [_task('brave', 'a'), CollectionTask('serper', 'b', boom), _task('reddit', 'c')]
+        scheduler = CollectionScheduler(
+            max_tasks=1, source_limits={},
+            progress_callback=lambda done, total, task, count: progress.append((done, total, task.source, count)),
+        )
+        with self.assertRaises(RuntimeError):
+            scheduler.run(tasks)
+        self.assertEqual(progress[0], (1, 3, 'brave', 1))
+        self.assertEqual(progress[1], (2, 3, 'serper', 0))
+
+    def test_parse_source_limits(self):
+        self.assertEqual(parse_source_limits('brave=2, Serper=3,bad,reddit=x'), {'brave': 2, 'serper': 3})
+
+    def test_tasks_see_the_callers_fetch_memo(self):
+        from ingestion.fetch_memo import active_fetch_memo, run_fetch_memo
+
+        seen = []
+        tasks = [
+            CollectionTask(source='brave', keyword=kw, run=lambda: seen.append(active_fetch_memo()) or [])
+            for kw in ('a', 'b', 'c')
+        ]
+        with run_fetch_memo() as memo:
+            CollectionScheduler(max_tasks=3, source_limits={}).run(tasks)
+        self.assertEqual(seen, [memo] * 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
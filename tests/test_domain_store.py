@@ -0,0 +1,97 @@
+"""Tests for the persistent per-domain fetch learning store."""
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from ingestion import domain_store
+from ingestion.domain_store import DomainConfigStore, open_domain_store
+
+
+class TestDomainConfigStore(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.db_path = os.path.join(self._tmp.name, 'domain_config.sqlite')
+
+    def test_state_survives_reopen(self):
+        store = DomainConfigStore(self.db_path)
+        store.mark_requires_playwright('spa.example.com')
+        store.record_fetch('spa.example.com', 'playwright', True, 1200.0)
+        store.flush()
+
+        state = DomainConfigStore(self.db_path).load()
+        self.assertIn('spa.example.com', state['requires_playwright'])
+        self.assertNotIn('footer_hashes', state)
+        stats = state['stats'][('spa.example.com', 'playwright')]
+        self.assertAlmostEqual(stats['successes'], 1.0, places=3)
+        self.assertEqual(stats['latency_ms'], 1200.0)
+
+    def test_expired_entries_are_dropped_on_load(self):
+        store = DomainConfigStore(self.db_path, playwright_ttl_seconds=60)
+        store.mark_requires_playwright('old.example.com', marked_at=time.time() - 120)
+        store.mark_requires_playwright('new.example.com')
+        state = store.load()
+        self.assertEqual(list(state['requires_playwright']), ['new.example.com'])
+
+    def test_counts_decay_and_latency_is_smoothed(self):
+        store = DomainConfigStore(self.db_path, stats_half_life_seconds=100)
+        store.record_fetch('example.com', 'http', False, 100.0)
+        with patch.object(domain_store.time, 'time', return_value=time.time() + 100):
+            stats = store.record_fetch('example.com', 'http', True, 200.0)
+        self.assertAlmostEqual(stats['failures'], 0.5, places=2)
+        self.assertAlmostEqual(stats['successes'], 1.0, places=2)
+        self.assertAlmostEqual(stats['latency_ms'], 130.0)
+
+    def test_stats_are_written_in_batches(self):
+        store = DomainConfigStore(self.db_path, flush_every=3)
+        store.record_fetch('a.com', 'http', True, 100.0)
+        store.record_fetch('a.com', 'http', True, 100.0)
+        store.record_fetch('b.com', 'http', False, None)
+        self.assertEqual(DomainConfigStore(self.db_path).load()['stats'], {})
+
+        store.record_fetch('c.com', 'playwright', True, 900.0)
+        stats = DomainConfigStore(self.db_path).load()['stats']
+        self.assertEqual(set(stats), {('a.com', 'http'), ('b.com', 'http'), ('c.com', 'playwright')})
+        self.assertAlmostEqual(stats[('a.com', 'http')]['successes'], 2.0, places=3)
+
+    def test_flush_writes_pending_stats(self):
+        store = DomainConfigStore(self.db_path)
+        store.record_fetch('a.com', 'http', True, 100.0)
+        self.assertEqual(store.flush(), 1)
+        self.assertEqual(store.flush(), 0)
+        stats = DomainConfigStore(self.db_path).load()['stats']
+        self.assertAlmostEqual(stats[('a.com', 'http')]['successes'], 1.0, places=3)
+
+    def test_clear(self):
+        store = DomainConfigStore(self.db_path)
+        store.mark_requires_playwright('a.com')
+        store.mark_requires_playwright('b.com')
+        store.record_fetch('a.com', 'http', True, None)
+        self.assertEqual(store.clear(), 2)
+        self.assertEqual(store.load(), {'requires_playwright': {}, 'stats': {}})
+
+    def test_empty_path_disables_persistence(self):
+        with patch.dict(os.environ, {'AR_DOMAIN_CONFIG_PATH': ''}):
+            self.assertIsNone(open_domain_store())
+
+
+
+class TestFooterHashScope(unittest.TestCase):
+    def test_footer_hashes_are_scoped_to_the_run(self):
+        from ingestion.fetch_memo import run_fetch_memo
+        from ingestion.page_fetcher import DomainConfigCache
+
+        cache = DomainConfigCache.get_instance()
+        url = 'https://footer.example.com/about'
+        with run_fetch_memo():
+            self.assertFalse(cache.is_footer_seen(url, 'f00'))
+            cache.mark_footer_seen(url, 'f00')
+            self.assertTrue(cache.is_footer_seen('https://footer.example.com/', 'f00'))
+        with run_fetch_memo():
+            # A later run captures the footer again
+            self.assertFalse(cache.is_footer_seen(url, 'f00'))
+
+if __name__ == '__main__':
+    unittest.main()
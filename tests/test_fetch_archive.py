@@ -0,0 +1,86 @@
+"""Tests for the WARC-style fetch recorder and offline replay."""
+import os
+import tempfile
+import unittest
+from datetime import timedelta
+from unittest import mock
+
+from ingestion import fetch_archive, search_cache
+from ingestion.fetch_archive import FetchArchive
+from ingestion.stream_reader import BodyAccumulator, StreamedResponse
+
+
+def _streamed(status, headers, body, elapsed_ms=120):
+    resp = mock.Mock(status_code=status, headers=headers, url='https://a.com/', elapsed=timedelta(milliseconds=elapsed_ms))
+    accumulator = BodyAccumulator(headers.get('Content-Type', '')).consume([body])
+    return StreamedResponse(resp, accumulator, accumulator.text())
+
+
+class TestFetchArchive(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'run.warc.gz')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _record(self):
+        archive = FetchArchive(self.path, 'record')
+        html = '<html><head><title>Café</title></head><body><p>Hello</p></body></html>'.encode('utf-8')
+        archive.record_http('https://A.com/about#team', _streamed(200, {
+            'Content-Type': 'text/html; charset=utf-8', 'ETag': '"v1"', 'Content-Encoding': 'gzip',
+        }, html))
+        archive.record_json('playwright', 'https://b.com/', {
+            'title': 'Rendered', 'body': 'JS body', 'html': '<html></html>', 'screenshot_path': 's3://shot',
+        }, latency_ms=900)
+        return archive
+
+    def test_http_round_trip_through_index(self):
+        self._record()
+        replay = FetchArchive(self.path, 'replay')
+        resp = replay.replay_http('https://a.com/about')
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn('<title>Café</title>', resp.text)
+        self.assertEqual(resp.headers.get('etag'), '"v1"')
+        self.assertIsNone(resp.headers.get('Content-Encoding'))  # Body is stored decoded
+        self.assertAlmostEqual(resp.elapsed.total_seconds(), 0.12, places=2)
+
+        rendered = replay.replay_json('playwright', 'https://b.com/')
+        self.assertEqual(rendered['body'], 'JS body')
+        self.assertNotIn('screenshot_path', rendered)
+
+        self.assertIsNone(replay.replay_http('https://unrecorded.com/'))
+        self.assertEqual(replay.get_stats()['served'], 2)
+        self.assertEqual(replay.get_stats()['missing'], 1)
+
+    def test_index_is_rebuilt_by_scanning(self):
+        self._record()
+        os.remove(self.path + '.idx')
+        replay = FetchArchive(self.path, 'replay')
+        self.assertEqual(replay.get_stats()['records'], 2)
+        self.assertEqual(replay.replay_json('playwright', 'https://b.com/')['title'], 'Rendered')
+
+    def test_recorded_and_synthetic_latency(self):
+        self._record()
+        recorded = FetchArchive(self.path, 'replay', replay_latency='recorded')
+        with mock.patch.object(fetch_archive.time, 'sleep') as sleep:
+            recorded.replay_json('playwright', 'https://b.com/')
+        sleep.assert_called_once_with(0.9)
+
+        synthetic = FetchArchive(self.path, 'replay', replay_latency='50')
+        with mock.patch.object(fetch_archive.time, 'sleep') as sleep:
+            synthetic.replay_http('https://a.com/about')
+        sleep.assert_called_once_with(0.05)
+
+    def test_search_results_are_recorded_and_replayed(self):
+        cache = search_cache.SearchCache(search_cache.MemorySearchCacheBackend())
+        with mock.patch.object(search_cache, '_search_cache', cache):
+            with mock.patch.object(search_cache, 'get_fetch_archive', return_value=FetchArchive(self.path, 'record')):
+                search_cache.cached_search('brave', 'acme', 5, 0, lambda: [{'url': 'https://acme.com/'}])
+            with mock.patch.object(search_cache, 'get_fetch_archive', return_value=FetchArchive(self.path, 'replay')):
+                results = search_cache.cached_search('brave', 'acme', 5, 0, lambda: self.fail('network used'))
+        self.assertEqual(results, [{'url': 'https://acme.com/'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
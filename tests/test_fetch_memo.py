@@ -0,0 +1,156 @@
+"""Tests for the run-scoped fetch memo."""
+import threading
+import time
+import unittest
+
+from ingestion.fetch_memo import FetchMemo, active_fetch_memo, run_fetch_memo
+
+
+class TestFetchMemo(unittest.TestCase):
+    def test_concurrent_requests_share_one_fetch(self):
+        memo = FetchMemo()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.1)
+            return {'url': 'https://a.com/', 'body': 'x'}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(memo.get_or_fetch('https://a.com/', fetch)))
+            for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 5)
+        stats = memo.get_stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'] + stats['coalesced'], 4)
+        self.assertEqual(stats['hit_rate'], 0.8)
+
+    def test_urls_are_normalized_and_results_copied(self):
+        memo = FetchMemo()
+        first = memo.get_or_fetch('https://A.com:443/about#team', lambda: {'body': 'x'})
+        first['source_type'] = 'brand_owned'
+        second = memo.get_or_fetch('https://a.com/about', lambda: self.fail('should be memoized'))
+        self.assertNotIn('source_type', second)
+
+    def test_parsed_document_is_not_memoized(self):
+        memo = FetchMemo()
+        doc = object()
+        first = memo.get_or_fetch('https://a.com/', lambda: {'body': 'x', 'html': '<p>x</p>', 'parsed_document': doc})
+        self.assertIs(first['parsed_document'], doc)
+        second = memo.get_or_fetch('https://a.com/', lambda: self.fail('should be memoized'))
+        self.assertNotIn('parsed_document', second)
+        self.assertEqual(second['html'], '<p>x</p>')
+        batch = memo.fetch_many(['https://b.com/'], lambda urls: [{'body': 'b', 'html': 'b', 'parsed_document': doc}])
+        self.assertNotIn('parsed_document', batch[0])
+
+    def test_failed_fetch_is_not_memoized(self):
+        memo = FetchMemo()
+
+        def boom():
+            raise RuntimeError('down')
+
+        with self.assertRaises(RuntimeError):
+            memo.get_or_fetch('https://a.com/', boom)
+        self.assertEqual(memo.get_or_fetch('https://a.com/', lambda: {'body': 'ok'})['body'], 'ok')
+
+    def test_error_and_empty_results_are_not_memoized(self):
+        memo = FetchMemo()
+        for failed in ({'body': '', 'error': 'timeout'}, {'body': 'Access Denied', 'access_denied': True}, {'body': ' '}):
+            self.assertEqual(memo.get_or_fetch('https://a.com/', lambda r=failed: r), failed)
+        self.assertEqual(memo.get_or_fetch('https://a.com/', lambda: {'body': 'ok'})['body'], 'ok')
+        self.assertEqual(memo.get_stats()['misses'], 4)
+
+        batches = []
+
+        def fetch_batch(urls):
+            batches.append(list(urls))
+            return [{'url': u, 'body': '', 'error': 'timeout'} for u in urls]
+
+        results = memo.fetch_many(['https://b.com/', 'https://b.com/'], fetch_batch)
+        self.assertEqual([r['error'] for r in results], ['timeout', 'timeout'])
+        self.assertEqual(batches, [['https://b.com/']])  # Returned to this batch, not refetched
+        memo.fetch_many(['https://b.com/'], fetch_batch)
+        self.assertEqual(len(batches), 2)
+
+    def test_waiters_share_a_failed_fetch_without_memoizing_it(self):
+        memo = FetchMemo()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.1)
+            return {'body': '', 'error': 'timeout'}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(memo.get_or_fetch('https://a.com/', fetch)))
+            for _ in range(3)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([r['error'] for r in results], ['timeout'] * 3)
+        self.assertEqual(len(memo), 0)
+
+    def test_fetch_many_only_fetches_new_urls(self):
+        memo = FetchMemo()
+        memo.get_or_fetch('https://a.com/', lambda: {'url': 'https://a.com/', 'body': 'a'})
+        batches = []
+
+        def fetch_batch(urls):
+            batches.append(list(urls))
+            return [{'url': u, 'body': u[-2]} for u in urls]
+
+        results = memo.fetch_many(['https://a.com/', 'https://b.com/', 'https://b.com/'], fetch_batch)
+        self.assertEqual(batches, [['https://b.com/']])
+        self.assertEqual([r['body'] for r in results], ['a', 'm', 'm'])
+
+    def test_scope_is_shared_and_nested_scopes_reuse_it(self):
+        self.assertIsNone(active_fetch_memo())
+        with run_fetch_memo() as outer:
+            self.assertIs(active_fetch_memo(), outer)
+            with run_fetch_memo() as inner:
+                self.assertIs(inner, outer)
+            self.assertIs(active_fetch_memo(), outer)
+        self.assertIsNone(active_fetch_memo())
+
+    def test_concurrent_runs_keep_their_own_memo(self):
+        first_entered, first_exited = threading.Event(), threading.Event()
+        seen = {}
+
+        def first_run():
+            with run_fetch_memo() as memo:
+                seen['first'] = memo
+                first_entered.set()
+                time.sleep(0.05)
+            first_exited.set()
+
+        def second_run():
+            first_entered.wait(1)
+            with run_fetch_memo() as memo:
+                seen['second'] = memo
+                first_exited.wait(1)  # The first run's exit must not end this scope
+                seen['second_after'] = active_fetch_memo()
+
+        threads = [threading.Thread(target=first_run), threading.Thread(target=second_run)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertIsNot(seen['first'], seen['second'])
+        self.assertIs(seen['second_after'], seen['second'])
+        self.assertIsNone(active_fetch_memo())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -170,6 +170,83 @@ def test_fetch_page_respects_robots(monkeypatch, tmp_path):
     assert result['privacy'] == ''
 
 
+def _visual_fetch_setup(monkeypatch, render_result, http_html=None):
+    """Visual analysis on; counts Playwright renders and HTTP requests."""
+    calls = {'render': 0, 'http': 0}
+
+    def fake_render(url, user_agent, browser_manager=None, min_body=100):
+        calls['render'] += 1
+        return dict(render_result, url=url)
+
+    class FakeSession:
+        def __init__(self):
+            self.max_redirects = 10
+        def get(self, *args, **kwargs):
+            calls['http'] += 1
+            return DummyResponse(status_code=200, text=http_html or '')
+
+    page_fetcher._SESSIONS_CACHE.clear()
+    monkeypatch.setattr(page_fetcher, 'requests', types.SimpleNamespace(get=None, Session=FakeSession))
+    monkeypatch.setitem(page_fetcher.SETTINGS, 'visual_analysis_enabled', True)
+    monkeypatch.setattr(page_fetcher, '_PLAYWRIGHT_AVAILABLE', True)
+    monkeypatch.setattr(page_fetcher, '_playwright_fetch_recorded', fake_render)
+    monkeypatch.setattr(page_fetcher, '_is_allowed_by_robots', lambda url, ua=None: True)
+    monkeypatch.setattr(page_fetcher, 'prefetch_ssl', lambda urls: None)
+    monkeypatch.setattr(page_fetcher, 'get_ssl_data', lambda url: {'ssl_valid': 'true'})
+    monkeypatch.setattr(page_fetcher, 'get_http_cache', lambda: None)
+    return calls
+
+
+def test_visual_fetch_renders_once(monkeypatch):
+    html = '<html><head><title>Rendered</title></head><body><main><h1>Jackets</h1><p>' + 'Recycled rain jackets. ' * 20 + '</p></main></body></html>'
+    calls = _visual_fetch_setup(monkeypatch, {
+        'title': 'Rendered', 'body': 'Recycled rain jackets. ' * 20, 'html': html,
+        'screenshot_path': 'shots/top.png', 'visual_analysis': {'screenshots': {'top': 'shots/top.png', 'bottom': None}},
+        'access_denied': False,
+    })
+
+    result = page_fetcher.fetch_page('https://visual.example.com/')
+    assert calls == {'render': 1, 'http': 0}
+    assert result['screenshot_path'] == 'shots/top.png'
+    assert result['structured_body']
+    assert result['parsed_document'] is not None
+    assert result['ssl_valid'] == 'true'
+
+
+def test_visual_fetch_falls_back_to_http_without_second_render(monkeypatch):
+    html = '<html><head><title>Plain</title></head><body><article><p>' + 'Plain HTTP content. ' * 20 + '</p></article></body></html>'
+    calls = _visual_fetch_setup(
+        monkeypatch, {'title': 'Access Denied', 'body': '', 'access_denied': True}, http_html=html,
+    )
+
+    result = page_fetcher.fetch_page('https://blocked-render.example.com/')
+    assert calls == {'render': 1, 'http': 1}
+    assert 'Plain HTTP content' in result['body']
+    assert result['screenshot_path'] is None
+
+
+def test_visual_capture_follows_source_and_content_type(monkeypatch):
+    from ingestion.domain_classifier import brand_url_scope
+
+    monkeypatch.setitem(page_fetcher.SETTINGS, 'visual_analysis_enabled', True)
+    monkeypatch.delenv('VISUAL_SCOPE', raising=False)
+    monkeypatch.setattr(page_fetcher, '_PLAYWRIGHT_AVAILABLE', True)
+    brand_page, third_party_page = 'https://www.acme.com/products/jacket', 'https://news.example.com/story/1'
+
+    # Outside a run's brand scope only landing pages qualify
+    assert page_fetcher._visual_capture_needed('https://news.example.com/')
+    assert not page_fetcher._renders_first(brand_page)
+    assert not page_fetcher._renders_first(third_party_page)
+
+    with brand_url_scope(['acme.com']):
+        assert page_fetcher._renders_first(brand_page)
+        assert not page_fetcher._renders_first(third_party_page)
+
+    monkeypatch.setitem(page_fetcher.SETTINGS, 'visual_analysis_enabled', False)
+    with brand_url_scope(['acme.com']):
+        assert not page_fetcher._renders_first(brand_page)
+
+
 class TestSocialMediaPlaywrightConfig:
     """Test that social media platforms are configured for Playwright rendering"""
     
@@ -0,0 +1,83 @@
+"""Tests for the persistent conditional-GET response cache."""
+import os
+import time
+
+from ingestion.http_cache import HTTPResponseCache, normalize_url
+
+
+def _cache(tmp_path, max_bytes=1024 * 1024, ttl_seconds=3600):
+    return HTTPResponseCache(str(tmp_path), max_bytes=max_bytes, ttl_seconds=ttl_seconds)
+
+
+def test_normalize_url_ignores_case_fragment_and_query_order():
+    assert normalize_url('HTTPS://Example.com:443/a?b=2&a=1#top') == normalize_url('https://example.com/a?a=1&b=2')
+
+
+def test_put_and_revalidate_round_trip(tmp_path):
+    cache = _cache(tmp_path)
+    result = {'title': 'T', 'body': 'Body', 'url': 'https://example.com/', 'screenshot_path': 's3://shot.png'}
+    assert cache.put('https://example.com/', {'ETag': '"abc"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}, result)
+
+    entry = cache.get('https://example.com/#frag')
+    assert cache.conditional_headers(entry) == {
+        'If-None-Match': '"abc"',
+        'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT',
+    }
+    cached = cache.revalidated('https://example.com/', entry)
+    assert cached['body'] == 'Body'
+    assert 'screenshot_path' not in cached
+    assert cache.get_stats()['hits'] == 1
+
+
+def test_revalidated_304_gets_fresh_ssl_fields(monkeypatch, tmp_path):
+    from ingestion import page_fetcher
+
+    cache = _cache(tmp_path)
+    result = {'title': 'T', 'body': 'Body', 'ssl_valid': 'true', 'ssl_expiry_days': 90}
+    cache.put('https://example.com/', {'ETag': '"abc"'}, result)
+    entry = cache.get('https://example.com/')
+    assert 'ssl_expiry_days' not in entry['result']
+
+    monkeypatch.setattr(page_fetcher, 'get_http_cache', lambda: cache)
+    monkeypatch.setattr(page_fetcher, 'get_ssl_data', lambda url: {'ssl_valid': 'true', 'ssl_expiry_days': 12})
+    resp = type('Resp', (), {'status_code': 304, 'text': ''})()
+    revalidated = page_fetcher._build_page_result('https://example.com/', resp, cached_entry=entry, rendered=True)
+    assert revalidated['body'] == 'Body'
+    assert revalidated['ssl_expiry_days'] == 12
+
+def test_responses_without_validators_are_not_stored(tmp_path):
+    cache = _cache(tmp_path)
+    assert not cache.put('https://example.com/', {}, {'body': 'x'})
+    assert cache.get('https://example.com/') is None
+
+
+def test_expired_entries_are_dropped(tmp_path):
+    cache = _cache(tmp_path, ttl_seconds=0.05)
+    cache.put('https://example.com/', {'ETag': '"1"'}, {'body': 'x'})
+    time.sleep(0.1)
+    assert cache.get('https://example.com/') is None
+    assert cache.get_stats()['entries'] == 0
+
+
+def test_lru_eviction_keeps_recently_used_entries(tmp_path):
+    cache = _cache(tmp_path)
+    body = 'x' * 400
+    cache.put('https://a.com/', {'ETag': '"a"'}, {'body': body})
+    entry_size = cache.get_stats()['bytes']
+    cache.max_bytes = entry_size * 2 + 10
+
+    cache.put('https://b.com/', {'ETag': '"b"'}, {'body': body})
+    time.sleep(0.01)
+    cache.revalidated('https://a.com/', cache.get('https://a.com/'))
+    cache.put('https://c.com/', {'ETag': '"c"'}, {'body': body})
+
+    assert cache.get('https://a.com/') is not None
+    assert cache.get('https://b.com/') is None
+    assert cache.get('https://c.com/') is not None
+
+
+def test_index_is_rebuilt_from_disk(tmp_path):
+    _cache(tmp_path).put('https://example.com/', {'ETag': '"abc"'}, {'body': 'persisted'})
+    reopened = _cache(tmp_path)
+    assert reopened.get('https://example.com/')['result']['body'] == 'persisted'
+    assert len([n for n in os.listdir(tmp_path) if n.endswith('.json')]) == 1
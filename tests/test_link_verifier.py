@@ -0,0 +1,137 @@
+"""Tests for the concurrent, cached link checker."""
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from scoring import link_verifier
+from scoring.link_verifier import LinkChecker, LinkStatusCache, prefetch_link_statuses
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    """Answers by host: HEAD-rejecting hosts, hosts with wrong HEAD answers and broken paths."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.active = {}
+        self.peak = {}
+        self._lock = threading.Lock()
+
+    def request(self, method, url, **kwargs):
+        host = url.split('/')[2]
+        with self._lock:
+            self.calls.append((method, url))
+            self.active[host] = self.active.get(host, 0) + 1
+            self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+        time.sleep(self.delay)
+        with self._lock:
+            self.active[host] -= 1
+        if host == 'nohead.com' and method == 'HEAD':
+            return FakeResponse(405)
+        if host == 'headlies.com' and method == 'HEAD':
+            return FakeResponse(404)
+        if url.endswith('/gone'):
+            return FakeResponse(404)
+        if host == 'bot.com':
+            return FakeResponse(403)
+        return FakeResponse(200)
+
+
+def _checker(session, **kwargs):
+    return LinkChecker(cache=LinkStatusCache(None), session=session, **kwargs)
+
+
+class TestLinkChecker(unittest.TestCase):
+    def test_statuses_and_get_fallback(self):
+        session = FakeSession()
+        checker = _checker(session)
+        results = checker.check_many([
+            'https://acme.com/', 'https://acme.com/gone', 'https://bot.com/',
+            'https://nohead.com/a', 'https://nohead.com/b',
+        ])
+        self.assertFalse(results['https://acme.com/']['is_broken'])
+        self.assertTrue(results['https://acme.com/gone']['is_broken'])
+        self.assertFalse(results['https://bot.com/']['is_broken'])  # 403 is anti-bot, not broken
+        self.assertEqual(results['https://nohead.com/b']['status_code'], 200)
+
+        self.assertIn(('GET', 'https://acme.com/gone'), session.calls)  # 404 confirmed by GET
+        self.assertNotIn(('GET', 'https://acme.com/'), session.calls)
+        gets = [url for method, url in session.calls if method == 'GET']
+        self.assertEqual(set(gets), {'https://acme.com/gone', 'https://nohead.com/a', 'https://nohead.com/b'})
+
+    def test_host_with_wrong_head_answers_switches_to_get(self):
+        session = FakeSession()
+        checker = _checker(session)
+        first = checker.check('https://headlies.com/a')
+        self.assertFalse(first['is_broken'])
+        self.assertEqual(first['status_code'], 200)
+
+        self.assertFalse(checker.check('https://headlies.com/b')['is_broken'])
+        self.assertEqual(session.calls, [
+            ('HEAD', 'https://headlies.com/a'), ('GET', 'https://headlies.com/a'), ('GET', 'https://headlies.com/b'),
+        ])
+
+    def test_duplicate_links_are_checked_once(self):
+        session = FakeSession(delay=0.05)
+        checker = _checker(session)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(checker.check('https://acme.com/footer')))
+                   for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(results), 5)
+        self.assertEqual(len(session.calls), 1)
+        self.assertEqual(checker.cached('https://acme.com/footer')['status_code'], 200)
+
+    def test_concurrency_is_bounded_per_host(self):
+        session = FakeSession(delay=0.05)
+        checker = _checker(session, max_workers=8, per_host=2)
+        urls = [f'https://acme.com/p{i}' for i in range(6)] + [f'https://other.com/p{i}' for i in range(6)]
+        start = time.monotonic()
+        checker.check_many(urls)
+        elapsed = time.monotonic() - start
+        self.assertLessEqual(session.peak['acme.com'], 2)
+        self.assertLess(elapsed, 6 * 0.05 * 2)  # Hosts run in parallel
+
+    def test_persistent_cache_survives_instances(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'links.sqlite')
+            LinkChecker(cache=LinkStatusCache(db_path), session=FakeSession()).check('https://acme.com/gone')
+            session = FakeSession()
+            result = LinkChecker(cache=LinkStatusCache(db_path), session=session).check('https://acme.com/gone')
+            self.assertTrue(result['is_broken'])
+            self.assertEqual(session.calls, [])
+
+    def test_prefetch_checks_all_assets_in_one_batch(self):
+        session = FakeSession()
+        checker = _checker(session)
+        contents = [
+            {'title': 'Home', 'body': 'See https://acme.com/about. Or https://acme.com/gone', 'url': 'https://acme.com/'},
+            {'title': 'About', 'body': 'Back to https://acme.com/about#team', 'url': 'https://acme.com/about'},
+        ]
+        with patch.dict(os.environ, {'AR_LINK_CHECK_PREFETCH': '1'}):
+            stats = prefetch_link_statuses(contents, checker=checker)
+        self.assertEqual(stats, {'links': 2, 'checked': 2, 'broken': 1})
+        self.assertEqual(len(session.calls), 3)  # The 404 is confirmed with GET
+
+        with patch.object(link_verifier, 'get_link_checker', return_value=checker):
+            broken = link_verifier.verify_broken_links(contents[0]['body'], contents[0]['url'])
+        self.assertEqual([link['url'] for link in broken], ['https://acme.com/gone'])
+        self.assertEqual(len(session.calls), 3)  # Served from cache
+
+
+if __name__ == '__main__':
+    unittest.main()
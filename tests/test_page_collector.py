@@ -0,0 +1,205 @@
+"""Tests for the shared producer/consumer collection pipeline."""
+import contextvars
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from ingestion.page_collector import run_collection_pipeline, shared_fetch_budget
+
+
+def _paged_search(total, calls=None):
+    """search_batch over `total` distinct URLs, paginated by offset."""
+    def search_batch(size, offset):
+        if calls is not None:
+            calls.append((time.monotonic(), offset))
+        end = min(total, offset + size)
+        return [{'url': f'https://site{i}.com/p'} for i in range(offset, end)], end
+    return search_batch
+
+
+def _page(url):
+    return {'title': 'Page', 'body': 'x' * 500, 'url': url}
+
+
+class TestRunCollectionPipeline(unittest.TestCase):
+    def test_reaches_target_and_stops_fetching(self):
+        fetched = []
+
+        def fetch(url):
+            fetched.append(url)
+            return _page(url)
+
+        pages = run_collection_pipeline(_paged_search(100), fetch, target_count=5, max_workers=2)
+        self.assertEqual(len(pages), 5)
+        # Queued URLs are drained without fetching once the target is reached
+        self.assertLess(len(fetched), 10)
+
+    def test_next_batch_is_prefetched_while_workers_fetch(self):
+        calls = []
+        finished = []
+
+        def fetch(url):
+            time.sleep(0.05)
+            finished.append(time.monotonic())
+            return {'title': '', 'body': '', 'url': url}  # Thin: never reaches target
+
+        run_collection_pipeline(_paged_search(30, calls), fetch, target_count=5, pool_size=30, max_workers=2)
+        self.assertGreaterEqual(len(calls), 2)
+        first_batch_size = 10  # target_count * 2
+        # The second search was issued before the first batch finished fetching
+        self.assertLess(calls[1][0], sorted(finished)[first_batch_size - 1])
+
+    def test_pool_size_is_configurable(self):
+        active = [0]
+        peak = [0]
+        lock = threading.Lock()
+
+        def fetch(url):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            return _page(url)
+
+        run_collection_pipeline(_paged_search(40), fetch, target_count=6, pool_size=40, max_workers=3)
+        self.assertLessEqual(peak[0], 3)
+        self.assertGreater(peak[0], 1)
+
+    def test_shared_fetch_budget_caps_fetches_across_pipelines(self):
+        active = [0]
+        peak = [0]
+        lock = threading.Lock()
+
+        def fetch(url):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            return _page(url)
+
+        def pipeline():
+            run_collection_pipeline(_paged_search(40), fetch, target_count=4, pool_size=40, max_workers=3)
+
+        with shared_fetch_budget(2):
+            threads = [threading.Thread(target=contextvars.copy_context().run, args=(pipeline,)) for _ in range(3)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(peak[0], 2)
+
+    def test_excluded_and_disallowed_urls_are_not_fetched(self):
+        fetched = []
+
+        def fetch(url):
+            fetched.append(url)
+            return _page(url)
+
+        with patch('ingestion.page_collector.prefetch_robots', return_value=0) as prefetch:
+            pages = run_collection_pipeline(
+                _paged_search(4), fetch, target_count=4, max_workers=1,
+                excluded_urls={'https://site0.com/p'},
+                is_allowed=lambda url: 'site1' not in url,
+            )
+        prefetch.assert_called()
+        self.assertEqual(sorted(p['url'] for p in pages), ['https://site2.com/p', 'https://site3.com/p'])
+        self.assertNotIn('https://site0.com/p', fetched)
+        self.assertNotIn('https://site1.com/p', fetched)
+
+    def test_domain_limit_is_enforced_before_fetching(self):
+        fetched = []
+
+        def search_batch(size, offset):
+            if offset:
+                return [], offset
+            urls = [f'https://big.com/{i}' for i in range(6)] + [f'https://other{i}.com/' for i in range(10)]
+            return [{'url': u} for u in urls], len(urls)
+
+        def fetch(url):
+            fetched.append(url)
+            time.sleep(0.01)
+            return _page(url)
+
+        # target 10 -> max_per_domain 2
+        pages = run_collection_pipeline(search_batch, fetch, target_count=10, max_workers=4)
+        self.assertEqual(len(pages), 10)
+        self.assertEqual(sum(1 for u in fetched if 'big.com' in u), 2)
+
+    def _first_url_fetched_first(self, urls, fetch_page):
+        """search_batch, fetch and is_allowed that hold back urls[1:] until urls[0] is being fetched."""
+        started = threading.Event()
+        fetched = []
+
+        def search_batch(size, offset):
+            if offset:
+                return [], offset
+            return [{'url': url} for url in urls], len(urls)
+
+        def fetch(url):
+            fetched.append(url)
+            if url == urls[0]:
+                started.set()
+            return fetch_page(url)
+
+        def is_allowed(url):
+            if url != urls[0]:
+                started.wait(2)  # urls[0] holds the domain's reservation by then
+            return True
+
+        return search_batch, fetch, is_allowed, fetched
+
+    def test_thin_fetch_releases_its_reservation(self):
+        urls = ['https://a.com/thin', 'https://a.com/good', 'https://a.com/extra']
+
+        def fetch_page(url):
+            time.sleep(0.02)
+            return {'title': 'T', 'body': '' if url.endswith('thin') else 'x' * 500, 'url': url}
+
+        search_batch, fetch, is_allowed, fetched = self._first_url_fetched_first(urls, fetch_page)
+        # target 5 -> max_per_domain 1: the thin page must not use up a.com's only slot
+        pages = run_collection_pipeline(search_batch, fetch, target_count=5, max_workers=3, is_allowed=is_allowed)
+        self.assertEqual(len(pages), 1)
+        # Exactly one of the deferred pages takes the released slot
+        self.assertEqual(len(fetched), 2)
+        self.assertEqual(pages[0]['url'], fetched[1])
+        self.assertIn(fetched[1], urls[1:])
+
+    def test_reserved_domain_does_not_block_other_urls(self):
+        urls = ['https://a.com/slow', 'https://a.com/next', 'https://b.com/']
+        b_fetched = threading.Event()
+
+        def fetch_page(url):
+            if url == urls[0]:
+                # Only returns promptly if another worker got to b.com meanwhile
+                self.assertTrue(b_fetched.wait(2))
+            elif url == urls[2]:
+                b_fetched.set()
+            return _page(url)
+
+        search_batch, fetch, is_allowed, fetched = self._first_url_fetched_first(urls, fetch_page)
+        # Two workers: one holds a.com's only slot, the other must defer a.com/next and move on
+        pages = run_collection_pipeline(search_batch, fetch, target_count=5, max_workers=2, is_allowed=is_allowed)
+        self.assertEqual(sorted(p['url'] for p in pages), ['https://a.com/slow', 'https://b.com/'])
+        self.assertNotIn('https://a.com/next', fetched)
+
+    def test_stops_when_search_repeats_results(self):
+        calls = []
+
+        def search_batch(size, cursor):
+            calls.append(cursor)
+            return [{'url': 'https://same.com/'}], cursor + 1
+
+        pages = run_collection_pipeline(
+            search_batch, lambda url: {'body': '', 'url': url}, target_count=3, max_workers=1,
+        )
+        self.assertEqual(pages, [])
+        self.assertLessEqual(len(calls), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
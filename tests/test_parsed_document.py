@@ -0,0 +1,63 @@
+"""Tests for the parse-once ParsedDocument shared by fetcher and MetadataExtractor."""
+from ingestion import parsed_document
+from ingestion.metadata_extractor import MetadataExtractor
+from data.models import NormalizedContent
+from ingestion.parsed_document import ParsedDocument
+
+HTML = """
+<html><head>
+<title>Example</title>
+<meta name="description" content="A description">
+<meta name="author" content="Jane">
+<meta property="og:title" content="OG Title">
+<meta property="og:type" content="article">
+<meta property="article:published_time" content="2024-05-01T00:00:00Z">
+<link rel="canonical" href="https://example.com/canonical">
+<script type="application/ld+json">{"@type": "Article", "headline": "Hi"}</script>
+<script type="application/ld+json">not json</script>
+</head><body>
+<main><p>Main content of the page.</p></main>
+<footer><a href="/privacy">Privacy</a> Copyright</footer>
+</body></html>
+"""
+
+
+def test_views_are_memoized():
+    doc = ParsedDocument(HTML, "https://example.com/")
+    assert doc.soup is doc.soup
+    assert doc.json_ld == [{"@type": "Article", "headline": "Hi"}]
+    assert doc.meta["description"] == "A description"
+    assert doc.meta_properties["article:published_time"] == "2024-05-01T00:00:00Z"
+    assert doc.og == {"og_title": "OG Title", "og_type": "article"}
+    assert doc.footer is doc.footer
+    assert "Copyright" in doc.footer.get_text()
+
+
+def test_of_returns_existing_document():
+    doc = ParsedDocument(HTML)
+    assert ParsedDocument.of(doc) is doc
+    assert not ParsedDocument("")
+
+
+def test_enrich_content_metadata_parses_once(monkeypatch):
+    calls = []
+    real_soup = parsed_document.BeautifulSoup
+
+    def counting_soup(*args, **kwargs):
+        calls.append(args)
+        return real_soup(*args, **kwargs)
+
+    monkeypatch.setattr(parsed_document, "BeautifulSoup", counting_soup)
+
+    content = NormalizedContent(
+        content_id="c1", src="web", platform_id="p1", author="a",
+        title="Example", body="", url="https://example.com/", meta={},
+    )
+    MetadataExtractor().enrich_content_metadata(content, html=HTML)
+
+    assert len(calls) == 1
+    assert content.meta["canonical"] == "https://example.com/canonical"
+    assert content.meta["og_title"] == "OG Title"
+    assert content.meta["description"] == "A description"
+    assert content.published_at == "2024-05-01T00:00:00Z"
+    assert "Main content" in content.main_text
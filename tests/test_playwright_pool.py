@@ -0,0 +1,154 @@
+"""Tests for the multi-worker Playwright browser pool."""
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from ingestion import playwright_manager
+from ingestion.playwright_manager import PlaywrightBrowserManager
+
+
+class TestPlaywrightBrowserPool(unittest.TestCase):
+    def setUp(self):
+        self.patches = [
+            patch.object(playwright_manager, '_PLAYWRIGHT_AVAILABLE', True),
+            patch.object(playwright_manager, 'sync_playwright', MagicMock(), create=True),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+
+    def _manager(self, workers, process_fetch):
+        manager = PlaywrightBrowserManager(num_workers=workers)
+        manager._process_fetch = process_fetch
+        self.assertTrue(manager.start())
+        self.addCleanup(manager.close)
+        return manager
+
+    def test_fetches_render_in_parallel_across_workers(self):
+        threads_seen = set()
+
+        def slow_fetch(browser, url, user_agent, capture_screenshot=False, on_page=None):
+            threads_seen.add(threading.current_thread().name)
+            time.sleep(0.3)
+            return {"title": "t", "body": "b", "url": url}
+
+        manager = self._manager(3, slow_fetch)
+
+        results = []
+        callers = [
+            threading.Thread(target=lambda u=u: results.append(manager.fetch_page(u, "UA")))
+            for u in ("https://a.com", "https://b.com", "https://c.com")
+        ]
+        start = time.time()
+        for t in callers:
+            t.start()
+        for t in callers:
+            t.join()
+        elapsed = time.time() - start
+
+        self.assertEqual(len(results), 3)
+        self.assertEqual(len(threads_seen), 3)
+        self.assertLess(elapsed, 0.8)
+
+        stats = manager.get_stats()
+        self.assertEqual(stats["workers"], 3)
+        self.assertEqual(stats["processed"], 3)
+        self.assertEqual(stats["pending"], 0)
+
+    def test_timeout_returns_error_result(self):
+        def slow_fetch(browser, url, user_agent, capture_screenshot=False, on_page=None):
+            time.sleep(1)
+            return {"title": "", "body": "", "url": url}
+
+        manager = self._manager(1, slow_fetch)
+        result = manager.fetch_page("https://example.com", "UA", timeout=0.2)
+        self.assertEqual(result["error"], "Timeout waiting for browser")
+
+    def test_failed_fetch_is_counted_and_answered(self):
+        def broken_fetch(browser, url, user_agent, capture_screenshot=False, on_page=None):
+            raise ValueError("boom")
+
+        manager = self._manager(2, broken_fetch)
+        result = manager.fetch_page("https://example.com", "UA")
+        self.assertEqual(result["error"], "boom")
+        self.assertEqual(manager.get_stats()["failed"], 1)
+
+    def test_fetch_queued_while_worker_stops_is_still_answered(self):
+        def fetch(browser, url, user_agent, capture_screenshot=False, on_page=None):
+            return {"title": "t", "body": "b", "url": url}
+
+        manager = self._manager(1, fetch)
+        drained, resume = threading.Event(), threading.Event()
+        drain = manager._drain_worker_queue
+
+        def slow_drain(worker):
+            drain(worker)
+            drained.set()
+            resume.wait(2)  # Thread still alive, but no longer taking tasks
+
+        manager._drain_worker_queue = slow_drain
+        self.addCleanup(resume.set)
+        manager._workers[0].request_queue.put(None)
+        self.assertTrue(drained.wait(2))
+
+        old_thread = manager._workers[0].thread
+        threading.Timer(0.2, resume.set).start()
+        # Waits for the draining thread to stop instead of starting a second one on its queue
+        result = manager.fetch_page("https://example.com", "UA", timeout=2)
+        self.assertEqual(result["body"], "b")
+        self.assertFalse(old_thread.is_alive())
+        self.assertIsNot(manager._workers[0].thread, old_thread)
+        self.assertEqual(manager.get_stats()["restarts"], 1)
+
+    def test_worker_that_cannot_launch_is_restarted_within_budget(self):
+        def fetch(browser, url, user_agent, capture_screenshot=False, on_page=None):
+            return {"title": "t", "body": "b", "url": url}
+
+        manager = PlaywrightBrowserManager(num_workers=2)
+        manager._process_fetch = fetch
+        launch = manager._launch_browser
+
+        def flaky_launch(playwright):
+            if threading.current_thread().name.endswith("-1"):
+                raise RuntimeError("chromium failed to launch")
+            return launch(playwright)
+
+        manager._launch_browser = flaky_launch
+        manager.restart_backoff_s = 0
+        manager.max_launch_failures = 3
+        self.assertTrue(manager.start())
+        self.addCleanup(manager.close)
+
+        broken = manager._workers[1]
+        for _ in range(6):
+            broken.thread.join(2)
+            # Answered either way: rendered by worker 0, or failed by the broken worker's drain
+            self.assertIn("url", manager.fetch_page("https://example.com", "UA", timeout=2))
+        broken.thread.join(2)
+
+        self.assertEqual(broken.launch_failures, 3)
+        self.assertEqual(broken.restarts, 2)  # The first launch plus two restarts
+        self.assertFalse(broken.is_alive)
+        # Once the budget is spent, every fetch goes to the healthy worker
+        self.assertEqual(manager.fetch_page("https://example.com", "UA", timeout=2)["body"], "b")
+        self.assertEqual(broken.restarts, 2)
+
+    def test_fetch_fails_once_no_worker_can_be_restarted(self):
+        manager = PlaywrightBrowserManager(num_workers=1)
+        manager._launch_browser = MagicMock(side_effect=RuntimeError("chromium failed to launch"))
+        manager.restart_backoff_s = 60
+        self.assertTrue(manager.start())
+        self.addCleanup(manager.close)
+        manager._workers[0].thread.join(2)
+
+        result = manager._dispatch({"type": "fetch", "url": "https://example.com"})
+        self.assertIsNone(result)
+        self.assertEqual(manager._workers[0].restarts, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+"""Tests for DOM-stability waits and learned render budgets."""
+import unittest
+
+from ingestion.render_wait import RenderBudget, wait_for_stable_dom
+
+
+class FakePage:
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.timeouts = []
+
+    def evaluate(self, script, args):
+        self.timeouts.append(args['timeoutMs'])
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return dict(outcome)
+
+
+class TestWaitForStableDom(unittest.TestCase):
+    def test_returns_page_result(self):
+        page = FakePage({'stable': True, 'chars': 1200, 'ticks': 5, 'mutations': 30, 'elapsed_ms': 700})
+        result = wait_for_stable_dom(page, 5000)
+        self.assertTrue(result['stable'])
+        self.assertEqual(result['chars'], 1200)
+        self.assertTrue(4900 <= page.timeouts[0] <= 5000)
+        self.assertNotIn('error', result)
+
+    def test_retries_once_after_navigation(self):
+        page = FakePage(
+            RuntimeError('Execution context was destroyed'),
+            {'stable': True, 'chars': 800, 'ticks': 4, 'mutations': 2, 'elapsed_ms': 600},
+        )
+        result = wait_for_stable_dom(page, 5000)
+        self.assertTrue(result['stable'])
+        self.assertEqual(len(page.timeouts), 2)
+        self.assertLessEqual(page.timeouts[1], 5000)
+
+    def test_gives_up_after_two_failures(self):
+        page = FakePage(RuntimeError('closed'), RuntimeError('closed'))
+        result = wait_for_stable_dom(page, 5000)
+        self.assertFalse(result['stable'])
+        self.assertIn('error', result)
+
+    def test_unexpected_result_is_an_error(self):
+        page = FakePage({'stable': True})
+        page.evaluate = lambda script, args: None
+        result = wait_for_stable_dom(page, 5000)
+        self.assertFalse(result['stable'])
+        self.assertIn('error', result)
+
+
+class TestRenderBudget(unittest.TestCase):
+    def setUp(self):
+        self.budget = RenderBudget(default_ms=8000, min_ms=1500, max_ms=20000, persist=False)
+
+    def test_unknown_domain_uses_default(self):
+        self.assertEqual(self.budget.budget_ms('https://acme.com/'), 8000)
+
+    def test_fast_domain_learns_a_short_budget(self):
+        for _ in range(5):
+            self.budget.record('https://fast.com/page', 400, stable=True)
+        self.assertEqual(self.budget.budget_ms('https://fast.com/other'), 1500)  # Clamped to min_ms
+
+        for _ in range(5):
+            self.budget.record('https://medium.com/', 3000, stable=True)
+        self.assertEqual(self.budget.budget_ms('https://medium.com/'), 3000 * 2 + 500)
+
+    def test_timeouts_grow_the_budget_up_to_max(self):
+        self.budget.record('https://slow.com/', 4000, stable=True)
+        before = self.budget.budget_ms('https://slow.com/')
+        self.budget.record('https://slow.com/', before, stable=False)
+        self.assertGreater(self.budget.budget_ms('https://slow.com/'), before)
+
+        for _ in range(20):
+            self.budget.record('https://slow.com/', 20000, stable=False)
+        self.assertEqual(self.budget.budget_ms('https://slow.com/'), 20000)
+        self.assertIn('slow.com', self.budget.snapshot())
+
+
+if __name__ == '__main__':
+    unittest.main()
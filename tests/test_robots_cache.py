@@ -0,0 +1,80 @@
+"""Tests for the shared robots.txt cache."""
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from ingestion.robots_cache import RobotsCache
+
+ROBOTS = "User-agent: *\nDisallow: /private\nSitemap: https://example.com/sitemap.xml\n"
+
+
+class TestRobotsCache(unittest.TestCase):
+    def _cache(self, tmp, **kwargs):
+        return RobotsCache(db_path=f"{tmp}/robots.sqlite", **kwargs)
+
+    def setUp(self):
+        import tempfile
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.tmp = self._tmp.name
+
+    def test_rules_and_sitemaps(self):
+        cache = self._cache(self.tmp)
+        with patch.object(RobotsCache, '_download', return_value=(200, ROBOTS)) as download:
+            self.assertTrue(cache.can_fetch('https://example.com/public'))
+            self.assertFalse(cache.can_fetch('https://example.com/private/page'))
+            self.assertEqual(cache.sitemaps('https://example.com/'), ['https://example.com/sitemap.xml'])
+        self.assertEqual(download.call_count, 1)
+
+    def test_persisted_across_instances(self):
+        with patch.object(RobotsCache, '_download', return_value=(200, ROBOTS)):
+            self._cache(self.tmp).can_fetch('https://example.com/')
+        with patch.object(RobotsCache, '_download') as download:
+            fresh = self._cache(self.tmp)
+            self.assertFalse(fresh.can_fetch('https://example.com/private'))
+            download.assert_not_called()
+            self.assertEqual(fresh.stats['disk_hits'], 1)
+
+    def test_timeouts_are_cached_negatively(self):
+        cache = self._cache(self.tmp, negative_ttl_seconds=0.05)
+        with patch.object(RobotsCache, '_download', return_value=(0, '')) as download:
+            self.assertTrue(cache.can_fetch('https://down.com/a'))
+            self.assertTrue(cache.can_fetch('https://down.com/b'))
+            self.assertEqual(download.call_count, 1)
+            time.sleep(0.1)
+            cache.can_fetch('https://down.com/c')
+            self.assertEqual(download.call_count, 2)
+        self.assertEqual(cache.stats['negative'], 2)
+
+    def test_prefetch_fetches_distinct_origins_concurrently_once(self):
+        cache = RobotsCache(db_path=None)
+        calls = []
+        lock = threading.Lock()
+
+        def slow_download(self_, origin, user_agent):
+            with lock:
+                calls.append(origin)
+            time.sleep(0.2)
+            return 404, ''
+
+        urls = ['https://a.com/1', 'https://a.com/2', 'https://b.com/', 'https://c.com/x', None]
+        with patch.object(RobotsCache, '_download', slow_download):
+            start = time.time()
+            self.assertEqual(cache.prefetch(urls), 3)
+            self.assertLess(time.time() - start, 0.5)
+            self.assertEqual(cache.prefetch(urls), 0)
+        self.assertEqual(sorted(calls), ['https://a.com', 'https://b.com', 'https://c.com'])
+        self.assertEqual(len(cache), 3)
+
+    def test_clear_removes_disk_entries(self):
+        cache = self._cache(self.tmp)
+        with patch.object(RobotsCache, '_download', return_value=(200, ROBOTS)):
+            cache.can_fetch('https://example.com/')
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertIsNone(cache._store.load('https://example.com'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,6 @@
+import threading
+import time
+
 from core.run_manager import RunManager
 from data import store
 from data.models import ContentAsset, DimensionScores, Run, TrustStackSummary
@@ -75,3 +78,35 @@ def test_run_manager_collects_serper(monkeypatch, tmp_path):
     assert len(assets) == 1
     assert assets[0]["source_type"] == "serper"
 
+
+
+def test_reddit_keywords_share_one_crawler(tmp_path):
+    engine = store.get_engine(f"sqlite:///{tmp_path/'reddit.db'}")
+    store.init_db(engine)
+    manager = RunManager(engine=engine)
+
+    crawlers = []
+    active = [0]
+    peak = [0]
+    lock = threading.Lock()
+
+    class FakeCrawler:
+        def search_posts(self, query, limit):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            return [{"url": f"https://reddit.com/{query}", "id": query, "title": query, "selftext": "post"}]
+
+    def new_crawler():
+        crawlers.append(FakeCrawler())
+        return crawlers[-1]
+
+    manager._new_reddit_crawler = new_crawler
+    assets = manager._collect_assets({"sources": ["reddit"], "keywords": ["a", "b", "c"], "limit": 1})
+
+    assert [a["meta_info"]["query"] for a in assets] == ["a", "b", "c"]
+    assert len(crawlers) == 1
+    assert peak[0] == 1
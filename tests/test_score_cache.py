@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from core.run_manager import RunManager
+from data import store
+from data.models import NormalizedContent, ScoreCacheEntry, TrustStackSummary
+from scoring.score_cache import cacheable_score, score_cache_key
+
+
+def _content(body="Acme makes recycled rain jackets.", **meta):
+    return NormalizedContent(
+        content_id="1", src="web", platform_id="https://acme.com/", author="", title="Acme",
+        body=body, url="https://acme.com/", meta=meta,
+    )
+
+
+def test_key_ignores_volatile_fields_and_tracks_config():
+    brand = {"brand_name": "Acme", "keywords": ["acme", "jackets"]}
+    key = score_cache_key(_content(query="acme", ssl_expiry_days=200), brand, "gpt-4o-mini")
+
+    # Whitespace, keyword order, search query and day-to-day SSL countdown do not matter
+    assert key == score_cache_key(
+        _content(body="Acme  makes recycled\nrain jackets.", query="acme jackets", ssl_expiry_days=199),
+        {"brand_name": "Acme", "keywords": ["jackets", "acme"]},
+        "gpt-4o-mini",
+    )
+    # Content, model, rubric and prompt version do
+    assert key != score_cache_key(_content(body="Acme makes tents."), brand, "gpt-4o-mini")
+    assert key != score_cache_key(_content(ssl_expiry_days=10), brand, "gpt-4o-mini")
+    assert key != score_cache_key(_content(), brand, "gpt-4o")
+    assert key != score_cache_key(_content(), brand, "gpt-4o-mini", rubric_version="v99")
+    assert key != score_cache_key(_content(), brand, "gpt-4o-mini", prompt_version="2")
+
+
+def test_only_scores_with_dimension_signals_are_cacheable():
+    scored = {"provenance": {"value": 8.0, "confidence": 0.9, "signals": []}}
+    assert cacheable_score({"rationale": {"dimensions": scored}})
+    assert not cacheable_score({"rationale": {}})  # Scoring error: neutral score, no dimensions
+    assert not cacheable_score({"rationale": {"dimensions": {"provenance": {"value": 5.0, "confidence": 0.0}}}})
+
+
+class CountingScorer:
+    rubric_version = "test"
+    llm_client = SimpleNamespace(model="test-model")
+
+    def __init__(self):
+        self.scored_ids = []
+        self.failing = False  # Mimic scoring errors: neutral scores without dimensions
+
+    def batch_score_content(self, contents, brand_context):
+        self.scored_ids.append([c.content_id for c in contents])
+        return [
+            SimpleNamespace(
+                content_id=c.content_id, score_provenance=0.8, score_verification=0.6,
+                score_transparency=0.7, score_coherence=0.9, score_resonance=0.5,
+                meta={} if self.failing else {
+                    "dimensions": {"provenance": {"value": 8.0, "confidence": 0.9, "coverage": 1.0, "signals": []}},
+                },
+            )
+            for c in contents
+        ]
+
+
+def test_unchanged_assets_are_not_rescored(tmp_path, monkeypatch):
+    monkeypatch.setenv("AR_SCORE_CACHE", "1")
+    engine = store.get_engine(f"sqlite:///{tmp_path/'cache.db'}")
+    store.init_db(engine)
+    scorer = CountingScorer()
+    manager = RunManager(engine=engine, scoring_pipeline=scorer)
+    assets = [
+        {"source_type": "web", "url": "https://acme.com/", "title": "Acme", "normalized_content": "Recycled jackets."},
+        {"source_type": "web", "url": "https://acme.com/tents", "title": "Tents", "normalized_content": "Tents."},
+    ]
+
+    manager.run_analysis("acme", "web", {"assets": assets, "keywords": ["acme"]})
+    assets[1]["normalized_content"] = "Tents, now with a lifetime warranty."
+    run = manager.run_analysis("acme", "web", {"assets": assets, "keywords": ["acme"]})
+
+    assert [len(ids) for ids in scorer.scored_ids] == [2, 1]
+    assert manager.last_score_cache_stats["hits"] == 1
+    with store.session_scope(engine) as session:
+        assert session.query(ScoreCacheEntry).count() == 3
+        summary = session.query(TrustStackSummary).filter_by(run_id=run.id).one()
+        assert summary.summary_insights["score_cache"]["hit_rate"] == 0.5
+
+
+def _manager(tmp_path, scorer):
+    engine = store.get_engine(f"sqlite:///{tmp_path/'cache.db'}")
+    store.init_db(engine)
+    return RunManager(engine=engine, scoring_pipeline=scorer), engine
+
+
+def test_failed_scores_are_not_cached(tmp_path, monkeypatch):
+    monkeypatch.setenv("AR_SCORE_CACHE", "1")
+    scorer = CountingScorer()
+    manager, engine = _manager(tmp_path, scorer)
+    assets = [{"source_type": "web", "url": "https://acme.com/", "title": "Acme", "normalized_content": "Jackets."}]
+
+    scorer.failing = True
+    manager.run_analysis("acme", "web", {"assets": assets, "keywords": ["acme"]})
+    with store.session_scope(engine) as session:
+        assert session.query(ScoreCacheEntry).count() == 0
+
+    scorer.failing = False
+    manager.run_analysis("acme", "web", {"assets": assets, "keywords": ["acme"]})
+    manager.run_analysis("acme", "web", {"assets": assets, "keywords": ["acme"]})
+
+    assert [len(ids) for ids in scorer.scored_ids] == [1, 1]
+    with store.session_scope(engine) as session:
+        assert session.query(ScoreCacheEntry).count() == 1
+
+
+def test_run_prunes_unused_entries(tmp_path, monkeypatch):
+    monkeypatch.setenv("AR_SCORE_CACHE", "1")
+    monkeypatch.setenv("AR_SCORE_CACHE_MAX_AGE_DAYS", "30")
+    manager, engine = _manager(tmp_path, CountingScorer())
+    with store.session_scope(engine) as session:
+        session.add(ScoreCacheEntry(cache_key="stale", last_used_at=datetime.utcnow() - timedelta(days=45)))
+        session.add(ScoreCacheEntry(cache_key="recent", last_used_at=datetime.utcnow() - timedelta(days=5)))
+
+    assets = [{"source_type": "web", "url": "https://acme.com/", "title": "Acme", "normalized_content": "Jackets."}]
+    manager.run_analysis("acme", "web", {"assets": assets, "keywords": ["acme"]})
+
+    with store.session_scope(engine) as session:
+        keys = {entry.cache_key for entry in session.query(ScoreCacheEntry)}
+    assert "stale" not in keys
+    assert "recent" in keys
@@ -0,0 +1,88 @@
+"""Tests for the TTL search results cache."""
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from ingestion.search_cache import MemorySearchCacheBackend, SearchCache, SQLiteSearchCacheBackend
+
+
+class TestSearchCache(unittest.TestCase):
+    def test_fresh_hit_skips_the_provider(self):
+        cache = SearchCache(MemorySearchCacheBackend(), ttl_seconds=60, stale_seconds=60)
+        calls = []
+
+        def search():
+            calls.append(1)
+            return [{'url': 'https://a.com/', 'title': 'A'}]
+
+        first = cache.get_or_search('serper', 'q', 3, 1, search)
+        first[0]['title'] = 'mutated'
+        second = cache.get_or_search('serper', 'q', 3, 1, search)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(second[0]['title'], 'A')
+        stats = cache.get_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertEqual(stats['hit_rate'], 0.5)
+
+    def test_key_includes_provider_size_offset_and_locale(self):
+        cache = SearchCache(MemorySearchCacheBackend())
+        calls = []
+
+        def search():
+            calls.append(1)
+            return [{'url': 'https://a.com/'}]
+
+        cache.get_or_search('brave', 'q', 3, 0, search)
+        cache.get_or_search('serper', 'q', 3, 0, search)
+        cache.get_or_search('brave', 'q', 5, 0, search)
+        cache.get_or_search('brave', 'q', 3, 10, search)
+        cache.get_or_search('brave', 'q', 3, 0, search, locale='de-DE')
+        self.assertEqual(len(calls), 5)
+
+    def test_empty_results_are_not_cached(self):
+        cache = SearchCache(MemorySearchCacheBackend())
+        cache.get_or_search('brave', 'q', 3, 0, lambda: [])
+        self.assertEqual(cache.get_or_search('brave', 'q', 3, 0, lambda: [{'url': 'x'}]), [{'url': 'x'}])
+
+    def test_stale_entry_is_served_while_refreshing(self):
+        backend = MemorySearchCacheBackend()
+        cache = SearchCache(backend, ttl_seconds=10, stale_seconds=10)
+        key = ('brave', 'q', 3, 0, 'en-US')
+        backend.set(key, [{'url': 'old'}], time.time() - 15)
+        refreshed = threading.Event()
+
+        def search():
+            refreshed.set()
+            return [{'url': 'new'}]
+
+        self.assertEqual(cache.get_or_search('brave', 'q', 3, 0, search, locale='en-US'), [{'url': 'old'}])
+        self.assertTrue(refreshed.wait(2))
+        for _ in range(50):
+            if cache.get_stats()['refreshes']:
+                break
+            time.sleep(0.01)
+        self.assertEqual(backend.get(key)[0], [{'url': 'new'}])
+        self.assertEqual(cache.get_stats()['stale_hits'], 1)
+
+    def test_expired_entry_is_a_miss(self):
+        backend = MemorySearchCacheBackend()
+        cache = SearchCache(backend, ttl_seconds=10, stale_seconds=10)
+        backend.set(('brave', 'q', 3, 0, 'en-US'), [{'url': 'old'}], time.time() - 30)
+        self.assertEqual(cache.get_or_search('brave', 'q', 3, 0, lambda: [{'url': 'new'}], locale='en-US'),
+                         [{'url': 'new'}])
+
+    def test_sqlite_backend_persists_across_instances(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'search.sqlite')
+            SearchCache(SQLiteSearchCacheBackend(path)).get_or_search('serper', 'q', 3, 1, lambda: [{'url': 'a'}])
+            cache = SearchCache(SQLiteSearchCacheBackend(path))
+            self.assertEqual(cache.get_or_search('serper', 'q', 3, 1, lambda: self.fail('should be cached')),
+                             [{'url': 'a'}])
+            self.assertEqual(cache.clear(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""Tests for SimHash fingerprints, the LSH index and near-duplicate removal."""
+import os
+import random
+import tempfile
+import unittest
+
+from ingestion.simhash import SimHashIndex, SimHashStore, hamming_distance, simhash64
+
+ARTICLE = (
+    "Acme Outdoor released its spring catalog today with a new line of recycled "
+    "rain jackets, lighter hiking boots and a repair program that extends the "
+    "warranty on every tent sold through its own stores and selected partners. "
+    "The company says the jackets use seventy percent recycled nylon and that the "
+    "repair program will be available in twelve countries by the end of the year."
+)
+
+
+class TestSimHash(unittest.TestCase):
+    def test_near_duplicates_are_close_and_unrelated_text_is_far(self):
+        base = simhash64(ARTICLE)
+        mirror = simhash64(ARTICLE.replace("twelve countries", "12 countries") + " Share this story.")
+        unrelated = simhash64("Quarterly earnings beat expectations as cloud revenue grew across every region.")
+        self.assertLessEqual(hamming_distance(base, mirror), 8)
+        self.assertGreater(hamming_distance(base, unrelated), 16)
+        self.assertEqual(simhash64(ARTICLE.upper()), base)
+
+    def test_index_finds_every_fingerprint_within_distance(self):
+        rng = random.Random(7)
+        index = SimHashIndex(max_distance=3)
+        base = rng.getrandbits(64)
+        index.add('base', base)
+        for i in range(500):
+            index.add(i, rng.getrandbits(64))
+        for flips in range(5):
+            probe = base
+            for bit in rng.sample(range(64), flips):
+                probe ^= 1 << bit
+            found = dict(index.query(probe))
+            if flips <= 3:
+                self.assertEqual(found.get('base'), flips)
+            else:
+                self.assertNotIn('base', found)
+
+        index.remove('base')
+        self.assertNotIn('base', dict(index.query(base)))
+
+    def test_store_round_trips_unsigned_fingerprints(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SimHashStore(os.path.join(tmp, 'simhash.sqlite'))
+            store.add_many([('a', (1 << 64) - 1, 'https://a.com/'), ('b', 5, '')])
+            self.assertEqual(store.load(3600), {'a': (1 << 64) - 1, 'b': 5})
+            self.assertEqual(store.load(-1), {})  # Outside the window: pruned
+
+
+class TestContentNormalizerDedup(unittest.TestCase):
+    def _content(self, content_id, body, upvotes=0):
+        from data.models import NormalizedContent
+        return NormalizedContent(content_id=content_id, src='web', platform_id=content_id, author='',
+                                 title='Spring catalog', body=body, upvotes=upvotes, url=f'https://{content_id}.com/')
+
+    def test_near_duplicates_collapse_to_most_engaged_and_persist(self):
+        from ingestion.normalizer import ContentNormalizer
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'simhash.sqlite')
+            normalizer = ContentNormalizer(dedup_store_path=path)
+            items = [
+                self._content('original', ARTICLE, upvotes=1),
+                self._content('mirror', ARTICLE + " Read more.", upvotes=9),
+                self._content('other', "An unrelated review of trail running shoes and their grip on wet rock."),
+            ]
+            kept = normalizer._deduplicate_content(items)
+            self.assertEqual([c.content_id for c in kept], ['mirror', 'other'])
+            self.assertEqual(normalizer.last_dedup_stats['near_duplicates'], 1)
+
+            next_run = ContentNormalizer(dedup_store_path=path)
+            kept = next_run._deduplicate_content([self._content('syndicated', ARTICLE)])
+            self.assertEqual(kept, [])
+            self.assertEqual(next_run.last_dedup_stats['seen_in_previous_runs'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""Tests for the priority-frontier site crawler."""
+import unittest
+
+from ingestion.site_crawler import SiteCrawler, canonicalize_url, classify_page, link_priority
+
+
+def _page(*links):
+    anchors = ''.join(f'<a href="{href}">link</a>' for href in links)
+    return f'<html><body><main><p>Content</p>{anchors}</main></body></html>'
+
+
+SITE = {
+    'https://acme.com/': _page(
+        '/blog/2019/launch', '/blog/2020/update', '/products/jacket?utm_source=home',
+        '/about-us#team', '/privacy-policy', '/terms', '/cart', '/logo.png', 'https://other.com/about',
+    ),
+    'https://acme.com/about-us': _page('/our-story', '/', '/products/jacket'),
+    'https://acme.com/privacy-policy': _page('/legal/cookies'),
+    'https://acme.com/terms': _page(),
+    'https://acme.com/products/jacket': _page('/products/tent'),
+    'https://acme.com/our-story': _page(),
+}
+
+
+class FakeFetcher:
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, urls):
+        self.batches.append(list(urls))
+        return [
+            {'url': url, 'title': url, 'body': 'text' if url in SITE else '', 'html': SITE.get(url, '')}
+            for url in urls
+        ]
+
+
+class TestSiteCrawler(unittest.TestCase):
+    def test_canonicalize_url(self):
+        self.assertEqual(
+            canonicalize_url('HTTPS://Acme.com:443/about/index.html?utm_source=x&b=2&a=1#team'),
+            'https://acme.com/about?a=1&b=2',
+        )
+        self.assertEqual(canonicalize_url('https://acme.com/shop/'), 'https://acme.com/shop')
+        self.assertEqual(canonicalize_url('https://acme.com'), 'https://acme.com/')
+
+    def test_priority_prefers_trust_pages_and_decays_per_category(self):
+        self.assertEqual(classify_page('https://acme.com/legal/cookies'), 'policies')
+        about = link_priority('https://acme.com/about', 1)
+        product = link_priority('https://acme.com/products/jacket', 1)
+        other = link_priority('https://acme.com/careers', 1)
+        self.assertGreater(about, product)
+        self.assertGreater(product, other)
+        self.assertLess(link_priority('https://acme.com/about', 1, taken_in_category=2), product)
+        self.assertLess(link_priority('https://acme.com/about', 2), about)
+
+    def test_crawl_fetches_high_signal_pages_first_within_budget(self):
+        fetcher = FakeFetcher()
+        crawler = SiteCrawler(max_pages=5, max_pages_per_domain=5, max_depth=2, max_workers=2,
+                              respect_robots=False, fetch_many=fetcher)
+        pages = crawler.crawl(['https://acme.com/'])
+
+        fetched = [url for batch in fetcher.batches for url in batch]
+        self.assertEqual(fetched[0], 'https://acme.com/')
+        self.assertEqual(set(fetched[1:3]), {'https://acme.com/about-us', 'https://acme.com/privacy-policy'})
+        self.assertEqual(len(fetched), 5)
+        self.assertEqual(len(set(fetched)), 5)
+        self.assertNotIn('https://acme.com/cart', fetched)
+        self.assertTrue(all(len(batch) <= 2 for batch in fetcher.batches))
+        self.assertTrue(all(url.startswith('https://acme.com/') for url in fetched))
+        self.assertEqual(pages[1]['page_category'], 'about')
+        self.assertGreater(crawler.stats['duplicates'], 0)
+
+    def test_per_domain_budget(self):
+        fetcher = FakeFetcher()
+        crawler = SiteCrawler(max_pages=10, max_pages_per_domain=2, respect_robots=False, fetch_many=fetcher)
+        crawler.crawl(['https://acme.com/', 'https://www.acme.com/terms'])
+        self.assertEqual(sum(len(batch) for batch in fetcher.batches), 2)
+        self.assertGreater(crawler.stats['over_budget'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""Tests for streaming sitemap discovery."""
+import gzip
+import io
+import tracemalloc
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from ingestion import sitemap_discovery
+from ingestion.sitemap_discovery import SitemapDiscovery, iter_sitemap, parse_lastmod
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" xmlns:image="http://www.google.com/schemas/sitemap-image/1.1"'
+
+
+def _urlset(entries):
+    rows = ''.join(
+        f'<url><loc>{loc}</loc>{f"<lastmod>{lastmod}</lastmod>" if lastmod else ""}'
+        f'<image:image><image:loc>{loc}/hero.jpg</image:loc></image:image></url>'
+        for loc, lastmod in entries
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><urlset {NS}>{rows}</urlset>'.encode('utf-8')
+
+
+def _index(children):
+    rows = ''.join(f'<sitemap><loc>{loc}</loc><lastmod>{lastmod}</lastmod></sitemap>' for loc, lastmod in children)
+    return f'<sitemapindex {NS}>{rows}</sitemapindex>'.encode('utf-8')
+
+
+class TestSitemapDiscovery(unittest.TestCase):
+    def setUp(self):
+        recent = (datetime.utcnow() - timedelta(days=3)).strftime('%Y-%m-%dT%H:%M:%SZ')
+        self.files = {
+            'https://acme.com/sitemap_index.xml': _index([
+                ('https://acme.com/sitemap-pages.xml.gz', '2020-01-01'),
+                ('https://acme.com/sitemap-blog.xml', recent),
+            ]),
+            'https://acme.com/sitemap-pages.xml.gz': gzip.compress(_urlset([
+                ('https://acme.com/', None),
+                ('https://acme.com/about-us', '2019-06-01'),
+                ('https://acme.com/privacy?utm_source=sitemap', '2019-06-01'),
+                ('https://acme.com/careers/engineering/backend', None),
+                ('https://cdn.other.com/about', None),
+            ])),
+            'https://acme.com/sitemap-blog.xml': _urlset([
+                ('https://acme.com/blog/new-jacket', recent),
+                ('https://acme.com/blog/old-post', '2015-01-01'),
+            ]),
+        }
+        self.opened = []
+        robots = mock.Mock()
+        robots.sitemaps.return_value = ['https://acme.com/sitemap_index.xml']
+        patcher = mock.patch.object(sitemap_discovery, 'get_robots_cache', return_value=robots)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _open(self, url):
+        self.opened.append(url)
+        return io.BytesIO(self.files[url]) if url in self.files else None
+
+    def test_index_children_are_followed_and_ranked(self):
+        discovery = SitemapDiscovery(opener=self._open)
+        results = discovery.discover('https://www.acme.com/', limit=4)
+        urls = [r['url'] for r in results]
+
+        self.assertEqual(self.opened[1], 'https://acme.com/sitemap-blog.xml')  # Most recent child first
+        self.assertEqual(urls[:2], ['https://acme.com/about-us', 'https://acme.com/privacy'])
+        self.assertIn('https://acme.com/blog/new-jacket', urls)
+        self.assertNotIn('https://cdn.other.com/about', urls)
+        self.assertFalse(any(u.endswith('.jpg') for u in urls))
+        self.assertEqual(len(results), 4)
+        self.assertEqual(discovery.stats['files'], 3)
+
+        fresh = discovery.discover('https://acme.com/', limit=10, max_age_days=30)
+        self.assertNotIn('https://acme.com/blog/old-post', [r['url'] for r in fresh])
+
+    def test_truncated_sitemap_keeps_parsed_entries(self):
+        body = self.files['https://acme.com/sitemap-blog.xml']
+        discovery = SitemapDiscovery(opener=lambda url: io.BytesIO(body), max_bytes=len(body) - 20)
+        entries = list(discovery.iter_entries('https://acme.com/'))
+        self.assertEqual([e.url for e in entries], ['https://acme.com/blog/new-jacket'])  # Cut inside the second entry
+        self.assertEqual(discovery.stats['truncated'], 1)
+
+    def test_streaming_parse_memory_is_flat(self):
+        def big_sitemap():
+            yield f'<urlset {NS}>'.encode()
+            for i in range(100_000):
+                yield f'<url><loc>https://acme.com/p/{i}</loc><lastmod>2024-01-01</lastmod></url>'.encode()
+            yield b'</urlset>'
+
+        stream = io.BytesIO(b''.join(big_sitemap()))
+        tracemalloc.start()
+        count = sum(1 for _ in iter_sitemap(stream))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.assertEqual(count, 100_000)
+        self.assertLess(peak, 5 * 1024 * 1024)
+
+    def test_parse_lastmod(self):
+        self.assertEqual(parse_lastmod('2024-05-01'), datetime(2024, 5, 1))
+        self.assertEqual(parse_lastmod('2024-05-01T12:00:00+02:00'), datetime(2024, 5, 1, 10))
+        self.assertIsNone(parse_lastmod('last week'))
+
+
+if __name__ == '__main__':
+    unittest.main()
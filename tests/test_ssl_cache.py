@@ -0,0 +1,85 @@
+"""Tests for the per-host SSL certificate probe cache."""
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from ingestion import ssl_utils
+
+
+def _record(valid=True, days=90):
+    return {
+        "ssl_valid": "true" if valid else "false",
+        "ssl_issuer": "Test CA" if valid else "",
+        "ssl_error": "" if valid else "Connection timed out",
+        "not_after": datetime.utcnow() + timedelta(days=days) if valid else None,
+    }
+
+
+class TestSSLProbeCache(unittest.TestCase):
+    def setUp(self):
+        ssl_utils.clear_ssl_cache()
+        self.addCleanup(ssl_utils.clear_ssl_cache)
+        self.calls = []
+
+    def _patch_probe(self, record, delay=0.0):
+        def fake_probe(hostname, timeout=5):
+            self.calls.append(hostname)
+            time.sleep(delay)
+            return dict(record)
+        p = patch.object(ssl_utils, '_probe_host', fake_probe)
+        p.start()
+        self.addCleanup(p.stop)
+
+    def test_one_probe_per_host(self):
+        self._patch_probe(_record(), delay=0.2)
+        results = []
+        threads = [
+            threading.Thread(target=lambda i=i: results.append(ssl_utils.get_ssl_data(f"https://example.com/p{i}")))
+            for i in range(5)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(self.calls, ["example.com"])
+        self.assertTrue(all(r["ssl_valid"] == "true" for r in results))
+        self.assertIn(results[0]["ssl_expiry_days"], (89, 90))
+        self.assertEqual(results[0]["ssl_issuer"], "Test CA")
+
+    def test_prefetch_runs_in_background(self):
+        self._patch_probe(_record(), delay=0.3)
+        start = time.time()
+        started = ssl_utils.prefetch_ssl(["https://a.com/1", "https://a.com/2", "https://b.com/", "http://c.com/"])
+        self.assertLess(time.time() - start, 0.1)
+        self.assertEqual(started, 2)
+
+        ssl_utils.get_ssl_data("https://a.com/3")
+        ssl_utils.get_ssl_data("https://b.com/x")
+        self.assertEqual(sorted(self.calls), ["a.com", "b.com"])
+
+    def test_ttl_is_capped_by_certificate_expiry(self):
+        with patch.dict('os.environ', {'AR_SSL_CACHE_TTL_HOURS': '24'}):
+            soon = ssl_utils._cache_expiry(_record(days=0.01))
+            later = ssl_utils._cache_expiry(_record(days=90))
+        self.assertLess(soon - time.time(), 0.02 * 86400)
+        self.assertAlmostEqual(later - time.time(), 24 * 3600, delta=5)
+
+    def test_failures_are_cached_briefly(self):
+        self._patch_probe(_record(valid=False))
+        with patch.dict('os.environ', {'AR_SSL_NEGATIVE_TTL_MINUTES': '10'}):
+            first = ssl_utils.get_ssl_data("https://down.com/")
+            ssl_utils.get_ssl_data("https://down.com/other")
+        self.assertEqual(first["ssl_error"], "Connection timed out")
+        self.assertEqual(self.calls, ["down.com"])
+
+    def test_non_https_is_not_probed(self):
+        self._patch_probe(_record())
+        self.assertEqual(ssl_utils.get_ssl_data("http://example.com/")["ssl_error"], "Not HTTPS")
+        self.assertEqual(self.calls, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
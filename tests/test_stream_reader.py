@@ -0,0 +1,66 @@
+"""Tests for bounded, content-type aware response reading."""
+import unittest
+import zlib
+from unittest import mock
+
+from ingestion import stream_reader
+from ingestion.stream_reader import BodyAccumulator, decode_body, extract_pdf_text, sniff_content_kind
+
+
+def _chunks(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestSniffing(unittest.TestCase):
+    def test_content_kinds(self):
+        self.assertEqual(sniff_content_kind('text/html; charset=utf-8', b'<!DOCTYPE html>'), 'html')
+        self.assertEqual(sniff_content_kind('', b'  <html><body>'), 'html')
+        self.assertEqual(sniff_content_kind('application/octet-stream', b'%PDF-1.7\n'), 'pdf')
+        self.assertEqual(sniff_content_kind('application/pdf', b''), 'pdf')
+        self.assertEqual(sniff_content_kind('image/png', b'\x89PNG\r\n\x1a\n\x00\x00'), 'other')
+        self.assertEqual(sniff_content_kind('text/html', b'PK\x03\x04\x00\x00'), 'other')
+        self.assertEqual(sniff_content_kind('application/zip', b'PK\x03\x04'), 'other')
+
+
+class TestBodyAccumulator(unittest.TestCase):
+    def test_stops_at_closing_body_tag_across_chunks(self):
+        html = b'<html><body><p>keep</p></BODY>' + b'<script>tracker()</script>' * 100 + b'</html>'
+        chunks = _chunks(html, 7)
+        consumed = []
+        body = BodyAccumulator('text/html').consume(c for c in chunks if not consumed.append(c))
+        self.assertTrue(body.reached_body_end)
+        self.assertFalse(body.truncated)
+        self.assertEqual(body.data, b'<html><body><p>keep</p></BODY>')
+        self.assertLess(len(consumed), len(chunks))
+
+    def test_enforces_byte_budget(self):
+        body = BodyAccumulator('text/html', max_bytes=100).consume(_chunks(b'<html><body>' + b'x' * 1000, 64))
+        self.assertTrue(body.truncated)
+        self.assertEqual(body.bytes_read, 100)
+
+    def test_binary_body_is_abandoned_after_first_chunk(self):
+        body = BodyAccumulator('application/zip').consume(_chunks(b'PK\x03\x04' + b'\x00' * 1000, 64))
+        self.assertEqual(body.kind, 'other')
+        self.assertEqual(body.data, b'')
+        self.assertEqual(body.text(), '')
+
+    def test_decode_prefers_declared_charsets(self):
+        self.assertEqual(decode_body('café'.encode('latin-1'), 'text/html; charset=ISO-8859-1'), 'café')
+        data = b'<meta charset="windows-1252"><p>' + 'naïve'.encode('cp1252')
+        self.assertIn('naïve', decode_body(data, 'text/html'))
+        self.assertEqual(decode_body('é'.encode('utf-8'), 'text/html'), 'é')
+
+
+class TestPdfExtraction(unittest.TestCase):
+    def test_builtin_extractor_reads_flate_text_streams(self):
+        content = zlib.compress(b'BT /F1 12 Tf (Trust \\(and\\) safety) Tj T* [(Second) -200 ( line)] TJ ET')
+        pdf = (b'%PDF-1.4\n1 0 obj << /Title (Annual Report) >> endobj\n'
+               b'2 0 obj << /Filter /FlateDecode >>\nstream\n' + content + b'\nendstream\nendobj\n%%EOF')
+        with mock.patch.object(stream_reader, '_PYPDF2_AVAILABLE', False):
+            title, text = extract_pdf_text(pdf)
+        self.assertEqual(title, 'Annual Report')
+        self.assertEqual(text, 'Trust (and) safety\nSecond line')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+"""Tests for text-only Playwright fetches (resource blocking)."""
+import unittest
+from unittest.mock import MagicMock, patch
+
+from ingestion import playwright_manager
+from ingestion.playwright_manager import (
+    PlaywrightBrowserManager,
+    get_block_list,
+    install_text_only_routes,
+    should_block_request,
+)
+
+
+def _fake_browser():
+    page = MagicMock()
+    page.content.return_value = "<html><body><p>Hello</p></body></html>"
+    page.title.return_value = "Hello"
+    page.query_selector.return_value = None
+    page.query_selector_all.return_value = []
+    page.is_visible.return_value = False
+    context = MagicMock()
+    context.new_page.return_value = page
+    browser = MagicMock()
+    browser.new_context.return_value = context
+    return browser, context
+
+
+class TestBlockList(unittest.TestCase):
+    def test_blocks_heavy_resources_and_trackers(self):
+        types, hosts = get_block_list()
+        self.assertTrue(should_block_request('image', 'https://shop.com/hero.jpg', types, hosts))
+        self.assertTrue(should_block_request('font', 'https://fonts.gstatic.com/a.woff2', types, hosts))
+        self.assertTrue(should_block_request('script', 'https://www.googletagmanager.com/gtm.js', types, hosts))
+        self.assertFalse(should_block_request('document', 'https://shop.com/', types, hosts))
+        self.assertFalse(should_block_request('script', 'https://shop.com/app.js', types, hosts))
+
+    def test_tracker_entries_match_hostnames_not_urls(self):
+        types, hosts = get_block_list()
+        self.assertTrue(should_block_request('script', 'https://static.hotjar.com/c/hotjar.js', types, hosts))
+        self.assertTrue(should_block_request('script', 'https://bat.bing.com/bat.js', types, hosts))
+        self.assertTrue(should_block_request('script', 'https://s.pinimg.com/ct/core.js', types, hosts))
+        # Lookalike hosts, paths and query strings do not count
+        self.assertFalse(should_block_request('script', 'https://nothotjar.com/app.js', types, hosts))
+        self.assertFalse(should_block_request('script', 'https://shop.example.com/js/criteo.com.js', types, hosts))
+        self.assertFalse(should_block_request('fetch', 'https://example.com/api?ref=segment.com', types, hosts))
+        self.assertFalse(should_block_request('script', 'https://www.bing.com/maps.js', types, hosts))
+        self.assertFalse(should_block_request('script', 'https://s.pinimg.com/js/widgets.js', types, hosts))
+
+    def test_first_party_pages_of_tracker_domains_load(self):
+        types, hosts = get_block_list()
+        for url in (
+            'https://www.hotjar.com/pricing',
+            'https://mixpanel.com/',
+            'https://example.com/blog?utm_source=segment.com',
+            'https://shop.example.com/reviews/criteo.com-partnership',
+        ):
+            self.assertFalse(should_block_request('document', url, types, hosts), url)
+        self.assertFalse(should_block_request('stylesheet', 'https://example.com/blog?utm_source=segment.com', types, hosts))
+
+    def test_block_list_is_configurable(self):
+        env = {'AR_PLAYWRIGHT_BLOCK_RESOURCES': 'media', 'AR_PLAYWRIGHT_BLOCK_HOSTS': 'tracker.example'}
+        with patch.dict('os.environ', env):
+            types, hosts = get_block_list()
+        self.assertEqual(types, ('media',))
+        self.assertIn('tracker.example', hosts)
+        self.assertFalse(should_block_request('image', 'https://shop.com/a.png', types, hosts))
+        self.assertTrue(should_block_request('xhr', 'https://tracker.example/collect', types, hosts))
+
+    def test_route_handler_aborts_and_continues(self):
+        target = MagicMock()
+        counter = install_text_only_routes(target)
+        handler = target.route.call_args[0][1]
+
+        blocked, allowed = MagicMock(), MagicMock()
+        blocked.request.resource_type, blocked.request.url = 'image', 'https://shop.com/a.png'
+        allowed.request.resource_type, allowed.request.url = 'document', 'https://shop.com/'
+        handler(blocked)
+        handler(allowed)
+
+        blocked.abort.assert_called_once()
+        allowed.continue_.assert_called_once()
+        self.assertEqual(counter['blocked'], 1)
+
+
+class TestProcessFetchModes(unittest.TestCase):
+    def test_text_only_fetch_installs_routes(self):
+        browser, context = _fake_browser()
+        result = PlaywrightBrowserManager(num_workers=1)._process_fetch(browser, 'https://shop.com/', 'UA')
+        context.route.assert_called_once()
+        context.new_page.return_value.close.assert_called_once()
+        self.assertEqual(result['title'], 'Hello')
+
+    def test_screenshot_fetch_loads_everything(self):
+        browser, context = _fake_browser()
+        capture = MagicMock()
+        capture.capture_above_fold.return_value = (b'png', {'success': False})
+        with patch.object(playwright_manager, 'get_screenshot_capture', return_value=capture):
+            PlaywrightBrowserManager(num_workers=1)._process_fetch(
+                browser, 'https://shop.com/', 'UA', capture_screenshot=True
+            )
+        context.route.assert_not_called()
+
+    def test_text_only_can_be_disabled(self):
+        browser, context = _fake_browser()
+        with patch.dict('os.environ', {'AR_PLAYWRIGHT_TEXT_ONLY': '0'}):
+            PlaywrightBrowserManager(num_workers=1)._process_fetch(browser, 'https://shop.com/', 'UA')
+        context.route.assert_not_called()
+
+    def test_page_job_runs_on_the_same_page(self):
+        browser, context = _fake_browser()
+        capture = MagicMock()
+        seen = []
+
+        def job(page, url, html):
+            seen.append((page, url, html))
+            return {'screenshot_path': 'top.png', 'visual_analysis': {'screenshots': {'top': 'top.png'}}}
+
+        with patch.object(playwright_manager, 'get_screenshot_capture', return_value=capture):
+            result = PlaywrightBrowserManager(num_workers=1)._process_fetch(
+                browser, 'https://shop.com/', 'UA', capture_screenshot=True, on_page=job
+            )
+        self.assertEqual(seen, [(context.new_page.return_value, 'https://shop.com/', result['html'])])
+        self.assertEqual(result['screenshot_path'], 'top.png')
+        capture.capture_above_fold.assert_not_called()
+        context.new_page.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
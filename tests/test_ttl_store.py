@@ -0,0 +1,70 @@
+"""Tests for the shared TTL key/value store."""
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+
+from ingestion.ttl_store import TTLStore
+
+
+class TestTTLStore(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.db_path = os.path.join(self._tmp.name, 'cache.sqlite')
+
+    def test_memory_tier_expires_and_evicts(self):
+        store = TTLStore(max_memory_entries=2)
+        store.put('a', 1, time.time() + 60)
+        store.put('b', 2, time.time() - 1)
+        self.assertEqual(store.get('a'), 1)
+        self.assertIsNone(store.get('b'))
+        store.put('c', 3, time.time() + 60)
+        store.put('d', 4, time.time() + 60)
+        self.assertIsNone(store.get('a'))
+        self.assertEqual(len(store), 2)
+
+    def test_persisted_entries_are_shared_across_instances(self):
+        TTLStore(self.db_path, table='things').put('a', {'x': 1}, time.time() + 60)
+        TTLStore(self.db_path, table='things').put('old', {'x': 2}, time.time() - 1)
+        other = TTLStore(self.db_path, table='things')
+        self.assertIsNone(other.get('a'))
+        self.assertEqual(other.load('a'), {'x': 1})
+        self.assertEqual(other.get('a'), {'x': 1})
+        self.assertIsNone(other.load('old'))
+        self.assertEqual(list(other.load_all()), ['a'])
+
+    def test_memory_only_entries_are_not_persisted(self):
+        store = TTLStore(self.db_path)
+        store.put('a', 1, time.time() + 60, persist=False)
+        self.assertEqual(store.get('a'), 1)
+        self.assertIsNone(TTLStore(self.db_path).load('a'))
+
+    def test_clear_and_delete(self):
+        store = TTLStore(self.db_path)
+        store.put_many([('a', 1, time.time() + 60), ('b', 2, time.time() + 60)])
+        store.delete('a')
+        self.assertIsNone(TTLStore(self.db_path).load('a'))
+        self.assertEqual(store.clear(), 1)
+        self.assertEqual(TTLStore(self.db_path).load_all(), {})
+
+    def test_table_from_an_older_layout_is_replaced(self):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('CREATE TABLE things (url TEXT PRIMARY KEY, result TEXT)')
+        store = TTLStore(self.db_path, table='things')
+        self.assertTrue(store.persistent)
+        store.put('a', 1, time.time() + 60)
+        self.assertEqual(TTLStore(self.db_path, table='things').load('a'), 1)
+
+    def test_unopenable_file_falls_back_to_memory(self):
+        blocker = os.path.join(self._tmp.name, 'file')
+        open(blocker, 'w').close()
+        store = TTLStore(os.path.join(blocker, 'cache.sqlite'))
+        self.assertFalse(store.persistent)
+        store.put('a', 1, time.time() + 60)
+        self.assertEqual(store.get('a'), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+"""Tests for the persistent WHOIS cache and concurrent prefetch."""
+import os
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest import mock
+
+from ingestion import whois_lookup
+from ingestion.whois_lookup import WHOISCache, WHOISLookup
+
+
+class FakeWhois:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.queries = []
+        self._lock = threading.Lock()
+
+    def whois(self, domain):
+        with self._lock:
+            self.queries.append(domain)
+        time.sleep(self.delay)
+        if domain == 'broken.com':
+            raise RuntimeError('connection reset')
+        if domain == 'missing.com':
+            raise RuntimeError('No match for "MISSING.COM".')
+        return SimpleNamespace(
+            domain_name=domain.upper(), registrar='MarkMonitor Inc.', creation_date=[datetime(2001, 5, 1)],
+            expiration_date=datetime(2040, 5, 1), updated_date=None, name_servers=['ns1.example.net'],
+            status='clientTransferProhibited', org='Acme Corp', country='US', state=None,
+        )
+
+
+class TestWHOISLookup(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'whois.sqlite')
+        self.fake = FakeWhois()
+        patcher = mock.patch.object(whois_lookup, 'whois', self.fake, create=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _lookup(self, **cache_kwargs):
+        lookup = WHOISLookup(cache=WHOISCache(self.path, **cache_kwargs))
+        lookup.available = True
+        return lookup
+
+    def test_subdomains_share_one_persisted_lookup(self):
+        lookup = self._lookup()
+        result = lookup.lookup('https://blog.acme.com/post')
+        self.assertEqual(result['domain'], 'acme.com')
+        self.assertGreater(result['domain_age_years'], 20)
+        self.assertEqual(result['trust_signals']['registrar_score'], 8.0)
+        self.assertEqual(lookup.lookup('www.acme.com')['registrar'], 'MarkMonitor Inc.')
+        self.assertEqual(lookup.lookup('https://shop.acme.co.uk/')['domain'], 'acme.co.uk')
+
+        # A new process reads the SQLite tier, including dates
+        again = self._lookup().lookup('acme.com')
+        self.assertEqual(again['creation_date'], datetime(2001, 5, 1))
+        self.assertEqual(self.fake.queries, ['acme.com', 'acme.co.uk'])
+
+    def test_definitive_failures_are_cached_negatively(self):
+        lookup = self._lookup(negative_ttl_seconds=60)
+        self.assertIn('error', lookup.lookup('missing.com'))
+        self.assertIn('error', lookup.lookup('https://www.missing.com/'))
+        self.assertEqual(self.fake.queries, ['missing.com'])
+        self.assertEqual(lookup.cache.stats['negative'], 1)
+
+        # Persisted for the next process
+        self.assertIn('error', self._lookup().lookup('missing.com'))
+        self.assertEqual(self.fake.queries, ['missing.com'])
+
+        expired = WHOISLookup(cache=WHOISCache(None, negative_ttl_seconds=-1))
+        expired.available = True
+        expired.lookup('missing.com')
+        expired.lookup('missing.com')
+        self.assertEqual(self.fake.queries, ['missing.com'] * 3)
+
+    def test_transient_failures_stay_in_memory_briefly(self):
+        lookup = self._lookup(negative_ttl_seconds=60, transient_ttl_seconds=60)
+        self.assertIn('error', lookup.lookup('broken.com'))
+        self.assertIn('error', lookup.lookup('broken.com'))
+        self.assertEqual(self.fake.queries, ['broken.com'])
+        self.assertEqual(lookup.cache.stats['transient'], 1)
+        self.assertEqual(lookup.cache.stats['negative'], 0)
+
+        # Not persisted: the next process retries
+        self._lookup().lookup('broken.com')
+        self.assertEqual(self.fake.queries, ['broken.com'] * 2)
+
+        retrying = self._lookup(transient_ttl_seconds=-1)
+        retrying.lookup('broken.com')
+        retrying.lookup('broken.com')
+        self.assertEqual(self.fake.queries, ['broken.com'] * 4)
+
+    def test_prefetch_runs_concurrently_and_lookups_join_it(self):
+        self.fake.delay = 0.2
+        lookup = self._lookup()
+        urls = [f'https://www.site{i}.com/page' for i in range(6)] + ['https://site0.com/other']
+        started = time.time()
+        futures = lookup.prefetch(urls)
+        self.assertEqual(len(futures), 6)
+        self.assertEqual(lookup.lookup('site3.com')['domain'], 'site3.com')  # Joins the in-flight query
+        for future in futures:
+            future.result()
+        self.assertLess(time.time() - started, 0.2 * 6)
+        self.assertEqual(sorted(self.fake.queries), sorted(f'site{i}.com' for i in range(6)))
+        self.assertEqual(lookup.prefetch(urls), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1391,8 +1391,16 @@ def show_analyze_page():
             engine = store.init_db()
             # Initialize scoring pipeline
             scorer = ContentScorer(use_attribute_detection=True)
-            manager = RunManager(engine=engine, scoring_pipeline=scorer)
-            
+
+            def on_collection_progress(completed, total, task, asset_count):
+                # Collection runs before scoring, between 30% and 50%
+                progress_animator.show(
+                    f"Collected {asset_count} items from {task.source} for '{task.keyword}' ({completed}/{total})...", "📥"
+                )
+                progress_bar.progress(30 + int(20 * completed / max(total, 1)))
+
+            manager = RunManager(engine=engine, scoring_pipeline=scorer, progress_callback=on_collection_progress)
+
             progress_animator.show("Preparing assets for analysis...", "📦")
             progress_bar.progress(10)
             
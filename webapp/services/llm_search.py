@@ -1,6 +1,7 @@
 """
 LLM-based search service for brand URL discovery
 """
+import os
 import re
 import json
 import logging
@@ -96,12 +97,82 @@ priceless.com
         return []
 
 
+def sitemap_brand_urls(brand_id: str, brand_domains: List[str], max_urls: int = 10,
+                       fetch_page_title_func=None) -> List[Dict[str, Any]]:
+    """
+    Collect brand URLs from the sitemaps of known brand domains.
+
+    Sitemap URLs are published by the site itself, so no LLM call or HTTP
+    verification is needed. Set AR_SITEMAP_DISCOVERY=0 to disable.
+
+    Returns:
+        Entries in the same shape as suggest_brand_urls_from_llm, best first
+    """
+    if not brand_domains or os.getenv('AR_SITEMAP_DISCOVERY', '1') == '0':
+        return []
+    try:
+        from ingestion.sitemap_discovery import discover_site_urls
+    except Exception as e:
+        logger.info('Sitemap discovery not available: %s', e)
+        return []
+
+    candidates: List[Dict[str, Any]] = []
+    with ThreadPoolExecutor(max_workers=min(8, len(brand_domains))) as exe:
+        futures = [
+            exe.submit(discover_site_urls, d if '://' in d else f'https://{d}/', limit=max_urls)
+            for d in brand_domains
+        ]
+        for fut in futures:
+            candidates.extend(fut.result())
+    candidates = [c for c in candidates if is_usa_host(c['url'])]
+    candidates.sort(key=lambda c: -c['score'])
+
+    entries: List[Dict[str, Any]] = []
+    seen = set()
+    for c in candidates:
+        if c['url'] in seen:
+            continue
+        seen.add(c['url'])
+        entries.append({
+            'url': c['url'],
+            'is_primary': classify_brand_url(c['url'], brand_id, brand_domains) == 'primary',
+            'verified': True,
+            'status': None,
+            'soft_verified': False,
+            'verification_method': 'sitemap',
+            'title': None,
+            'evidence': f"Listed in {c['sitemap']}",
+            'confidence': 0,
+            'lastmod': c.get('lastmod'),
+            'is_promotional': is_promotional_url(c['url'])
+        })
+        if len(entries) >= max_urls:
+            break
+
+    if fetch_page_title_func and entries:
+        def _title(entry):
+            try:
+                return fetch_page_title_func(entry['url'], brand_id)
+            except Exception as exc:
+                logger.debug('Title fetch failed for %s: %s', entry['url'], exc)
+                return None
+
+        with ThreadPoolExecutor(max_workers=min(20, len(entries))) as exe:
+            for entry, title in zip(entries, exe.map(_title, entries)):
+                entry['title'] = title
+    logger.info('Sitemap discovery found %d URLs for %s', len(entries), brand_id)
+    return entries
+
+
 def suggest_brand_urls_from_llm(brand_id: str, keywords: List[str], model: str = 'gpt-4o-mini', max_urls: int = 10,
                                brand_domains: List[str] = None, verify_url_func=None,
                                fetch_page_title_func=None, search_urls_fallback_func=None) -> List[Dict[str, Any]]:
     """
     Ask an LLM to enumerate likely brand-owned URLs for the given brand.
 
+    URLs from the sitemaps of ``brand_domains`` come first (see
+    sitemap_brand_urls); the LLM is only asked when they do not fill max_urls.
+
     Args:
         brand_id: Brand identifier
         keywords: Search keywords to provide context
@@ -133,6 +204,12 @@ def suggest_brand_urls_from_llm(brand_id: str, keywords: List[str], model: str =
             logger.info('Brand %s is in excluded_brands; skipping LLM enumeration', brand_id)
             return []
 
+        # Sitemaps list the brand's real pages: use them first and only ask the LLM for the rest
+        sitemap_entries = sitemap_brand_urls(brand_id, brand_domains, max_urls, fetch_page_title_func)
+        if len(sitemap_entries) >= max_urls:
+            logger.info('Sitemaps provided %d URLs for %s; skipping LLM enumeration', len(sitemap_entries), brand_id)
+            return sitemap_entries[:max_urls]
+
         # Ask the model for structured JSON-per-line output: url, evidence, confidence
         # Temporarily enable debug logging for this call so we can capture raw model output
         prev_level = logger.level
@@ -251,7 +328,9 @@ def suggest_brand_urls_from_llm(brand_id: str, keywords: List[str], model: str =
             except Exception as e:
                 logger.warning('Search fallback failed for %s: %s', brand_id, e)
 
-        return verified_entries[:max_urls]
+        sitemap_urls = {e['url'] for e in sitemap_entries}
+        combined = sitemap_entries + [e for e in verified_entries if e['url'] not in sitemap_urls]
+        return combined[:max_urls]
     except Exception as exc:
         logger.warning('LLM brand URL suggestion failed: %s', exc)
         return []
@@ -15,6 +15,7 @@ from webapp.utils.url_utils import is_login_page, is_core_domain
 from webapp.services.brand_discovery import detect_brand_owned_url
 from webapp.services.llm_search import get_brand_domains_from_llm
 from webapp.services.social_search import search_social_media_channels
+from ingestion.domain_classifier import brand_url_scope, extract_domain_parts
 from ingestion.page_fetcher import fetch_pages_parallel
 from ingestion.playwright_manager import get_browser_manager
 
@@ -409,8 +410,11 @@ def fetch_and_process_selected_urls(selected_urls: List[Dict[str, Any]]):
             logger.warning('[ORCHESTRATION] Could not start persistent browser: %s', e)
             browser_manager = None
 
-        # Fetch pages in parallel
-        fetched_results = fetch_pages_parallel(urls_to_fetch, max_workers=5, browser_manager=browser_manager)
+        # Fetch pages in parallel; the domains of URLs classified as brand-owned
+        # during the search decide which pages get visual capture
+        brand_domains = {extract_domain_parts(u['url'])[0] for u in selected_urls if u.get('is_brand_owned')}
+        with brand_url_scope(brand_domains):
+            fetched_results = fetch_pages_parallel(urls_to_fetch, max_workers=5, browser_manager=browser_manager)
         
         # Map results back to original objects
         processed_urls = []